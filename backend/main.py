@@ -1,23 +1,179 @@
 """
 FastAPI 백엔드 서버
-서울 관광지 혼잡도 예측을 위한 REST API 제공
+서울 관광지 혼잡도 예측을 위한 REST API 제공 (실행: python backend/server.py)
 """
+import asyncio
 import sys
+import warnings
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import List
-from fastapi import FastAPI, HTTPException
+from typing import Dict, List, Optional
+from fastapi import FastAPI, HTTPException, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from datetime import datetime
-import uvicorn
 import numpy as np
 
 sys.path.append(str(Path(__file__).parent.parent))
 
 from ml_service import PredictionService, MLConfig
+from ml_service.evaluation_artifact import EvaluationArtifactStore
+from ml_service.evaluation_cache import EvaluationCache
+from ml_service.evaluation_pool import EvaluationPool
+from ml_service.metrics import (
+    CONTENT_TYPE,
+    REGISTRY,
+    MetricsMiddleware,
+    counter_family,
+    gauge_family,
+    sample,
+    track_stage,
+)
+from ml_service.preprocessing import RAW_OBSERVATION_COLUMNS
+from ml_service.registry import ModelReloadWatcher
+from ml_service.resilience import CircuitOpenError, DeadlineExceededError
+from ml_service.scatter import SCATTER_MODES, compact_evaluation
+from ml_service.scenarios import CATEGORICAL_RANGES, build_scenarios
+from ml_service.shared_state import RefreshLeader, SharedObservationCache, shared_state_paths
+from ml_service.snapshot import SnapshotScheduler
+from ml_service.tracing import TraceMiddleware, annotate, attach_trace
+from ml_service.warmup import ModelWarmup
 from scripts.evaluate_models import evaluate_model
 
 prediction_service = PredictionService()
+snapshot_scheduler = SnapshotScheduler(prediction_service)
+model_warmup = ModelWarmup(prediction_service)
+evaluation_artifacts = EvaluationArtifactStore()
+evaluation_cache = EvaluationCache()
+evaluation_pool = EvaluationPool(evaluate_model)
+
+
+async def refresh_snapshot_after_reload(result: dict):
+    """모델 교체 후 예측 스냅샷을 새 모델로 다시 계산 (캐시된 관측값 사용)"""
+    if not MLConfig.SNAPSHOT_ENABLED:
+        return
+    try:
+        await snapshot_scheduler.refresh(clear_cache=False)
+    except Exception as e:
+        warnings.warn(f"모델 교체 후 스냅샷 갱신 실패, 다음 갱신 시각에 다시 계산: {e}")
+
+
+model_reload_watcher = ModelReloadWatcher(prediction_service, on_reload=refresh_snapshot_after_reload)
+
+
+def enable_shared_state(state_dir: Path):
+    """
+    워커 간 공유 상태 사용 (다중 워커 실행 시 fork 전에 호출)
+    
+    관측 데이터/예보/예측 시계열 캐시를 SQLite 파일로 공유하고,
+    예측 스냅샷은 잠금을 얻은 워커 하나만 갱신하도록 합니다.
+    """
+    paths = shared_state_paths(state_dir)
+    prediction_service.observation_cache = SharedObservationCache(paths["cache"])
+    prediction_service.observation_cache.clear()
+    snapshot_scheduler.leader = RefreshLeader(paths["leader_lock"])
+
+
+def collect_service_metrics() -> list:
+    """
+    /metrics 요청 시 서비스 객체들이 이미 세고 있는 값을 읽어 메트릭으로 변환
+
+    관측 데이터 캐시, 예측 메모, 업스트림 회로 차단기, 모델 버전, 예열 상태, 스냅샷 나이
+    """
+    families = []
+    cache = prediction_service.observation_cache
+    families.append(counter_family("tourist_observation_cache_requests", "관측 데이터 캐시 조회 수", [
+        sample({"result": "hit"}, cache.hits),
+        sample({"result": "miss"}, cache.misses)
+    ]))
+    families.append(gauge_family("tourist_observation_cache_entries", "만료되지 않은 관측 데이터 캐시 항목 수", [
+        sample(None, len(cache))
+    ]))
+
+    memo = prediction_service.memo
+    if memo is not None:
+        stats = memo.stats()
+        families.append(counter_family("tourist_memo_requests", "예측 메모 조회 수", [
+            sample({"result": "hit"}, stats["hits"]),
+            sample({"result": "table_hit"}, stats["table_hits"]),
+            sample({"result": "miss"}, stats["misses"])
+        ]))
+        families.append(gauge_family("tourist_memo_entries", "예측 메모 항목 수", [sample(None, stats["entries"])]))
+
+    guards = list(prediction_service.upstream_guards.items())
+    families.append(counter_family("tourist_upstream_calls", "업스트림 호출 수 (헤지 요청 제외)", [
+        sample({"upstream": name}, guard.calls) for name, guard in guards
+    ]))
+    families.append(counter_family("tourist_upstream_hedges", "업스트림 헤지 요청 수", [
+        sample({"upstream": name}, guard.hedges) for name, guard in guards
+    ]))
+    families.append(counter_family("tourist_upstream_rejected", "회로 차단기가 거부한 업스트림 호출 수", [
+        sample({"upstream": name}, guard.breaker.rejected) for name, guard in guards
+    ]))
+    families.append(gauge_family("tourist_upstream_breaker_state", "업스트림 회로 차단기 상태 (현재 상태만 1)", [
+        sample({"upstream": name, "state": state}, 1 if guard.breaker.state == state else 0)
+        for name, guard in guards
+        for state in (guard.breaker.CLOSED, guard.breaker.OPEN, guard.breaker.HALF_OPEN)
+    ]))
+
+    families.append(gauge_family("tourist_model_info", "현재 모델 버전 (레지스트리를 쓰지 않으면 빈 문자열)", [
+        sample({"version": prediction_service.models.version or ""}, 1)
+    ]))
+    families.append(counter_family("tourist_model_reloads", "모델 교체 수", [
+        sample(None, prediction_service.model_reloads)
+    ]))
+    families.append(gauge_family("tourist_ready", "모델 예열 완료 여부 (1이면 준비)", [
+        sample(None, 1 if model_warmup.ready else 0)
+    ]))
+    evaluation = evaluation_cache.stats()
+    families.append(counter_family("tourist_evaluation_cache_requests", "모델 평가 결과 캐시 조회 수", [
+        sample({"result": "memory_hit"}, evaluation["memory_hits"]),
+        sample({"result": "disk_hit"}, evaluation["disk_hits"]),
+        sample({"result": "miss"}, evaluation["misses"])
+    ]))
+    artifacts = evaluation_artifacts.stats()
+    families.append(counter_family("tourist_evaluation_artifact_requests", "학습 시 평가 아티팩트 조회 수", [
+        sample({"result": "hit"}, artifacts["hits"]),
+        sample({"result": "stale"}, artifacts["stale"]),
+        sample({"result": "missing"}, artifacts["missing"])
+    ]))
+
+    snapshot = snapshot_scheduler.snapshot
+    if snapshot is not None:
+        families.append(gauge_family("tourist_snapshot_age_seconds", "예측 스냅샷 나이 (초)", [
+            sample(None, snapshot.age_seconds())
+        ]))
+    return families
+
+
+REGISTRY.add_collector(collect_service_metrics)
+
+
+def evaluate_site(tourist_code: str) -> dict:
+    """
+    관광지 하나의 모델 평가 (스레드에서 호출)
+    
+    학습 시 저장된 평가 아티팩트가 현재 모델/DB와 맞으면 이를 반환하고,
+    없거나 오래되었으면 저장된 평가 결과 또는 평가 프로세스 풀의 실시간 평가 결과를 반환합니다.
+    평가 아티팩트, 평가 결과 캐시, 실시간 평가 모두 현재 서비스 중인 모델 세트의 디렉토리(레지스트리 버전)를 사용합니다.
+    """
+    with track_stage("evaluate"):
+        models = prediction_service.models
+        annotate(tourist_code=tourist_code, model_version=models.version)
+        result = evaluation_artifacts.load(tourist_code, models.models_dir)
+        if result is not None:
+            return result
+        return evaluation_cache.get_or_compute(tourist_code, evaluation_pool.evaluate, models.models_dir)
+
+
+def check_scatter_mode(scatter: str):
+    """산점도 데이터 형식 검증 (알 수 없는 형식이면 400)"""
+    if scatter not in SCATTER_MODES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"scatter는 {', '.join(SCATTER_MODES)} 중 하나여야 합니다: {scatter}"
+        )
 
 
 def calculate_performance_level(r2: float) -> str:
@@ -67,12 +223,46 @@ class HealthResponse(BaseModel):
     timestamp: str
     service: str
 
+class ReadinessResponse(BaseModel):
+    status: str
+    ready: bool
+    timestamp: str
+    warmup: dict
+
+class ScenarioRequest(BaseModel):
+    sites: Optional[List[str]] = None
+    rows: Optional[List[Dict[str, float]]] = None
+    columns: Optional[Dict[str, List[float]]] = None
+    grid: Optional[Dict[str, List[float]]] = None
+    include_inputs: bool = True
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """애플리케이션 시작/종료 처리"""
+    # 모델 예열 및 메모 사전 계산 (백그라운드, 끝날 때까지 readiness false, pre-fork 부모에서 마쳤으면 생략)
+    model_warmup.start()
+    # 예측 스냅샷 백그라운드 갱신 시작
+    if MLConfig.SNAPSHOT_ENABLED:
+        snapshot_scheduler.start()
+    # 모델 레지스트리 현재 버전 감시 (바뀌면 새 모델 세트를 예열 후 교체)
+    model_reload_watcher.start()
+    yield
+    await model_reload_watcher.stop()
+    await snapshot_scheduler.stop()
+    await model_warmup.stop()
+    # 업스트림 연결 풀 정리
+    await prediction_service.aclose()
+    # 평가 워커 프로세스 종료
+    await asyncio.to_thread(evaluation_pool.shutdown)
+
 
 app = FastAPI(
     title="KOREA TOUR GUIDE API",
     version="1.0.0",
     description="서울 내 주요 관광지의 실시간 혼잡도를 예측하는 API",
     docs_url="/docs",
+    lifespan=lifespan,
     tags_metadata=[
         {
             "name": "info",
@@ -104,6 +294,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(MetricsMiddleware, routes=app.routes)
+app.add_middleware(TraceMiddleware, prefixes=("/api/predict", "/api/evaluate"))
 
 
 @app.get("/", tags=["info"])
@@ -120,9 +312,21 @@ async def root():
             "tourist_sites": "/api/tourist-sites",
             "predict": "/api/predict/{tourist_code}",
             "predict_all": "/api/predict-all",
+            "forecast": "/api/forecast/{tourist_code}",
+            "forecast_all": "/api/forecast-all",
+            "scenarios": "/api/scenarios",
             "evaluate": "/api/evaluate/{tourist_code}",
             "evaluate_all": "/api/evaluate-all",
-            "health": "/api/health"
+            "snapshot": "/api/snapshot",
+            "upstream": "/api/upstream",
+            "memo": "/api/memo",
+            "engine": "/api/engine",
+            "models": "/api/models",
+            "models_reload": "/api/models/reload",
+            "health": "/api/health",
+            "liveness": "/api/health/live",
+            "readiness": "/api/health/ready",
+            "metrics": "/metrics"
         },
         "docs": "/docs"
     }
@@ -186,20 +390,22 @@ async def get_tourist_sites():
             }
         },
         503: {
-            "description": "서비스 사용 불가 (모델 파일 없음)",
+            "description": "서비스 사용 불가 (모델 파일 없음, 업스트림 회로 차단 또는 시간 예산 초과)",
         },
         500: {
             "description": "서버 내부 오류",
         }
     }
 )
-async def predict_single(tourist_code: str):
+async def predict_single(tourist_code: str, response: Response):
     """
     단일 관광지의 혼잡도를 예측합니다.
     
     - **tourist_code**: 관광지 코드 (예: changdeok_palace)
     
     실시간 기상 데이터와 대기환경 데이터를 기반으로 XGBoost 모델을 사용하여 예측합니다.
+    백그라운드에서 미리 계산된 스냅샷이 있으면 이를 반환하며,
+    관광지 예측 시각과 나이는 `X-Snapshot-Created-At`, `X-Snapshot-Age` 헤더로 제공합니다.
     
     **사용 가능한 관광지 코드:**
     - changdeok_palace (창덕궁)
@@ -210,12 +416,22 @@ async def predict_single(tourist_code: str):
     - seoul_arts_center (예술의전당)
     - seoul_grand_park (서울대공원)
     """
+    snapshot = snapshot_scheduler.snapshot
+    if snapshot is not None:
+        result = snapshot.get(tourist_code)
+        if result is not None:
+            # 갱신에 실패해 이전 예측을 이어받은 관광지는 그 예측 시각 기준
+            response.headers["X-Snapshot-Created-At"] = snapshot.predicted_at(tourist_code).isoformat()
+            response.headers["X-Snapshot-Age"] = f"{snapshot.age_seconds(tourist_code=tourist_code):.3f}"
+            annotate(source="snapshot")
+            return attach_trace(result)
+    
     try:
-        result = prediction_service.predict(tourist_code)
-        return result
+        result = await prediction_service.predict_async(tourist_code)
+        return attach_trace(result)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
-    except FileNotFoundError as e:
+    except (FileNotFoundError, CircuitOpenError, DeadlineExceededError) as e:
         raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"예측 중 오류 발생: {str(e)}")
@@ -232,46 +448,331 @@ async def predict_all():
     모든 관광지의 혼잡도를 한 번에 예측합니다.
     
     각 관광지별로 예측을 수행하며, 실패한 경우 errors 배열에 포함됩니다.
+    관측 데이터는 자치구 코드와 기상청 격자별로 한 번씩만 수집합니다.
     
     **응답 구조:**
     - **predictions**: 성공한 예측 결과 (관광지명: 예측값)
     - **errors**: 실패한 관광지 정보 (있는 경우)
     - **timestamp**: 예측 시각
+    - **snapshot**: 스냅샷 메타데이터 (갱신 시각, 가장 오래된 예측의 나이와 stale 여부, 관광지별 sites, 스냅샷 사용 시)
+      갱신에 실패해 이전 예측을 이어받은 관광지는 predictions에 남고 errors에는 포함되지 않습니다.
     """
-    results = {}
-    errors = []
+    snapshot = snapshot_scheduler.snapshot
+    if snapshot is not None:
+        annotate(source="snapshot")
+        return attach_trace({
+            "predictions": {name: dict(result) for name, result in snapshot.predictions.items()},
+            "errors": list(snapshot.errors),
+            "timestamp": snapshot.created_at.isoformat(),
+            "snapshot": snapshot.metadata()
+        })
     
-    for tourist_code in MLConfig.TOURIST_SITES.keys():
-        try:
-            result = prediction_service.predict(tourist_code)
-            results.update(result)
-        except Exception as e:
-            korean_name = MLConfig.TOURIST_SITES[tourist_code]["korean_name"]
-            errors.append({
-                "site": korean_name,
-                "code": tourist_code,
-                "error": str(e)
-            })
+    results, errors = await prediction_service.predict_all_async()
     
-    return {
+    return attach_trace({
         "predictions": results,
         "errors": errors,
+        "timestamp": datetime.now().isoformat(),
+        "snapshot": None
+    })
+
+
+@app.get(
+    "/api/forecast/{tourist_code}",
+    tags=["predictions"],
+    summary="단일 관광지 시간별 혼잡도 예보",
+    description="기상청 단기예보를 사용하여 앞으로 최대 72시간의 시간별 예상 방문자 수와 혼잡도를 예측합니다.",
+    responses={
+        404: {"description": "관광지 코드를 찾을 수 없음"},
+        503: {"description": "서비스 사용 불가 (모델 파일 없음, 업스트림 회로 차단 또는 시간 예산 초과)"},
+        500: {"description": "서버 내부 오류"}
+    }
+)
+async def forecast_single(
+    tourist_code: str,
+    hours: int = Query(MLConfig.FORECAST_DEFAULT_HOURS, ge=1, le=MLConfig.FORECAST_MAX_HOURS, description="예보 구간 (시간)")
+):
+    """
+    단일 관광지의 시간별 혼잡도를 예보합니다.
+    
+    - **tourist_code**: 관광지 코드 (예: changdeok_palace)
+    - **hours**: 예보 구간 (기본 24시간, 최대 72시간)
+    
+    기상청 단기예보(기온, 습도, 풍속, 강수량)와 현재 미세먼지 측정값으로
+    예보 구간 전체를 한 번에 예측합니다. 결과는 다음 예보 발표 시각까지 캐싱됩니다.
+    
+    **응답 구조:**
+    - **tourist_code**, **korean_name**: 관광지 정보
+    - **issued_at**: 사용한 단기예보 발표 시각
+    - **hours**: 예보 구간
+    - **forecast**: 시각별 예측 (datetime, predicted_visitors, congestion_level, 입력 기상값)
+    """
+    try:
+        return await prediction_service.forecast_async(tourist_code, hours)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except (FileNotFoundError, CircuitOpenError, DeadlineExceededError) as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"예보 중 오류 발생: {str(e)}")
+
+
+@app.get(
+    "/api/forecast-all",
+    tags=["predictions"],
+    summary="모든 관광지 시간별 혼잡도 예보",
+    description="모든 관광지의 시간별 예상 방문자 수와 혼잡도를 기상청 단기예보로 한 번에 예측합니다."
+)
+async def forecast_all(
+    hours: int = Query(MLConfig.FORECAST_DEFAULT_HOURS, ge=1, le=MLConfig.FORECAST_MAX_HOURS, description="예보 구간 (시간)")
+):
+    """
+    모든 관광지의 시간별 혼잡도를 예보합니다.
+    
+    단기예보와 미세먼지 측정값은 격자/자치구별로 한 번씩만 수집하며,
+    실패한 관광지는 errors 배열에 포함됩니다.
+    
+    **응답 구조:**
+    - **forecasts**: 관광지명별 예보 (단일 예보 응답과 같은 형식)
+    - **errors**: 실패한 관광지 정보 (있는 경우)
+    - **hours**: 예보 구간
+    - **timestamp**: 응답 시각
+    """
+    results, errors = await prediction_service.forecast_many_async(hours=hours)
+    
+    return {
+        "forecasts": results,
+        "errors": errors,
+        "hours": hours,
         "timestamp": datetime.now().isoformat()
     }
 
 
+@app.post(
+    "/api/scenarios",
+    tags=["predictions"],
+    summary="가상 조건(what-if) 일괄 예측",
+    description="가상의 미세먼지/기상/요일/계절 조건을 여러 관광지에 대해 한 번에 예측합니다.",
+    responses={
+        400: {"description": "잘못된 시나리오 또는 관광지 코드"},
+        503: {"description": "서비스 사용 불가 (모델 파일 없음)"},
+        500: {"description": "서버 내부 오류"}
+    }
+)
+def predict_scenarios(request: ScenarioRequest):
+    """
+    가상 조건(시나리오)을 일괄 예측합니다.
+    
+    시나리오는 다음 중 하나로 지정합니다.
+    - **rows**: 행 목록 `[{"pm10": 150, "rainfall": 10, "weekday": 5, "season": 0}, ...]`
+    - **columns**: 컬럼별 같은 길이의 값 목록 `{"pm10": [...], "weekday": [...], ...}` (대량 요청에 권장)
+    - **grid**: 컬럼별 후보값, 모든 조합(데카르트 곱)을 예측 `{"pm10": [30, 80, 150], "weekday": [0, 5, 6], ...}`
+    
+    컬럼: pm10, windspeed, temperature, humidity, rainfall, weekday(0=월~6=일), season(0=봄~3=겨울)
+    (temperature, humidity, windspeed, rainfall은 생략 시 20, 60, 2, 0)
+    
+    - **sites**: 관광지 코드 목록 (생략 시 모든 관광지)
+    - **include_inputs**: 응답에 시나리오 입력값 포함 여부
+    
+    **응답 구조 (컬럼형):**
+    - **count**: 시나리오 수
+    - **inputs**: 컬럼별 입력값 목록 (include_inputs=true)
+    - **predictions**: 관광지명별 predicted_visitors, congestion_level 목록 (시나리오 순서)
+    """
+    try:
+        raw = build_scenarios(request.rows, request.columns, request.grid)
+        results = prediction_service.predict_scenarios(raw, request.sites)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"시나리오 예측 중 오류 발생: {str(e)}")
+    
+    inputs = None
+    if request.include_inputs:
+        inputs = {
+            col: (raw[:, i].astype(int) if col in CATEGORICAL_RANGES else raw[:, i]).tolist()
+            for i, col in enumerate(RAW_OBSERVATION_COLUMNS)
+        }
+    
+    # 대량 응답은 jsonable_encoder를 거치지 않고 바로 직렬화
+    return JSONResponse({
+        "count": int(raw.shape[0]),
+        "inputs": inputs,
+        "predictions": {
+            name: {
+                "code": result["code"],
+                "predicted_visitors": result["predicted_visitors"].tolist(),
+                "congestion_level": result["congestion_level"].tolist()
+            }
+            for name, result in results.items()
+        }
+    })
+
+
+@app.get(
+    "/api/snapshot",
+    tags=["predictions"],
+    summary="예측 스냅샷 상태",
+    description="백그라운드 예측 스냅샷의 생성 시각, 나이, 다음 갱신 시각을 반환합니다."
+)
+async def snapshot_status():
+    """
+    예측 스냅샷 스케줄러 상태를 반환합니다.
+    
+    - **running**: 백그라운드 갱신 실행 여부
+    - **snapshot**: 현재 스냅샷 메타데이터 (없으면 null)
+    - **last_refresh_at**: 마지막 갱신 시도 시각
+    - **next_refresh_at**: 다음 갱신 예정 시각
+    - **last_error**: 마지막 갱신 오류 (있는 경우)
+    """
+    return snapshot_scheduler.status()
+
+
+@app.get(
+    "/api/upstream",
+    tags=["info"],
+    summary="업스트림 API 상태",
+    description="대기환경/기상청 API별 회로 차단기 상태와 지연 시간 백분위수를 반환합니다."
+)
+async def upstream_status():
+    """
+    업스트림 API 상태를 반환합니다.
+    
+    - **upstreams**: 업스트림별 상태 (air_quality, kma)
+      - **breaker**: 회로 차단기 상태 (closed, open, half_open), 연속 실패 수, 차단 횟수, 거부된 호출 수
+      - **latency**: 최근 성공 호출의 지연 시간 백분위수 (p50, p90, p99, 밀리초)
+      - **calls / failures / hedges**: 호출 수, 실패 수, 헤지 요청 수
+    - **deadline_seconds**: 요청별 업스트림 시간 예산
+    - **hedging**: 헤지 요청 설정
+    """
+    return prediction_service.get_upstream_status()
+
+
+@app.get(
+    "/api/memo",
+    tags=["info"],
+    summary="예측 메모 상태",
+    description="양자화 예측 메모의 적중률, 항목 수, 관광지별 양자화 오차 범위를 반환합니다."
+)
+def memo_status():
+    """
+    양자화 예측 메모 상태를 반환합니다.
+    
+    - **enabled**: 메모 사용 여부 (MEMO_ENABLED)
+    - **bins**: 연속형 컬럼별 구간 폭
+    - **entries / max_entries**: LRU 항목 수와 최대값
+    - **precomputed**: 관광지별 사전 계산 테이블 셀 수
+    - **precompute_skipped**: 셀 수가 MEMO_PRECOMPUTE_MAX_CELLS를 넘어 LRU만 사용하는 관광지와 사유
+    - **hits / table_hits / misses / hit_rate**: 조회 통계
+    - **error_bounds**: 관광지별 양자화 전/후 예측 차이 (방문자 수, 최대/99백분위수/평균)
+    """
+    return prediction_service.get_memo_status()
+
+
+@app.get(
+    "/api/engine",
+    tags=["info"],
+    summary="예측 엔진 상태",
+    description="예측 엔진 설정(xgboost/compiled)과 관광지별 사용 엔진, XGBoost와의 비교 결과를 반환합니다."
+)
+async def engine_status():
+    """
+    예측 엔진 상태를 반환합니다.
+    
+    - **engine**: 설정된 예측 엔진 (PREDICT_ENGINE)
+    - **compiled_max_batch_rows**: 컴파일 엔진이 직접 평가하는 최대 배치 크기 (초과 시 XGBoost)
+    - **bundle**: 다중 관광지 모델 번들 사용 설정, 로드 여부, 포함된 관광지
+    - **sites**: 로드된 관광지별 실제 사용 엔진, 모델 파일 형식(native/pickle)과 XGBoost 비교 결과 (최대 차이, 방문자 수 불일치 행 수)
+    """
+    return prediction_service.get_engine_status()
+
+
+@app.get(
+    "/api/models",
+    tags=["info"],
+    summary="모델 버전 상태",
+    description="현재 사용 중인 모델 버전, 모델 레지스트리의 게시된 버전 목록, 마지막 모델 교체 기록을 반환합니다."
+)
+async def models_status():
+    """
+    모델 버전 상태를 반환합니다.
+    
+    - **version**: 현재 모델 버전 (레지스트리를 사용하지 않으면 null)
+    - **models_dir**: 현재 모델 디렉토리
+    - **registry**: 레지스트리 경로, 현재 버전 포인터(CURRENT), 게시된 버전 목록
+    - **reloads / last_reload**: 모델 교체 횟수와 마지막 교체 결과
+    - **watcher**: 현재 버전 포인터 감시 상태
+    """
+    return {**prediction_service.get_model_status(), "watcher": model_reload_watcher.status()}
+
+
+@app.post(
+    "/api/models/reload",
+    tags=["info"],
+    summary="모델 다시 로드",
+    description="모델 레지스트리의 현재 버전(또는 지정한 버전)으로 모델을 무중단 교체합니다. 새 모델을 예열하는 동안 요청은 이전 모델로 처리됩니다.",
+    responses={
+        409: {"description": "새 모델 버전을 검증/로드할 수 없음 (이전 모델 유지)"},
+        503: {"description": "모델 버전 디렉토리 또는 모델 파일 없음 (이전 모델 유지)"}
+    }
+)
+async def reload_models(
+    version: Optional[str] = Query(None, description="현재 버전 포인터(CURRENT)를 이 버전으로 바꾼 뒤 로드"),
+    force: bool = Query(False, description="버전이 같아도 다시 로드 (요청을 받은 워커만)")
+):
+    """
+    모델 레지스트리의 현재 버전(CURRENT)으로 모델을 다시 로드합니다.
+    
+    새 모델 세트에 모든 관광지 모델을 로드하고 예열을 마친 뒤 참조 한 번으로 교체하므로
+    진행 중인 요청은 멈추지 않고, 한 요청 안에서 여러 버전의 모델이 섞이지 않습니다.
+    모델이 교체되면 예측 스냅샷도 새 모델로 다시 계산합니다.
+    
+    version을 지정하면 레지스트리의 현재 버전 포인터를 먼저 바꿉니다. 다중 워커 모드에서 이 요청은
+    워커 하나만 처리하므로, 다른 워커는 각자의 포인터 감시(MODEL_RELOAD_POLL_SECONDS)로 새 버전을 로드합니다.
+    force로 같은 버전을 다시 로드하는 것은 요청을 받은 워커에만 적용됩니다.
+    
+    - **reloaded**: 교체 여부 (버전이 같으면 false)
+    - **previous_version / version**: 교체 전/후 모델 버전
+    - **elapsed_ms**: 로드 및 예열 시간
+    """
+    try:
+        if version is not None:
+            await asyncio.to_thread(prediction_service.registry.activate, version)
+        result = await asyncio.to_thread(prediction_service.reload_models, force)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"모델 다시 로드 중 오류 발생: {str(e)}")
+    
+    if result["reloaded"]:
+        await refresh_snapshot_after_reload(result)
+    return result
+
+
 @app.get(
     "/api/health",
     response_model=HealthResponse,
     tags=["info"],
     summary="헬스 체크",
-    description="API 서버의 상태를 확인합니다."
+    description="API 서버의 상태를 확인합니다. (/api/health/live와 동일)"
+)
+@app.get(
+    "/api/health/live",
+    response_model=HealthResponse,
+    tags=["info"],
+    summary="생존(liveness) 확인",
+    description="API 서버 프로세스가 요청을 처리할 수 있는지 확인합니다. 모델 예열 중에도 200을 반환합니다."
 )
 async def health_check():
     """
     API 서버의 헬스 상태를 확인합니다.
     
     서버가 정상적으로 작동 중이면 "healthy" 상태를 반환합니다.
+    모델 준비 여부는 `/api/health/ready`로 확인합니다.
     """
     return {
         "status": "healthy",
@@ -280,28 +781,102 @@ async def health_check():
     }
 
 
+@app.get(
+    "/api/health/ready",
+    response_model=ReadinessResponse,
+    tags=["info"],
+    summary="준비(readiness) 확인",
+    description="모델 예열이 끝나 예측 요청을 받을 준비가 되었는지 확인합니다. 준비되지 않았으면 503을 반환합니다.",
+    responses={503: {"description": "모델 예열 중이거나 예열 실패"}}
+)
+async def readiness_check(response: Response):
+    """
+    모델 예열 상태를 확인합니다.
+    
+    시작 시 모든 관광지의 스케일러, 피처 스키마, 모델을 로드하고 더미 예측을 실행합니다.
+    예열이 끝나기 전(warming_up)이나 실패한 경우(failed) 503을 반환하므로
+    로드 밸런서가 예열되지 않은 워커로 요청을 보내지 않습니다.
+    
+    - **status**: ready, warming_up, failed
+    - **warmup**: 예열 상태, 시작/종료 시각, 단계별 로드 시간 (밀리초), 실패한 관광지
+    """
+    warmup = model_warmup.status()
+    if warmup["ready"]:
+        status = "ready"
+    elif warmup["state"] == ModelWarmup.FAILED:
+        status = "failed"
+    else:
+        status = "warming_up"
+    if not warmup["ready"]:
+        response.status_code = 503
+    return {
+        "status": status,
+        "ready": warmup["ready"],
+        "timestamp": datetime.now().isoformat(),
+        "warmup": warmup
+    }
+
+
+@app.get(
+    "/metrics",
+    tags=["info"],
+    summary="메트릭 (Prometheus 텍스트 형식)",
+    description="단계별 지연 시간 히스토그램, 캐시 적중/미스, 업스트림 오류, 처리 중인 요청 수를 Prometheus 텍스트 형식으로 반환합니다.",
+    response_class=Response
+)
+async def metrics():
+    """
+    Prometheus 스크레이프용 메트릭을 반환합니다.
+    
+    - **tourist_stage_duration_seconds**: 예측 단계별 소요 시간 히스토그램
+      (air_quality_fetch, weather_fetch, forecast_fetch, scaler_load, pipeline_load, engine_compile,
+      bundle_load, feature_build, model_predict, evaluate, db_query, evaluate_load, evaluate_predict)
+    - **tourist_http_request_duration_seconds**: API 라우트별 처리 시간 히스토그램
+    - **tourist_upstream_request_duration_seconds / tourist_upstream_errors_total**: 업스트림 지연 시간, 오류 유형별 실패 수
+    - **tourist_observation_cache_requests_total / tourist_memo_requests_total / tourist_evaluation_cache_requests_total**: 캐시 적중/미스 수
+    - **tourist_evaluation_artifact_requests_total**: 학습 시 평가 아티팩트 사용(hit), 오래됨(stale), 없음(missing) 수
+    - **tourist_stage_in_flight / tourist_http_requests_in_flight**: 실행 중인 단계, 처리 중인 요청 수
+    
+    값은 워커 프로세스별입니다 (pre-fork 모드에서는 요청을 받은 워커의 값).
+    """
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
 @app.get(
     "/api/evaluate/{tourist_code}",
     tags=["evaluation"],
     summary="단일 관광지 모델 성능 평가",
     description="특정 관광지 모델의 성능을 평가하고 시각화에 필요한 데이터를 반환합니다."
 )
-async def evaluate_single(tourist_code: str):
+async def evaluate_single(
+    tourist_code: str,
+    scatter: str = Query(MLConfig.EVALUATE_SCATTER_MODE, description="산점도 데이터 형식 (sample, histogram, full)"),
+    sample_size: int = Query(MLConfig.EVALUATE_SCATTER_SAMPLE_SIZE, ge=10, le=10000, description="sample 형식의 표본 크기"),
+    bins: int = Query(MLConfig.EVALUATE_SCATTER_BINS, ge=2, le=200, description="histogram 형식의 축별 구간 수")
+):
     """
     단일 관광지 모델의 성능을 평가합니다.
     
     - **tourist_code**: 관광지 코드 (예: changdeok_palace)
+    - **scatter**: 산점도 데이터 형식
+      - sample (기본): 실제값 분포를 따르는 고정 크기(sample_size) 층화 표본
+      - histogram: 실제값 × 예측값 2차원 히스토그램 (bins × bins)
+      - full: 테스트 데이터 전체의 실제값/예측값 배열
     
     **응답 구조:**
     - **train_metrics**: 학습 데이터 성능 지표 (R², MAE, RMSE, MAPE)
     - **test_metrics**: 테스트 데이터 성능 지표
     - **stats**: 통계 정보 (평균, 표준편차, 범위 등)
-    - **predictions**: 실제값과 예측값 배열 (scatter plot용)
+    - **predictions**: scatter plot용 데이터 (mode, total, 형식별 actual/predicted 또는 edges/counts)
+    - **residual_quantiles**: 잔차(실제값 - 예측값) 분위수 (p1, p5, p25, p50, p75, p95, p99)
+    - **evaluated_at**: 평가 실행 시각 (모델 파일과 학습 DB가 바뀌지 않았으면 저장된 결과 반환)
+    - **artifact**: 학습 시 평가 아티팩트를 반환한 경우 파일 이름, 데이터 분할 설정, 학습 단계별 소요 시간
     - **performance_level**: 성능 등급 (excellent, good, fair, poor)
     - **overfitting_risk**: 과적합 위험도 (low, medium, high)
     """
+    check_scatter_mode(scatter)
     try:
-        result = evaluate_model(tourist_code)
+        result = await asyncio.to_thread(evaluate_site, tourist_code)
         
         if "error" in result:
             raise HTTPException(status_code=404, detail=result["error"])
@@ -312,7 +887,8 @@ async def evaluate_single(tourist_code: str):
         result["performance_level"] = calculate_performance_level(test_r2)
         result["overfitting_risk"] = calculate_overfitting_risk(train_r2, test_r2)
         
-        return result
+        # 배열이 큰 full 형식도 jsonable_encoder를 거치지 않고 바로 직렬화
+        return JSONResponse(attach_trace(compact_evaluation(result, scatter, sample_size, bins)))
         
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -328,11 +904,16 @@ async def evaluate_single(tourist_code: str):
     summary="모든 관광지 모델 성능 평가",
     description="모든 관광지 모델의 성능을 평가하고 시각화에 필요한 데이터를 반환합니다."
 )
-async def evaluate_all():
+async def evaluate_all(
+    scatter: str = Query(MLConfig.EVALUATE_SCATTER_MODE, description="산점도 데이터 형식 (sample, histogram, full)"),
+    sample_size: int = Query(MLConfig.EVALUATE_SCATTER_SAMPLE_SIZE, ge=10, le=10000, description="sample 형식의 표본 크기"),
+    bins: int = Query(MLConfig.EVALUATE_SCATTER_BINS, ge=2, le=200, description="histogram 형식의 축별 구간 수")
+):
     """
     모든 관광지 모델의 성능을 평가합니다.
     
     각 관광지별로 평가를 수행하며, 실패한 경우 errors 배열에 포함됩니다.
+    산점도 데이터 형식(scatter, sample_size, bins)은 /api/evaluate/{tourist_code}와 같습니다.
     
     **응답 구조:**
     - **results**: 성공한 평가 결과 배열
@@ -340,32 +921,38 @@ async def evaluate_all():
     - **summary**: 전체 요약 통계 (평균 R², 평균 MAE 등)
     - **timestamp**: 평가 시각
     """
+    check_scatter_mode(scatter)
     all_results = []
     errors = []
     
-    for tourist_code in MLConfig.TOURIST_SITES.keys():
-        try:
-            result = evaluate_model(tourist_code)
-            if "error" in result:
-                errors.append({
-                    "tourist_code": result["tourist_code"],
-                    "korean_name": result["korean_name"],
-                    "error": result["error"]
-                })
-            else:
-                train_r2 = result["train_metrics"]["R²"]
-                test_r2 = result["test_metrics"]["R²"]
-                
-                result["performance_level"] = calculate_performance_level(test_r2)
-                result["overfitting_risk"] = calculate_overfitting_risk(train_r2, test_r2)
-                all_results.append(result)
-        except Exception as e:
+    # 관광지별 평가를 동시에 실행 (캐시에 없는 관광지는 평가 프로세스 풀에서 병렬 평가)
+    tourist_codes = list(MLConfig.TOURIST_SITES.keys())
+    outcomes = await asyncio.gather(
+        *(asyncio.to_thread(evaluate_site, tourist_code) for tourist_code in tourist_codes),
+        return_exceptions=True
+    )
+    
+    for tourist_code, result in zip(tourist_codes, outcomes):
+        if isinstance(result, Exception):
             korean_name = MLConfig.TOURIST_SITES[tourist_code]["korean_name"]
             errors.append({
                 "tourist_code": tourist_code,
                 "korean_name": korean_name,
-                "error": str(e)
+                "error": str(result)
+            })
+        elif "error" in result:
+            errors.append({
+                "tourist_code": result["tourist_code"],
+                "korean_name": result["korean_name"],
+                "error": result["error"]
             })
+        else:
+            train_r2 = result["train_metrics"]["R²"]
+            test_r2 = result["test_metrics"]["R²"]
+            
+            result["performance_level"] = calculate_performance_level(test_r2)
+            result["overfitting_risk"] = calculate_overfitting_risk(train_r2, test_r2)
+            all_results.append(compact_evaluation(result, scatter, sample_size, bins))
     
     if all_results:
         summary = {
@@ -397,13 +984,14 @@ async def evaluate_all():
             "overfitting_distribution": {}
         }
     
-    return {
+    return JSONResponse(attach_trace({
         "results": all_results,
         "errors": errors,
         "summary": summary,
         "timestamp": datetime.now().isoformat()
-    }
+    }))
 
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # 스크립트로 실행하면 spawn 평가 워커가 이 모듈(서버 객체 생성 포함)을 다시 실행하므로 실행은 backend/server.py에서
+    sys.exit("서버는 python backend/server.py로 실행하세요 (--host, --port, --workers 인자 동일).")
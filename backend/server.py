@@ -0,0 +1,43 @@
+"""
+FastAPI 백엔드 서버 실행
+
+평가 워커(EvaluationPool)는 spawn 방식으로 시작되며, spawn 워커는 실행한 스크립트를 `__mp_main__`으로 다시 불러옵니다.
+서버 객체(PredictionService, SnapshotScheduler, EvaluationPool, app 등)를 만드는 backend/main.py를
+스크립트로 실행하면 평가 워커마다 이 객체들을 다시 만들게 되므로, 이 모듈은 인자만 해석하고
+backend.main은 실행 함수 안에서 불러옵니다.
+
+Usage:
+    python backend/server.py
+    python backend/server.py --workers 4
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from ml_service.config import MLConfig
+
+
+def main():
+    parser = argparse.ArgumentParser(description="KOREA TOUR GUIDE API 서버")
+    parser.add_argument("--host", default="0.0.0.0", help="바인딩 호스트")
+    parser.add_argument("--port", type=int, default=8000, help="바인딩 포트")
+    parser.add_argument("--workers", type=int, default=MLConfig.SERVER_WORKERS,
+                        help="워커 프로세스 수 (2 이상이면 모델을 로드한 뒤 fork하여 메모리와 캐시 공유)")
+    args = parser.parse_args()
+
+    if args.workers > 1:
+        from backend import main as server
+        from ml_service.prefork import serve_prefork
+
+        server.enable_shared_state(MLConfig.SHARED_STATE_DIR)
+        serve_prefork(server.app, args.host, args.port, args.workers, before_fork=server.model_warmup.run_sync)
+    else:
+        import uvicorn
+
+        uvicorn.run("backend.main:app", host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+"""
+다중 관광지 모델 번들 모듈
+모든 관광지의 트리를 하나의 배열 묶음으로 합쳐 한 번의 호출로 전체 관광지를 예측
+"""
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ml_service.config import MLConfig
+from ml_service.preprocessing import DEFAULT_FEATURE_COLUMNS, ObservationFeatureTransformer, get_model_pipeline
+from ml_service.tree_engine import (
+    CHUNK_ROWS,
+    CompiledForest,
+    accumulate_trees,
+    booster_trees,
+    heap_arrays,
+    tree_depth,
+)
+
+# 번들 파일 형식 버전 (배열 구성이 바뀌면 증가)
+BUNDLE_FORMAT_VERSION = 1
+
+
+class SiteBundle:
+    """
+    관광지별 모델을 합친 번들
+
+    관광지마다 피처 컬럼 순서가 다르므로 컴파일할 때 분기 피처 인덱스를
+    공통 순서(DEFAULT_FEATURE_COLUMNS)로 바꿔, 관측값 변환을 한 번만 하고
+    모든 관광지의 트리를 하나의 CompiledForest로 동시에 평가합니다.
+    관광지별 예측값은 자기 트리 구간의 리프 값을 base_score부터 트리 순서대로 누적하므로
+    관광지별 XGBoost 예측과 비트 단위로 일치합니다.
+
+    Args:
+        tourist_codes: 번들에 포함된 관광지 코드 (트리 구간 순서)
+        transformer: 공통 피처 순서의 관측값 변환기
+        forest: 모든 관광지 트리를 합친 CompiledForest (base_score 0)
+        tree_counts: 관광지별 트리 수
+        base_scores: 관광지별 base_score
+        sources: 관광지별 원본 모델 파일 정보 {"mtime", "size"} (번들 생성 이후 모델 변경 확인용)
+    """
+
+    def __init__(self, tourist_codes: List[str], transformer: ObservationFeatureTransformer,
+                 forest: CompiledForest, tree_counts: List[int], base_scores: List[float],
+                 sources: Optional[Dict[str, dict]] = None):
+        self.tourist_codes = list(tourist_codes)
+        self.transformer = transformer
+        self.forest = forest
+        self.tree_counts = [int(count) for count in tree_counts]
+        self.base_scores = np.asarray(base_scores, dtype=np.float32)
+        self.sources = sources or {}
+
+        bounds = np.concatenate([[0], np.cumsum(self.tree_counts)])
+        self._slices = {
+            code: slice(int(bounds[i]), int(bounds[i + 1]))
+            for i, code in enumerate(self.tourist_codes)
+        }
+        self._site_of_tree = np.repeat(np.arange(len(self.tourist_codes)), self.tree_counts)
+
+    @classmethod
+    def from_pipelines(cls, pipelines: Dict[str, object], sources: Optional[Dict[str, dict]] = None) -> "SiteBundle":
+        """
+        관광지별 Pipeline(관측값 변환기 + XGBoost)을 하나의 번들로 합침
+
+        Raises:
+            ValueError: 관광지별 변환기의 스케일링 값이 다르거나 모델을 컴파일할 수 없는 경우
+        """
+        canonical = list(DEFAULT_FEATURE_COLUMNS)
+        positions = {col: i for i, col in enumerate(canonical)}
+        transformer = None
+        site_trees = []
+        base_scores = []
+
+        for tourist_code, pipeline in pipelines.items():
+            site_transformer = pipeline.steps[0][1]
+            if transformer is None:
+                transformer = ObservationFeatureTransformer(
+                    means=list(site_transformer.mean_), scales=list(site_transformer.scale_),
+                    feature_columns=canonical
+                ).fit()
+            elif not (np.array_equal(transformer.mean_, site_transformer.mean_)
+                      and np.array_equal(transformer.scale_, site_transformer.scale_)):
+                raise ValueError(f"'{tourist_code}' 모델의 스케일링 값이 다른 관광지와 달라 번들로 합칠 수 없습니다.")
+
+            model_pipeline = get_model_pipeline(pipeline)
+            steps = getattr(model_pipeline, "steps", [("model", model_pipeline)])
+            if len(steps) != 1 or not hasattr(steps[0][1], "get_booster"):
+                raise ValueError(f"'{tourist_code}' 모델이 XGBoost 모델 하나가 아니어서 번들로 합칠 수 없습니다.")
+            trees, base_score, feature_names = booster_trees(steps[0][1].get_booster())
+            if set(feature_names) != set(canonical):
+                raise ValueError(f"'{tourist_code}' 모델의 피처가 공통 피처와 다릅니다: {feature_names}")
+
+            feature_map = np.array([positions[name] for name in feature_names])
+            site_trees.append((trees, feature_map))
+            base_scores.append(base_score)
+
+        if transformer is None:
+            raise ValueError("번들로 합칠 모델이 없습니다.")
+
+        # 모든 관광지를 가장 깊은 트리에 맞춘 같은 깊이로 펼쳐서 이어 붙임
+        depth = max(tree_depth(tree) for trees, _ in site_trees for tree in trees)
+        arrays = [heap_arrays(trees, depth, feature_map) for trees, feature_map in site_trees]
+        forest = CompiledForest(
+            *(np.concatenate([site_arrays[i] for site_arrays in arrays]) for i in range(4)),
+            base_score=0.0, feature_names=canonical
+        )
+        return cls(list(pipelines), transformer, forest, [len(trees) for trees, _ in site_trees],
+                   base_scores, sources)
+
+    def _accumulate(self, leaves: np.ndarray, tourist_codes: List[str]) -> np.ndarray:
+        """관광지별 트리 구간의 리프 값을 base_score부터 트리 순서대로 누적"""
+        return np.stack([
+            accumulate_trees(leaves[self._slices[code]], self.base_scores[self.tourist_codes.index(code)])
+            for code in tourist_codes
+        ])
+
+    def predict(self, raw: np.ndarray, tourist_codes: Optional[List[str]] = None) -> np.ndarray:
+        """
+        같은 관측값 배열을 여러 관광지에 대해 예측
+
+        Args:
+            raw: (n, 7) 관측값 배열
+            tourist_codes: 관광지 코드 목록 (None이면 번들의 모든 관광지)
+
+        Returns:
+            np.ndarray: (관광지 수, n) float32 예측값
+        """
+        tourist_codes = tourist_codes or self.tourist_codes
+        features = self.transformer.transform(raw).astype(np.float32)
+        out = np.empty((len(tourist_codes), len(features)), dtype=np.float32)
+        for start in range(0, len(features), CHUNK_ROWS):
+            chunk = features[start:start + CHUNK_ROWS]
+            out[:, start:start + CHUNK_ROWS] = self._accumulate(self.forest.leaf_values(chunk), tourist_codes)
+        return out
+
+    def predict_rows(self, raw: np.ndarray, tourist_codes: List[str]) -> np.ndarray:
+        """
+        관광지별 관측값 한 행씩 예측 (i번째 행 → tourist_codes[i])
+
+        모든 관광지의 트리가 자기 관광지의 행 하나만 평가하므로 트리 순회 한 번으로 끝납니다.
+
+        Returns:
+            np.ndarray: (관광지 수,) float32 예측값
+        """
+        if len(raw) != len(tourist_codes):
+            raise ValueError("관측값 행 수와 관광지 수가 다릅니다.")
+        features = self.transformer.transform(raw).astype(np.float32)
+        row_of_site = np.zeros(len(self.tourist_codes), dtype=np.intp)
+        for row, code in enumerate(tourist_codes):
+            row_of_site[self.tourist_codes.index(code)] = row
+        leaves = self.forest.leaf_values(features, tree_rows=row_of_site[self._site_of_tree])
+        return self._accumulate(leaves, tourist_codes)[:, 0]
+
+    def is_stale(self, models_dir: Path) -> bool:
+        """번들 생성 이후 관광지 모델 파일이 바뀌었는지 여부"""
+        for tourist_code, source in self.sources.items():
+            model_path = models_dir / MLConfig.MODEL_FILES[tourist_code]
+            if not model_path.exists():
+                return True
+            stat = model_path.stat()
+            if stat.st_mtime != source["mtime"] or stat.st_size != source["size"]:
+                return True
+        return False
+
+    def save(self, path: Path):
+        """번들을 .npz 파일로 저장"""
+        forest = self.forest
+        np.savez(
+            path,
+            format_version=np.int32(BUNDLE_FORMAT_VERSION),
+            tourist_codes=np.asarray(self.tourist_codes),
+            means=self.transformer.mean_,
+            scales=self.transformer.scale_,
+            feature_names=np.asarray(forest.feature_names),
+            feature=forest.feature.astype(np.int32),
+            threshold=forest.threshold,
+            default_left=forest.default_left,
+            leaf_value=forest.leaf_value,
+            tree_counts=np.asarray(self.tree_counts, dtype=np.int32),
+            base_scores=self.base_scores,
+            source_mtimes=np.asarray([self.sources.get(c, {}).get("mtime", 0.0) for c in self.tourist_codes]),
+            source_sizes=np.asarray([self.sources.get(c, {}).get("size", 0) for c in self.tourist_codes])
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "SiteBundle":
+        """
+        .npz 파일에서 번들 로드
+
+        Raises:
+            ValueError: 파일 형식 버전이 다른 경우
+        """
+        with np.load(path) as data:
+            version = int(data["format_version"])
+            if version != BUNDLE_FORMAT_VERSION:
+                raise ValueError(f"모델 번들 형식 버전이 다릅니다: {version} (필요: {BUNDLE_FORMAT_VERSION})")
+            feature_names = data["feature_names"].tolist()
+            tourist_codes = data["tourist_codes"].tolist()
+            transformer = ObservationFeatureTransformer(
+                means=data["means"].tolist(), scales=data["scales"].tolist(), feature_columns=feature_names
+            ).fit()
+            forest = CompiledForest(
+                data["feature"], data["threshold"], data["default_left"], data["leaf_value"],
+                base_score=0.0, feature_names=feature_names
+            )
+            sources = {
+                code: {"mtime": float(mtime), "size": int(size)}
+                for code, mtime, size in zip(tourist_codes, data["source_mtimes"], data["source_sizes"])
+            }
+            return cls(tourist_codes, transformer, forest, data["tree_counts"].tolist(),
+                       data["base_scores"].tolist(), sources)
+
+
+def model_sources(tourist_codes: List[str], models_dir: Optional[Path] = None) -> Dict[str, dict]:
+    """관광지별 모델 파일의 수정 시각과 크기"""
+    models_dir = models_dir or MLConfig.MODELS_SAVED_DIR
+    sources = {}
+    for tourist_code in tourist_codes:
+        stat = (models_dir / MLConfig.MODEL_FILES[tourist_code]).stat()
+        sources[tourist_code] = {"mtime": stat.st_mtime, "size": stat.st_size}
+    return sources
+
+
+def check_bundle_parity(bundle: SiteBundle, pipelines: Dict[str, object], raw: np.ndarray) -> dict:
+    """
+    번들과 관광지별 Pipeline의 예측 차이 측정
+
+    Returns:
+        dict: 관광지 코드별 {"samples", "max_abs_diff", "mismatched_visitors"}
+    """
+    actual = bundle.predict(raw, list(pipelines))
+    parity = {}
+    for i, (tourist_code, pipeline) in enumerate(pipelines.items()):
+        expected = np.asarray(pipeline.predict(raw), dtype=np.float32)
+        diff = np.abs(expected.astype(float) - actual[i].astype(float))
+        parity[tourist_code] = {
+            "samples": int(len(raw)),
+            "max_abs_diff": float(diff.max()) if diff.size else 0.0,
+            "mismatched_visitors": int((expected.astype(np.int64) != actual[i].astype(np.int64)).sum())
+        }
+    return parity
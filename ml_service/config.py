@@ -79,20 +79,138 @@ class MLConfig:
         }
     }
     
+    # 업스트림 모드 (ml_service/fixtures.py, scripts/stub_upstream.py)
+    # UPSTREAM_MODE: "live" (실제 API), "record" (실제 API 응답을 UPSTREAM_FIXTURES_DIR에 픽스처로 저장),
+    #                "replay" (UPSTREAM_STUB_URL의 스텁 서버 사용, 네트워크와 API 키 불필요)
+    # replay 모드에서는 Base URL 기본값이 스텁 서버 주소가 되고, API 키가 없으면 REPLAY_API_KEY를 사용
+    UPSTREAM_MODE = os.getenv("UPSTREAM_MODE", "live").lower()
+    UPSTREAM_FIXTURES_DIR = Path(os.getenv("UPSTREAM_FIXTURES_DIR", str(PROJECT_ROOT / "fixtures" / "upstream")))
+    UPSTREAM_STUB_URL = os.getenv("UPSTREAM_STUB_URL", "http://127.0.0.1:8089").rstrip("/")
+    REPLAY_API_KEY = "replay"
+    
     # API 설정
-    SEOUL_AIR_QUALITY_API_BASE_URL = "http://openapi.seoul.go.kr:8088"
-    SEOUL_AIR_QUALITY_API_KEY = os.getenv("SEOUL_AIR_QUALITY_API_KEY")
+    # Base URL은 환경변수로 변경 가능 (로컬 스텁 서버 사용 시)
+    SEOUL_AIR_QUALITY_API_BASE_URL = os.getenv(
+        "SEOUL_AIR_QUALITY_API_BASE_URL",
+        UPSTREAM_STUB_URL if UPSTREAM_MODE == "replay" else "http://openapi.seoul.go.kr:8088"
+    )
+    SEOUL_AIR_QUALITY_API_KEY = os.getenv("SEOUL_AIR_QUALITY_API_KEY") or (
+        REPLAY_API_KEY if UPSTREAM_MODE == "replay" else None
+    )
     AIR_QUALITY_API_SERVICE = "ListAirQualityByDistrictService"
     AIR_QUALITY_API_START_INDEX = 1
     AIR_QUALITY_API_END_INDEX = 5
     AIR_QUALITY_API_TYPE = "json"
     
-    KMA_API_BASE_URL = "https://apis.data.go.kr/1360000/VilageFcstInfoService_2.0"
+    KMA_API_PATH = "/1360000/VilageFcstInfoService_2.0"
+    KMA_API_BASE_URL = os.getenv(
+        "KMA_API_BASE_URL",
+        (UPSTREAM_STUB_URL if UPSTREAM_MODE == "replay" else "https://apis.data.go.kr") + KMA_API_PATH
+    )
     KMA_API_SERVICE = "getUltraSrtNcst"
     KMA_API_PAGE_NO = 1
     KMA_API_NUM_OF_ROWS = 10
     KMA_API_DATA_TYPE = "JSON"
-    KMA_API_KEY = os.getenv("KMA_API_KEY")
+    KMA_API_KEY = os.getenv("KMA_API_KEY") or (REPLAY_API_KEY if UPSTREAM_MODE == "replay" else None)
+    
+    # 기상청 단기예보 설정 (예보 기반 혼잡도 예측)
+    # 매일 02, 05, 08, 11, 14, 17, 20, 23시 발표, 발표 약 10분 후부터 API 제공
+    KMA_FORECAST_SERVICE = "getVilageFcst"
+    KMA_FORECAST_NUM_OF_ROWS = 1500
+    KMA_FORECAST_BASE_HOURS = [2, 5, 8, 11, 14, 17, 20, 23]
+    KMA_FORECAST_RELEASE_DELAY_MINUTES = 10
+    FORECAST_DEFAULT_HOURS = int(os.getenv("FORECAST_DEFAULT_HOURS", "24"))
+    FORECAST_MAX_HOURS = int(os.getenv("FORECAST_MAX_HOURS", "72"))
+    
+    # 시나리오(what-if) 예측 요청당 최대 행 수
+    SCENARIO_MAX_ROWS = int(os.getenv("SCENARIO_MAX_ROWS", "200000"))
+    
+    # 양자화 예측 메모 설정
+    # MEMO_BINS: 연속형 관측값별 구간 폭 (기본값은 업스트림 측정 단위와 같아 실측값에는 오차 없음)
+    # MEMO_PRECOMPUTE_RANGES: 사전 계산 및 오차 측정 범위 (최소:최대)
+    # 사전 계산 테이블은 MEMO_BINS 구간을 그대로 사용하며, 셀 수가 MEMO_PRECOMPUTE_MAX_CELLS를 넘으면
+    # 구간 폭을 바꾸지 않고 경고 후 LRU만 사용 (기본 구간 폭과 기본 범위는 약 1.9e10셀이므로 범위를 줄여야 사전 계산됨)
+    MEMO_ENABLED = os.getenv("MEMO_ENABLED", "false").lower() == "true"
+    MEMO_BINS = {
+        key: float(value)
+        for key, value in (
+            item.split("=") for item in
+            os.getenv("MEMO_BINS", "pm10=1,windspeed=0.1,temperature=0.1,humidity=1,rainfall=0.1").split(",")
+        )
+    }
+    MEMO_MAX_ENTRIES = int(os.getenv("MEMO_MAX_ENTRIES", "200000"))
+    MEMO_LRU_MAX_BATCH = int(os.getenv("MEMO_LRU_MAX_BATCH", "1024"))
+    MEMO_PRECOMPUTE = os.getenv("MEMO_PRECOMPUTE", "false").lower() == "true"
+    MEMO_PRECOMPUTE_RANGES = {
+        key: tuple(float(bound) for bound in value.split(":"))
+        for key, value in (
+            item.split("=") for item in
+            os.getenv(
+                "MEMO_PRECOMPUTE_RANGES",
+                "pm10=0:150,windspeed=0:10,temperature=-15:35,humidity=10:100,rainfall=0:0"
+            ).split(",")
+        )
+    }
+    MEMO_PRECOMPUTE_MAX_CELLS = int(os.getenv("MEMO_PRECOMPUTE_MAX_CELLS", "2000000"))
+    MEMO_ERROR_SAMPLES = int(os.getenv("MEMO_ERROR_SAMPLES", "5000"))
+    
+    # 업스트림 HTTP 클라이언트 설정
+    UPSTREAM_TIMEOUT = float(os.getenv("UPSTREAM_TIMEOUT", "10"))  # 초
+    UPSTREAM_MAX_CONNECTIONS_PER_HOST = int(os.getenv("UPSTREAM_MAX_CONNECTIONS_PER_HOST", "8"))
+    
+    # 업스트림 장애 대응 설정
+    # UPSTREAM_DEADLINE: 한 요청의 대기환경/기상청 호출이 함께 쓰는 시간 예산 (초)
+    # UPSTREAM_HEDGE_*: 응답이 최근 지연 시간 백분위수를 넘으면 같은 요청을 한 번 더 전송 (비동기 경로)
+    # CIRCUIT_BREAKER_*: 연속 실패 횟수가 임계값에 도달하면 재시도 대기 시간 동안 호출을 즉시 실패 처리
+    UPSTREAM_DEADLINE = float(os.getenv("UPSTREAM_DEADLINE", "10"))
+    UPSTREAM_HEDGE_ENABLED = os.getenv("UPSTREAM_HEDGE_ENABLED", "false").lower() == "true"
+    UPSTREAM_HEDGE_PERCENTILE = float(os.getenv("UPSTREAM_HEDGE_PERCENTILE", "95"))
+    UPSTREAM_HEDGE_MIN_SAMPLES = int(os.getenv("UPSTREAM_HEDGE_MIN_SAMPLES", "20"))
+    UPSTREAM_LATENCY_WINDOW = int(os.getenv("UPSTREAM_LATENCY_WINDOW", "256"))
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_BREAKER_FAILURE_THRESHOLD", "5"))
+    CIRCUIT_BREAKER_RESET_SECONDS = float(os.getenv("CIRCUIT_BREAKER_RESET_SECONDS", "30"))
+    
+    # 관측 데이터 캐시 설정
+    # 대기환경: 다음 측정 시각까지, 기상청: 다음 base_time(정각)까지 캐시
+    OBSERVATION_CACHE_ENABLED = os.getenv("OBSERVATION_CACHE_ENABLED", "true").lower() == "true"
+    OBSERVATION_CACHE_MIN_TTL = int(os.getenv("OBSERVATION_CACHE_MIN_TTL", "300"))  # 초
+    
+    # 예측 스냅샷 설정 (백그라운드 갱신)
+    # SNAPSHOT_REFRESH_MINUTES: 매시 갱신할 분 목록 (대기환경 발표 약 20분, 기상청 실황 제공 40분 이후)
+    SNAPSHOT_ENABLED = os.getenv("SNAPSHOT_ENABLED", "true").lower() == "true"
+    SNAPSHOT_REFRESH_MINUTES = [
+        int(minute) for minute in os.getenv("SNAPSHOT_REFRESH_MINUTES", "20,45").split(",")
+    ]
+    SNAPSHOT_RETRY_SECONDS = int(os.getenv("SNAPSHOT_RETRY_SECONDS", "60"))
+    SNAPSHOT_MAX_AGE = int(os.getenv("SNAPSHOT_MAX_AGE", "7200"))  # 초, 초과 시 stale 표시
+    
+    # 다중 워커 설정 (python backend/server.py --workers N, ml_service/prefork.py)
+    # SERVER_WORKERS: 워커 프로세스 수 (2 이상이면 모델을 로드한 뒤 fork하고 아래 공유 상태 사용)
+    # SHARED_STATE_DIR: 워커들이 공유하는 관측 데이터 캐시(SQLite)와 스냅샷 갱신 잠금 파일 디렉토리
+    # SNAPSHOT_FOLLOW_SECONDS: 갱신 담당이 아닌 워커가 공유 스냅샷을 다시 읽는 주기
+    SERVER_WORKERS = int(os.getenv("SERVER_WORKERS", "1"))
+    SHARED_STATE_DIR = Path(os.getenv("SHARED_STATE_DIR", str(PROJECT_ROOT / "run")))
+    SHARED_CACHE_TIMEOUT = float(os.getenv("SHARED_CACHE_TIMEOUT", "5"))  # 초, SQLite 잠금 대기
+    SNAPSHOT_FOLLOW_SECONDS = float(os.getenv("SNAPSHOT_FOLLOW_SECONDS", "5"))
+    
+    # 시작 시 모델 예열 설정 (준비 상태: /api/health/ready)
+    # WARMUP_ENABLED: 시작 시 모든 관광지 스케일러/스키마/모델을 로드하고 더미 예측 실행, 끝날 때까지 준비되지 않음
+    # (끄면 모델은 첫 요청에서 로드되며 메모 사전 계산이 끝나면 바로 준비 상태)
+    WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "true").lower() == "true"
+    
+    # 일괄 예측 스레드 설정 (0이면 CPU 수에 맞춰 자동 결정)
+    # PREDICT_WORKERS: 관광지 모델을 동시에 실행할 스레드 수
+    # MODEL_THREADS: 모델 하나가 내부적으로 사용할 스레드 수
+    PREDICT_WORKERS = int(os.getenv("PREDICT_WORKERS", "0"))
+    MODEL_THREADS = int(os.getenv("MODEL_THREADS", "0"))
+    
+    # 예측 엔진 설정
+    # PREDICT_ENGINE: "xgboost" (Pipeline 그대로) 또는 "compiled" (NumPy 트리 평가, ml_service/tree_engine.py)
+    # COMPILED_MAX_BATCH_ROWS: 이보다 큰 배치는 compiled 엔진에서도 XGBoost로 예측 (NumPy 평가가 더 느려지는 지점)
+    # COMPILED_PARITY_SAMPLES: 엔진 로드 시 XGBoost와 비교할 무작위 관측값 수 (불일치 시 XGBoost 사용)
+    PREDICT_ENGINE = os.getenv("PREDICT_ENGINE", "xgboost").lower()
+    COMPILED_MAX_BATCH_ROWS = int(os.getenv("COMPILED_MAX_BATCH_ROWS", "256"))
+    COMPILED_PARITY_SAMPLES = int(os.getenv("COMPILED_PARITY_SAMPLES", "2000"))
     
     # 스케일러 파일명
     SCALER_FILES = {
@@ -114,6 +232,83 @@ class MLConfig:
         "seoul_grand_park": "model_seoul_grand_park.pkl"
     }
     
+    # 다중 관광지 모델 번들 (scripts/train_models.py --bundle로 생성)
+    # MODEL_BUNDLE_ENABLED: 전체 관광지 예측(predict-all, 스냅샷)을 번들 한 번의 호출로 계산
+    MODEL_BUNDLE_FILE = "model_bundle.npz"
+    MODEL_BUNDLE_ENABLED = os.getenv("MODEL_BUNDLE_ENABLED", "false").lower() == "true"
+    
+    # 네이티브 모델 파일 (XGBoost UBJSON 부스터 + 메타데이터 사이드카, scripts/train_models.py가 pkl과 함께 저장)
+    # NATIVE_MODEL_ENABLED: pkl보다 오래되지 않은 네이티브 파일이 있으면 pickle 대신 이를 로드
+    NATIVE_MODEL_SUFFIX = ".ubj"
+    NATIVE_META_SUFFIX = ".native.json"
+    NATIVE_MODEL_ENABLED = os.getenv("NATIVE_MODEL_ENABLED", "true").lower() == "true"
+    
+    # 모델 레지스트리 (scripts/publish_models.py로 버전 게시, 버전 디렉토리는 게시 후 변경하지 않음)
+    # MODEL_REGISTRY_DIR/CURRENT 파일이 현재 버전을 가리키며, 없으면 MODELS_SAVED_DIR의 모델 사용
+    # MODEL_RELOAD_POLL_SECONDS: 서버가 CURRENT 변경을 확인하는 주기 (0이면 POST /api/models/reload로만 교체)
+    # MODEL_REGISTRY_KEEP: 게시 후 남겨 둘 최근 버전 수 (현재 버전은 항상 유지)
+    MODEL_REGISTRY_DIR = Path(os.getenv("MODEL_REGISTRY_DIR", str(PROJECT_ROOT / "models" / "registry")))
+    MODEL_REGISTRY_POINTER = "CURRENT"
+    MODEL_REGISTRY_MANIFEST = "manifest.json"
+    MODEL_RELOAD_POLL_SECONDS = float(os.getenv("MODEL_RELOAD_POLL_SECONDS", "30"))
+    MODEL_REGISTRY_KEEP = int(os.getenv("MODEL_REGISTRY_KEEP", "5"))
+    
+    # 메트릭 (GET /metrics, Prometheus 텍스트 형식, ml_service/metrics.py)
+    # METRICS_ENABLED: 단계별 지연 시간, 업스트림 오류, API 요청 처리 시간 기록 여부
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    
+    # 요청별 추적 (?trace=1 또는 TRACE_HEADER: 1, /api/predict*, /api/evaluate*, ml_service/tracing.py)
+    # TRACE_ENABLED: false이면 추적 요청을 무시 (span 트리와 Server-Timing 헤더를 반환하지 않음)
+    TRACE_ENABLED = os.getenv("TRACE_ENABLED", "true").lower() == "true"
+    TRACE_HEADER = os.getenv("TRACE_HEADER", "X-Debug-Trace")
+    
+    # 모델 평가 결과 캐시 (/api/evaluate*, ml_service/evaluation_cache.py)
+    # 모델 파일과 학습 DB의 지문이 같으면 이전 평가 결과를 메모리/디스크에서 반환
+    # EVALUATION_CACHE_FINGERPRINT: "mtime" (크기 + 수정 시각) 또는 "content" (SHA-256, 수정 시각만 바뀐 경우에도 적중)
+    EVALUATION_CACHE_ENABLED = os.getenv("EVALUATION_CACHE_ENABLED", "true").lower() == "true"
+    EVALUATION_CACHE_DIR = Path(os.getenv("EVALUATION_CACHE_DIR", str(SHARED_STATE_DIR / "evaluation")))
+    EVALUATION_CACHE_FINGERPRINT = os.getenv("EVALUATION_CACHE_FINGERPRINT", "mtime").lower()
+    
+    # 학습 시 평가 아티팩트 (scripts/train_models.py가 모델 옆에 저장, ml_service/evaluation_artifact.py)
+    # 모델 파일과 학습 DB 지문(EVALUATION_CACHE_FINGERPRINT 방식)이 저장 시점과 같으면 /api/evaluate*가 다시 예측하지 않고 반환
+    EVALUATION_ARTIFACT_ENABLED = os.getenv("EVALUATION_ARTIFACT_ENABLED", "true").lower() == "true"
+    EVALUATION_ARTIFACT_SUFFIX = ".eval.npz"
+    
+    # 병렬 모델 평가 설정 (ml_service/evaluation_pool.py, 0이면 CPU 수에 맞춰 자동 결정)
+    # EVALUATE_WORKERS: 관광지별 평가를 동시에 실행할 프로세스 수 (1이면 서버 프로세스의 스레드에서 평가)
+    # EVALUATE_MODEL_THREADS: 평가 워커 하나의 모델 내부 스레드 수
+    EVALUATE_WORKERS = int(os.getenv("EVALUATE_WORKERS", "0"))
+    EVALUATE_MODEL_THREADS = int(os.getenv("EVALUATE_MODEL_THREADS", "0"))
+    
+    # 평가 응답의 산점도 데이터 기본값 (?scatter=, ml_service/scatter.py)
+    # EVALUATE_SCATTER_MODE: "sample" (층화 표본), "histogram" (2차원 히스토그램), "full" (전체 실제값/예측값 배열)
+    EVALUATE_SCATTER_MODE = os.getenv("EVALUATE_SCATTER_MODE", "sample").lower()
+    EVALUATE_SCATTER_SAMPLE_SIZE = int(os.getenv("EVALUATE_SCATTER_SAMPLE_SIZE", "500"))
+    EVALUATE_SCATTER_BINS = int(os.getenv("EVALUATE_SCATTER_BINS", "30"))
+    
+    # 청크 단위 스트리밍 평가 (scripts/evaluate_models.py, ml_service/streaming_eval.py)
+    # 테이블을 EVALUATE_CHUNK_ROWS행씩 읽어 지표의 충분 통계량만 누적하므로 메모리 사용량이 테이블 크기와 무관
+    # EVALUATE_STREAMING: "auto" (모델이 행 키 해시 분할로 학습되었고 행 수가 EVALUATE_STREAMING_MIN_ROWS 이상이면 스트리밍), "true", "false"
+    # EVALUATE_STREAM_SAMPLE_ROWS: 산점도/잔차 분위수용으로 보관하는 테스트 표본 크기
+    EVALUATE_STREAMING = os.getenv("EVALUATE_STREAMING", "auto").lower()
+    EVALUATE_STREAMING_MIN_ROWS = int(os.getenv("EVALUATE_STREAMING_MIN_ROWS", "1000000"))
+    EVALUATE_CHUNK_ROWS = int(os.getenv("EVALUATE_CHUNK_ROWS", "50000"))
+    EVALUATE_STREAM_SAMPLE_ROWS = int(os.getenv("EVALUATE_STREAM_SAMPLE_ROWS", "20000"))
+    
+    # 학습 데이터에서 제거하는 피처 (사용하지 않는 피처)
+    REMOVED_FEATURES = ['달러환율', 'total_7d_avg', '운항수_표준화']
+    
+    # 원-핫 인코딩 피처 그룹
+    ONEHOT_GROUPS = {
+        "weekday": ['weekday_0', 'weekday_1', 'weekday_2', 'weekday_3',
+                    'weekday_4', 'weekday_5', 'weekday_6'],
+        "season": ['season_0', 'season_1', 'season_2', 'season_3']
+    }
+    
+    # 피처 스키마 매니페스트 버전 (스키마 구조 변경 시 증가)
+    FEATURE_SCHEMA_VERSION = 1
+    FEATURE_SCHEMA_SUFFIX = ".schema.json"
+    
     # 모델 타입 설정 (환경변수로 변경 가능)
     # 사용 가능한 타입: "xgboost", "random_forest", "lightgbm", "catboost"
     MODEL_TYPE = os.getenv("MODEL_TYPE", "xgboost").lower()
@@ -130,7 +325,9 @@ class MLConfig:
     
     @classmethod
     def validate(cls):
-        """설정 유효성 검사"""
+        """설정 유효성 검사 (UPSTREAM_MODE=replay이면 API 키 불필요)"""
+        if cls.UPSTREAM_MODE not in ("live", "record", "replay"):
+            raise ValueError(f"UPSTREAM_MODE는 live, record, replay 중 하나여야 합니다: {cls.UPSTREAM_MODE}")
         if not cls.SEOUL_AIR_QUALITY_API_KEY:
             raise ValueError(
                 "SEOUL_AIR_QUALITY_API_KEY가 설정되지 않았습니다. "
@@ -143,4 +340,6 @@ class MLConfig:
                 ".env 파일을 생성하고 KMA_API_KEY를 설정하거나 "
                 "환경 변수로 설정해주세요."
             )
+        if cls.PREDICT_ENGINE not in ("xgboost", "compiled"):
+            raise ValueError(f"PREDICT_ENGINE은 xgboost 또는 compiled여야 합니다: {cls.PREDICT_ENGINE}")
 
@@ -3,9 +3,43 @@
 SQLite 데이터베이스에서 관광지 데이터를 로드
 """
 import pandas as pd
+import numpy as np
 import sqlite3
-from typing import Tuple
+from typing import Iterator, Optional, Tuple
 from ml_service.config import MLConfig
+from ml_service.metrics import track_stage
+
+# iter_tourist_data가 행 키(SQLite rowid)를 담는 컬럼 이름
+ROW_KEY_COLUMN = "__rowid__"
+
+
+def _check_db_exists():
+    """작업용 DB 파일 확인"""
+    if not MLConfig.DB_PATH.exists():
+        raise FileNotFoundError(
+            f"데이터베이스 파일을 찾을 수 없습니다: {MLConfig.DB_PATH}\n"
+            "먼저 백업 DB에서 복원하세요: python scripts/backup_db.py restore"
+        )
+
+
+def _split_features(df: pd.DataFrame, tourist_name: str) -> Tuple[pd.DataFrame, pd.Series]:
+    """테이블 행을 피처와 라벨로 분리하고 사용하지 않는 피처 제거, 원-핫 피처 정수 변환"""
+    # Feature와 Label 분리
+    X = df.drop(columns=[tourist_name])
+    y = df[tourist_name]
+    
+    # 사용하지 않는 피처 제거
+    features_to_remove = MLConfig.REMOVED_FEATURES
+    X = X.drop(columns=[col for col in features_to_remove if col in X.columns], errors='ignore')
+    
+    # 타입 확인 및 변환 (원-핫 피처는 정수형)
+    boolean_cols = [col for group in MLConfig.ONEHOT_GROUPS.values() for col in group]
+    
+    for col in boolean_cols:
+        if col in X.columns:
+            X[col] = X[col].astype(int)
+    
+    return X, y
 
 
 def load_tourist_data(tourist_name: str) -> Tuple[pd.DataFrame, pd.Series]:
@@ -16,43 +50,75 @@ def load_tourist_data(tourist_name: str) -> Tuple[pd.DataFrame, pd.Series]:
         tourist_name: 관광지 이름 (예: "창덕궁", "경복궁")
     
     Returns:
-        tuple: (X: Feature DataFrame, y: Label Series)
+        tuple: (X: Feature DataFrame, y: Label Series), 인덱스는 SQLite rowid (해시 분할의 행 키)
     """
-    if not MLConfig.DB_PATH.exists():
-        raise FileNotFoundError(
-            f"데이터베이스 파일을 찾을 수 없습니다: {MLConfig.DB_PATH}\n"
-            "먼저 백업 DB에서 복원하세요: python scripts/backup_db.py restore"
-        )
+    _check_db_exists()
     
     # SQLite 연결
     conn = sqlite3.connect(str(MLConfig.DB_PATH))
     
     try:
         # 테이블에서 데이터 로드
-        query = f"SELECT * FROM {tourist_name}"
-        df = pd.read_sql_query(query, conn)
+        query = f"SELECT rowid AS {ROW_KEY_COLUMN}, * FROM {tourist_name}"
+        with track_stage("db_query"):
+            df = pd.read_sql_query(query, conn, index_col=ROW_KEY_COLUMN)
+        df.index.name = None
         
         if df.empty:
             raise ValueError(f"'{tourist_name}' 테이블에 데이터가 없습니다.")
         
-        # Feature와 Label 분리
-        X = df.drop(columns=[tourist_name])
-        y = df[tourist_name]
-        
-        # 하드코딩된 피처 제거 (사용하지 않는 피처)
-        features_to_remove = ['달러환율', 'total_7d_avg', '운항수_표준화']
-        X = X.drop(columns=[col for col in features_to_remove if col in X.columns], errors='ignore')
+        return _split_features(df, tourist_name)
         
-        # 타입 확인 및 변환
-        boolean_cols = ['weekday_0', 'weekday_1', 'weekday_2', 'weekday_3', 
-                        'weekday_4', 'weekday_5', 'weekday_6',
-                        'season_0', 'season_1', 'season_2', 'season_3']
+    finally:
+        conn.close()
+
+
+def count_tourist_rows(tourist_name: str) -> int:
+    """관광지 테이블의 행 수"""
+    _check_db_exists()
+    conn = sqlite3.connect(str(MLConfig.DB_PATH))
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM {tourist_name}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def iter_tourist_data(tourist_name: str, chunk_rows: Optional[int] = None
+                      ) -> Iterator[Tuple[np.ndarray, pd.DataFrame, pd.Series]]:
+    """
+    관광지 데이터를 chunk_rows행씩 읽는 제너레이터 (테이블 전체를 메모리에 올리지 않음)
+    
+    Args:
+        tourist_name: 관광지 이름 (예: "창덕궁", "경복궁")
+        chunk_rows: 한 번에 읽을 행 수 (None이면 MLConfig.EVALUATE_CHUNK_ROWS)
+    
+    Yields:
+        tuple: (행 키: SQLite rowid 배열, X: Feature DataFrame, y: Label Series)
         
-        for col in boolean_cols:
-            if col in X.columns:
-                X[col] = X[col].astype(int)
+    Raises:
+        ValueError: 테이블에 데이터가 없음
+    """
+    _check_db_exists()
+    conn = sqlite3.connect(str(MLConfig.DB_PATH))
+    
+    try:
+        query = f"SELECT rowid AS {ROW_KEY_COLUMN}, * FROM {tourist_name}"
+        chunks = pd.read_sql_query(query, conn, chunksize=chunk_rows or MLConfig.EVALUATE_CHUNK_ROWS)
+        empty = True
+        while True:
+            with track_stage("db_query"):
+                df = next(chunks, None)
+            if df is None:
+                break
+            if df.empty:
+                continue
+            empty = False
+            keys = df.pop(ROW_KEY_COLUMN).to_numpy(dtype=np.int64)
+            X, y = _split_features(df, tourist_name)
+            yield keys, X, y
         
-        return X, y
+        if empty:
+            raise ValueError(f"'{tourist_name}' 테이블에 데이터가 없습니다.")
         
     finally:
         conn.close()
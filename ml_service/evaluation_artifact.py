@@ -0,0 +1,263 @@
+"""
+학습 시 평가 아티팩트 모듈
+scripts/train_models.py가 모델 학습 직후 계산한 데이터 분할, 테스트 예측값, 지표, 소요 시간을
+모델 파일 옆(model_x.eval.npz)에 저장하고, 평가 API가 다시 예측하지 않고 이를 바로 반환
+
+아티팩트에는 저장 시점의 모델 파일과 학습 DB 지문이 기록되며, 둘 중 하나라도 바뀌면(재학습 없이 모델 교체,
+DB 갱신 등) 오래된 아티팩트로 보고 사용하지 않습니다 (평가 API는 실시간 평가로 대체).
+"""
+import json
+import os
+import tempfile
+import warnings
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+from sklearn.metrics import (
+    mean_absolute_error,
+    mean_squared_error,
+    r2_score,
+    mean_absolute_percentage_error
+)
+
+from ml_service.config import MLConfig
+from ml_service.evaluation_cache import FileFingerprinter
+from ml_service.tracing import annotate
+
+# 아티팩트 형식 버전 (저장하는 배열이나 메타데이터 구조가 바뀌면 증가)
+EVALUATION_ARTIFACT_VERSION = 2
+
+
+def regression_metrics(y_true, y_pred) -> dict:
+    """
+    회귀 지표
+
+    Returns:
+        dict: MAE, MSE, RMSE, R², MAPE (MAPE는 백분율)
+    """
+    mse = mean_squared_error(y_true, y_pred)
+    return {
+        "MAE": float(mean_absolute_error(y_true, y_pred)),
+        "MSE": float(mse),
+        "RMSE": float(np.sqrt(mse)),
+        "R²": float(r2_score(y_true, y_pred)),
+        "MAPE": float(mean_absolute_percentage_error(y_true, y_pred) * 100)
+    }
+
+
+def build_evaluation_result(tourist_code: str, y_train, y_train_pred, y_test, y_test_pred,
+                            feature_count: int) -> dict:
+    """
+    학습/테스트 실제값과 예측값으로 평가 결과 구성 (실시간 평가와 학습 시 아티팩트가 같은 형식을 사용)
+
+    Args:
+        tourist_code: 관광지 코드
+        y_train, y_test: 실제값 (Series)
+        y_train_pred, y_test_pred: 예측값 배열
+        feature_count: 모델 피처 수
+
+    Returns:
+        dict: tourist_code, korean_name, train_metrics, test_metrics, stats, predictions
+    """
+    stats = {
+        "train_size": len(y_train),
+        "test_size": len(y_test),
+        "feature_count": feature_count,
+        "actual_mean": float(y_test.mean()),
+        "actual_std": float(y_test.std()),
+        "predicted_mean": float(y_test_pred.mean()),
+        "predicted_std": float(y_test_pred.std()),
+        "max_actual": int(y_test.max()),
+        "max_predicted": int(y_test_pred.max()),
+        "min_actual": int(y_test.min()),
+        "min_predicted": int(y_test_pred.min())
+    }
+    return {
+        "tourist_code": tourist_code,
+        "korean_name": MLConfig.TOURIST_SITES[tourist_code]["korean_name"],
+        "train_metrics": regression_metrics(y_train, y_train_pred),
+        "test_metrics": regression_metrics(y_test, y_test_pred),
+        "stats": stats,
+        "predictions": {
+            "actual": y_test.values.tolist(),
+            "predicted": y_test_pred.tolist()
+        }
+    }
+
+
+def artifact_path(tourist_code: str, models_dir: Optional[Path] = None) -> Path:
+    """
+    모델 파일 옆의 평가 아티팩트 경로 (예: models/saved/model_changdeok_palace.eval.npz)
+
+    Raises:
+        ValueError: 알 수 없는 관광지 코드
+    """
+    if tourist_code not in MLConfig.MODEL_FILES:
+        raise ValueError(f"알 수 없는 관광지 코드: {tourist_code}")
+    models_dir = models_dir or MLConfig.MODELS_SAVED_DIR
+    return models_dir / (Path(MLConfig.MODEL_FILES[tourist_code]).stem + MLConfig.EVALUATION_ARTIFACT_SUFFIX)
+
+
+def _input_fingerprint(tourist_code: str, fingerprinter: FileFingerprinter, models_dir: Optional[Path] = None) -> dict:
+    """아티팩트가 유효한지 판단하는 모델 파일과 학습 DB 지문"""
+    models_dir = models_dir or MLConfig.MODELS_SAVED_DIR
+    return {
+        "mode": fingerprinter.mode,
+        "model": fingerprinter(models_dir / MLConfig.MODEL_FILES[tourist_code]),
+        "db": fingerprinter(MLConfig.DB_PATH)
+    }
+
+
+def save_evaluation_artifact(tourist_code: str, result: dict, train_index: np.ndarray, test_index: np.ndarray,
+                             timing: dict, split: dict) -> Path:
+    """
+    학습 직후 평가 결과를 아티팩트로 저장 (모델 pkl을 저장한 뒤 호출해야 모델 지문이 맞음)
+
+    Args:
+        tourist_code: 관광지 코드
+        result: build_evaluation_result 결과
+        train_index, test_index: 학습/테스트 행 키 (SQLite rowid)
+        timing: 단계별 소요 시간(초) (load_seconds, fit_seconds, predict_seconds)
+        split: 데이터 분할 설정 (method, test_size, random_state)
+
+    Returns:
+        Path: 저장된 아티팩트 경로
+    """
+    path = artifact_path(tourist_code)
+    fingerprinter = FileFingerprinter(MLConfig.EVALUATION_CACHE_FINGERPRINT)
+    metadata = {
+        "format_version": EVALUATION_ARTIFACT_VERSION,
+        "tourist_code": tourist_code,
+        "model_type": MLConfig.MODEL_TYPE,
+        "fingerprint": _input_fingerprint(tourist_code, fingerprinter),
+        "split": split,
+        "timing": {name: round(float(seconds), 4) for name, seconds in timing.items()},
+        "train_metrics": result["train_metrics"],
+        "test_metrics": result["test_metrics"],
+        "stats": result["stats"],
+        "created_at": datetime.now().isoformat()
+    }
+
+    # 임시 파일에 쓴 뒤 교체 (평가 중인 서버가 반쯤 쓰인 파일을 읽지 않음)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-", suffix=".npz")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez_compressed(
+                f,
+                train_index=np.asarray(train_index, dtype=np.int64),
+                test_index=np.asarray(test_index, dtype=np.int64),
+                test_actual=np.asarray(result["predictions"]["actual"]),
+                test_predicted=np.asarray(result["predictions"]["predicted"]),
+                metadata=np.array(json.dumps(metadata, ensure_ascii=False))
+            )
+        # mkstemp는 0600으로 만드므로 다른 모델 파일과 같이 읽을 수 있도록 변경 (레지스트리로 복사해 공유)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return path
+
+
+class EvaluationArtifactStore:
+    """
+    학습 시 저장된 평가 아티팩트 조회
+
+    load()는 아티팩트가 있고 모델 파일/학습 DB 지문이 저장 시점과 같으면 평가 결과를 반환하고,
+    없거나(missing) 오래되었거나(stale) 읽을 수 없으면 None을 반환합니다.
+    서버는 호출마다 현재 모델 세트의 디렉토리를 넘겨 서비스 중인 버전의 아티팩트와 pkl을 비교합니다.
+
+    Args:
+        models_dir: load()에 디렉토리를 넘기지 않았을 때의 모델 파일 디렉토리 (None이면 MLConfig.MODELS_SAVED_DIR)
+        enabled: False이면 항상 None (None이면 MLConfig.EVALUATION_ARTIFACT_ENABLED)
+        fingerprint: 지문 방식 (None이면 MLConfig.EVALUATION_CACHE_FINGERPRINT, 저장 시와 같아야 유효)
+    """
+
+    def __init__(self, models_dir: Optional[Path] = None, enabled: Optional[bool] = None,
+                 fingerprint: Optional[str] = None):
+        self.models_dir = models_dir
+        self.enabled = MLConfig.EVALUATION_ARTIFACT_ENABLED if enabled is None else enabled
+        self._fingerprinter = FileFingerprinter(fingerprint or MLConfig.EVALUATION_CACHE_FINGERPRINT)
+        self.hits = 0
+        self.stale = 0
+        self.missing = 0
+
+    def load(self, tourist_code: str, models_dir: Optional[Path] = None) -> Optional[dict]:
+        """
+        아티팩트의 평가 결과
+
+        Args:
+            tourist_code: 관광지 코드
+            models_dir: 아티팩트와 모델 파일을 찾을 디렉토리 (None이면 생성 시 models_dir)
+
+        Returns:
+            dict: evaluate_model과 같은 형식의 평가 결과
+                  (evaluated_at: 학습 시 평가 시각, artifact: 파일 이름, 분할 설정, 소요 시간)
+                  아티팩트가 없거나 오래되었으면 None
+
+        Raises:
+            ValueError: 알 수 없는 관광지 코드
+        """
+        models_dir = models_dir or self.models_dir
+        path = artifact_path(tourist_code, models_dir)
+        if not self.enabled:
+            return None
+        if not path.exists():
+            self.missing += 1
+            annotate(evaluation_artifact="missing")
+            return None
+
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                metadata = json.loads(str(data["metadata"]))
+                if not self._is_current(tourist_code, metadata, models_dir):
+                    self.stale += 1
+                    annotate(evaluation_artifact="stale")
+                    return None
+                actual = data["test_actual"]
+                predicted = data["test_predicted"]
+        except (OSError, KeyError, ValueError) as e:
+            warnings.warn(f"평가 아티팩트를 읽지 못해 실시간으로 평가합니다 ({path}): {e}")
+            self.stale += 1
+            annotate(evaluation_artifact="stale")
+            return None
+
+        self.hits += 1
+        annotate(evaluation_artifact="hit")
+        return {
+            "tourist_code": tourist_code,
+            "korean_name": MLConfig.TOURIST_SITES[tourist_code]["korean_name"],
+            "train_metrics": metadata["train_metrics"],
+            "test_metrics": metadata["test_metrics"],
+            "stats": metadata["stats"],
+            "predictions": {
+                "actual": actual.tolist(),
+                "predicted": predicted.tolist()
+            },
+            "evaluated_at": metadata["created_at"],
+            "artifact": {
+                "file": path.name,
+                "split": metadata["split"],
+                "timing": metadata["timing"]
+            }
+        }
+
+    def _is_current(self, tourist_code: str, metadata: dict, models_dir: Optional[Path] = None) -> bool:
+        """형식 버전, 관광지, models_dir 안의 모델 파일/학습 DB 지문이 모두 현재와 같은지 여부"""
+        return (
+            metadata.get("format_version") == EVALUATION_ARTIFACT_VERSION
+            and metadata.get("tourist_code") == tourist_code
+            and metadata.get("fingerprint") == _input_fingerprint(tourist_code, self._fingerprinter, models_dir)
+        )
+
+    def stats(self) -> dict:
+        """조회 통계"""
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "stale": self.stale,
+            "missing": self.missing
+        }
@@ -0,0 +1,244 @@
+"""
+모델 평가 결과 캐시 모듈
+평가 결과는 모델 파일과 학습 DB가 바뀔 때만 달라지므로, 평가한 모델 디렉토리(레지스트리 버전)와 두 파일의
+지문(fingerprint)을 키로 메모리와 디스크(EVALUATION_CACHE_DIR/<관광지 코드>.json)에 저장하여 서버 재시작 후에도 재사용
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import warnings
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+from ml_service.config import MLConfig
+from ml_service.singleflight import SingleFlight
+from ml_service.tracing import annotate
+
+# 평가 결과 형식이나 평가 방법(데이터 분할 등)을 바꾸면 증가시켜 이전 캐시를 무효화
+EVALUATION_CACHE_VERSION = 2
+
+# content 지문 계산 시 한 번에 읽는 크기
+_HASH_CHUNK_BYTES = 1 << 20
+
+
+class FileFingerprinter:
+    """
+    파일 지문 계산기
+
+    mtime 모드는 크기와 수정 시각(ns)을, content 모드는 SHA-256 해시를 사용합니다.
+    content 모드도 크기와 수정 시각이 같으면 이전 해시를 재사용하므로 파일을 다시 읽지 않습니다.
+    (백업에서 DB를 복원하는 등 내용은 같고 수정 시각만 바뀐 경우에도 캐시 적중)
+
+    Args:
+        mode: "mtime" 또는 "content"
+    """
+
+    def __init__(self, mode: str = "mtime"):
+        if mode not in ("mtime", "content"):
+            raise ValueError(f"EVALUATION_CACHE_FINGERPRINT는 mtime 또는 content여야 합니다: {mode}")
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._hashes: Dict[Tuple[str, int, int], str] = {}
+
+    def __call__(self, path: Path) -> Optional[str]:
+        """
+        파일 지문
+
+        Returns:
+            지문 문자열 (파일이 없으면 None)
+        """
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        if self.mode == "mtime":
+            return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+        key = (str(path), stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            digest = self._hashes.get(key)
+        if digest is None:
+            sha = hashlib.sha256()
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(_HASH_CHUNK_BYTES), b""):
+                    sha.update(chunk)
+            digest = sha.hexdigest()
+            with self._lock:
+                self._hashes = {k: v for k, v in self._hashes.items() if k[0] != key[0]}
+                self._hashes[key] = digest
+        return f"sha256:{digest}"
+
+
+class EvaluationCache:
+    """
+    관광지별 평가 결과 캐시 (메모리 + 디스크)
+
+    get_or_compute()는 모델 파일과 DB 지문이 저장된 결과와 같으면 이를 반환하고,
+    다르면 평가 함수를 실행해 결과를 저장합니다. 같은 관광지의 동시 평가는 한 번만 실행합니다.
+    오류 결과("error" 키)와 예외는 저장하지 않습니다.
+    디스크 파일은 지문이 다르면 덮어쓰므로 관광지마다 최근 결과 하나만 남습니다.
+
+    반환하는 dict는 얕은 복사본이므로 최상위 키 추가는 캐시에 영향이 없지만,
+    중첩된 지표/배열은 수정하지 않아야 합니다.
+
+    Args:
+        directory: 디스크 캐시 디렉토리 (None이면 MLConfig.EVALUATION_CACHE_DIR)
+        enabled: False이면 항상 평가 함수 실행 (None이면 MLConfig.EVALUATION_CACHE_ENABLED)
+        fingerprint: 지문 방식 (None이면 MLConfig.EVALUATION_CACHE_FINGERPRINT)
+    """
+
+    def __init__(self, directory: Optional[Path] = None, enabled: Optional[bool] = None,
+                 fingerprint: Optional[str] = None):
+        self.directory = Path(directory or MLConfig.EVALUATION_CACHE_DIR)
+        self.enabled = MLConfig.EVALUATION_CACHE_ENABLED if enabled is None else enabled
+        self._fingerprinter = FileFingerprinter(fingerprint or MLConfig.EVALUATION_CACHE_FINGERPRINT)
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[dict, dict]] = {}
+        self._flight = SingleFlight()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def fingerprint(self, tourist_code: str, models_dir: Optional[Path] = None) -> dict:
+        """
+        평가 결과를 결정하는 입력의 지문 (모델 디렉토리와 모델 파일, 학습 DB, 캐시 형식 버전, 스트리밍 평가 설정)
+
+        Args:
+            tourist_code: 관광지 코드
+            models_dir: 평가할 모델 파일 디렉토리 (None이면 MLConfig.MODELS_SAVED_DIR,
+                        레지스트리 버전 디렉토리이면 버전이 바뀔 때 키도 바뀜)
+
+        Raises:
+            ValueError: 알 수 없는 관광지 코드
+        """
+        if tourist_code not in MLConfig.MODEL_FILES:
+            raise ValueError(f"알 수 없는 관광지 코드: {tourist_code}")
+        models_dir = Path(models_dir or MLConfig.MODELS_SAVED_DIR)
+        return {
+            "version": EVALUATION_CACHE_VERSION,
+            "models_dir": str(models_dir),
+            "model": self._fingerprinter(models_dir / MLConfig.MODEL_FILES[tourist_code]),
+            "db": self._fingerprinter(MLConfig.DB_PATH),
+            "method": {
+                "streaming": MLConfig.EVALUATE_STREAMING,
+                "streaming_min_rows": MLConfig.EVALUATE_STREAMING_MIN_ROWS,
+                "sample_rows": MLConfig.EVALUATE_STREAM_SAMPLE_ROWS
+            }
+        }
+
+    def path_for(self, tourist_code: str) -> Path:
+        """관광지의 디스크 캐시 파일 경로"""
+        return self.directory / f"{tourist_code}.json"
+
+    def get(self, tourist_code: str, fingerprint: Optional[dict] = None,
+            models_dir: Optional[Path] = None) -> Optional[dict]:
+        """
+        지문이 일치하는 저장된 평가 결과 (메모리 우선, 없으면 디스크)
+
+        Returns:
+            평가 결과 복사본 (없거나 지문이 다르면 None)
+        """
+        fingerprint = fingerprint or self.fingerprint(tourist_code, models_dir)
+        with self._lock:
+            entry = self._entries.get(tourist_code)
+        if entry is not None and entry[0] == fingerprint:
+            self.memory_hits += 1
+            annotate(evaluation_cache="memory")
+            return dict(entry[1])
+
+        record = self._read(tourist_code)
+        if record is not None and record.get("fingerprint") == fingerprint:
+            with self._lock:
+                self._entries[tourist_code] = (fingerprint, record["result"])
+            self.disk_hits += 1
+            annotate(evaluation_cache="disk")
+            return dict(record["result"])
+        return None
+
+    def put(self, tourist_code: str, fingerprint: dict, result: dict):
+        """평가 결과를 메모리와 디스크에 저장 (디스크 저장 실패는 경고만 출력)"""
+        with self._lock:
+            self._entries[tourist_code] = (fingerprint, result)
+        try:
+            self._write(tourist_code, {"fingerprint": fingerprint, "result": result})
+        except (OSError, TypeError, ValueError) as e:
+            warnings.warn(f"평가 결과를 디스크 캐시에 저장하지 못했습니다 ({tourist_code}): {e}")
+
+    def get_or_compute(self, tourist_code: str, evaluate: Callable[..., dict],
+                       models_dir: Optional[Path] = None) -> dict:
+        """
+        캐시된 평가 결과 또는 새로 평가한 결과
+
+        Args:
+            tourist_code: 관광지 코드
+            evaluate: 평가 함수 (tourist_code, models_dir 인자, scripts/evaluate_models.py의 evaluate_model 등)
+            models_dir: 평가할 모델 파일 디렉토리 (서버는 현재 모델 세트의 디렉토리, None이면 MLConfig.MODELS_SAVED_DIR)
+
+        Returns:
+            dict: 평가 결과 (evaluated_at: 평가를 실행한 시각)
+        """
+        if not self.enabled:
+            return evaluate(tourist_code, models_dir=models_dir)
+
+        fingerprint = self.fingerprint(tourist_code, models_dir)
+        cached = self.get(tourist_code, fingerprint)
+        if cached is not None:
+            return cached
+
+        def compute() -> dict:
+            # 먼저 시작한 동시 호출이 이미 저장했을 수 있으므로 다시 확인
+            cached = self.get(tourist_code, fingerprint)
+            if cached is not None:
+                return cached
+            self.misses += 1
+            annotate(evaluation_cache="miss")
+            result = evaluate(tourist_code, models_dir=models_dir)
+            if "error" in result:
+                return result
+            result = {**result, "evaluated_at": datetime.now().isoformat()}
+            # 평가 도중 파일이 바뀌었으면 다음 요청에서 다시 평가하도록 저장하지 않음
+            if self.fingerprint(tourist_code, models_dir) == fingerprint:
+                self.put(tourist_code, fingerprint, result)
+            return result
+
+        return dict(self._flight.do((tourist_code, repr(fingerprint)), compute))
+
+    def stats(self) -> dict:
+        """캐시 통계"""
+        with self._lock:
+            entries = len(self._entries)
+        return {
+            "enabled": self.enabled,
+            "entries": entries,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses
+        }
+
+    def _read(self, tourist_code: str) -> Optional[dict]:
+        """디스크 캐시 파일 (없거나 손상되었으면 None)"""
+        path = self.path_for(tourist_code)
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            warnings.warn(f"평가 결과 캐시 파일을 읽지 못해 다시 평가합니다 ({path}): {e}")
+            return None
+
+    def _write(self, tourist_code: str, record: dict):
+        """임시 파일에 쓴 뒤 교체 (다른 워커가 반쯤 쓰인 파일을 읽지 않음)"""
+        path = self.path_for(tourist_code)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-", suffix=".json")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(record, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
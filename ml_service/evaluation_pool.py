@@ -0,0 +1,121 @@
+"""
+병렬 모델 평가 모듈
+관광지별 평가(DB 로드, 데이터 분할, 모델 로드, 예측)를 프로세스 풀에서 동시에 실행
+
+평가는 CPU를 오래 쓰는 작업이므로 별도 프로세스에서 실행하여 서버 프로세스의 GIL과 이벤트 루프를 막지 않고,
+평가 함수에 모델 내부 스레드 수(CPU 수 / 워커 수)를 넘겨 XGBoost 스레드가 코어를 과다 할당하지 않도록 합니다.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ml_service.config import MLConfig
+
+
+class EvaluationPool:
+    """
+    관광지별 평가 함수를 프로세스 풀에서 실행
+
+    워커가 1개이면 프로세스를 만들지 않고 호출한 스레드에서 바로 평가합니다.
+    풀은 첫 평가 때 만들어 재사용하며, 스레드나 OpenMP를 이미 사용 중인 서버 프로세스를
+    fork하지 않도록 spawn 방식으로 워커를 시작합니다 (첫 평가에 워커 시작 시간 추가).
+
+    Args:
+        evaluate: 평가 함수 (tourist_code, model_threads, models_dir 인자, 다른 프로세스에서 불러올 수 있는 모듈 최상위 함수)
+        workers: 워커 프로세스 수 (None이면 MLConfig.EVALUATE_WORKERS, 0이면 CPU 수와 관광지 수 중 작은 값)
+        model_threads: 워커 하나의 모델 내부 스레드 수
+                       (None이면 MLConfig.EVALUATE_MODEL_THREADS, 0이면 CPU 수 / 워커 수)
+    """
+
+    def __init__(self, evaluate: Callable[..., dict], workers: Optional[int] = None,
+                 model_threads: Optional[int] = None):
+        cpu_count = os.cpu_count() or 1
+        workers = MLConfig.EVALUATE_WORKERS if workers is None else workers
+        model_threads = MLConfig.EVALUATE_MODEL_THREADS if model_threads is None else model_threads
+        self.workers = workers if workers > 0 else max(1, min(len(MLConfig.TOURIST_SITES), cpu_count))
+        self.model_threads = model_threads if model_threads > 0 else max(1, cpu_count // self.workers)
+        self._evaluate = partial(evaluate, model_threads=self.model_threads)
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """평가용 프로세스 풀 (지연 생성)"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def _discard(self, executor: ProcessPoolExecutor):
+        """비정상 종료된 워커가 있는 풀을 버려 다음 평가 때 새로 만들도록 함"""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False)
+
+    def evaluate(self, tourist_code: str, models_dir: Optional[Path] = None) -> dict:
+        """
+        관광지 하나 평가 (완료될 때까지 호출한 스레드에서 대기)
+
+        여러 스레드에서 동시에 호출하면 워커 수만큼 병렬로 평가합니다.
+        워커 프로세스가 비정상 종료되면 풀을 다시 만들도록 버리고 예외를 그대로 전달합니다.
+
+        Args:
+            tourist_code: 관광지 코드
+            models_dir: 평가할 모델 파일 디렉토리 (None이면 평가 함수 기본값 MLConfig.MODELS_SAVED_DIR)
+        """
+        if self.workers <= 1:
+            return self._evaluate(tourist_code, models_dir=models_dir)
+
+        executor = self._get_executor()
+        try:
+            return executor.submit(self._evaluate, tourist_code, models_dir=models_dir).result()
+        except BrokenProcessPool:
+            self._discard(executor)
+            raise
+
+    def evaluate_many(self, tourist_codes: List[str],
+                      models_dir: Optional[Path] = None) -> Tuple[Dict[str, dict], Dict[str, Exception]]:
+        """
+        여러 관광지를 병렬로 평가 (models_dir은 evaluate()와 같음)
+
+        Returns:
+            tuple: (관광지 코드별 평가 결과, 관광지 코드별 예외), 둘 다 tourist_codes 순서
+        """
+        executor = self._get_executor() if self.workers > 1 else None
+        futures = {}
+        if executor is not None:
+            try:
+                futures = {code: executor.submit(self._evaluate, code, models_dir=models_dir) for code in tourist_codes}
+            except BrokenProcessPool:
+                self._discard(executor)
+                raise
+
+        results: Dict[str, dict] = {}
+        errors: Dict[str, Exception] = {}
+        for tourist_code in tourist_codes:
+            try:
+                if executor is None:
+                    results[tourist_code] = self._evaluate(tourist_code, models_dir=models_dir)
+                else:
+                    results[tourist_code] = futures[tourist_code].result()
+            except BrokenProcessPool as e:
+                self._discard(executor)
+                errors[tourist_code] = e
+            except Exception as e:
+                errors[tourist_code] = e
+        return results, errors
+
+    def shutdown(self):
+        """워커 프로세스 종료"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
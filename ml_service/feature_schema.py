@@ -0,0 +1,156 @@
+"""
+피처 스키마 매니페스트 모듈
+모델별 입력 피처 구조(컬럼 순서, dtype, 원-핫 그룹, 제거된 피처)를 저장/로드
+"""
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+from ml_service.config import MLConfig
+
+
+def get_schema_path(tourist_code: str, models_dir: Optional[Path] = None) -> Path:
+    """
+    모델 파일과 같은 위치의 스키마 매니페스트 경로 반환
+
+    Args:
+        tourist_code: 관광지 코드 (예: "changdeok_palace")
+        models_dir: 모델 디렉토리 (None이면 MLConfig.MODELS_SAVED_DIR)
+
+    Returns:
+        Path: 스키마 파일 경로 (예: models/saved/model_changdeok_palace.schema.json)
+    """
+    if tourist_code not in MLConfig.MODEL_FILES:
+        raise ValueError(f"알 수 없는 관광지 코드: {tourist_code}")
+
+    model_filename = MLConfig.MODEL_FILES[tourist_code]
+    return (models_dir or MLConfig.MODELS_SAVED_DIR) / (Path(model_filename).stem + MLConfig.FEATURE_SCHEMA_SUFFIX)
+
+
+def _onehot_groups_for(columns: list) -> dict:
+    """컬럼 목록에 존재하는 원-핫 그룹만 추출"""
+    return {
+        group: [col for col in group_cols if col in columns]
+        for group, group_cols in MLConfig.ONEHOT_GROUPS.items()
+        if any(col in columns for col in group_cols)
+    }
+
+
+def build_feature_schema(tourist_code: str, X: pd.DataFrame, split: Optional[dict] = None) -> dict:
+    """
+    학습 데이터 프레임으로부터 피처 스키마 생성
+
+    Args:
+        tourist_code: 관광지 코드
+        X: 학습에 사용된 Feature DataFrame
+        split: 학습 시 데이터 분할 설정 (method, test_size, random_state), 평가가 같은 분할을 쓰는지 확인용
+
+    Returns:
+        dict: 피처 스키마 매니페스트 (split이 없는 스키마는 train_test_split으로 학습한 기존 모델)
+    """
+    columns = list(X.columns)
+
+    schema = {
+        "schema_version": MLConfig.FEATURE_SCHEMA_VERSION,
+        "tourist_code": tourist_code,
+        "korean_name": MLConfig.TOURIST_SITES[tourist_code]["korean_name"],
+        "feature_columns": columns,
+        "dtypes": {col: str(dtype) for col, dtype in X.dtypes.items()},
+        "onehot_groups": _onehot_groups_for(columns),
+        "removed_features": list(MLConfig.REMOVED_FEATURES),
+        "created_at": datetime.now().isoformat()
+    }
+    if split is not None:
+        schema["split"] = split
+    return schema
+
+
+def build_feature_schema_from_pipeline(tourist_code: str, pipeline) -> dict:
+    """
+    학습된 Pipeline의 feature_names_in_으로부터 피처 스키마 생성
+
+    스키마 매니페스트 없이 저장된 기존 모델을 위한 대체 경로입니다.
+    원-핫 피처는 int64, 나머지는 float64로 간주합니다.
+
+    Args:
+        tourist_code: 관광지 코드
+        pipeline: 학습된 sklearn Pipeline
+
+    Returns:
+        dict: 피처 스키마 매니페스트
+    """
+    feature_names = getattr(pipeline, "feature_names_in_", None)
+    if feature_names is None:
+        feature_names = getattr(pipeline.steps[-1][1], "feature_names_in_", None)
+    if feature_names is None:
+        raise ValueError(f"'{tourist_code}' 모델에서 피처 이름을 찾을 수 없습니다.")
+
+    columns = [str(col) for col in feature_names]
+    onehot_cols = {col for group in MLConfig.ONEHOT_GROUPS.values() for col in group}
+
+    return {
+        "schema_version": MLConfig.FEATURE_SCHEMA_VERSION,
+        "tourist_code": tourist_code,
+        "korean_name": MLConfig.TOURIST_SITES[tourist_code]["korean_name"],
+        "feature_columns": columns,
+        "dtypes": {col: ("int64" if col in onehot_cols else "float64") for col in columns},
+        "onehot_groups": _onehot_groups_for(columns),
+        "removed_features": list(MLConfig.REMOVED_FEATURES),
+        "created_at": datetime.now().isoformat()
+    }
+
+
+def save_feature_schema(tourist_code: str, schema: dict) -> Path:
+    """
+    피처 스키마 매니페스트를 모델 파일 옆에 저장
+
+    Args:
+        tourist_code: 관광지 코드
+        schema: 피처 스키마 매니페스트
+
+    Returns:
+        Path: 저장된 스키마 파일 경로
+    """
+    schema_path = get_schema_path(tourist_code)
+    schema_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(schema_path, "w", encoding="utf-8") as f:
+        json.dump(schema, f, ensure_ascii=False, indent=2)
+
+    return schema_path
+
+
+def load_feature_schema(tourist_code: str, models_dir: Optional[Path] = None) -> dict:
+    """
+    저장된 피처 스키마 매니페스트 로드
+
+    Args:
+        tourist_code: 관광지 코드
+        models_dir: 모델 디렉토리 (None이면 MLConfig.MODELS_SAVED_DIR)
+
+    Returns:
+        dict: 피처 스키마 매니페스트
+
+    Raises:
+        FileNotFoundError: 스키마 파일이 없는 경우
+        ValueError: 스키마 버전이 호환되지 않는 경우
+    """
+    schema_path = get_schema_path(tourist_code, models_dir)
+
+    if not schema_path.exists():
+        raise FileNotFoundError(f"피처 스키마 파일을 찾을 수 없습니다: {schema_path}")
+
+    with open(schema_path, "r", encoding="utf-8") as f:
+        schema = json.load(f)
+
+    version = schema.get("schema_version")
+    if version != MLConfig.FEATURE_SCHEMA_VERSION:
+        raise ValueError(
+            f"지원하지 않는 피처 스키마 버전: {version} "
+            f"(필요 버전: {MLConfig.FEATURE_SCHEMA_VERSION}, 파일: {schema_path})"
+        )
+
+    return schema
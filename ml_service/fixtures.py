@@ -0,0 +1,195 @@
+"""
+업스트림 응답 픽스처 모듈
+UPSTREAM_MODE=record일 때 실제 대기환경/기상청 API 응답을 디스크에 저장하고,
+스텁 서버(scripts/stub_upstream.py --replay)가 이를 현재 시각에 맞춰 다시 제공
+
+픽스처는 요청 URL이 아니라 서비스와 위치(자치구 코드, 격자 좌표)로 구분하므로
+API 키나 발표 시각이 달라도 같은 픽스처를 사용하며, 파일에 API 키가 남지 않습니다.
+"""
+import json
+import os
+import tempfile
+import warnings
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from ml_service.config import MLConfig
+from ml_service.resilience import AIR_QUALITY_UPSTREAM, KMA_UPSTREAM
+
+AIR_QUALITY_FIXTURE = "air_quality"
+WEATHER_FIXTURE = "weather"
+FORECAST_FIXTURE = "forecast"
+
+# 픽스처 종류별 업스트림 (스텁 서버의 업스트림별 지연/오류 프로필 선택에 사용)
+FIXTURE_UPSTREAMS = {
+    AIR_QUALITY_FIXTURE: AIR_QUALITY_UPSTREAM,
+    WEATHER_FIXTURE: KMA_UPSTREAM,
+    FORECAST_FIXTURE: KMA_UPSTREAM
+}
+
+
+def fixture_name(url: str, params: Optional[dict] = None) -> Optional[str]:
+    """
+    업스트림 요청에 해당하는 픽스처 이름
+
+    Args:
+        url: 요청 URL (쿼리 문자열 포함 가능)
+        params: 쿼리 파라미터 (None이면 URL의 쿼리 문자열 사용)
+
+    Returns:
+        "air_quality/<자치구 코드>", "weather/<nx>_<ny>", "forecast/<nx>_<ny>"
+        또는 None (알 수 없는 요청)
+    """
+    parts = urlsplit(url)
+    segments = [segment for segment in parts.path.split("/") if segment]
+    if params is None:
+        params = {key: values[0] for key, values in parse_qs(parts.query).items()}
+
+    if MLConfig.AIR_QUALITY_API_SERVICE in segments:
+        return f"{AIR_QUALITY_FIXTURE}/{segments[-1]}"
+    if not segments or segments[-1] not in (MLConfig.KMA_API_SERVICE, MLConfig.KMA_FORECAST_SERVICE):
+        return None
+    kind = FORECAST_FIXTURE if segments[-1] == MLConfig.KMA_FORECAST_SERVICE else WEATHER_FIXTURE
+    return f"{kind}/{params.get('nx', '')}_{params.get('ny', '')}"
+
+
+def _shift(value: str, fmt: str, delta: timedelta) -> str:
+    """날짜/시각 문자열을 delta만큼 이동 (형식이 다르면 그대로)"""
+    try:
+        return (datetime.strptime(value, fmt) + delta).strftime(fmt)
+    except (TypeError, ValueError):
+        return value
+
+
+def _shift_item(item: dict, date_key: str, time_key: str, delta: timedelta):
+    """기상청 아이템의 날짜(YYYYMMDD)와 시각(HHMM) 필드를 함께 이동"""
+    if date_key in item and time_key in item:
+        shifted = _shift(str(item[date_key]) + str(item[time_key]), "%Y%m%d%H%M", delta)
+        item[date_key], item[time_key] = shifted[:8], shifted[8:]
+
+
+def rebase_payload(kind: str, payload: dict, delta: timedelta) -> dict:
+    """
+    응답 본문의 측정/발표/예보 시각을 delta만큼 이동한 복사본
+
+    녹화 시각과 재생 시각의 차이만큼 옮겨 캐시 만료 시각 계산과 예보 구간 선택이 재생 시각 기준으로 동작하도록 합니다.
+    """
+    payload = json.loads(json.dumps(payload))
+    if kind == AIR_QUALITY_FIXTURE:
+        service = payload.get(MLConfig.AIR_QUALITY_API_SERVICE, {})
+        rows = service.get("row", [])
+        for row in rows if isinstance(rows, list) else [rows]:
+            if "MSRMT_YMD" in row:
+                row["MSRMT_YMD"] = _shift(str(row["MSRMT_YMD"]), "%Y%m%d%H%M%S", delta)
+        return payload
+
+    items = payload.get("response", {}).get("body", {}).get("items", {}).get("item", [])
+    for item in items:
+        _shift_item(item, "baseDate", "baseTime", delta)
+        _shift_item(item, "fcstDate", "fcstTime", delta)
+    return payload
+
+
+class FixtureStore:
+    """
+    픽스처 디렉토리 (<root>/<종류>/<위치>.json, 위치별 최근 응답 하나)
+
+    Args:
+        root: 픽스처 디렉토리 (None이면 MLConfig.UPSTREAM_FIXTURES_DIR)
+    """
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = Path(root or MLConfig.UPSTREAM_FIXTURES_DIR)
+
+    def path_for(self, name: str) -> Path:
+        """픽스처 이름에 해당하는 파일 경로"""
+        return self.root / f"{name}.json"
+
+    def save(self, name: str, contents: dict, recorded_at: Optional[datetime] = None) -> Path:
+        """
+        응답 본문 저장 (임시 파일에 쓴 뒤 교체하므로 재생 중인 스텁 서버가 반쯤 쓰인 파일을 읽지 않음)
+
+        Returns:
+            Path: 저장한 파일 경로
+        """
+        path = self.path_for(name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        record = {
+            "name": name,
+            "recorded_at": (recorded_at or datetime.now()).isoformat(),
+            "response": contents
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-", suffix=".json")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(record, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+        return path
+
+    def load(self, name: str, now: Optional[datetime] = None, rebase: bool = True) -> Optional[dict]:
+        """
+        저장된 응답 본문
+
+        Args:
+            name: 픽스처 이름
+            now: 재생 기준 시각 (None이면 현재 시각)
+            rebase: 녹화 시각과 재생 시각의 차이(정시 단위)만큼 응답의 시각 필드 이동
+
+        Returns:
+            응답 본문 (픽스처가 없으면 None)
+        """
+        path = self.path_for(name)
+        if not path.exists():
+            return None
+        with open(path, encoding="utf-8") as f:
+            record = json.load(f)
+        if not rebase:
+            return record["response"]
+
+        recorded_at = datetime.fromisoformat(record["recorded_at"]).replace(minute=0, second=0, microsecond=0)
+        now = (now or datetime.now()).replace(minute=0, second=0, microsecond=0)
+        return rebase_payload(name.split("/", 1)[0], record["response"], now - recorded_at)
+
+    def names(self) -> List[str]:
+        """저장된 픽스처 이름 목록"""
+        if not self.root.exists():
+            return []
+        return sorted(
+            f"{path.parent.name}/{path.stem}"
+            for path in self.root.glob("*/*.json")
+            if not path.name.startswith(".")
+        )
+
+    def summary(self) -> Dict[str, int]:
+        """종류별 픽스처 수"""
+        counts: Dict[str, int] = {}
+        for name in self.names():
+            kind = name.split("/", 1)[0]
+            counts[kind] = counts.get(kind, 0) + 1
+        return counts
+
+
+_recorder: Optional[FixtureStore] = None
+
+
+def record_fixture(url: str, params: Optional[dict], contents: dict):
+    """
+    UPSTREAM_MODE=record이면 업스트림 응답을 픽스처로 저장 (다른 모드에서는 아무것도 하지 않음)
+
+    HTTP 200으로 오는 API 오류 응답(RESULT.CODE, resultCode)이 기존 픽스처를 덮어쓰지 않도록
+    parse_*_response로 파싱에 성공한 응답만 넘겨야 합니다.
+    저장 실패는 예측 요청을 실패시키지 않도록 경고만 합니다.
+    """
+    global _recorder
+    if MLConfig.UPSTREAM_MODE != "record":
+        return
+    name = fixture_name(url, params)
+    if name is None:
+        return
+    if _recorder is None or _recorder.root != Path(MLConfig.UPSTREAM_FIXTURES_DIR):
+        _recorder = FixtureStore()
+    try:
+        _recorder.save(name, contents)
+    except OSError as e:
+        warnings.warn(f"업스트림 응답을 픽스처로 저장하지 못했습니다 ({name}): {e}")
@@ -0,0 +1,249 @@
+"""
+예측 메모 모듈
+연속형 관측값을 구간(bin)으로 양자화하여 (관광지, 구간 키) → 예측값을 재사용
+"""
+import math
+import threading
+import warnings
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from ml_service.config import MLConfig
+from ml_service.preprocessing import CONTINUOUS_SCALER_KEYS
+from ml_service.scenarios import sample_observations
+
+# 양자화 대상 컬럼 (RAW_OBSERVATION_COLUMNS의 앞 다섯 개), 요일/계절은 그대로 키에 포함
+CONTINUOUS_COLUMNS = list(CONTINUOUS_SCALER_KEYS)
+
+PredictFn = Callable[[np.ndarray], np.ndarray]
+
+
+class PredictionMemo:
+    """
+    양자화 예측 메모 테이블
+
+    관측값 (n, 7) 배열의 연속형 컬럼을 구간 폭(bins)의 배수로 맞춘 뒤,
+    같은 구간에 속하는 입력은 구간 중심값으로 한 번만 예측하여 재사용합니다.
+
+    - LRU: (관광지 코드, 구간 키) → 예측값, 최대 max_entries개
+      (MEMO_LRU_MAX_BATCH행보다 큰 배치는 LRU를 거치지 않고 구간 중심값으로 바로 예측)
+    - 사전 계산 테이블: precompute()로 지정한 범위의 모든 구간을 미리 예측한 밀집 배열
+      (셀 수가 MEMO_PRECOMPUTE_MAX_CELLS를 넘으면 구간 폭을 바꾸지 않고 건너뛰어 LRU만 사용)
+    - 오차 범위: estimate_error_bound()로 양자화 전/후 예측 차이를 측정
+
+    Args:
+        bins: 연속형 컬럼별 구간 폭 (None이면 MLConfig.MEMO_BINS)
+        max_entries: LRU 최대 항목 수 (None이면 MLConfig.MEMO_MAX_ENTRIES)
+    """
+
+    def __init__(self, bins: Optional[Dict[str, float]] = None, max_entries: Optional[int] = None):
+        bins = bins or MLConfig.MEMO_BINS
+        missing = [col for col in CONTINUOUS_COLUMNS if col not in bins]
+        if missing:
+            raise ValueError(f"구간 폭이 지정되지 않은 컬럼: {', '.join(missing)}")
+        self.bins = {col: float(bins[col]) for col in CONTINUOUS_COLUMNS}
+        self._widths = np.array([self.bins[col] for col in CONTINUOUS_COLUMNS])
+        self.max_entries = max_entries or MLConfig.MEMO_MAX_ENTRIES
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, bytes], float]" = OrderedDict()
+        self._tables: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self.error_bounds: Dict[str, dict] = {}
+        self.precompute_skipped: Dict[str, str] = {}
+        self.hits = 0
+        self.table_hits = 0
+        self.misses = 0
+
+    def bin_index(self, raw: np.ndarray) -> np.ndarray:
+        """관측값 배열을 구간 인덱스 (n, 7) 정수 배열로 변환 (요일/계절은 그대로)"""
+        index = np.empty(raw.shape, dtype=np.int64)
+        index[:, :len(CONTINUOUS_COLUMNS)] = np.rint(raw[:, :len(CONTINUOUS_COLUMNS)] / self._widths)
+        index[:, len(CONTINUOUS_COLUMNS):] = raw[:, len(CONTINUOUS_COLUMNS):]
+        return index
+
+    def snap(self, raw: np.ndarray) -> np.ndarray:
+        """관측값을 구간 중심값으로 양자화"""
+        return self.from_bin_index(self.bin_index(raw))
+
+    def from_bin_index(self, index: np.ndarray) -> np.ndarray:
+        """구간 인덱스를 구간 중심 관측값 배열로 변환"""
+        raw = index.astype(float)
+        raw[:, :len(CONTINUOUS_COLUMNS)] *= self._widths
+        return raw
+
+    def predict(self, tourist_code: str, raw: np.ndarray, predict_fn: PredictFn) -> np.ndarray:
+        """
+        메모를 거친 예측
+
+        사전 계산 테이블 → LRU 순으로 찾고, 없는 구간만 모아 predict_fn을 한 번 호출합니다.
+
+        Args:
+            tourist_code: 관광지 코드
+            raw: (n, 7) 관측값 배열 (RAW_OBSERVATION_COLUMNS 순서)
+            predict_fn: 관측값 배열을 받아 예측값 배열을 반환하는 함수 (Pipeline.predict)
+
+        Returns:
+            np.ndarray: 구간 중심값 기준 예측값 (n,)
+        """
+        index = self.bin_index(np.asarray(raw, dtype=float))
+        out = np.empty(len(index), dtype=np.float64)
+        found = np.zeros(len(index), dtype=bool)
+
+        table = self._tables.get(tourist_code)
+        if table is not None:
+            found, values = self._table_lookup(table, index)
+            out[found] = values
+            with self._lock:
+                self.table_hits += int(found.sum())
+
+        pending = np.flatnonzero(~found)
+        if pending.size == 0:
+            return out
+
+        if pending.size > MLConfig.MEMO_LRU_MAX_BATCH:
+            # 대량 배치: 행별 LRU 조회와 고유 행 정렬 비용이 예측보다 크므로 구간 중심값을 그대로 예측
+            out[pending] = predict_fn(self.from_bin_index(index[pending]))
+            return out
+
+        keys = [index[i].tobytes() for i in pending]
+        missing = []
+        with self._lock:
+            for i, key in zip(pending, keys):
+                value = self._entries.get((tourist_code, key))
+                if value is None:
+                    missing.append(i)
+                else:
+                    self._entries.move_to_end((tourist_code, key))
+                    out[i] = value
+            self.hits += len(pending) - len(missing)
+            self.misses += len(missing)
+
+        if missing:
+            missing = np.asarray(missing)
+            unique_index, inverse = np.unique(index[missing], axis=0, return_inverse=True)
+            predictions = np.asarray(predict_fn(self.from_bin_index(unique_index)), dtype=np.float64)
+            out[missing] = predictions[inverse.ravel()]
+            with self._lock:
+                for row, value in zip(unique_index, predictions):
+                    self._entries[(tourist_code, row.tobytes())] = float(value)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+        return out
+
+    @staticmethod
+    def _table_lookup(table: Tuple[np.ndarray, np.ndarray], index: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """사전 계산 테이블 조회 (범위 안의 행 마스크, 해당 행의 예측값)"""
+        lower, values = table
+        offset = index - lower
+        inside = ((offset >= 0) & (offset < np.array(values.shape))).all(axis=1)
+        flat = np.ravel_multi_index(tuple(offset[inside].T), values.shape)
+        return inside, values.ravel()[flat]
+
+    def precompute(self, tourist_code: str, predict_fn: PredictFn,
+                   ranges: Optional[Dict[str, Tuple[float, float]]] = None) -> int:
+        """
+        지정한 범위의 모든 구간을 미리 예측하여 밀집 테이블로 보관
+
+        Args:
+            tourist_code: 관광지 코드
+            predict_fn: Pipeline.predict
+            ranges: 연속형 컬럼별 (최소, 최대) 범위 (None이면 MLConfig.MEMO_PRECOMPUTE_RANGES)
+
+        Returns:
+            int: 테이블 셀 수 (MEMO_PRECOMPUTE_MAX_CELLS를 넘어 건너뛴 경우 0)
+        """
+        ranges = ranges or MLConfig.MEMO_PRECOMPUTE_RANGES
+        axes = []
+        for col in CONTINUOUS_COLUMNS:
+            low, high = ranges.get(col, (0.0, 0.0))
+            axes.append(np.arange(round(low / self.bins[col]), round(high / self.bins[col]) + 1))
+        axes.append(np.arange(len(MLConfig.ONEHOT_GROUPS["weekday"])))
+        axes.append(np.arange(len(MLConfig.ONEHOT_GROUPS["season"])))
+
+        shape = tuple(axis.size for axis in axes)
+        # 구간 폭이 좁으면 셀 수가 int64를 넘을 수 있으므로 Python 정수로 계산
+        n_cells = math.prod(shape)
+        if n_cells > MLConfig.MEMO_PRECOMPUTE_MAX_CELLS:
+            # 구간 폭을 넓히면 예측 오차가 커지므로 테이블 없이 LRU만 사용
+            reason = (
+                f"사전 계산 셀 수({n_cells:,})가 최대값({MLConfig.MEMO_PRECOMPUTE_MAX_CELLS:,})을 넘어 LRU만 사용합니다. "
+                f"MEMO_PRECOMPUTE_RANGES를 줄이면 사전 계산됩니다."
+            )
+            warnings.warn(f"{tourist_code}: {reason}")
+            with self._lock:
+                self._tables.pop(tourist_code, None)
+                self.precompute_skipped[tourist_code] = reason
+            return 0
+
+        mesh = np.meshgrid(*axes, indexing="ij")
+        index = np.stack([m.ravel() for m in mesh], axis=1)
+        values = np.asarray(predict_fn(self.from_bin_index(index)), dtype=np.float32).reshape(shape)
+        lower = np.array([axis[0] for axis in axes])
+
+        with self._lock:
+            self._tables[tourist_code] = (lower, values)
+            self.precompute_skipped.pop(tourist_code, None)
+        return n_cells
+
+    def estimate_error_bound(self, tourist_code: str, predict_fn: PredictFn,
+                             n_samples: Optional[int] = None, seed: int = 0) -> dict:
+        """
+        양자화로 인한 예측 오차 측정
+
+        관측 범위(MEMO_PRECOMPUTE_RANGES) 안에서 무작위 관측값을 뽑아
+        원래 값과 구간 중심값의 예측 차이(방문자 수)를 계산합니다.
+
+        Returns:
+            dict: {"samples", "max_abs", "p99_abs", "mean_abs"}
+        """
+        n_samples = n_samples or MLConfig.MEMO_ERROR_SAMPLES
+        ranges = {}
+        for col in CONTINUOUS_COLUMNS:
+            low, high = MLConfig.MEMO_PRECOMPUTE_RANGES.get(col, (0.0, 0.0))
+            ranges[col] = (low, high + self.bins[col])
+        raw = sample_observations(n_samples, ranges, seed)
+
+        error = np.abs(np.asarray(predict_fn(raw), dtype=float) - np.asarray(predict_fn(self.snap(raw)), dtype=float))
+        bound = {
+            "samples": n_samples,
+            "max_abs": round(float(error.max()), 2),
+            "p99_abs": round(float(np.percentile(error, 99)), 2),
+            "mean_abs": round(float(error.mean()), 2)
+        }
+        self.error_bounds[tourist_code] = bound
+        return bound
+
+    def clear(self, tourist_code: Optional[str] = None):
+        """메모 삭제 (관광지 코드를 지정하면 해당 관광지만)"""
+        with self._lock:
+            if tourist_code is None:
+                self._entries.clear()
+                self._tables.clear()
+                self.error_bounds.clear()
+                self.precompute_skipped.clear()
+                return
+            for key in [key for key in self._entries if key[0] == tourist_code]:
+                del self._entries[key]
+            self._tables.pop(tourist_code, None)
+            self.error_bounds.pop(tourist_code, None)
+            self.precompute_skipped.pop(tourist_code, None)
+
+    def stats(self) -> dict:
+        """메모 상태"""
+        with self._lock:
+            lookups = self.hits + self.table_hits + self.misses
+            return {
+                "bins": self.bins,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "precomputed": {code: int(values.size) for code, (_, values) in self._tables.items()},
+                "precompute_skipped": dict(self.precompute_skipped),
+                "hits": self.hits,
+                "table_hits": self.table_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.hits + self.table_hits) / lookups, 4) if lookups else None,
+                "error_bounds": dict(self.error_bounds)
+            }
@@ -0,0 +1,425 @@
+"""
+메트릭 모듈
+단계별 지연 시간 히스토그램, 카운터, 게이지를 프로세스 메모리에 기록하고 Prometheus 텍스트 형식으로 출력
+
+외부 의존성 없이 요청 경로에서는 잠금 한 번과 덧셈만 수행합니다.
+캐시 적중 수처럼 이미 다른 객체가 세고 있는 값은 수집 시점에 collector로 읽어 출력합니다.
+"""
+import bisect
+import functools
+import inspect
+import math
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ml_service.config import MLConfig
+from ml_service.tracing import span
+
+# 지연 시간 히스토그램 기본 버킷 (초, 캐시된 모델 예측 ~ 업스트림 시간 초과까지)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+Sample = Tuple[str, Dict[str, str], float]
+
+
+def _format_value(value: float) -> str:
+    """Prometheus 숫자 표기 (+Inf, 정수는 소수점 없이)"""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    """레이블 값의 역슬래시, 큰따옴표, 줄바꿈 이스케이프"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    """{name="value",...}"""
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+class _Metric:
+    """레이블별 값을 가진 메트릭 공통 부분"""
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._unlabeled = self._new_child()
+            self._children[()] = self._unlabeled
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values):
+        """레이블 값에 해당하는 자식 메트릭 (처음 사용할 때 생성, 값은 문자열로 변환하여 구분)"""
+        key = tuple(value if isinstance(value, str) else str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} 메트릭의 레이블 수가 다릅니다: {self.labelnames}")
+            with self._lock:
+                child = self._children.get(key)
+                if child is None:
+                    child = self._children[key] = self._new_child()
+        return child
+
+    def _items(self) -> List[Tuple[Dict[str, str], object]]:
+        with self._lock:
+            items = list(self._children.items())
+        return [(dict(zip(self.labelnames, values)), child) for values, child in items]
+
+    def samples(self) -> Iterable[Sample]:
+        raise NotImplementedError
+
+
+class _Value:
+    """잠금으로 보호되는 숫자 하나"""
+
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float):
+        self.value = float(value)
+
+
+class Counter(_Metric):
+    """단조 증가 카운터"""
+
+    type_name = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1.0):
+        """레이블 없는 카운터 증가"""
+        self._unlabeled.inc(amount)
+
+    def samples(self) -> Iterable[Sample]:
+        for labels, child in self._items():
+            yield self.name + "_total", labels, child.value
+
+
+class Gauge(_Metric):
+    """증가/감소하는 현재 값 (진행 중인 요청 수 등)"""
+
+    type_name = "gauge"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1.0):
+        self._unlabeled.inc(amount)
+
+    def dec(self, amount: float = 1.0):
+        self._unlabeled.dec(amount)
+
+    def set(self, value: float):
+        self._unlabeled.set(value)
+
+    def samples(self) -> Iterable[Sample]:
+        for labels, child in self._items():
+            yield self.name, labels, child.value
+
+
+class _HistogramValue:
+    """버킷별 관측 수와 합계"""
+
+    __slots__ = ("upper_bounds", "counts", "total", "_lock")
+
+    def __init__(self, upper_bounds: Tuple[float, ...]):
+        self.upper_bounds = upper_bounds
+        self.counts = [0] * (len(upper_bounds) + 1)
+        self.total = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.upper_bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.total += value
+
+    def snapshot(self) -> Tuple[List[int], float]:
+        with self._lock:
+            return list(self.counts), self.total
+
+
+class Histogram(_Metric):
+    """버킷별 누적 관측 수 히스토그램 (지연 시간 등)"""
+
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.upper_bounds = tuple(sorted(float(b) for b in buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramValue(self.upper_bounds)
+
+    def observe(self, value: float):
+        self._unlabeled.observe(value)
+
+    def samples(self) -> Iterable[Sample]:
+        for labels, child in self._items():
+            counts, total = child.snapshot()
+            cumulative = 0
+            for bound, count in zip(self.upper_bounds + (math.inf,), counts):
+                cumulative += count
+                yield self.name + "_bucket", {**labels, "le": _format_value(bound)}, cumulative
+            yield self.name + "_count", labels, cumulative
+            yield self.name + "_sum", labels, total
+
+
+class MetricsRegistry:
+    """
+    메트릭과 collector 모음
+
+    collector는 (이름, 타입, 설명, 샘플 목록) 튜플 목록을 반환하는 함수로,
+    /metrics 요청 시에만 호출되어 다른 객체가 이미 세고 있는 값을 읽습니다.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], Iterable[tuple]]] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        """메트릭 등록 (같은 이름이 있으면 기존 메트릭 반환)"""
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def add_collector(self, collector: Callable[[], Iterable[tuple]]):
+        """수집 시점에 호출할 collector 등록"""
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Prometheus 텍스트 형식 (exposition format 0.0.4)"""
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+
+        families = [(m.name, m.type_name, m.documentation, m.samples()) for m in metrics]
+        for collector in collectors:
+            families.extend(collector())
+
+        for name, type_name, documentation, samples in families:
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {type_name}")
+            for sample_name, labels, value in samples:
+                lines.append(f"{sample_name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+    """REGISTRY에 카운터 등록"""
+    return REGISTRY.register(Counter(name, documentation, labelnames))
+
+
+def gauge(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+    """REGISTRY에 게이지 등록"""
+    return REGISTRY.register(Gauge(name, documentation, labelnames))
+
+
+def histogram(name: str, documentation: str, labelnames: Sequence[str] = (),
+              buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+    """REGISTRY에 히스토그램 등록"""
+    return REGISTRY.register(Histogram(name, documentation, labelnames, buckets))
+
+
+STAGE_SECONDS = histogram(
+    "tourist_stage_duration_seconds", "예측 단계별 소요 시간 (초)", ["stage"]
+)
+STAGE_IN_FLIGHT = gauge(
+    "tourist_stage_in_flight", "실행 중인 예측 단계 수", ["stage"]
+)
+STAGE_ERRORS = counter(
+    "tourist_stage_errors", "예외로 끝난 예측 단계 수", ["stage", "error"]
+)
+UPSTREAM_SECONDS = histogram(
+    "tourist_upstream_request_duration_seconds", "업스트림 HTTP 요청 지연 시간 (성공한 요청, 초)", ["upstream"]
+)
+UPSTREAM_ERRORS = counter(
+    "tourist_upstream_errors", "업스트림 호출 실패 수 (오류 유형별)", ["upstream", "error"]
+)
+HTTP_SECONDS = histogram(
+    "tourist_http_request_duration_seconds", "API 요청 처리 시간 (초)", ["method", "route", "status"]
+)
+HTTP_IN_FLIGHT = gauge(
+    "tourist_http_requests_in_flight", "처리 중인 API 요청 수"
+)
+
+
+class StageTimer:
+    """
+    예측 단계 하나의 소요 시간, 실행 중 수, 예외 수를 기록하는 컨텍스트 매니저
+
+    단계별 레이블 자식 메트릭은 처음 한 번만 찾아 두므로 진입/종료 시 잠금 세 번과 시간 측정 두 번만 수행합니다.
+    추적 중인 요청이면 같은 이름의 span도 기록합니다 (ml_service/tracing.py).
+    """
+
+    __slots__ = ("stage", "_seconds", "_in_flight", "_start", "_span")
+
+    _children: Dict[str, tuple] = {}
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        children = self._children.get(stage)
+        if children is None:
+            children = self._children.setdefault(stage, (STAGE_SECONDS.labels(stage), STAGE_IN_FLIGHT.labels(stage)))
+        self._seconds, self._in_flight = children
+
+    def __enter__(self):
+        self._span = span(self.stage)
+        self._span.__enter__()
+        self._in_flight.inc()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._seconds.observe(time.perf_counter() - self._start)
+        self._in_flight.dec()
+        if exc_type is not None:
+            STAGE_ERRORS.labels(self.stage, exc_type.__name__).inc()
+        self._span.__exit__(exc_type, exc, tb)
+        return False
+
+
+def track_stage(stage: str):
+    """
+    예측 단계 측정 컨텍스트 매니저 (METRICS_ENABLED=false여도 추적 중인 요청의 span은 기록)
+
+    Usage:
+        with track_stage("model_predict"):
+            engine.predict(raw)
+    """
+    if not MLConfig.METRICS_ENABLED:
+        return span(stage)
+    return StageTimer(stage)
+
+
+def timed_stage(stage: str):
+    """
+    함수 전체를 예측 단계 하나로 측정하는 데코레이터 (코루틴 함수도 지원)
+
+    Usage:
+        @timed_stage("pipeline_load")
+        def _load_pipeline_once(self, tourist_code): ...
+    """
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with track_stage(stage):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with track_stage(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def observe_upstream_latency(upstream: str, seconds: float):
+    """성공한 업스트림 요청 지연 시간 기록"""
+    if MLConfig.METRICS_ENABLED:
+        UPSTREAM_SECONDS.labels(upstream).observe(seconds)
+
+
+def count_upstream_error(upstream: str, error: Exception):
+    """업스트림 호출 실패 기록 (오류 클래스 이름별)"""
+    if MLConfig.METRICS_ENABLED:
+        UPSTREAM_ERRORS.labels(upstream, type(error).__name__).inc()
+
+
+class MetricsMiddleware:
+    """
+    API 요청 처리 시간과 처리 중인 요청 수를 기록하는 ASGI 미들웨어
+
+    경로는 라우트 템플릿(/api/predict/{tourist_code})으로 기록하여 레이블 수가 늘지 않도록 합니다.
+
+    Args:
+        app: ASGI 애플리케이션
+        routes: 라우트 목록 (FastAPI app.routes, path_regex와 path 속성 사용)
+        exclude: 기록하지 않을 경로 (/metrics 등)
+    """
+
+    def __init__(self, app, routes: Sequence = (), exclude: Sequence[str] = ("/metrics",)):
+        self.app = app
+        self.routes = routes
+        self.exclude = set(exclude)
+
+    def _route_path(self, path: str) -> str:
+        """요청 경로에 해당하는 라우트 템플릿 (없으면 unmatched)"""
+        for route in self.routes:
+            regex = getattr(route, "path_regex", None)
+            if regex is not None and regex.match(path):
+                return route.path
+        return "unmatched"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not MLConfig.METRICS_ENABLED or scope["path"] in self.exclude:
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            HTTP_SECONDS.labels(scope["method"], self._route_path(scope["path"]), str(status["code"])).observe(
+                time.perf_counter() - start
+            )
+
+
+def counter_family(name: str, documentation: str, samples: Iterable[Sample]) -> tuple:
+    """collector용 카운터 (이름에 _total 추가)"""
+    return name, "counter", documentation, [(name + "_total", labels, value) for _, labels, value in samples]
+
+
+def gauge_family(name: str, documentation: str, samples: Iterable[Sample]) -> tuple:
+    """collector용 게이지"""
+    return name, "gauge", documentation, [(name, labels, value) for _, labels, value in samples]
+
+
+def sample(labels: Optional[Dict[str, str]], value: float) -> Sample:
+    """collector 샘플 (이름은 family에서 채움)"""
+    return "", labels or {}, float(value)
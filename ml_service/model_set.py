@@ -0,0 +1,267 @@
+"""
+모델 세트 모듈
+한 모델 버전 디렉토리의 Pipeline/스키마/예측 엔진/번들/메모를 함께 로드하고 캐싱
+"""
+import warnings
+from pathlib import Path
+from typing import Callable, Optional
+
+import numpy as np
+
+from ml_service.bundle import SiteBundle
+from ml_service.config import MLConfig
+from ml_service.feature_schema import build_feature_schema_from_pipeline, load_feature_schema
+from ml_service.memo import PredictionMemo
+from ml_service.metrics import timed_stage
+from ml_service.native_model import has_native_model, load_native_pipeline
+from ml_service.preprocessing import (
+    ObservationFeatureTransformer,
+    get_model_pipeline,
+    has_feature_step,
+    with_feature_step,
+)
+from ml_service.scenarios import sample_observations
+from ml_service.singleflight import SingleFlight
+from ml_service.tree_engine import CompiledPipeline, check_parity, load_compiled_pipeline
+
+TransformerFactory = Callable[[list], ObservationFeatureTransformer]
+
+
+def limit_model_threads(pipeline, n_threads: int):
+    """Pipeline 마지막 단계 모델의 내부 스레드 수 제한 (CPU 과다 할당 방지)"""
+    model = pipeline.steps[-1][1] if hasattr(pipeline, "steps") else pipeline
+    if hasattr(model, "get_booster"):
+        model.get_booster().set_param({"nthread": n_threads})
+    elif "n_jobs" in model.get_params():
+        model.set_params(n_jobs=n_threads)
+
+
+class ModelSet:
+    """
+    한 모델 버전의 관광지별 모델 묶음
+
+    모델 디렉토리 하나에서 로드한 Pipeline, 스키마, 예측 엔진, 번들과
+    그 모델로 계산한 양자화 메모를 함께 보관합니다.
+    모델을 다시 로드할 때는 새 ModelSet을 만들어 통째로 교체하므로,
+    요청 하나가 ModelSet 참조를 한 번 가져와 사용하면 여러 버전의 모델이 섞이지 않습니다.
+
+    Args:
+        models_dir: 모델 파일 디렉토리
+        version: 모델 버전 이름 (레지스트리를 사용하지 않으면 None)
+        transformer_factory: 피처 순서를 받아 pkl/ 스케일러 변환기를 만드는 함수 (변환기 없이 저장된 기존 모델용)
+        model_threads: 모델 하나가 사용할 스레드 수
+    """
+
+    def __init__(self, models_dir: Path, version: Optional[str], transformer_factory: TransformerFactory,
+                 model_threads: int):
+        self.models_dir = Path(models_dir)
+        self.version = version
+        self._transformer_factory = transformer_factory
+        self._model_threads = model_threads
+        self._pipelines_cache = {}
+        self._schemas_cache = {}
+        # 관광지별 예측 엔진 (Pipeline 또는 CompiledPipeline)과 컴파일 엔진 비교 결과
+        self._engines_cache = {}
+        self.engine_parity = {}
+        # 관광지별 로드한 모델 파일 형식 ("native" 또는 "pickle")
+        self.model_formats = {}
+        # 다중 관광지 모델 번들 (MODEL_BUNDLE_ENABLED일 때만 로드)
+        self._bundle = None
+        self._bundle_loaded = False
+        # 같은 관광지 모델을 동시에 로드하지 않도록 하나로 합침
+        self._flight = SingleFlight()
+        # 양자화 예측 메모 (MEMO_ENABLED일 때만 사용, 모델 버전마다 따로 보관)
+        self.memo = PredictionMemo() if MLConfig.MEMO_ENABLED else None
+
+    def model_path(self, tourist_code: str) -> Path:
+        """관광지 pkl 모델 파일 경로"""
+        return self.models_dir / MLConfig.MODEL_FILES[tourist_code]
+
+    def load_pipeline(self, tourist_code: str):
+        """
+        저장된 Pipeline 모델 로드 (캐싱)
+
+        반환되는 Pipeline의 첫 단계는 항상 관측값 변환기(features)입니다.
+        NATIVE_MODEL_ENABLED이고 pkl보다 오래되지 않은 네이티브 모델 파일(.ubj + .native.json)이 있으면
+        pickle 대신 이를 로드합니다.
+        변환기 없이 저장된 기존 모델은 pkl/ 스케일러로 만든 변환기를 앞에 붙입니다.
+        """
+        if tourist_code not in self._pipelines_cache:
+            if tourist_code not in MLConfig.MODEL_FILES:
+                raise ValueError(f"알 수 없는 관광지 코드: {tourist_code}")
+            # 동시에 들어온 첫 요청들이 같은 pkl을 중복으로 읽지 않도록 하나로 합침
+            self._flight.do(("pipeline", tourist_code), lambda: self._load_pipeline_once(tourist_code))
+
+        return self._pipelines_cache[tourist_code]
+
+    @timed_stage("pipeline_load")
+    def _load_pipeline_once(self, tourist_code: str):
+        """Pipeline 로드 후 캐시에 저장 (single-flight 선두 호출자만 실행)"""
+        if tourist_code in self._pipelines_cache:
+            return
+
+        model_path = self.model_path(tourist_code)
+        if not model_path.exists():
+            raise FileNotFoundError(
+                f"모델 파일을 찾을 수 없습니다: {model_path}\n"
+                f"먼저 'python scripts/train_models.py'를 실행하여 모델을 학습하세요."
+            )
+
+        pipeline = None
+        if MLConfig.NATIVE_MODEL_ENABLED and has_native_model(tourist_code, self.models_dir):
+            try:
+                pipeline = load_native_pipeline(tourist_code, self.models_dir)
+                self.model_formats[tourist_code] = "native"
+            except (FileNotFoundError, ValueError) as e:
+                warnings.warn(f"'{tourist_code}' 네이티브 모델을 읽을 수 없어 pkl을 사용합니다: {e}")
+        if pipeline is None:
+            import joblib
+
+            pipeline = joblib.load(model_path)
+            self.model_formats[tourist_code] = "pickle"
+        limit_model_threads(pipeline, self._model_threads)
+
+        feature_columns = self.load_schema(tourist_code, pipeline)["feature_columns"]
+        if has_feature_step(pipeline):
+            if pipeline.steps[0][1].feature_columns_ != feature_columns:
+                raise ValueError(f"'{tourist_code}' 모델의 변환기 피처 순서가 스키마와 다릅니다.")
+        else:
+            pipeline = with_feature_step(pipeline, self._transformer_factory(feature_columns))
+
+        self._pipelines_cache[tourist_code] = pipeline
+
+    def load_schema(self, tourist_code: str, pipeline=None) -> dict:
+        """모델과 함께 저장된 피처 스키마 매니페스트 로드 (캐싱)"""
+        if tourist_code not in self._schemas_cache:
+            try:
+                schema = load_feature_schema(tourist_code, self.models_dir)
+            except FileNotFoundError as e:
+                # 매니페스트 없이 저장된 기존 모델: Pipeline의 피처 이름 사용
+                warnings.warn(f"{e}, 모델의 피처 이름으로 대체합니다.")
+                schema = build_feature_schema_from_pipeline(
+                    tourist_code, pipeline if pipeline is not None else self.load_pipeline(tourist_code)
+                )
+            self._schemas_cache[tourist_code] = schema
+
+        return self._schemas_cache[tourist_code]
+
+    def load_engine(self, tourist_code: str):
+        """
+        관광지 예측 엔진 반환 (캐싱)
+
+        PREDICT_ENGINE=compiled이면 Pipeline을 NumPy 트리 배열로 컴파일한 CompiledPipeline을,
+        아니면 Pipeline을 그대로 반환합니다. 둘 다 관측값 배열 (n, 7)을 받는 predict를 제공합니다.
+        """
+        if tourist_code not in self._engines_cache:
+            pipeline = self.load_pipeline(tourist_code)
+            if MLConfig.PREDICT_ENGINE == "compiled":
+                self._flight.do(("engine", tourist_code), lambda: self._load_compiled_engine(tourist_code, pipeline))
+            else:
+                self._engines_cache[tourist_code] = pipeline
+
+        return self._engines_cache[tourist_code]
+
+    @timed_stage("engine_compile")
+    def _load_compiled_engine(self, tourist_code: str, pipeline):
+        """
+        컴파일 엔진 로드 후 XGBoost와 비교하여 캐시에 저장 (single-flight 선두 호출자만 실행)
+
+        컴파일할 수 없거나 무작위 관측값 COMPILED_PARITY_SAMPLES개 중 하나라도
+        정수 방문자 수가 XGBoost와 다르면 경고 후 Pipeline을 사용합니다.
+        """
+        if tourist_code in self._engines_cache:
+            return
+
+        engine = pipeline
+        try:
+            compiled = load_compiled_pipeline(pipeline, self.model_path(tourist_code))
+            parity = check_parity(pipeline, compiled.forest, sample_observations(MLConfig.COMPILED_PARITY_SAMPLES))
+            self.engine_parity[tourist_code] = parity
+            if parity["mismatched_visitors"]:
+                warnings.warn(
+                    f"'{tourist_code}' 컴파일 엔진의 예측이 XGBoost와 다릅니다 "
+                    f"({parity['mismatched_visitors']}/{parity['samples']}행), XGBoost를 사용합니다."
+                )
+            else:
+                engine = compiled
+        except ValueError as e:
+            warnings.warn(f"'{tourist_code}' 모델을 컴파일할 수 없어 XGBoost를 사용합니다: {e}")
+
+        self._engines_cache[tourist_code] = engine
+
+    def load_bundle(self) -> Optional[SiteBundle]:
+        """
+        다중 관광지 모델 번들 로드 (캐싱)
+
+        Returns:
+            SiteBundle 또는 None (MODEL_BUNDLE_ENABLED가 아니거나, 번들 파일이 없거나,
+            번들 생성 이후 관광지 모델이 바뀐 경우)
+        """
+        if not MLConfig.MODEL_BUNDLE_ENABLED:
+            return None
+        if not self._bundle_loaded:
+            self._flight.do(("bundle",), self._load_bundle_once)
+        return self._bundle
+
+    @timed_stage("bundle_load")
+    def _load_bundle_once(self):
+        """번들 파일 로드 후 캐시에 저장 (single-flight 선두 호출자만 실행)"""
+        if self._bundle_loaded:
+            return
+
+        bundle_path = self.models_dir / MLConfig.MODEL_BUNDLE_FILE
+        bundle = None
+        if not bundle_path.exists():
+            warnings.warn(f"모델 번들 파일을 찾을 수 없어 관광지별 모델을 사용합니다: {bundle_path}")
+        else:
+            try:
+                bundle = SiteBundle.load(bundle_path)
+            except ValueError as e:
+                warnings.warn(f"모델 번들을 읽을 수 없어 관광지별 모델을 사용합니다: {e}")
+            if bundle is not None and bundle.is_stale(self.models_dir):
+                warnings.warn(
+                    "번들 생성 이후 관광지 모델이 바뀌어 관광지별 모델을 사용합니다. "
+                    "'python scripts/train_models.py --bundle-only'로 번들을 다시 생성하세요."
+                )
+                bundle = None
+
+        self._bundle = bundle
+        self._bundle_loaded = True
+
+    @timed_stage("model_predict")
+    def predict_features(self, tourist_code: str, features: np.ndarray) -> np.ndarray:
+        """관측값 변환기를 거친 피처 배열 예측 (여러 관광지가 변환 결과를 공유할 때 사용)"""
+        engine = self.load_engine(tourist_code)
+        if isinstance(engine, CompiledPipeline):
+            return engine.predict_features(features)
+        return get_model_pipeline(engine).predict(features)
+
+    @timed_stage("model_predict")
+    def predict_raw(self, tourist_code: str, raw: np.ndarray) -> np.ndarray:
+        """
+        관측값 배열 (n, 7) 예측
+
+        양자화 메모가 활성화되어 있으면 메모에 없는 구간만 예측 엔진으로 예측합니다.
+        """
+        engine = self.load_engine(tourist_code)
+        if self.memo is not None:
+            return self.memo.predict(tourist_code, raw, engine.predict)
+        return engine.predict(raw)
+
+    def engine_status(self) -> dict:
+        """번들 상태와 로드된 관광지별 엔진/모델 파일 형식 및 XGBoost 비교 결과"""
+        return {
+            "bundle": {
+                "enabled": MLConfig.MODEL_BUNDLE_ENABLED,
+                "loaded": self._bundle is not None,
+                "sites": self._bundle.tourist_codes if self._bundle is not None else []
+            },
+            "sites": {
+                tourist_code: {
+                    "engine": "compiled" if isinstance(engine, CompiledPipeline) else "xgboost",
+                    "model_format": self.model_formats.get(tourist_code),
+                    "parity": self.engine_parity.get(tourist_code)
+                }
+                for tourist_code, engine in self._engines_cache.items()
+            }
+        }
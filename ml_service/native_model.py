@@ -0,0 +1,157 @@
+"""
+네이티브 모델 파일 모듈
+XGBoost 자체 형식(UBJSON) 부스터와 메타데이터 사이드카로 Pipeline을 저장/로드 (pickle 없이 로드)
+"""
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Tuple
+
+from ml_service.config import MLConfig
+from ml_service.preprocessing import FEATURE_STEP_NAME, ObservationFeatureTransformer, has_feature_step
+
+# 메타데이터 형식 버전 (사이드카 구조가 바뀌면 증가)
+NATIVE_FORMAT_VERSION = 1
+
+
+def native_paths(tourist_code: str, models_dir: Optional[Path] = None) -> Tuple[Path, Path]:
+    """
+    모델 파일 옆의 네이티브 부스터 파일과 메타데이터 사이드카 경로 (models_dir이 None이면 MLConfig.MODELS_SAVED_DIR)
+
+    Returns:
+        tuple: (model_x.ubj, model_x.native.json)
+    """
+    if tourist_code not in MLConfig.MODEL_FILES:
+        raise ValueError(f"알 수 없는 관광지 코드: {tourist_code}")
+    models_dir = models_dir or MLConfig.MODELS_SAVED_DIR
+    stem = Path(MLConfig.MODEL_FILES[tourist_code]).stem
+    return (
+        models_dir / (stem + MLConfig.NATIVE_MODEL_SUFFIX),
+        models_dir / (stem + MLConfig.NATIVE_META_SUFFIX)
+    )
+
+
+def has_native_model(tourist_code: str, models_dir: Optional[Path] = None) -> bool:
+    """
+    사용할 수 있는 네이티브 모델 파일이 있는지 여부
+
+    부스터와 사이드카가 모두 있고 pkl 모델 파일보다 오래되지 않아야 합니다.
+    (pkl만 다시 저장된 경우 오래된 네이티브 파일을 사용하지 않음)
+    """
+    booster_path, meta_path = native_paths(tourist_code, models_dir)
+    if not (booster_path.exists() and meta_path.exists()):
+        return False
+    model_path = (models_dir or MLConfig.MODELS_SAVED_DIR) / MLConfig.MODEL_FILES[tourist_code]
+    if not model_path.exists():
+        return True
+    model_mtime = model_path.stat().st_mtime
+    return booster_path.stat().st_mtime >= model_mtime and meta_path.stat().st_mtime >= model_mtime
+
+
+def save_native_model(tourist_code: str, pipeline) -> Path:
+    """
+    Pipeline(관측값 변환기 + XGBoost)을 네이티브 부스터 파일과 메타데이터 사이드카로 저장
+
+    Args:
+        tourist_code: 관광지 코드
+        pipeline: 첫 단계가 관측값 변환기이고 마지막 단계가 XGBoost 모델인 Pipeline
+
+    Returns:
+        Path: 저장된 메타데이터 사이드카 경로
+
+    Raises:
+        ValueError: 관측값 변환기 단계가 없거나 XGBoost 모델 하나가 아닌 경우
+    """
+    if not has_feature_step(pipeline):
+        raise ValueError("관측값 변환기 단계가 있는 Pipeline만 네이티브 형식으로 저장할 수 있습니다.")
+    model_steps = pipeline.steps[1:]
+    if len(model_steps) != 1 or not hasattr(model_steps[0][1], "get_booster"):
+        raise ValueError(f"'{tourist_code}' 모델이 XGBoost 모델 하나가 아니어서 네이티브 형식으로 저장할 수 없습니다.")
+
+    import xgboost
+
+    transformer = pipeline.steps[0][1]
+    model_name, model = model_steps[0]
+    booster_path, meta_path = native_paths(tourist_code)
+    booster_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # 부스터를 먼저 저장하고 사이드카를 마지막에 저장 (사이드카가 있으면 부스터도 완성된 상태)
+    model.save_model(booster_path)
+    metadata = {
+        "format_version": NATIVE_FORMAT_VERSION,
+        "tourist_code": tourist_code,
+        "korean_name": MLConfig.TOURIST_SITES[tourist_code]["korean_name"],
+        "booster_file": booster_path.name,
+        "model_step": model_name,
+        "model_class": type(model).__name__,
+        "xgboost_version": xgboost.__version__,
+        "feature_columns": list(transformer.feature_columns_),
+        "transformer": {
+            "means": [float(value) for value in transformer.mean_],
+            "scales": [float(value) for value in transformer.scale_]
+        },
+        "created_at": datetime.now().isoformat()
+    }
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump(metadata, f, ensure_ascii=False, indent=2)
+
+    return meta_path
+
+
+def load_native_metadata(tourist_code: str, models_dir: Optional[Path] = None) -> dict:
+    """
+    메타데이터 사이드카 로드
+
+    Raises:
+        FileNotFoundError: 사이드카 파일이 없는 경우
+        ValueError: 형식 버전이 다르거나 다른 관광지의 파일인 경우
+    """
+    _, meta_path = native_paths(tourist_code, models_dir)
+    if not meta_path.exists():
+        raise FileNotFoundError(f"네이티브 모델 메타데이터를 찾을 수 없습니다: {meta_path}")
+
+    with open(meta_path, "r", encoding="utf-8") as f:
+        metadata = json.load(f)
+
+    version = metadata.get("format_version")
+    if version != NATIVE_FORMAT_VERSION:
+        raise ValueError(f"지원하지 않는 네이티브 모델 형식 버전: {version} (필요: {NATIVE_FORMAT_VERSION})")
+    if metadata.get("tourist_code") != tourist_code:
+        raise ValueError(f"'{meta_path.name}'은(는) '{tourist_code}'의 메타데이터가 아닙니다.")
+    return metadata
+
+
+def load_native_pipeline(tourist_code: str, models_dir: Optional[Path] = None):
+    """
+    네이티브 부스터 파일과 사이드카로 Pipeline 구성 (pickle을 사용하지 않음)
+
+    반환되는 Pipeline은 pkl에서 로드한 것과 같은 구조(관측값 변환기 + XGBRegressor)이므로
+    컴파일 엔진, 모델 번들, 메모 등 기존 경로를 그대로 사용할 수 있습니다.
+
+    Raises:
+        FileNotFoundError: 부스터 또는 사이드카 파일이 없는 경우
+        ValueError: 메타데이터가 올바르지 않은 경우
+    """
+    metadata = load_native_metadata(tourist_code, models_dir)
+    booster_path = native_paths(tourist_code, models_dir)[0].with_name(metadata["booster_file"])
+    if not booster_path.exists():
+        raise FileNotFoundError(f"네이티브 부스터 파일을 찾을 수 없습니다: {booster_path}")
+
+    from sklearn.pipeline import Pipeline
+    from xgboost import XGBRegressor
+
+    if metadata["model_class"] != XGBRegressor.__name__:
+        raise ValueError(f"지원하지 않는 네이티브 모델 클래스: {metadata['model_class']}")
+
+    model = XGBRegressor()
+    model.load_model(booster_path)
+    booster_features = model.get_booster().feature_names
+    if booster_features is not None and list(booster_features) != metadata["feature_columns"]:
+        raise ValueError(f"'{tourist_code}' 부스터의 피처 순서가 메타데이터와 다릅니다.")
+
+    transformer = ObservationFeatureTransformer(
+        means=metadata["transformer"]["means"],
+        scales=metadata["transformer"]["scales"],
+        feature_columns=metadata["feature_columns"]
+    ).fit()
+    return Pipeline([(FEATURE_STEP_NAME, transformer), (metadata["model_step"], model)])
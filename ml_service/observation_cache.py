@@ -0,0 +1,129 @@
+"""
+관측 데이터 캐시 모듈
+대기환경/기상청 관측값을 발표 주기에 맞춰 만료되는 캐시에 보관
+"""
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Hashable, Optional, Tuple
+
+from ml_service.config import MLConfig
+
+# 발표 주기마다 새로 수집하는 실시간 관측 캐시 키 종류 (예보/예측 시계열은 자체 만료 시각 사용)
+REALTIME_OBSERVATION_KINDS = ("air", "weather")
+
+
+def air_quality_cache_key(district_code: str) -> tuple:
+    """대기환경 관측 캐시 키 (자치구 코드 기준)"""
+    return ("air", district_code)
+
+
+def weather_cache_key(nx: int, ny: int) -> tuple:
+    """기상청 관측 캐시 키 (격자 좌표 기준)"""
+    return ("weather", nx, ny)
+
+
+def forecast_cache_key(nx: int, ny: int) -> tuple:
+    """기상청 단기예보 캐시 키 (격자 좌표 기준)"""
+    return ("forecast", nx, ny)
+
+
+def forecast_series_cache_key(tourist_code: str, model_version: Optional[str] = None) -> tuple:
+    """관광지별 예보 기반 예측 시계열 캐시 키 (모델이 교체되면 새로 계산하도록 모델 버전 포함)"""
+    return ("forecast_series", tourist_code, model_version)
+
+
+def weather_expires_at(now: Optional[datetime] = None) -> datetime:
+    """
+    기상청 초단기실황 캐시 만료 시각
+
+    요청 시 사용하는 base_time은 매시 정각 단위이므로 다음 정각에 만료됩니다.
+    """
+    now = now or datetime.now()
+    return now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+
+
+def forecast_expires_at(now: Optional[datetime] = None) -> datetime:
+    """
+    기상청 단기예보 캐시 만료 시각
+
+    다음 단기예보 발표가 API로 제공되는 시각에 만료됩니다.
+    """
+    from ml_service.upstream import next_forecast_issue_time
+
+    return next_forecast_issue_time(now)
+
+
+def air_quality_expires_at(measured_at: datetime, now: Optional[datetime] = None) -> datetime:
+    """
+    대기환경 캐시 만료 시각
+
+    다음 측정 시각(MSRMT_YMD + 1시간)에 만료됩니다. 발표 지연으로 다음 측정 시각이
+    이미 지난 경우에는 최소 TTL 후 다시 조회합니다.
+    """
+    now = now or datetime.now()
+    next_measurement = measured_at + timedelta(hours=1)
+    min_expiry = now + timedelta(seconds=MLConfig.OBSERVATION_CACHE_MIN_TTL)
+    return max(next_measurement, min_expiry)
+
+
+class ObservationCache:
+    """만료 시각 기반 관측 데이터 캐시 (스레드 안전)"""
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, now: Optional[datetime] = None) -> Optional[Any]:
+        """
+        캐시 조회
+
+        Args:
+            key: 캐시 키
+            now: 기준 시각 (None이면 현재 시각)
+
+        Returns:
+            캐시된 값 (없거나 만료된 경우 None)
+        """
+        now = now or datetime.now()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= now:
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: Hashable, value: Any, expires_at: datetime):
+        """
+        캐시 저장
+
+        Args:
+            key: 캐시 키
+            value: 저장할 값
+            expires_at: 만료 시각
+        """
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+
+    def clear(self):
+        """캐시 전체 삭제"""
+        with self._lock:
+            self._entries.clear()
+
+    def invalidate(self, kinds: Tuple[str, ...]):
+        """
+        키 종류(튜플 키의 첫 값)가 kinds에 속하는 항목만 삭제
+
+        Args:
+            kinds: 삭제할 키 종류 (예: REALTIME_OBSERVATION_KINDS)
+        """
+        with self._lock:
+            for key in [key for key in self._entries if isinstance(key, tuple) and key and key[0] in kinds]:
+                del self._entries[key]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
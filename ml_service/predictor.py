@@ -2,18 +2,61 @@
 예측 서비스 모듈
 실시간 데이터 수집 및 예측 로직
 """
+import asyncio
+import contextvars
 import json
+import os
+import threading
+import time
 import warnings
-from datetime import datetime, timedelta
-from typing import Dict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 import requests
-import joblib
 
+from ml_service.bundle import SiteBundle
 from ml_service.config import MLConfig
-from ml_service.data_loader import load_tourist_data
+from ml_service.fixtures import record_fixture
+from ml_service.memo import PredictionMemo
+from ml_service.metrics import timed_stage, track_stage
+from ml_service.model_set import ModelSet
+from ml_service.preprocessing import (
+    DEFAULT_FEATURE_COLUMNS,
+    ObservationFeatureTransformer,
+    calculate_discomfort_index,
+    load_scalers,
+    month_to_season,
+    observations_to_array,
+)
+from ml_service.observation_cache import (
+    ObservationCache,
+    air_quality_cache_key,
+    air_quality_expires_at,
+    forecast_cache_key,
+    forecast_expires_at,
+    forecast_series_cache_key,
+    weather_cache_key,
+    weather_expires_at,
+)
+from ml_service.registry import ModelRegistry
+from ml_service.resilience import AIR_QUALITY_UPSTREAM, KMA_UPSTREAM, Deadline, build_upstream_guards
+from ml_service.singleflight import AsyncSingleFlight, SingleFlight
+from ml_service.tracing import span
+from ml_service.warmup import warm_site
+from ml_service.upstream import (
+    AsyncUpstreamClient,
+    build_air_quality_url,
+    build_forecast_request,
+    build_weather_request,
+    forecast_base_datetime,
+    parse_air_quality_response,
+    parse_forecast_response,
+    parse_weather_response,
+)
 
 warnings.simplefilter("ignore")
 
@@ -25,144 +68,158 @@ class PredictionService:
         """초기화 및 설정 검증"""
         MLConfig.validate()
         self._scalers_cache = None
-        self._pipelines_cache = {}
+        self._transformers_cache = {}
+        self.observation_cache = ObservationCache()
+        # 업스트림별 회로 차단기/지연 시간 통계 (동기/비동기 경로 공유)
+        self.upstream_guards = build_upstream_guards()
+        self.upstream = AsyncUpstreamClient(guards=self.upstream_guards)
+        self._executor = None
+        # 같은 키의 동시 업스트림 호출/모델 로드를 하나로 합침
+        self._flight = SingleFlight()
+        self._async_flight = AsyncSingleFlight()
+        # 현재 모델 세트 (다시 로드할 때 새 ModelSet으로 통째로 교체, 요청은 참조를 한 번만 가져와 사용)
+        self.registry = ModelRegistry()
+        self.models = self._create_model_set(*self._resolve_models_dir())
+        self.model_reloads = 0
+        self.last_reload: Optional[dict] = None
     
     @staticmethod
     def calculate_discomfort_index(temp_celsius: float, humidity_percent: float) -> float:
         """불쾌지수 계산"""
-        return 0.81 * temp_celsius + 0.01 * humidity_percent * (0.99 * temp_celsius - 14.3) + 46.3
+        return calculate_discomfort_index(temp_celsius, humidity_percent)
     
     @staticmethod
     def month_to_season(month: int) -> int:
         """월을 계절로 변환 (0: 봄, 1: 여름, 2: 가을, 3: 겨울)"""
-        if month in [3, 4, 5]:
-            return 0  # 봄
-        elif month in [6, 7, 8]:
-            return 1  # 여름
-        elif month in [9, 10, 11]:
-            return 2  # 가을
-        else:
-            return 3  # 겨울
-    
-    def fetch_air_quality_data(self, district_code: str) -> dict:
+        return int(month_to_season(month))
+    
+    def _get_json(self, url: str, params: Optional[dict], upstream: str,
+                  deadline: Optional[Deadline] = None) -> dict:
+        """
+        회로 차단기와 시간 예산을 적용한 동기 GET 요청
+        
+        Raises:
+            CircuitOpenError: 회로 차단기가 열려 있는 경우
+            DeadlineExceededError: 시간 예산을 모두 사용한 경우
+            requests.exceptions.RequestException: HTTP 요청 실패
+        """
+        guard = self.upstream_guards[upstream]
+        timeout = deadline.timeout(MLConfig.UPSTREAM_TIMEOUT) if deadline is not None else MLConfig.UPSTREAM_TIMEOUT
+        guard.breaker.before_call()
+        
+        start = time.monotonic()
+        try:
+            with span(f"upstream.{upstream}"):
+                response = requests.get(url, params=params, timeout=timeout)
+                response.raise_for_status()
+                contents = json.loads(response.text)
+        except Exception as e:
+            guard.record_failure(e)
+            raise
+        
+        guard.observe_latency(time.monotonic() - start)
+        guard.record_success()
+        return contents
+    
+    @timed_stage("air_quality_fetch")
+    def fetch_air_quality_data(self, district_code: str, deadline: Optional[Deadline] = None) -> dict:
         """서울시 자치구별 실시간 대기환경 데이터 수집"""
-        url = f"{MLConfig.SEOUL_AIR_QUALITY_API_BASE_URL}/{MLConfig.SEOUL_AIR_QUALITY_API_KEY}/{MLConfig.AIR_QUALITY_API_TYPE}/{MLConfig.AIR_QUALITY_API_SERVICE}/{MLConfig.AIR_QUALITY_API_START_INDEX}/{MLConfig.AIR_QUALITY_API_END_INDEX}/{district_code}"
+        url = build_air_quality_url(district_code)
         
         try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            contents = json.loads(response.text)
-            
-            if 'ListAirQualityByDistrictService' not in contents:
-                raise ValueError("API 응답 형식이 올바르지 않습니다.")
-            
-            api_response = contents['ListAirQualityByDistrictService']
-            
-            if 'RESULT' in api_response:
-                result_code = api_response['RESULT'].get('CODE', '')
-                if result_code != 'INFO-000':
-                    error_msg = api_response['RESULT'].get('MESSAGE', '알 수 없는 오류')
-                    raise RuntimeError(f"API 오류: {error_msg} (코드: {result_code})")
-            
-            if 'row' not in api_response:
-                raise ValueError("API 응답에 데이터가 없습니다.")
-            
-            if isinstance(api_response['row'], list):
-                row_data = api_response['row'][0]
-            else:
-                row_data = api_response['row']
-            
-            msrmt_ymd = str(row_data.get('MSRMT_YMD', ''))
-            if len(msrmt_ymd) >= 14:
-                datetime_str = f"{msrmt_ymd[:4]}-{msrmt_ymd[4:6]}-{msrmt_ymd[6:8]} {msrmt_ymd[8:10]}:{msrmt_ymd[10:12]}"
-                datetime_obj = pd.to_datetime(datetime_str)
-            else:
-                datetime_obj = pd.Timestamp.now()
-            
-            return {
-                'pm10': float(row_data.get('PM', 0)),
-                'datetime': datetime_obj
-            }
+            contents = self._get_json(url, None, AIR_QUALITY_UPSTREAM, deadline)
+            air_data = parse_air_quality_response(contents)
+            record_fixture(url, None, contents)
+            return air_data
         except requests.exceptions.RequestException as e:
             raise RuntimeError(f"API 요청 실패: {e}")
         except (KeyError, ValueError, TypeError) as e:
             raise RuntimeError(f"데이터 파싱 실패: {e}")
     
-    def fetch_weather_api_data(self, nx: int, ny: int) -> dict:
+    @timed_stage("weather_fetch")
+    def fetch_weather_api_data(self, nx: int, ny: int, deadline: Optional[Deadline] = None) -> dict:
         """기상청 API에서 초단기실황 데이터 수집"""
-        now = datetime.now()
-        current_hour = now.hour
-        base_time = f"{current_hour:02d}00"
-        base_date = now.strftime("%Y%m%d")
-        
-        if current_hour == 0:
-            base_date = (now - timedelta(days=1)).strftime("%Y%m%d")
-            base_time = "2300"
-        
-        url = f"{MLConfig.KMA_API_BASE_URL}/{MLConfig.KMA_API_SERVICE}"
-        params = {
-            "ServiceKey": MLConfig.KMA_API_KEY,
-            "pageNo": MLConfig.KMA_API_PAGE_NO,
-            "numOfRows": MLConfig.KMA_API_NUM_OF_ROWS,
-            "dataType": MLConfig.KMA_API_DATA_TYPE,
-            "base_date": base_date,
-            "base_time": base_time,
-            "nx": nx,
-            "ny": ny
-        }
+        url, params = build_weather_request(nx, ny)
         
         try:
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            contents = json.loads(response.text)
-            
-            if 'response' not in contents:
-                raise ValueError("API 응답 형식이 올바르지 않습니다.")
-            
-            response_data = contents['response']
-            
-            if 'header' in response_data:
-                result_code = response_data['header'].get('resultCode', '')
-                if result_code != '00':
-                    result_msg = response_data['header'].get('resultMsg', '알 수 없는 오류')
-                    raise RuntimeError(f"기상청 API 오류: {result_msg} (코드: {result_code})")
-            
-            if 'body' not in response_data or 'items' not in response_data['body']:
-                raise ValueError("API 응답에 데이터가 없습니다.")
-            
-            items = response_data['body']['items']['item']
-            if not items:
-                raise ValueError("API 응답에 아이템이 없습니다.")
-            
-            data_dict = {}
-            for item in items:
-                category = item.get('category', '')
-                obsr_value = item.get('obsrValue', '0')
-                try:
-                    data_dict[category] = float(obsr_value)
-                except (ValueError, TypeError):
-                    data_dict[category] = 0.0
-            
-            return {
-                'temperature': data_dict.get('T1H', 20.0),
-                'humidity': data_dict.get('REH', 60.0),
-                'windspeed': data_dict.get('WSD', 2.0),
-                'rainfall': data_dict.get('RN1', 0.0),
-                'datetime': pd.Timestamp.now()
-            }
+            contents = self._get_json(url, params, KMA_UPSTREAM, deadline)
+            weather_data = parse_weather_response(contents)
+            record_fixture(url, params, contents)
+            return weather_data
         except requests.exceptions.RequestException as e:
             raise RuntimeError(f"기상청 API 요청 실패: {e}")
         except (KeyError, ValueError, TypeError) as e:
             raise RuntimeError(f"기상청 데이터 파싱 실패: {e}")
     
-    def fetch_weather_data(self, district_code: str, nx: int, ny: int) -> dict:
-        """대기환경 API와 기상청 API를 모두 호출하여 통합 데이터 반환"""
-        air_data = self.fetch_air_quality_data(district_code)
+    def get_air_quality_data(self, district_code: str, deadline: Optional[Deadline] = None) -> dict:
+        """대기환경 데이터 조회 (다음 측정 시각까지 자치구 코드별 캐싱)"""
+        if not MLConfig.OBSERVATION_CACHE_ENABLED:
+            return self.fetch_air_quality_data(district_code, deadline)
         
-        try:
-            weather_data = self.fetch_weather_api_data(nx, ny)
-        except Exception as e:
-            warnings.warn(f"기상청 API 호출 실패, 기본값 사용: {e}")
+        key = air_quality_cache_key(district_code)
+        air_data = self._cache_get(key)
+        if air_data is None:
+            air_data = self._flight.do(key, lambda: self._store_air_quality(key, self.fetch_air_quality_data(district_code, deadline)))
+        return air_data
+    
+    def get_weather_api_data(self, nx: int, ny: int, deadline: Optional[Deadline] = None) -> dict:
+        """기상청 초단기실황 데이터 조회 (다음 base_time까지 격자 좌표별 캐싱)"""
+        if not MLConfig.OBSERVATION_CACHE_ENABLED:
+            return self.fetch_weather_api_data(nx, ny, deadline)
+        
+        key = weather_cache_key(nx, ny)
+        weather_data = self._cache_get(key)
+        if weather_data is None:
+            weather_data = self._flight.do(key, lambda: self._store_weather(key, self.fetch_weather_api_data(nx, ny, deadline)))
+        return weather_data
+    
+    async def get_air_quality_data_async(self, district_code: str, deadline: Optional[Deadline] = None) -> dict:
+        """대기환경 데이터 비동기 조회 (get_air_quality_data와 동일한 캐시 사용)"""
+        if not MLConfig.OBSERVATION_CACHE_ENABLED:
+            return await self.upstream.fetch_air_quality(district_code, deadline)
+        
+        key = air_quality_cache_key(district_code)
+        air_data = self._cache_get(key)
+        if air_data is None:
+            async def fetch():
+                return self._store_air_quality(key, await self.upstream.fetch_air_quality(district_code, deadline))
+            air_data = await self._async_flight.do(key, fetch)
+        return air_data
+    
+    async def get_weather_api_data_async(self, nx: int, ny: int, deadline: Optional[Deadline] = None) -> dict:
+        """기상청 초단기실황 데이터 비동기 조회 (get_weather_api_data와 동일한 캐시 사용)"""
+        if not MLConfig.OBSERVATION_CACHE_ENABLED:
+            return await self.upstream.fetch_weather(nx, ny, deadline)
+        
+        key = weather_cache_key(nx, ny)
+        weather_data = self._cache_get(key)
+        if weather_data is None:
+            async def fetch():
+                return self._store_weather(key, await self.upstream.fetch_weather(nx, ny, deadline))
+            weather_data = await self._async_flight.do(key, fetch)
+        return weather_data
+    
+    def _cache_get(self, key: tuple):
+        """관측 데이터 캐시 조회 (추적 중인 요청이면 cache_lookup 구간과 적중 여부 기록)"""
+        with span("cache_lookup", key=":".join(str(part) for part in key)) as lookup:
+            value = self.observation_cache.get(key)
+            lookup.set(hit=value is not None)
+        return value
+    
+    def _store_air_quality(self, key: tuple, air_data: dict) -> dict:
+        """대기환경 데이터를 다음 측정 시각까지 캐시에 저장"""
+        self.observation_cache.set(key, air_data, air_quality_expires_at(air_data['datetime'].to_pydatetime()))
+        return air_data
+    
+    def _store_weather(self, key: tuple, weather_data: dict) -> dict:
+        """기상청 데이터를 다음 base_time까지 캐시에 저장"""
+        self.observation_cache.set(key, weather_data, weather_expires_at())
+        return weather_data
+    
+    @staticmethod
+    def combine_observations(air_data: dict, weather_data: Optional[dict]) -> dict:
+        """대기환경 데이터와 기상청 데이터를 통합 (기상청 데이터가 없으면 기본값 사용)"""
+        if weather_data is None:
             weather_data = {
                 'temperature': 20.0,
                 'humidity': 60.0,
@@ -180,82 +237,232 @@ class PredictionService:
             'datetime': weather_data['datetime']
         }
     
+    def fetch_weather_data(self, district_code: str, nx: int, ny: int) -> dict:
+        """
+        대기환경 API와 기상청 API를 모두 호출하여 통합 데이터 반환
+        
+        두 호출은 UPSTREAM_DEADLINE 시간 예산 하나를 함께 사용합니다.
+        """
+        deadline = Deadline()
+        air_data = self.get_air_quality_data(district_code, deadline)
+        
+        try:
+            weather_data = self.get_weather_api_data(nx, ny, deadline)
+        except Exception as e:
+            warnings.warn(f"기상청 API 호출 실패, 기본값 사용: {e}")
+            weather_data = None
+        
+        return self.combine_observations(air_data, weather_data)
+    
+    @staticmethod
+    def _plan_observation_keys(tourist_codes: List[str]) -> Tuple[List[str], List[Tuple[int, int]]]:
+        """관광지 목록에서 고유한 자치구 코드와 격자 좌표 추출"""
+        district_codes = {MLConfig.TOURIST_SITES[code]["district_code"] for code in tourist_codes}
+        grids = {(MLConfig.TOURIST_SITES[code]["nx"], MLConfig.TOURIST_SITES[code]["ny"]) for code in tourist_codes}
+        return sorted(district_codes), sorted(grids)
+    
+    def _assemble_observations(self, tourist_codes: List[str], air_results: dict,
+                               weather_results: dict) -> Tuple[Dict[str, dict], Dict[str, Exception]]:
+        """고유 키별 수집 결과를 관광지별 통합 관측 데이터로 조립"""
+        observations = {}
+        errors = {}
+        for code in tourist_codes:
+            site_info = MLConfig.TOURIST_SITES[code]
+            air_data = air_results[site_info["district_code"]]
+            if isinstance(air_data, Exception):
+                errors[code] = air_data
+                continue
+            
+            weather_data = weather_results[(site_info["nx"], site_info["ny"])]
+            if isinstance(weather_data, Exception):
+                warnings.warn(
+                    f"기상청 API 호출 실패 (nx={site_info['nx']}, ny={site_info['ny']}), 기본값 사용: {weather_data}"
+                )
+                weather_data = None
+            observations[code] = self.combine_observations(air_data, weather_data)
+        
+        return observations, errors
+    
+    def fetch_observations(self, tourist_codes: List[str]) -> Tuple[Dict[str, dict], Dict[str, Exception]]:
+        """
+        여러 관광지의 관측 데이터를 중복 없이 수집
+        
+        관광지들이 공유하는 자치구 코드와 격자 좌표를 모아 고유 키마다 한 번씩만
+        업스트림 API를 호출합니다.
+        
+        Args:
+            tourist_codes: 관광지 코드 목록
+        
+        Returns:
+            tuple: (관광지 코드별 통합 관측 데이터, 관광지 코드별 실패 예외)
+        """
+        district_codes, grids = self._plan_observation_keys(tourist_codes)
+        deadline = Deadline()
+        
+        air_results = {}
+        for district_code in district_codes:
+            try:
+                air_results[district_code] = self.get_air_quality_data(district_code, deadline)
+            except Exception as e:
+                air_results[district_code] = e
+        
+        weather_results = {}
+        for nx, ny in grids:
+            try:
+                weather_results[(nx, ny)] = self.get_weather_api_data(nx, ny, deadline)
+            except Exception as e:
+                weather_results[(nx, ny)] = e
+        
+        return self._assemble_observations(tourist_codes, air_results, weather_results)
+    
+    async def fetch_weather_data_async(self, district_code: str, nx: int, ny: int) -> dict:
+        """대기환경 API와 기상청 API를 동시에 호출하여 통합 데이터 반환 (시간 예산 공유)"""
+        deadline = Deadline()
+        air_data, weather_data = await asyncio.gather(
+            self.get_air_quality_data_async(district_code, deadline),
+            self.get_weather_api_data_async(nx, ny, deadline),
+            return_exceptions=True
+        )
+        
+        if isinstance(air_data, BaseException):
+            raise air_data
+        if isinstance(weather_data, BaseException):
+            warnings.warn(f"기상청 API 호출 실패, 기본값 사용: {weather_data}")
+            weather_data = None
+        
+        return self.combine_observations(air_data, weather_data)
+    
+    async def fetch_observations_async(self, tourist_codes: List[str]) -> Tuple[Dict[str, dict], Dict[str, Exception]]:
+        """fetch_observations의 비동기 버전 (모든 고유 키를 동시에 수집)"""
+        district_codes, grids = self._plan_observation_keys(tourist_codes)
+        deadline = Deadline()
+        
+        results = await asyncio.gather(
+            *[self.get_air_quality_data_async(district_code, deadline) for district_code in district_codes],
+            *[self.get_weather_api_data_async(nx, ny, deadline) for nx, ny in grids],
+            return_exceptions=True
+        )
+        
+        air_results = dict(zip(district_codes, results[:len(district_codes)]))
+        weather_results = dict(zip(grids, results[len(district_codes):]))
+        
+        return self._assemble_observations(tourist_codes, air_results, weather_results)
+    
     def load_scalers(self) -> dict:
         """모든 스케일러 로드 (캐싱)"""
         if self._scalers_cache is None:
-            scalers = {}
-            for key, filename in MLConfig.SCALER_FILES.items():
-                scaler_path = MLConfig.SCALERS_DIR / filename
-                if scaler_path.exists():
-                    scalers[key] = joblib.load(scaler_path)
-                else:
-                    warnings.warn(f"스케일러 파일을 찾을 수 없습니다: {scaler_path}")
-            self._scalers_cache = scalers
+            self._flight.do(("scalers",), self._load_scalers_once)
         return self._scalers_cache
     
+    @timed_stage("scaler_load")
+    def _load_scalers_once(self):
+        """스케일러 로드 (single-flight 선두 호출자만 실행)"""
+        if self._scalers_cache is None:
+            self._scalers_cache = load_scalers()
+    
+    def get_feature_transformer(self, feature_columns: Optional[list] = None) -> ObservationFeatureTransformer:
+        """pkl/ 스케일러로 만든 관측값 변환기 (피처 순서별 캐싱)"""
+        key = tuple(feature_columns or DEFAULT_FEATURE_COLUMNS)
+        if key not in self._transformers_cache:
+            scalers = self.load_scalers()
+            self._transformers_cache.setdefault(
+                key, ObservationFeatureTransformer.from_scalers(scalers, feature_columns=list(key))
+            )
+        return self._transformers_cache[key]
+    
+    def _resolve_models_dir(self) -> Tuple[Optional[str], Path]:
+        """레지스트리의 현재 버전과 모델 디렉토리 (포인터가 가리키는 버전을 읽을 수 없으면 경고 후 MODELS_SAVED_DIR)"""
+        try:
+            return self.registry.resolve()
+        except (FileNotFoundError, ValueError) as e:
+            warnings.warn(f"모델 레지스트리의 현재 버전을 사용할 수 없어 {MLConfig.MODELS_SAVED_DIR}을(를) 사용합니다: {e}")
+            return None, MLConfig.MODELS_SAVED_DIR
+    
+    def _create_model_set(self, version: Optional[str], models_dir: Path) -> ModelSet:
+        """모델 디렉토리의 ModelSet 생성 (모델은 처음 사용할 때 로드)"""
+        return ModelSet(
+            models_dir, version,
+            transformer_factory=self.get_feature_transformer,
+            model_threads=self.get_model_threads()
+        )
+    
+    @property
+    def memo(self) -> Optional[PredictionMemo]:
+        """현재 모델 세트의 양자화 예측 메모 (MEMO_ENABLED일 때만 사용)"""
+        return self.models.memo
+    
     def load_pipeline(self, tourist_code: str):
-        """저장된 Pipeline 모델 로드 (캐싱)"""
-        if tourist_code not in self._pipelines_cache:
-            if tourist_code not in MLConfig.MODEL_FILES:
-                raise ValueError(f"알 수 없는 관광지 코드: {tourist_code}")
-            
-            model_filename = MLConfig.MODEL_FILES[tourist_code]
-            model_path = MLConfig.MODELS_SAVED_DIR / model_filename
-            
-            if not model_path.exists():
-                raise FileNotFoundError(
-                    f"모델 파일을 찾을 수 없습니다: {model_path}\n"
-                    f"먼저 'python scripts/train_models.py'를 실행하여 모델을 학습하세요."
-                )
-            
-            self._pipelines_cache[tourist_code] = joblib.load(model_path)
-        
-        return self._pipelines_cache[tourist_code]
+        """현재 모델 세트의 Pipeline 로드 (ModelSet.load_pipeline)"""
+        return self.models.load_pipeline(tourist_code)
+    
+    def load_schema(self, tourist_code: str, pipeline=None) -> dict:
+        """현재 모델 세트의 피처 스키마 매니페스트 로드 (ModelSet.load_schema)"""
+        return self.models.load_schema(tourist_code, pipeline)
     
     def get_feature_columns(self, tourist_code: str) -> list:
-        """관광지별 Feature 컬럼 목록 가져오기"""
-        site_info = MLConfig.TOURIST_SITES[tourist_code]
-        korean_name = site_info["korean_name"]
+        """관광지별 Feature 컬럼 목록 가져오기 (학습 DB에 접근하지 않음)"""
+        return self.load_schema(tourist_code)["feature_columns"]
+    
+    @timed_stage("feature_build")
+    def prepare_features_batch(self, observations: List[dict], scalers: dict) -> pd.DataFrame:
+        """
+        여러 관측 데이터를 한 번에 모델 입력 형식으로 변환
         
-        X, _ = load_tourist_data(korean_name)
-        return list(X.columns)
+        Args:
+            observations: 통합 관측 데이터 목록 (fetch_weather_data 반환 형식)
+            scalers: load_scalers 반환값
+        
+        Returns:
+            pd.DataFrame: 관측 데이터 순서대로의 Feature DataFrame
+        """
+        transformer = ObservationFeatureTransformer.from_scalers(scalers)
+        return transformer.transform_frame(observations_to_array(observations))
     
     def prepare_features(self, weather_data: dict, scalers: dict) -> pd.DataFrame:
         """실시간 기상 데이터를 모델 입력 형식으로 변환"""
-        date = weather_data['datetime']
-        weekday = date.weekday()
-        season = self.month_to_season(date.month)
-        
-        # 스케일링
-        scaled_pm10 = scalers['tinydust'].transform(np.array([[weather_data['pm10']]]))[0][0]
-        scaled_windspeed = scalers['windspeed'].transform(np.array([[weather_data['windspeed']]]))[0][0]
-        scaled_temperature = scalers['temperature'].transform(np.array([[weather_data['temperature']]]))[0][0]
-        scaled_humidity = scalers['humidity'].transform(np.array([[weather_data['humidity']]]))[0][0]
-        scaled_rainfall = scalers['rainfall'].transform(np.array([[weather_data['rainfall']]]))[0][0]
-        
-        # 불쾌지수 계산 및 스케일링
-        scaled_discomfort = 0.01 * self.calculate_discomfort_index(scaled_temperature, scaled_humidity)
-        
-        # Feature 딕셔너리 생성
-        feature_dict = {
-            '미세먼지(PM10)': scaled_pm10,
-            '불쾌지수': scaled_discomfort,
-            'Windspeed(m/s)': scaled_windspeed,
-            'Rainfall(mm)': scaled_rainfall,
-            'weekday_0': 1 if weekday == 0 else 0,
-            'weekday_1': 1 if weekday == 1 else 0,
-            'weekday_2': 1 if weekday == 2 else 0,
-            'weekday_3': 1 if weekday == 3 else 0,
-            'weekday_4': 1 if weekday == 4 else 0,
-            'weekday_5': 1 if weekday == 5 else 0,
-            'weekday_6': 1 if weekday == 6 else 0,
-            'season_0': 1 if season == 0 else 0,
-            'season_1': 1 if season == 1 else 0,
-            'season_2': 1 if season == 2 else 0,
-            'season_3': 1 if season == 3 else 0
-        }
+        return self.prepare_features_batch([weather_data], scalers)
+    
+    def load_engine(self, tourist_code: str):
+        """현재 모델 세트의 예측 엔진 반환 (ModelSet.load_engine)"""
+        return self.models.load_engine(tourist_code)
+    
+    def load_bundle(self) -> Optional[SiteBundle]:
+        """현재 모델 세트의 다중 관광지 모델 번들 (ModelSet.load_bundle)"""
+        return self.models.load_bundle()
+    
+    def predict_features(self, tourist_code: str, features: np.ndarray) -> np.ndarray:
+        """관측값 변환기를 거친 피처 배열 예측 (ModelSet.predict_features)"""
+        return self.models.predict_features(tourist_code, features)
+    
+    def predict_raw(self, tourist_code: str, raw: np.ndarray) -> np.ndarray:
+        """관측값 배열 (n, 7) 예측 (ModelSet.predict_raw, 메모가 활성화되어 있으면 메모 사용)"""
+        return self.models.predict_raw(tourist_code, raw)
+    
+    def predict_from_observation(self, tourist_code: str, weather_data: dict) -> Dict[str, Dict[str, float]]:
+        """
+        이미 수집된 관측 데이터로 예측
+        
+        Args:
+            tourist_code: 관광지 코드 (예: "changdeok_palace")
+            weather_data: 통합 관측 데이터 (fetch_weather_data 반환 형식)
+        
+        Returns:
+            dict: 예측 결과 {"관광지명": {"predicted_visitors": int, "congestion_level": float}}
+        """
+        site_info = MLConfig.TOURIST_SITES[tourist_code]
+        korean_name = site_info["korean_name"]
+        max_capacity = site_info["max_capacity"]
+        
+        # 예측 (전처리는 Pipeline의 첫 단계에서 수행)
+        predicted_visitors = int(self.models.predict_raw(tourist_code, observations_to_array([weather_data]))[0])
+        congestion_level = (predicted_visitors / max_capacity) * 100
         
-        return pd.DataFrame([feature_dict])
+        return {
+            korean_name: {
+                "predicted_visitors": predicted_visitors,
+                "congestion_level": round(congestion_level, 2)
+            }
+        }
     
     def predict(self, tourist_code: str) -> Dict[str, Dict[str, float]]:
         """
@@ -271,36 +478,651 @@ class PredictionService:
             raise ValueError(f"알 수 없는 관광지 코드: {tourist_code}")
         
         site_info = MLConfig.TOURIST_SITES[tourist_code]
-        korean_name = site_info["korean_name"]
-        max_capacity = site_info["max_capacity"]
-        district_code = site_info["district_code"]
-        nx = site_info["nx"]
-        ny = site_info["ny"]
         
-        # Pipeline 모델 로드
-        pipeline = self.load_pipeline(tourist_code)
+        # 실시간 데이터 수집
+        weather_data = self.fetch_weather_data(site_info["district_code"], site_info["nx"], site_info["ny"])
         
-        # Feature 컬럼 순서 가져오기
-        feature_columns = self.get_feature_columns(tourist_code)
+        return self.predict_from_observation(tourist_code, weather_data)
+    
+    def _validate_tourist_codes(self, tourist_codes: Optional[List[str]]) -> List[str]:
+        """관광지 코드 목록 검증 (None이면 모든 관광지)"""
+        if tourist_codes is None:
+            return list(MLConfig.TOURIST_SITES.keys())
         
-        # 실시간 데이터 수집 및 전처리
-        weather_data = self.fetch_weather_data(district_code, nx, ny)
-        scalers = self.load_scalers()
-        features_df = self.prepare_features(weather_data, scalers)
+        for tourist_code in tourist_codes:
+            if tourist_code not in MLConfig.TOURIST_SITES:
+                raise ValueError(f"알 수 없는 관광지 코드: {tourist_code}")
+        return list(tourist_codes)
+    
+    @staticmethod
+    def get_model_threads() -> int:
+        """모델 하나가 사용할 스레드 수 (예측 스레드 풀 크기로 CPU를 나눔)"""
+        if MLConfig.MODEL_THREADS > 0:
+            return MLConfig.MODEL_THREADS
+        return max(1, (os.cpu_count() or 1) // PredictionService.get_predict_workers())
+    
+    @staticmethod
+    def get_predict_workers() -> int:
+        """관광지 모델을 동시에 실행할 스레드 풀 크기"""
+        if MLConfig.PREDICT_WORKERS > 0:
+            return MLConfig.PREDICT_WORKERS
+        return max(1, min(len(MLConfig.TOURIST_SITES), os.cpu_count() or 1))
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """예측용 스레드 풀 (지연 생성)"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.get_predict_workers(),
+                thread_name_prefix="predict"
+            )
+        return self._executor
+    
+    def predict_observations_batch(self, tourist_codes: List[str], observations: Dict[str, dict],
+                                   fetch_errors: Optional[Dict[str, Exception]] = None
+                                   ) -> Tuple[Dict[str, Dict[str, float]], List[dict]]:
+        """
+        수집된 관측 데이터로 여러 관광지를 한 번에 예측
         
-        # 컬럼 순서 맞추기
-        features_df = features_df[feature_columns]
+        모든 관광지의 관측값을 하나의 행렬로 만들어 한 번에 변환하고,
+        관광지별 모델은 스레드 풀에서 동시에 실행합니다.
+        모델 번들(MODEL_BUNDLE_ENABLED)이 있으면 번들 한 번의 호출로 모든 관광지를 예측합니다.
+        모든 관광지는 호출 시점의 같은 모델 세트로 예측합니다 (도중에 모델이 교체되어도 섞이지 않음).
+        결과는 관광지별 predict와 동일합니다.
         
-        # 예측
-        predicted_visitors = int(pipeline.predict(features_df)[0])
-        congestion_level = (predicted_visitors / max_capacity) * 100
+        Args:
+            tourist_codes: 관광지 코드 목록
+            observations: 관광지 코드별 통합 관측 데이터
+            fetch_errors: 관측 데이터 수집에 실패한 관광지 코드별 예외
+        
+        Returns:
+            tuple: (관광지명별 예측 결과, 실패한 관광지 정보 목록)
+        """
+        fetch_errors = fetch_errors or {}
+        ready_codes = [code for code in tourist_codes if code not in fetch_errors]
+        
+        models = self.models
+        futures = {}
+        predicted = {}
+        bundle = models.load_bundle() if models.memo is None else None
+        if ready_codes and bundle is not None and set(ready_codes) <= set(bundle.tourist_codes):
+            # 번들: 관광지별 관측값 행을 모든 관광지 트리의 순회 한 번으로 예측
+            raw = observations_to_array([observations[code] for code in ready_codes])
+            with track_stage("model_predict"):
+                predictions = bundle.predict_rows(raw, ready_codes)
+            predicted = {code: int(value) for code, value in zip(ready_codes, predictions)}
+        elif ready_codes:
+            raw = observations_to_array([observations[code] for code in ready_codes])
+            # 같은 변환을 하는 관광지끼리는 전체 행렬을 한 번만 변환
+            transformed = {}
+            transform_lock = threading.Lock()
+            
+            def predict_row(row_index: int, tourist_code: str) -> int:
+                with span("predict_site", tourist_code=tourist_code):
+                    if models.memo is not None:
+                        return int(models.predict_raw(tourist_code, raw[row_index:row_index + 1])[0])
+                    transformer = models.load_pipeline(tourist_code).steps[0][1]
+                    key = transformer.cache_key()
+                    with transform_lock:
+                        if key not in transformed:
+                            with track_stage("feature_build"):
+                                transformed[key] = transformer.transform(raw)
+                    features = transformed[key][row_index:row_index + 1]
+                    return int(models.predict_features(tourist_code, features)[0])
+            
+            executor = self._get_executor()
+            futures = {
+                code: executor.submit(contextvars.copy_context().run, predict_row, i, code)
+                for i, code in enumerate(ready_codes)
+            }
+        
+        results = {}
+        errors = []
+        for tourist_code in tourist_codes:
+            site_info = MLConfig.TOURIST_SITES[tourist_code]
+            try:
+                if tourist_code in fetch_errors:
+                    raise fetch_errors[tourist_code]
+                if tourist_code in predicted:
+                    predicted_visitors = predicted[tourist_code]
+                else:
+                    predicted_visitors = futures[tourist_code].result()
+                congestion_level = (predicted_visitors / site_info["max_capacity"]) * 100
+                results[site_info["korean_name"]] = {
+                    "predicted_visitors": predicted_visitors,
+                    "congestion_level": round(congestion_level, 2)
+                }
+            except Exception as e:
+                errors.append({
+                    "site": site_info["korean_name"],
+                    "code": tourist_code,
+                    "error": str(e)
+                })
+        
+        return results, errors
+    
+    def predict_many(self, tourist_codes: Optional[List[str]] = None) -> Tuple[Dict[str, Dict[str, float]], List[dict]]:
+        """
+        여러 관광지 일괄 예측
+        
+        고유 자치구/격자별로 관측 데이터를 한 번씩만 수집한 뒤
+        predict_observations_batch로 한 번에 예측합니다.
+        
+        Args:
+            tourist_codes: 관광지 코드 목록 (None이면 모든 관광지)
+        
+        Returns:
+            tuple: (관광지명별 예측 결과, 실패한 관광지 정보 목록)
+        """
+        tourist_codes = self._validate_tourist_codes(tourist_codes)
+        observations, fetch_errors = self.fetch_observations(tourist_codes)
+        return self.predict_observations_batch(tourist_codes, observations, fetch_errors)
+    
+    def predict_all(self, tourist_codes: Optional[List[str]] = None) -> Tuple[Dict[str, Dict[str, float]], List[dict]]:
+        """모든 관광지 예측 (predict_many와 동일)"""
+        return self.predict_many(tourist_codes)
+    
+    async def predict_async(self, tourist_code: str) -> Dict[str, Dict[str, float]]:
+        """
+        predict의 비동기 버전
+        
+        업스트림 호출은 이벤트 루프를 막지 않고 동시에 수행하며,
+        모델 로드/추론은 스레드에서 실행합니다.
+        """
+        if tourist_code not in MLConfig.TOURIST_SITES:
+            raise ValueError(f"알 수 없는 관광지 코드: {tourist_code}")
+        
+        site_info = MLConfig.TOURIST_SITES[tourist_code]
+        weather_data = await self.fetch_weather_data_async(
+            site_info["district_code"], site_info["nx"], site_info["ny"]
+        )
+        
+        return await asyncio.to_thread(self.predict_from_observation, tourist_code, weather_data)
+    
+    async def predict_all_async(self, tourist_codes: Optional[List[str]] = None) -> Tuple[Dict[str, Dict[str, float]], List[dict]]:
+        """predict_all의 비동기 버전"""
+        tourist_codes = self._validate_tourist_codes(tourist_codes)
+        observations, fetch_errors = await self.fetch_observations_async(tourist_codes)
+        return await asyncio.to_thread(self.predict_observations_batch, tourist_codes, observations, fetch_errors)
+    
+    @timed_stage("forecast_fetch")
+    def fetch_forecast_api_data(self, nx: int, ny: int, deadline: Optional[Deadline] = None) -> List[dict]:
+        """기상청 API에서 단기예보 데이터 수집"""
+        url, params = build_forecast_request(nx, ny)
+        
+        try:
+            contents = self._get_json(url, params, KMA_UPSTREAM, deadline)
+            forecast = parse_forecast_response(contents)
+            record_fixture(url, params, contents)
+            return forecast
+        except requests.exceptions.RequestException as e:
+            raise RuntimeError(f"기상청 단기예보 API 요청 실패: {e}")
+        except (KeyError, ValueError, TypeError) as e:
+            raise RuntimeError(f"기상청 단기예보 데이터 파싱 실패: {e}")
+    
+    def get_forecast_data(self, nx: int, ny: int, deadline: Optional[Deadline] = None) -> List[dict]:
+        """기상청 단기예보 조회 (다음 발표 시각까지 격자 좌표별 캐싱)"""
+        if not MLConfig.OBSERVATION_CACHE_ENABLED:
+            return self.fetch_forecast_api_data(nx, ny, deadline)
+        
+        key = forecast_cache_key(nx, ny)
+        forecast = self._cache_get(key)
+        if forecast is None:
+            forecast = self._flight.do(key, lambda: self._store_forecast(key, self.fetch_forecast_api_data(nx, ny, deadline)))
+        return forecast
+    
+    async def get_forecast_data_async(self, nx: int, ny: int, deadline: Optional[Deadline] = None) -> List[dict]:
+        """기상청 단기예보 비동기 조회 (get_forecast_data와 동일한 캐시 사용)"""
+        if not MLConfig.OBSERVATION_CACHE_ENABLED:
+            return await self.upstream.fetch_forecast(nx, ny, deadline)
+        
+        key = forecast_cache_key(nx, ny)
+        forecast = self._cache_get(key)
+        if forecast is None:
+            async def fetch():
+                return self._store_forecast(key, await self.upstream.fetch_forecast(nx, ny, deadline))
+            forecast = await self._async_flight.do(key, fetch)
+        return forecast
+    
+    def _store_forecast(self, key: tuple, value):
+        """단기예보 또는 예보 기반 예측 시계열을 다음 예보 발표 시각까지 캐시에 저장"""
+        self.observation_cache.set(key, value, forecast_expires_at())
+        return value
+    
+    @staticmethod
+    def build_forecast_observations(air_data: dict, forecast: List[dict],
+                                    now: Optional[datetime] = None) -> List[dict]:
+        """
+        단기예보 시계열을 통합 관측 데이터 목록으로 변환
+        
+        미세먼지 예보는 제공되지 않으므로 모든 시각에 현재 측정값을 사용합니다.
+        현재 시각(정시)부터 FORECAST_MAX_HOURS 이내의 예보만 포함합니다.
+        """
+        start = pd.Timestamp(now or datetime.now()).floor("h")
+        end = start + pd.Timedelta(hours=MLConfig.FORECAST_MAX_HOURS)
+        return [
+            {
+                'pm10': air_data['pm10'],
+                'windspeed': step['windspeed'],
+                'temperature': step['temperature'],
+                'humidity': step['humidity'],
+                'rainfall': step['rainfall'],
+                'datetime': step['datetime']
+            }
+            for step in forecast
+            if start <= step['datetime'] < end
+        ]
+    
+    def forecast_from_observations(self, tourist_code: str, observations: List[dict],
+                                   models: Optional[ModelSet] = None) -> dict:
+        """
+        예보 시계열 전체를 하나의 행렬로 만들어 predict 한 번으로 예측
+        
+        Args:
+            tourist_code: 관광지 코드
+            observations: build_forecast_observations 반환값
+            models: 예측에 사용할 모델 세트 (None이면 현재 모델 세트)
+        
+        Returns:
+            dict: {"tourist_code", "korean_name", "issued_at", "forecast": [시각별 예측]}
+        """
+        site_info = MLConfig.TOURIST_SITES[tourist_code]
+        max_capacity = site_info["max_capacity"]
+        
+        models = models or self.models
+        predictions = []
+        if observations:
+            predictions = models.predict_raw(tourist_code, observations_to_array(observations))
+        
+        forecast = []
+        for obs, prediction in zip(observations, predictions):
+            predicted_visitors = int(prediction)
+            forecast.append({
+                "datetime": obs['datetime'].isoformat(),
+                "predicted_visitors": predicted_visitors,
+                "congestion_level": round((predicted_visitors / max_capacity) * 100, 2),
+                "pm10": obs['pm10'],
+                "temperature": obs['temperature'],
+                "humidity": obs['humidity'],
+                "windspeed": obs['windspeed'],
+                "rainfall": obs['rainfall']
+            })
         
         return {
-            korean_name: {
+            "tourist_code": tourist_code,
+            "korean_name": site_info["korean_name"],
+            "issued_at": forecast_base_datetime().isoformat(),
+            "forecast": forecast
+        }
+    
+    @staticmethod
+    def _validate_forecast_hours(hours: Optional[int]) -> int:
+        """예보 구간(시간) 검증"""
+        hours = hours or MLConfig.FORECAST_DEFAULT_HOURS
+        if not 1 <= hours <= MLConfig.FORECAST_MAX_HOURS:
+            raise ValueError(f"예보 구간은 1~{MLConfig.FORECAST_MAX_HOURS}시간이어야 합니다: {hours}")
+        return hours
+    
+    @staticmethod
+    def _slice_forecast(series: dict, hours: int, now: Optional[datetime] = None) -> dict:
+        """캐시된 예측 시계열에서 현재 시각(정시)부터 hours 시간 구간만 반환"""
+        start = pd.Timestamp(now or datetime.now()).floor("h")
+        end = start + pd.Timedelta(hours=hours)
+        return {
+            **series,
+            "hours": hours,
+            "forecast": [step for step in series["forecast"] if start <= pd.Timestamp(step["datetime"]) < end]
+        }
+    
+    def _forecast_series_batch(self, tourist_codes: List[str], air_results: dict, forecast_results: dict
+                               ) -> Tuple[Dict[str, dict], Dict[str, Exception]]:
+        """
+        수집된 대기환경/단기예보로 관광지별 예측 시계열 계산 (관광지별 모델은 스레드 풀에서 동시 실행)
+        
+        예측 시계열은 계산에 사용한 모델 버전별로 캐싱합니다.
+        """
+        models = self.models
+        futures = {}
+        errors = {}
+        executor = self._get_executor()
+        for code in tourist_codes:
+            site_info = MLConfig.TOURIST_SITES[code]
+            air_data = air_results[site_info["district_code"]]
+            forecast = forecast_results[(site_info["nx"], site_info["ny"])]
+            if isinstance(air_data, Exception) or isinstance(forecast, Exception):
+                errors[code] = air_data if isinstance(air_data, Exception) else forecast
+                continue
+            observations = self.build_forecast_observations(air_data, forecast)
+            futures[code] = executor.submit(
+                contextvars.copy_context().run, self.forecast_from_observations, code, observations, models
+            )
+        
+        series = {}
+        for code, future in futures.items():
+            try:
+                series[code] = self._store_forecast(forecast_series_cache_key(code, models.version), future.result())
+            except Exception as e:
+                errors[code] = e
+        return series, errors
+    
+    def _cached_forecast_series(self, tourist_codes: List[str]) -> Tuple[Dict[str, dict], List[str]]:
+        """현재 모델 버전으로 캐시된 예측 시계열과 새로 계산해야 하는 관광지 코드 목록"""
+        version = self.models.version
+        cached = {}
+        missing = []
+        for code in tourist_codes:
+            series = self._cache_get(forecast_series_cache_key(code, version))
+            if series is None:
+                missing.append(code)
+            else:
+                cached[code] = series
+        return cached, missing
+    
+    def _format_forecasts(self, tourist_codes: List[str], series: Dict[str, dict],
+                          errors: Dict[str, Exception], hours: int) -> Tuple[Dict[str, dict], List[dict]]:
+        """관광지명별 예측 시계열과 실패 정보 목록으로 정리"""
+        results = {}
+        error_list = []
+        for code in tourist_codes:
+            korean_name = MLConfig.TOURIST_SITES[code]["korean_name"]
+            if code in series:
+                results[korean_name] = self._slice_forecast(series[code], hours)
+            else:
+                error_list.append({"site": korean_name, "code": code, "error": str(errors[code])})
+        return results, error_list
+    
+    def forecast_many(self, tourist_codes: Optional[List[str]] = None,
+                      hours: Optional[int] = None) -> Tuple[Dict[str, dict], List[dict]]:
+        """
+        기상청 단기예보 기반 다중 관광지 혼잡도 예측
+        
+        고유 자치구/격자별로 대기환경 측정값과 단기예보를 한 번씩만 수집하고,
+        관광지마다 예보 구간 전체를 predict 한 번으로 예측합니다.
+        관광지별 예측 시계열은 다음 예보 발표 시각까지 캐싱합니다.
+        
+        Args:
+            tourist_codes: 관광지 코드 목록 (None이면 모든 관광지)
+            hours: 예보 구간 (시간, 기본 FORECAST_DEFAULT_HOURS, 최대 FORECAST_MAX_HOURS)
+        
+        Returns:
+            tuple: (관광지명별 예측 시계열, 실패한 관광지 정보 목록)
+        """
+        tourist_codes = self._validate_tourist_codes(tourist_codes)
+        hours = self._validate_forecast_hours(hours)
+        series, errors = self._collect_forecast_series(tourist_codes)
+        return self._format_forecasts(tourist_codes, series, errors, hours)
+    
+    def _collect_forecast_series(self, tourist_codes: List[str]) -> Tuple[Dict[str, dict], Dict[str, Exception]]:
+        """캐시된 예측 시계열을 사용하고, 없는 관광지만 수집/예측"""
+        series, missing = self._cached_forecast_series(tourist_codes)
+        
+        errors = {}
+        if missing:
+            district_codes, grids = self._plan_observation_keys(missing)
+            deadline = Deadline()
+            air_results = {}
+            for district_code in district_codes:
+                try:
+                    air_results[district_code] = self.get_air_quality_data(district_code, deadline)
+                except Exception as e:
+                    air_results[district_code] = e
+            forecast_results = {}
+            for nx, ny in grids:
+                try:
+                    forecast_results[(nx, ny)] = self.get_forecast_data(nx, ny, deadline)
+                except Exception as e:
+                    forecast_results[(nx, ny)] = e
+            
+            new_series, errors = self._forecast_series_batch(missing, air_results, forecast_results)
+            series.update(new_series)
+        
+        return series, errors
+    
+    def forecast(self, tourist_code: str, hours: Optional[int] = None) -> dict:
+        """
+        단일 관광지의 단기예보 기반 혼잡도 예측
+        
+        Returns:
+            dict: {"tourist_code", "korean_name", "issued_at", "hours", "forecast": [시각별 예측]}
+        
+        Raises:
+            ValueError: 알 수 없는 관광지 코드 또는 잘못된 예보 구간
+        """
+        if tourist_code not in MLConfig.TOURIST_SITES:
+            raise ValueError(f"알 수 없는 관광지 코드: {tourist_code}")
+        hours = self._validate_forecast_hours(hours)
+        
+        series, errors = self._collect_forecast_series([tourist_code])
+        if tourist_code in errors:
+            raise errors[tourist_code]
+        return self._slice_forecast(series[tourist_code], hours)
+    
+    async def forecast_many_async(self, tourist_codes: Optional[List[str]] = None,
+                                  hours: Optional[int] = None) -> Tuple[Dict[str, dict], List[dict]]:
+        """forecast_many의 비동기 버전 (모든 고유 키를 동시에 수집)"""
+        tourist_codes = self._validate_tourist_codes(tourist_codes)
+        hours = self._validate_forecast_hours(hours)
+        series, errors = await self._collect_forecast_series_async(tourist_codes)
+        return self._format_forecasts(tourist_codes, series, errors, hours)
+    
+    async def _collect_forecast_series_async(self, tourist_codes: List[str]
+                                             ) -> Tuple[Dict[str, dict], Dict[str, Exception]]:
+        """_collect_forecast_series의 비동기 버전"""
+        series, missing = self._cached_forecast_series(tourist_codes)
+        
+        errors = {}
+        if missing:
+            district_codes, grids = self._plan_observation_keys(missing)
+            deadline = Deadline()
+            results = await asyncio.gather(
+                *[self.get_air_quality_data_async(district_code, deadline) for district_code in district_codes],
+                *[self.get_forecast_data_async(nx, ny, deadline) for nx, ny in grids],
+                return_exceptions=True
+            )
+            air_results = dict(zip(district_codes, results[:len(district_codes)]))
+            forecast_results = dict(zip(grids, results[len(district_codes):]))
+            
+            new_series, errors = await asyncio.to_thread(
+                self._forecast_series_batch, missing, air_results, forecast_results
+            )
+            series.update(new_series)
+        
+        return series, errors
+    
+    async def forecast_async(self, tourist_code: str, hours: Optional[int] = None) -> dict:
+        """forecast의 비동기 버전"""
+        if tourist_code not in MLConfig.TOURIST_SITES:
+            raise ValueError(f"알 수 없는 관광지 코드: {tourist_code}")
+        hours = self._validate_forecast_hours(hours)
+        
+        series, errors = await self._collect_forecast_series_async([tourist_code])
+        if tourist_code in errors:
+            raise errors[tourist_code]
+        return self._slice_forecast(series[tourist_code], hours)
+    
+    def predict_scenarios(self, raw: np.ndarray, tourist_codes: Optional[List[str]] = None) -> Dict[str, dict]:
+        """
+        가상의 관측 조건(시나리오) 배열을 여러 관광지에 대해 한 번에 예측
+        
+        같은 변환을 하는 관광지끼리는 전체 배열을 한 번만 변환하고,
+        관광지마다 모델의 predict를 한 번만 호출합니다.
+        
+        Args:
+            raw: (n, 7) 시나리오 배열 (RAW_OBSERVATION_COLUMNS 순서, ml_service.scenarios로 생성)
+            tourist_codes: 관광지 코드 목록 (None이면 모든 관광지)
+        
+        Returns:
+            dict: 관광지명별 {"code", "predicted_visitors": np.ndarray, "congestion_level": np.ndarray}
+        """
+        tourist_codes = self._validate_tourist_codes(tourist_codes)
+        models = self.models
+        transformed = {}
+        transform_lock = threading.Lock()
+        
+        def score(tourist_code: str) -> dict:
+            if models.memo is not None:
+                predicted_visitors = models.predict_raw(tourist_code, raw).astype(np.int64)
+            else:
+                transformer = models.load_pipeline(tourist_code).steps[0][1]
+                key = transformer.cache_key()
+                with transform_lock:
+                    if key not in transformed:
+                        with track_stage("feature_build"):
+                            transformed[key] = transformer.transform(raw)
+                predicted_visitors = models.predict_features(tourist_code, transformed[key]).astype(np.int64)
+            max_capacity = MLConfig.TOURIST_SITES[tourist_code]["max_capacity"]
+            return {
+                "code": tourist_code,
                 "predicted_visitors": predicted_visitors,
-                "congestion_level": round(congestion_level, 2)
+                "congestion_level": np.round(predicted_visitors / max_capacity * 100, 2)
+            }
+        
+        executor = self._get_executor()
+        futures = {code: executor.submit(contextvars.copy_context().run, score, code) for code in tourist_codes}
+        return {
+            MLConfig.TOURIST_SITES[code]["korean_name"]: future.result()
+            for code, future in futures.items()
+        }
+    
+    def precompute_memo(self, tourist_codes: Optional[List[str]] = None,
+                        models: Optional[ModelSet] = None) -> Dict[str, int]:
+        """
+        관광지별 양자화 메모 테이블 사전 계산 (MEMO_PRECOMPUTE_RANGES 범위)
+        
+        Args:
+            tourist_codes: 관광지 코드 목록 (None이면 모든 관광지)
+            models: 메모를 채울 모델 세트 (None이면 현재 모델 세트)
+        
+        Returns:
+            dict: 관광지 코드별 테이블 셀 수 (MEMO_PRECOMPUTE_MAX_CELLS를 넘어 LRU만 사용하는 관광지는 0)
+        
+        Raises:
+            RuntimeError: 메모가 비활성화된 경우
+        """
+        models = models or self.models
+        if models.memo is None:
+            raise RuntimeError("예측 메모가 비활성화되어 있습니다 (MEMO_ENABLED=false).")
+        tourist_codes = self._validate_tourist_codes(tourist_codes)
+        cells = {}
+        for tourist_code in tourist_codes:
+            predict_fn = models.load_engine(tourist_code).predict
+            cells[tourist_code] = models.memo.precompute(tourist_code, predict_fn)
+            models.memo.estimate_error_bound(tourist_code, predict_fn)
+        return cells
+    
+    def get_memo_status(self) -> dict:
+        """양자화 메모 상태 (적중률, 항목 수, 관광지별 양자화 오차 범위)"""
+        models = self.models
+        if models.memo is None:
+            return {"enabled": False}
+        for tourist_code in MLConfig.TOURIST_SITES:
+            if tourist_code not in models.memo.error_bounds:
+                try:
+                    models.memo.estimate_error_bound(tourist_code, models.load_engine(tourist_code).predict)
+                except FileNotFoundError:
+                    continue
+        return {"enabled": True, "model_version": models.version, **models.memo.stats()}
+    
+    def get_engine_status(self) -> dict:
+        """예측 엔진 설정, 모델 버전, 모델 번들 상태, 로드된 관광지별 엔진/모델 파일 형식 및 XGBoost 비교 결과"""
+        models = self.models
+        return {
+            "engine": MLConfig.PREDICT_ENGINE,
+            "compiled_max_batch_rows": MLConfig.COMPILED_MAX_BATCH_ROWS,
+            "model_version": models.version,
+            **models.engine_status()
+        }
+    
+    def reload_models(self, force: bool = False) -> dict:
+        """
+        레지스트리의 현재 버전으로 모델 세트 교체 (무중단)
+        
+        새 ModelSet에 모든 관광지 모델을 로드하고 예열(번들, 메모 사전 계산 포함)을 마친 뒤
+        self.models 참조 한 번으로 교체합니다. 그동안 들어온 요청은 이전 모델 세트로 처리되고,
+        요청마다 모델 세트 참조를 한 번만 가져오므로 여러 버전의 모델이 섞이지 않습니다.
+        동시에 여러 번 호출되면 하나로 합칩니다.
+        
+        Args:
+            force: 버전이 같아도 다시 로드 (MODELS_SAVED_DIR의 파일을 직접 교체한 경우)
+        
+        Returns:
+            dict: {"reloaded", "previous_version", "version", "models_dir", "elapsed_ms"}
+        
+        Raises:
+            FileNotFoundError: 현재 버전 디렉토리나 모델 파일이 없는 경우 (이전 모델 유지)
+            ValueError: 버전 파일이 매니페스트와 다르거나 모델을 로드할 수 없는 경우 (이전 모델 유지)
+        """
+        return self._flight.do(("reload",), lambda: self._reload_models_once(force))
+    
+    def _reload_models_once(self, force: bool) -> dict:
+        """모델 세트 생성, 예열 후 교체 (single-flight 선두 호출자만 실행)"""
+        start = time.perf_counter()
+        current = self.models
+        version, models_dir = self.registry.resolve()
+        result = {
+            "reloaded": False,
+            "previous_version": current.version,
+            "version": version,
+            "models_dir": str(models_dir),
+            "elapsed_ms": 0.0
+        }
+        if not force and version == current.version and Path(models_dir) == current.models_dir:
+            return result
+        
+        if version is not None:
+            self.registry.verify(version)
+        models = self._create_model_set(version, models_dir)
+        try:
+            for tourist_code in MLConfig.TOURIST_SITES:
+                warm_site(models, tourist_code)
+            models.load_bundle()
+            if models.memo is not None and MLConfig.MEMO_PRECOMPUTE:
+                self.precompute_memo(models=models)
+        except FileNotFoundError:
+            raise
+        except Exception as e:
+            raise ValueError(f"모델 버전 '{version}'을(를) 로드할 수 없어 이전 모델을 유지합니다: {e}") from e
+        
+        # 참조 한 번으로 교체 (이후 요청부터 새 모델 세트 사용)
+        self.models = models
+        if version == current.version:
+            # 같은 버전을 강제로 다시 로드하면 버전별 예보 시계열 캐시를 구분할 수 없으므로 비움
+            self.observation_cache.clear()
+        result["reloaded"] = True
+        result["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        self.model_reloads += 1
+        self.last_reload = {**result, "reloaded_at": datetime.now().isoformat()}
+        return result
+    
+    def get_model_status(self) -> dict:
+        """현재 모델 버전, 모델 디렉토리, 레지스트리 상태와 마지막 교체 기록"""
+        models = self.models
+        return {
+            "version": models.version,
+            "models_dir": str(models.models_dir),
+            "registry": self.registry.status(),
+            "reloads": self.model_reloads,
+            "last_reload": self.last_reload
+        }
+    
+    def get_upstream_status(self) -> dict:
+        """업스트림별 회로 차단기 상태, 지연 시간 백분위수 및 장애 대응 설정"""
+        return {
+            "upstreams": self.upstream.stats(),
+            "deadline_seconds": MLConfig.UPSTREAM_DEADLINE,
+            "timeout_seconds": MLConfig.UPSTREAM_TIMEOUT,
+            "hedging": {
+                "enabled": MLConfig.UPSTREAM_HEDGE_ENABLED,
+                "percentile": MLConfig.UPSTREAM_HEDGE_PERCENTILE,
+                "min_samples": MLConfig.UPSTREAM_HEDGE_MIN_SAMPLES
             }
         }
+    
+    async def aclose(self):
+        """업스트림 연결 풀 및 예측 스레드 풀 정리"""
+        await self.upstream.aclose()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
 
 
 # 편의 함수 (하위 호환성)
@@ -0,0 +1,108 @@
+"""
+pre-fork 서버 모듈
+부모 프로세스에서 모델을 모두 로드한 뒤 워커를 fork하여 모델 메모리를 copy-on-write로 공유
+"""
+import gc
+import os
+import signal
+import socket
+import time
+import traceback
+from typing import Callable, Dict, Optional
+
+# 워커가 시작 직후 종료되었을 때 다시 띄우기 전 대기 시간 (초)
+RESPAWN_DELAY = 1.0
+
+
+def bind_socket(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    """워커들이 함께 accept할 리스닝 소켓 생성"""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def serve_prefork(app, host: str, port: int, workers: int,
+                  before_fork: Optional[Callable[[], None]] = None, log_level: str = "info"):
+    """
+    pre-fork 방식으로 uvicorn 워커 여러 개 실행
+
+    1. 부모 프로세스에서 before_fork(모델 예열 등)를 실행하고 리스닝 소켓을 엽니다.
+    2. gc.freeze()로 이미 만든 객체를 GC 대상에서 제외한 뒤 워커를 fork합니다.
+       (GC가 객체 헤더를 건드려 공유 페이지가 복사되는 것을 줄임)
+    3. 워커는 같은 소켓으로 요청을 받고, 부모는 종료된 워커를 다시 띄웁니다.
+    4. SIGTERM/SIGINT를 받으면 모든 워커에 SIGTERM을 보내고 종료를 기다립니다.
+
+    모델 Pipeline, XGBoost 부스터, 컴파일된 트리 배열은 fork 전에 로드되므로 워커들이 같은 물리 메모리를 공유합니다.
+    fork 이후 다시 로드한 모델(POST /api/models/reload 등)은 워커마다 따로 메모리를 사용합니다.
+
+    Args:
+        app: ASGI 애플리케이션
+        host: 바인딩 호스트
+        port: 바인딩 포트
+        workers: 워커 프로세스 수
+        before_fork: fork 전에 부모 프로세스에서 실행할 함수
+        log_level: uvicorn 로그 레벨
+    """
+    import uvicorn
+
+    if before_fork is not None:
+        before_fork()
+    sock = bind_socket(host, port)
+    gc.collect()
+    gc.freeze()
+
+    children: Dict[int, int] = {}
+    started_at: Dict[int, float] = {}
+    stopping = False
+
+    def spawn(index: int):
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            exit_code = 0
+            try:
+                server = uvicorn.Server(uvicorn.Config(app, log_level=log_level))
+                server.run(sockets=[sock])
+            except Exception:
+                traceback.print_exc()
+                exit_code = 1
+            finally:
+                os._exit(exit_code)
+        children[pid] = index
+        started_at[index] = time.monotonic()
+
+    def shutdown(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    print(f"[INFO] pre-fork 워커 {workers}개 시작 (http://{host}:{port}, 부모 PID {os.getpid()})")
+    for index in range(workers):
+        spawn(index)
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        index = children.pop(pid, None)
+        if index is None or stopping:
+            continue
+        print(f"[WARNING] 워커 {index} (PID {pid})가 종료되어 다시 시작합니다 (상태 {status})")
+        if time.monotonic() - started_at[index] < RESPAWN_DELAY:
+            time.sleep(RESPAWN_DELAY)
+        spawn(index)
+
+    sock.close()
@@ -0,0 +1,227 @@
+"""
+전처리 모듈
+관측값(미세먼지, 기상, 날짜)을 모델 입력 피처로 변환하는 sklearn 호환 변환기
+"""
+import warnings
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+import joblib
+from sklearn.base import BaseEstimator, TransformerMixin
+
+from ml_service.config import MLConfig
+
+# 변환기 입력 컬럼 순서 (관측값 원본)
+RAW_OBSERVATION_COLUMNS = ['pm10', 'windspeed', 'temperature', 'humidity', 'rainfall', 'weekday', 'season']
+
+# 연속형 관측값 컬럼과 대응하는 스케일러 키
+CONTINUOUS_SCALER_KEYS = {
+    'pm10': 'tinydust',
+    'windspeed': 'windspeed',
+    'temperature': 'temperature',
+    'humidity': 'humidity',
+    'rainfall': 'rainfall'
+}
+
+# 기본 모델 입력 피처 순서
+DEFAULT_FEATURE_COLUMNS = (
+    ['미세먼지(PM10)', '불쾌지수', 'Windspeed(m/s)', 'Rainfall(mm)']
+    + MLConfig.ONEHOT_GROUPS["weekday"]
+    + MLConfig.ONEHOT_GROUPS["season"]
+)
+
+
+def calculate_discomfort_index(temp_celsius, humidity_percent):
+    """불쾌지수 계산 (스칼라 또는 배열)"""
+    return 0.81 * temp_celsius + 0.01 * humidity_percent * (0.99 * temp_celsius - 14.3) + 46.3
+
+
+def month_to_season(month):
+    """월을 계절로 변환 (0: 봄, 1: 여름, 2: 가을, 3: 겨울, 스칼라 또는 배열)"""
+    return ((np.asarray(month) + 9) % 12) // 3
+
+
+def load_scalers() -> dict:
+    """pkl/ 디렉토리의 스케일러 로드"""
+    scalers = {}
+    for key, filename in MLConfig.SCALER_FILES.items():
+        scaler_path = MLConfig.SCALERS_DIR / filename
+        if scaler_path.exists():
+            scalers[key] = joblib.load(scaler_path)
+        else:
+            warnings.warn(f"스케일러 파일을 찾을 수 없습니다: {scaler_path}")
+    return scalers
+
+
+def observations_to_array(observations: List[dict]) -> np.ndarray:
+    """
+    통합 관측 데이터 목록을 변환기 입력 배열로 변환
+
+    Args:
+        observations: fetch_weather_data 반환 형식의 딕셔너리 목록
+
+    Returns:
+        np.ndarray: (n, 7) 배열, 컬럼 순서는 RAW_OBSERVATION_COLUMNS
+    """
+    raw = np.empty((len(observations), len(RAW_OBSERVATION_COLUMNS)), dtype=float)
+    for i, obs in enumerate(observations):
+        date = obs['datetime']
+        raw[i, 0] = obs['pm10']
+        raw[i, 1] = obs['windspeed']
+        raw[i, 2] = obs['temperature']
+        raw[i, 3] = obs['humidity']
+        raw[i, 4] = obs['rainfall']
+        raw[i, 5] = date.weekday()
+        raw[i, 6] = month_to_season(date.month)
+    return raw
+
+
+class ObservationFeatureTransformer(BaseEstimator, TransformerMixin):
+    """
+    관측값 → 모델 입력 피처 변환기
+
+    입력은 RAW_OBSERVATION_COLUMNS 순서의 (n, 7) 배열 또는 DataFrame입니다.
+    다섯 개의 StandardScaler를 하나의 벡터 연산 (X - mean) / scale로 합쳐 적용하고,
+    불쾌지수를 계산한 뒤 요일/계절 원-핫 컬럼을 미리 할당한 출력 배열에 직접 기록합니다.
+
+    Args:
+        means: 연속형 관측값(pm10, windspeed, temperature, humidity, rainfall) 평균
+        scales: 연속형 관측값 표준편차
+        feature_columns: 출력 피처 순서 (None이면 DEFAULT_FEATURE_COLUMNS)
+    """
+
+    def __init__(self, means: Optional[list] = None, scales: Optional[list] = None,
+                 feature_columns: Optional[list] = None):
+        self.means = means
+        self.scales = scales
+        self.feature_columns = feature_columns
+
+    @classmethod
+    def from_scalers(cls, scalers: dict, feature_columns: Optional[list] = None) -> "ObservationFeatureTransformer":
+        """
+        학습에 사용된 스케일러로부터 변환기 생성 (fit 완료 상태)
+
+        Args:
+            scalers: load_scalers 반환값
+            feature_columns: 출력 피처 순서
+        """
+        missing = [key for key in CONTINUOUS_SCALER_KEYS.values() if key not in scalers]
+        if missing:
+            raise FileNotFoundError(f"스케일러를 찾을 수 없습니다: {', '.join(missing)}")
+
+        means = [float(scalers[key].mean_[0]) for key in CONTINUOUS_SCALER_KEYS.values()]
+        scales = [float(scalers[key].scale_[0]) for key in CONTINUOUS_SCALER_KEYS.values()]
+        return cls(means=means, scales=scales, feature_columns=feature_columns).fit()
+
+    def fit(self, X=None, y=None):
+        """
+        변환 파라미터 확정
+
+        means/scales가 주어지지 않으면 X의 연속형 관측값 컬럼으로부터 계산합니다.
+        """
+        if self.means is None or self.scales is None:
+            if X is None:
+                raise ValueError("means/scales가 없으면 X가 필요합니다.")
+            continuous = self._as_array(X)[:, :len(CONTINUOUS_SCALER_KEYS)]
+            mean = continuous.mean(axis=0)
+            scale = continuous.std(axis=0)
+            scale[scale == 0] = 1.0
+        else:
+            mean = np.asarray(self.means, dtype=float)
+            scale = np.asarray(self.scales, dtype=float)
+
+        self.mean_ = mean
+        self.scale_ = scale
+        self.feature_columns_ = list(self.feature_columns or DEFAULT_FEATURE_COLUMNS)
+        self.n_features_in_ = len(RAW_OBSERVATION_COLUMNS)
+
+        positions = {col: i for i, col in enumerate(self.feature_columns_)}
+        self._continuous_pos = np.array([
+            positions['미세먼지(PM10)'], positions['Windspeed(m/s)'], positions['Rainfall(mm)']
+        ])
+        self._discomfort_pos = positions['불쾌지수']
+        self._weekday_pos = np.array([positions[col] for col in MLConfig.ONEHOT_GROUPS["weekday"]])
+        self._season_pos = np.array([positions[col] for col in MLConfig.ONEHOT_GROUPS["season"]])
+        return self
+
+    @staticmethod
+    def _as_array(X) -> np.ndarray:
+        """입력을 RAW_OBSERVATION_COLUMNS 순서의 2차원 float 배열로 변환"""
+        if isinstance(X, pd.DataFrame):
+            X = X[RAW_OBSERVATION_COLUMNS].to_numpy(dtype=float)
+        X = np.asarray(X, dtype=float)
+        if X.ndim != 2 or X.shape[1] != len(RAW_OBSERVATION_COLUMNS):
+            raise ValueError(
+                f"입력 형식이 올바르지 않습니다: {X.shape} "
+                f"(필요: (n, {len(RAW_OBSERVATION_COLUMNS)}), 컬럼: {RAW_OBSERVATION_COLUMNS})"
+            )
+        return X
+
+    def transform(self, X) -> np.ndarray:
+        """
+        관측값을 모델 입력 피처 배열로 변환
+
+        Returns:
+            np.ndarray: (n, len(feature_columns_)) 배열
+        """
+        X = self._as_array(X)
+        n_rows = X.shape[0]
+
+        # 다섯 개의 스케일러를 한 번의 벡터 연산으로 적용 (pm10, windspeed, temperature, humidity, rainfall)
+        scaled = (X[:, :5] - self.mean_) / self.scale_
+
+        out = np.zeros((n_rows, len(self.feature_columns_)), dtype=float)
+        out[:, self._continuous_pos] = scaled[:, [0, 1, 4]]
+        # 불쾌지수 계산 및 스케일링
+        out[:, self._discomfort_pos] = 0.01 * calculate_discomfort_index(scaled[:, 2], scaled[:, 3])
+
+        rows = np.arange(n_rows)
+        out[rows, self._weekday_pos[X[:, 5].astype(int)]] = 1.0
+        out[rows, self._season_pos[X[:, 6].astype(int)]] = 1.0
+        return out
+
+    def get_feature_names_out(self, input_features=None) -> np.ndarray:
+        """출력 피처 이름"""
+        return np.asarray(self.feature_columns_, dtype=object)
+
+    def cache_key(self) -> tuple:
+        """동일한 변환을 수행하는 변환기를 식별하는 키"""
+        return (tuple(self.mean_), tuple(self.scale_), tuple(self.feature_columns_))
+
+    def transform_frame(self, X) -> pd.DataFrame:
+        """transform 결과를 피처 이름과 dtype(원-핫은 정수형)을 갖춘 DataFrame으로 반환"""
+        df = pd.DataFrame(self.transform(X), columns=self.feature_columns_)
+        onehot_cols = MLConfig.ONEHOT_GROUPS["weekday"] + MLConfig.ONEHOT_GROUPS["season"]
+        df[onehot_cols] = df[onehot_cols].astype(np.int64)
+        return df
+
+
+FEATURE_STEP_NAME = "features"
+
+
+def has_feature_step(pipeline) -> bool:
+    """Pipeline의 첫 단계가 관측값 변환기인지 확인"""
+    steps = getattr(pipeline, "steps", None)
+    return bool(steps) and steps[0][0] == FEATURE_STEP_NAME and isinstance(steps[0][1], ObservationFeatureTransformer)
+
+
+def with_feature_step(pipeline, transformer: ObservationFeatureTransformer):
+    """변환기가 없는 기존 Pipeline 앞에 관측값 변환기를 추가한 새 Pipeline 반환"""
+    from sklearn.pipeline import Pipeline
+
+    if has_feature_step(pipeline):
+        return pipeline
+    steps = list(pipeline.steps) if hasattr(pipeline, "steps") else [("model", pipeline)]
+    return Pipeline([(FEATURE_STEP_NAME, transformer)] + steps)
+
+
+def get_model_pipeline(pipeline):
+    """
+    피처가 이미 생성된 데이터(학습 DB)에 적용할 Pipeline 반환
+
+    관측값 변환기 단계가 있으면 이를 제외한 나머지 단계를 반환합니다.
+    """
+    if has_feature_step(pipeline):
+        return pipeline[1:]
+    return pipeline
@@ -0,0 +1,338 @@
+"""
+모델 레지스트리 모듈
+학습된 모델 파일을 변경되지 않는 버전 디렉토리로 게시하고 현재 버전 포인터를 원자적으로 교체
+"""
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import warnings
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ml_service.config import MLConfig
+
+# 버전 디렉토리로 복사하는 모델 파일 (관광지별 pkl 외)
+ARTIFACT_SUFFIXES = (
+    MLConfig.FEATURE_SCHEMA_SUFFIX,
+    MLConfig.NATIVE_MODEL_SUFFIX,
+    MLConfig.NATIVE_META_SUFFIX,
+    MLConfig.EVALUATION_ARTIFACT_SUFFIX,
+    ".trees.npz",
+)
+VERSION_FORMAT = "%Y%m%d-%H%M%S"
+STAGING_PREFIX = ".staging-"
+
+
+def _sha256(path: Path) -> str:
+    """파일 SHA-256 해시"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def artifact_files(models_dir: Path) -> List[Path]:
+    """
+    모델 디렉토리에서 게시할 파일 목록
+
+    관광지별 pkl 모델과 같은 이름의 스키마/네이티브 모델/컴파일된 트리 파일, 모델 번들을 포함합니다.
+
+    Raises:
+        FileNotFoundError: 관광지 pkl 모델 파일이 하나라도 없는 경우
+    """
+    files = []
+    for tourist_code, filename in MLConfig.MODEL_FILES.items():
+        model_path = models_dir / filename
+        if not model_path.exists():
+            raise FileNotFoundError(f"'{tourist_code}' 모델 파일을 찾을 수 없습니다: {model_path}")
+        files.append(model_path)
+        for suffix in ARTIFACT_SUFFIXES:
+            path = model_path.with_suffix(suffix)
+            if path.exists():
+                files.append(path)
+    bundle_path = models_dir / MLConfig.MODEL_BUNDLE_FILE
+    if bundle_path.exists():
+        files.append(bundle_path)
+    return files
+
+
+class ModelRegistry:
+    """
+    버전별 모델 디렉토리와 현재 버전 포인터
+
+    - <root>/<version>/: 게시된 모델 파일과 manifest.json (게시 후 변경하지 않음)
+    - <root>/CURRENT: 현재 버전 이름 (임시 파일에 쓴 뒤 os.replace로 교체하므로 읽는 쪽은 항상 완전한 값을 봄)
+
+    새 버전은 .staging-<version> 디렉토리에 모두 복사한 뒤 이름을 바꿔 게시하므로,
+    버전 디렉토리가 보이면 파일도 모두 쓰여 있습니다.
+
+    Args:
+        root: 레지스트리 디렉토리 (None이면 MLConfig.MODEL_REGISTRY_DIR)
+    """
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = Path(root or MLConfig.MODEL_REGISTRY_DIR)
+
+    @property
+    def pointer_path(self) -> Path:
+        """현재 버전 포인터 파일 경로"""
+        return self.root / MLConfig.MODEL_REGISTRY_POINTER
+
+    def version_dir(self, version: str) -> Path:
+        """버전 디렉토리 경로"""
+        if not version or version.startswith(".") or "/" in version or "\\" in version:
+            raise ValueError(f"잘못된 모델 버전 이름: {version!r}")
+        return self.root / version
+
+    def current_version(self) -> Optional[str]:
+        """현재 버전 이름 (포인터가 없으면 None)"""
+        try:
+            version = self.pointer_path.read_text(encoding="utf-8").strip()
+        except FileNotFoundError:
+            return None
+        return version or None
+
+    def resolve(self) -> Tuple[Optional[str], Path]:
+        """
+        현재 버전과 모델 디렉토리
+
+        Returns:
+            tuple: (버전 이름, 모델 디렉토리), 포인터가 없으면 (None, MODELS_SAVED_DIR)
+
+        Raises:
+            FileNotFoundError: 포인터가 가리키는 버전 디렉토리가 없는 경우
+        """
+        version = self.current_version()
+        if version is None:
+            return None, MLConfig.MODELS_SAVED_DIR
+        models_dir = self.version_dir(version)
+        if not models_dir.is_dir():
+            raise FileNotFoundError(f"현재 모델 버전 디렉토리를 찾을 수 없습니다: {models_dir}")
+        return version, models_dir
+
+    def versions(self) -> List[str]:
+        """게시된 버전 목록 (오래된 순)"""
+        if not self.root.exists():
+            return []
+        return sorted(
+            path.name for path in self.root.iterdir()
+            if path.is_dir() and not path.name.startswith(".")
+        )
+
+    def load_manifest(self, version: str) -> dict:
+        """
+        버전 매니페스트 로드
+
+        Raises:
+            FileNotFoundError: 버전 디렉토리나 매니페스트가 없는 경우
+        """
+        manifest_path = self.version_dir(version) / MLConfig.MODEL_REGISTRY_MANIFEST
+        if not manifest_path.exists():
+            raise FileNotFoundError(f"모델 버전 매니페스트를 찾을 수 없습니다: {manifest_path}")
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def verify(self, version: str) -> dict:
+        """
+        버전 디렉토리의 파일이 매니페스트와 일치하는지 확인
+
+        Returns:
+            dict: 매니페스트
+
+        Raises:
+            FileNotFoundError: 버전 디렉토리, 매니페스트 또는 파일이 없는 경우
+            ValueError: 파일 크기나 해시가 매니페스트와 다른 경우
+        """
+        manifest = self.load_manifest(version)
+        models_dir = self.version_dir(version)
+        for name, entry in manifest["files"].items():
+            path = models_dir / name
+            if not path.exists():
+                raise FileNotFoundError(f"모델 버전 '{version}'의 파일이 없습니다: {name}")
+            if path.stat().st_size != entry["size"] or _sha256(path) != entry["sha256"]:
+                raise ValueError(f"모델 버전 '{version}'의 파일이 매니페스트와 다릅니다: {name}")
+        return manifest
+
+    def _new_version_name(self) -> str:
+        """현재 시각 기반 버전 이름 (같은 이름이 있으면 -2, -3 ... 추가)"""
+        base = datetime.now().strftime(VERSION_FORMAT)
+        version = base
+        suffix = 2
+        while (self.root / version).exists() or (self.root / (STAGING_PREFIX + version)).exists():
+            version = f"{base}-{suffix}"
+            suffix += 1
+        return version
+
+    def create_version(self, source_dir: Optional[Path] = None, version: Optional[str] = None) -> str:
+        """
+        모델 디렉토리의 파일을 새 버전으로 복사 (현재 버전은 바꾸지 않음)
+
+        Args:
+            source_dir: 모델 파일 디렉토리 (None이면 MLConfig.MODELS_SAVED_DIR)
+            version: 버전 이름 (None이면 현재 시각)
+
+        Returns:
+            str: 생성된 버전 이름
+
+        Raises:
+            FileNotFoundError: 관광지 pkl 모델 파일이 없는 경우
+            ValueError: 같은 이름의 버전이 이미 있는 경우
+        """
+        source_dir = Path(source_dir or MLConfig.MODELS_SAVED_DIR)
+        files = artifact_files(source_dir)
+        self.root.mkdir(parents=True, exist_ok=True)
+        version = version or self._new_version_name()
+        target = self.version_dir(version)
+        if target.exists():
+            raise ValueError(f"이미 있는 모델 버전입니다: {version}")
+
+        staging = self.root / (STAGING_PREFIX + version)
+        staging.mkdir()
+        try:
+            entries = {}
+            for path in files:
+                # copy2는 수정 시각도 복사하므로 번들/컴파일 트리의 최신 여부 확인이 그대로 동작
+                copied = Path(shutil.copy2(path, staging / path.name))
+                entries[path.name] = {"size": copied.stat().st_size, "sha256": _sha256(copied)}
+            manifest = {
+                "version": version,
+                "created_at": datetime.now().isoformat(),
+                "source_dir": str(source_dir),
+                "model_type": MLConfig.MODEL_TYPE,
+                "files": entries
+            }
+            with open(staging / MLConfig.MODEL_REGISTRY_MANIFEST, "w", encoding="utf-8") as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=2)
+            os.rename(staging, target)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        return version
+
+    def activate(self, version: str) -> str:
+        """
+        현재 버전 포인터를 원자적으로 교체
+
+        Raises:
+            FileNotFoundError, ValueError: verify 실패 (포인터는 바꾸지 않음)
+        """
+        self.verify(version)
+        tmp_path = self.pointer_path.with_name(f".{MLConfig.MODEL_REGISTRY_POINTER}.{os.getpid()}.tmp")
+        tmp_path.write_text(version + "\n", encoding="utf-8")
+        os.replace(tmp_path, self.pointer_path)
+        return version
+
+    def publish(self, source_dir: Optional[Path] = None, keep: Optional[int] = None) -> str:
+        """
+        모델 디렉토리를 새 버전으로 게시하고 현재 버전으로 지정한 뒤 오래된 버전 정리
+
+        Args:
+            source_dir: 모델 파일 디렉토리 (None이면 MLConfig.MODELS_SAVED_DIR)
+            keep: 남겨 둘 최근 버전 수 (None이면 MLConfig.MODEL_REGISTRY_KEEP)
+
+        Returns:
+            str: 게시된 버전 이름
+        """
+        version = self.create_version(source_dir)
+        self.activate(version)
+        self.prune(MLConfig.MODEL_REGISTRY_KEEP if keep is None else keep)
+        return version
+
+    def prune(self, keep: int) -> List[str]:
+        """
+        최근 keep개를 제외한 버전 삭제 (현재 버전은 항상 유지)
+
+        Returns:
+            list: 삭제한 버전 목록
+        """
+        current = self.current_version()
+        versions = self.versions()
+        stale = versions[:-keep] if keep > 0 else versions
+        removed = []
+        for version in stale:
+            if version == current:
+                continue
+            shutil.rmtree(self.version_dir(version), ignore_errors=True)
+            removed.append(version)
+        return removed
+
+    def status(self) -> dict:
+        """레지스트리 경로, 현재 버전, 게시된 버전 목록"""
+        return {
+            "root": str(self.root),
+            "current": self.current_version(),
+            "versions": self.versions()
+        }
+
+
+class ModelReloadWatcher:
+    """
+    현재 버전 포인터 감시
+
+    MODEL_RELOAD_POLL_SECONDS마다 CURRENT 파일을 읽어 서비스의 모델 버전과 다르면
+    스레드에서 service.reload_models()를 실행합니다. 새 모델 세트는 예열을 마친 뒤 교체되므로
+    그동안 들어온 요청은 이전 모델 세트로 처리됩니다.
+
+    Args:
+        service: PredictionService
+        on_reload: 모델이 교체된 뒤 호출할 코루틴 함수 (reload_models 반환값을 받음)
+    """
+
+    def __init__(self, service, on_reload: Optional[Callable[[dict], object]] = None):
+        self.service = service
+        self.on_reload = on_reload
+        self.last_check_at: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def check(self) -> Optional[dict]:
+        """포인터가 바뀌었으면 모델 다시 로드 (바뀌지 않았으면 None)"""
+        self.last_check_at = datetime.now()
+        version = self.service.registry.current_version()
+        if version is None or version == self.service.models.version:
+            return None
+        result = await asyncio.to_thread(self.service.reload_models)
+        if result["reloaded"] and self.on_reload is not None:
+            await self.on_reload(result)
+        return result
+
+    async def run(self):
+        """감시 루프 (start()에서 백그라운드 태스크로 실행)"""
+        while True:
+            await asyncio.sleep(MLConfig.MODEL_RELOAD_POLL_SECONDS)
+            try:
+                await self.check()
+                self.last_error = None
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.last_error = str(e)
+                warnings.warn(f"모델 다시 로드 실패, 이전 모델 유지: {e}")
+
+    def start(self):
+        """백그라운드 감시 시작 (MODEL_RELOAD_POLL_SECONDS가 0이면 시작하지 않음)"""
+        if self._task is None and MLConfig.MODEL_RELOAD_POLL_SECONDS > 0:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        """백그라운드 감시 중지"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def status(self) -> Dict[str, object]:
+        """감시 상태"""
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "poll_seconds": MLConfig.MODEL_RELOAD_POLL_SECONDS,
+            "last_check_at": self.last_check_at.isoformat() if self.last_check_at else None,
+            "last_error": self.last_error
+        }
@@ -0,0 +1,242 @@
+"""
+업스트림 장애 대응 모듈
+요청별 시간 예산(Deadline), 지연 시간 백분위수 추적, 업스트림별 회로 차단기
+"""
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+
+import numpy as np
+
+from ml_service.config import MLConfig
+from ml_service.metrics import count_upstream_error, observe_upstream_latency
+
+AIR_QUALITY_UPSTREAM = "air_quality"
+KMA_UPSTREAM = "kma"
+
+
+class DeadlineExceededError(RuntimeError):
+    """요청 시간 예산을 모두 사용한 경우"""
+
+
+class CircuitOpenError(RuntimeError):
+    """회로 차단기가 열려 있어 업스트림 호출을 즉시 실패 처리한 경우"""
+
+
+class Deadline:
+    """
+    요청 하나의 업스트림 호출 시간 예산
+
+    한 요청에서 발생하는 모든 업스트림 호출이 같은 Deadline을 공유하므로
+    호출이 순차적으로 실행되어도 전체 소요 시간은 예산을 넘지 않습니다.
+    """
+
+    def __init__(self, budget: Optional[float] = None):
+        self.budget = budget if budget is not None else MLConfig.UPSTREAM_DEADLINE
+        self.expires_at = time.monotonic() + self.budget
+
+    def remaining(self) -> float:
+        """남은 시간 (초, 음수면 초과)"""
+        return self.expires_at - time.monotonic()
+
+    def timeout(self, cap: Optional[float] = None) -> float:
+        """
+        다음 호출에 사용할 타임아웃 (남은 시간과 cap 중 작은 값)
+
+        Raises:
+            DeadlineExceededError: 남은 시간이 없는 경우
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise DeadlineExceededError(f"업스트림 호출 시간 예산 초과 ({self.budget:.1f}초)")
+        return min(cap, remaining) if cap is not None else remaining
+
+
+class LatencyTracker:
+    """최근 성공한 호출의 지연 시간을 고정 크기 창으로 보관하고 백분위수 계산"""
+
+    def __init__(self, window: Optional[int] = None):
+        self._samples = deque(maxlen=window or MLConfig.UPSTREAM_LATENCY_WINDOW)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        """지연 시간 기록"""
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._samples)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """q 백분위수 지연 시간 (초, 기록이 없으면 None)"""
+        with self._lock:
+            if not self._samples:
+                return None
+            samples = np.fromiter(self._samples, dtype=float)
+        return float(np.percentile(samples, q))
+
+    def summary(self) -> dict:
+        """지연 시간 요약 (밀리초)"""
+        with self._lock:
+            samples = np.fromiter(self._samples, dtype=float)
+        if samples.size == 0:
+            return {"count": 0, "p50_ms": None, "p90_ms": None, "p99_ms": None}
+        p50, p90, p99 = np.percentile(samples, [50, 90, 99]) * 1000
+        return {
+            "count": int(samples.size),
+            "p50_ms": round(float(p50), 1),
+            "p90_ms": round(float(p90), 1),
+            "p99_ms": round(float(p99), 1)
+        }
+
+
+class CircuitBreaker:
+    """
+    업스트림별 회로 차단기
+
+    - closed: 정상 호출
+    - open: 연속 실패가 임계값에 도달하면 reset_seconds 동안 호출을 즉시 실패 처리
+    - half_open: 대기 시간이 지나면 시험 호출 하나만 허용하고, 성공하면 closed, 실패하면 다시 open
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: Optional[int] = None,
+                 reset_seconds: Optional[float] = None):
+        self.name = name
+        self.failure_threshold = failure_threshold or MLConfig.CIRCUIT_BREAKER_FAILURE_THRESHOLD
+        self.reset_seconds = reset_seconds if reset_seconds is not None else MLConfig.CIRCUIT_BREAKER_RESET_SECONDS
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self.trips = 0
+        self.rejected = 0
+        self.last_error: Optional[str] = None
+
+    @property
+    def state(self) -> str:
+        """현재 상태 (대기 시간이 지난 open은 half_open으로 표시)"""
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_seconds:
+                return self.HALF_OPEN
+            return self._state
+
+    def before_call(self):
+        """
+        호출 허용 여부 확인
+
+        Raises:
+            CircuitOpenError: 회로가 열려 있거나 시험 호출이 이미 진행 중인 경우
+        """
+        with self._lock:
+            if self._state == self.OPEN:
+                waited = time.monotonic() - self._opened_at
+                if waited < self.reset_seconds:
+                    self.rejected += 1
+                    raise CircuitOpenError(
+                        f"{self.name} 업스트림 회로 차단 중 ({self.reset_seconds - waited:.0f}초 후 재시도): {self.last_error}"
+                    )
+                self._state = self.HALF_OPEN
+                self._trial_in_flight = False
+
+            if self._state == self.HALF_OPEN:
+                if self._trial_in_flight:
+                    self.rejected += 1
+                    raise CircuitOpenError(f"{self.name} 업스트림 회로 차단 중 (시험 호출 진행 중): {self.last_error}")
+                self._trial_in_flight = True
+
+    def record_success(self):
+        """호출 성공 기록"""
+        with self._lock:
+            self._state = self.CLOSED
+            self._consecutive_failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self, error: Exception):
+        """호출 실패 기록 (임계값에 도달하거나 시험 호출이 실패하면 open)"""
+        with self._lock:
+            self._consecutive_failures += 1
+            self.last_error = str(error)
+            if self._state == self.HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self.trips += 1
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+    def release(self):
+        """결과 없이 끝난 호출 정리 (취소 등, 성공/실패로 집계하지 않음)"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def stats(self) -> dict:
+        """차단기 상태"""
+        state = self.state
+        with self._lock:
+            return {
+                "state": state,
+                "consecutive_failures": self._consecutive_failures,
+                "trips": self.trips,
+                "rejected": self.rejected,
+                "last_error": self.last_error
+            }
+
+
+class UpstreamGuard:
+    """업스트림 하나의 회로 차단기와 지연 시간 통계"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.breaker = CircuitBreaker(name)
+        self.latency = LatencyTracker()
+        self.calls = 0
+        self.failures = 0
+        self.hedges = 0
+
+    def hedge_delay(self) -> Optional[float]:
+        """
+        헤지 요청을 보낼 대기 시간 (초)
+
+        헤지가 비활성화되어 있거나 지연 시간 기록이 UPSTREAM_HEDGE_MIN_SAMPLES보다 적으면 None
+        """
+        if not MLConfig.UPSTREAM_HEDGE_ENABLED or len(self.latency) < MLConfig.UPSTREAM_HEDGE_MIN_SAMPLES:
+            return None
+        return self.latency.percentile(MLConfig.UPSTREAM_HEDGE_PERCENTILE)
+
+    def observe_latency(self, seconds: float):
+        """성공한 실제 요청 하나의 지연 시간 기록 (헤지 대기 시간 계산과 메트릭에 사용)"""
+        self.latency.record(seconds)
+        observe_upstream_latency(self.name, seconds)
+
+    def record_success(self):
+        """성공한 호출 기록 (지연 시간은 실제 요청마다 observe_latency로 따로 기록)"""
+        self.calls += 1
+        self.breaker.record_success()
+
+    def record_failure(self, error: Exception):
+        """실패한 호출 기록"""
+        self.calls += 1
+        self.failures += 1
+        self.breaker.record_failure(error)
+        count_upstream_error(self.name, error)
+
+    def stats(self) -> dict:
+        """업스트림 상태 (차단기 상태, 호출 수, 지연 시간 백분위수)"""
+        return {
+            "breaker": self.breaker.stats(),
+            "calls": self.calls,
+            "failures": self.failures,
+            "hedges": self.hedges,
+            "latency": self.latency.summary()
+        }
+
+
+def build_upstream_guards() -> Dict[str, UpstreamGuard]:
+    """대기환경/기상청 업스트림별 UpstreamGuard 생성"""
+    return {name: UpstreamGuard(name) for name in (AIR_QUALITY_UPSTREAM, KMA_UPSTREAM)}
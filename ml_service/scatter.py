@@ -0,0 +1,110 @@
+"""
+평가 응답의 산점도 데이터 모듈
+테스트 데이터 전체의 실제값/예측값 배열 대신 고정 크기의 층화 표본이나 2차원 히스토그램과
+잔차(실제값 - 예측값) 분위수를 반환하여 데이터가 늘어도 응답 크기와 직렬화 시간을 일정하게 유지
+"""
+from typing import Sequence
+
+import numpy as np
+
+# 산점도 데이터 형식
+# sample: 실제값 순위로 나눈 구간마다 한 점씩 뽑은 표본, histogram: 실제값 × 예측값 2차원 히스토그램, full: 전체 배열
+SCATTER_MODES = ("sample", "histogram", "full")
+
+# 응답에 포함할 잔차 분위수 (백분위)
+RESIDUAL_PERCENTILES = (1, 5, 25, 50, 75, 95, 99)
+
+
+def residual_quantiles(actual: np.ndarray, predicted: np.ndarray,
+                       percentiles: Sequence[int] = RESIDUAL_PERCENTILES) -> dict:
+    """
+    잔차(실제값 - 예측값) 분위수 (양수면 과소 예측)
+
+    Returns:
+        dict: {"p1": ..., "p5": ..., ..., "p99": ...} (데이터가 없으면 빈 dict)
+    """
+    if len(actual) == 0:
+        return {}
+    values = np.percentile(actual - predicted, percentiles)
+    return {f"p{p}": float(value) for p, value in zip(percentiles, values)}
+
+
+def stratified_sample(actual: np.ndarray, size: int, seed: int = 0) -> np.ndarray:
+    """
+    실제값 기준 층화 표본의 인덱스
+
+    실제값 순으로 정렬한 뒤 같은 개수의 구간 size개로 나누고 구간마다 한 점을 뽑으므로
+    실제값 분포(최솟값/최댓값 부근 포함)가 표본에 고르게 반영됩니다. 같은 입력이면 같은 표본을 반환합니다.
+
+    Returns:
+        np.ndarray: 원래 순서로 정렬된 인덱스 (데이터가 size개 이하이면 전체)
+    """
+    n = len(actual)
+    if n <= size:
+        return np.arange(n)
+    order = np.argsort(actual, kind="stable")
+    bounds = np.linspace(0, n, size + 1).astype(np.int64)
+    offsets = (np.random.default_rng(seed).random(size) * np.diff(bounds)).astype(np.int64)
+    return np.sort(order[bounds[:-1] + offsets])
+
+
+def scatter_histogram(actual: np.ndarray, predicted: np.ndarray, bins: int) -> dict:
+    """
+    실제값 × 예측값 2차원 히스토그램
+
+    두 축이 같은 구간 경계를 사용하므로 counts[i][i]가 대각선(실제값 = 예측값) 칸입니다.
+
+    Returns:
+        dict: {"edges": 구간 경계 (bins + 1개), "counts": counts[실제값 구간][예측값 구간]}
+    """
+    if len(actual) == 0:
+        return {"edges": [], "counts": []}
+    low = float(min(actual.min(), predicted.min()))
+    high = float(max(actual.max(), predicted.max()))
+    if high <= low:
+        high = low + 1.0
+    edges = np.linspace(low, high, bins + 1)
+    counts, _, _ = np.histogram2d(actual, predicted, bins=[edges, edges])
+    return {
+        "edges": np.round(edges, 2).tolist(),
+        "counts": counts.astype(np.int64).tolist()
+    }
+
+
+def compact_evaluation(result: dict, mode: str, sample_size: int, bins: int, seed: int = 0) -> dict:
+    """
+    평가 결과의 predictions(전체 실제값/예측값 배열)를 응답 형식으로 바꾸고 잔차 분위수 추가
+
+    Args:
+        result: evaluate_model 결과 (변경하지 않음)
+        mode: SCATTER_MODES 중 하나
+        sample_size: sample 형식의 표본 크기
+        bins: histogram 형식의 축별 구간 수
+        seed: 표본 추출 시드 (같은 시드면 같은 표본)
+
+    Returns:
+        dict: predictions를 바꾸고 residual_quantiles를 추가한 복사본
+              predictions: mode, total(테스트 데이터 수), 형식별 데이터
+              (sample/full: actual, predicted 배열, histogram: edges, counts)
+
+    Raises:
+        ValueError: 알 수 없는 형식
+    """
+    if mode not in SCATTER_MODES:
+        raise ValueError(f"scatter는 {', '.join(SCATTER_MODES)} 중 하나여야 합니다: {mode}")
+    predictions = result["predictions"]
+    actual = np.asarray(predictions["actual"], dtype=np.float64)
+    predicted = np.asarray(predictions["predicted"], dtype=np.float64)
+
+    # 스트리밍 평가 결과의 predictions는 테스트 데이터 일부(표본)이므로 전체 수는 stats에서 가져옴
+    total = result.get("stats", {}).get("test_size", len(actual))
+    payload = {"mode": mode, "total": total}
+    if mode == "full":
+        payload.update(actual=predictions["actual"], predicted=predictions["predicted"])
+    elif mode == "histogram":
+        payload.update(scatter_histogram(actual, predicted, bins))
+    else:
+        index = stratified_sample(actual, sample_size, seed)
+        payload.update(actual=actual[index].tolist(), predicted=predicted[index].tolist())
+
+    return {**result, "predictions": payload, "residual_quantiles": residual_quantiles(actual, predicted)}
@@ -0,0 +1,168 @@
+"""
+시나리오 모듈
+가상의 기상/미세먼지 조건(시나리오)을 변환기 입력 배열로 만드는 함수
+"""
+import math
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ml_service.config import MLConfig
+from ml_service.preprocessing import RAW_OBSERVATION_COLUMNS
+
+# 시나리오에서 생략할 수 있는 컬럼의 기본값 (기상청 데이터가 없을 때의 기본값과 동일)
+SCENARIO_DEFAULTS = {
+    'temperature': 20.0,
+    'humidity': 60.0,
+    'windspeed': 2.0,
+    'rainfall': 0.0
+}
+
+# 범주형 컬럼의 허용 범위 (weekday: 0=월요일 ~ 6=일요일, season: 0=봄 ~ 3=겨울)
+CATEGORICAL_RANGES = {
+    'weekday': len(MLConfig.ONEHOT_GROUPS["weekday"]),
+    'season': len(MLConfig.ONEHOT_GROUPS["season"])
+}
+
+
+# 무작위 관측값 생성 범위 (엔진 비교 등), 서울 관측 기록을 포함하는 범위
+OBSERVATION_RANGES = {
+    'pm10': (0.0, 200.0),
+    'windspeed': (0.0, 15.0),
+    'temperature': (-20.0, 40.0),
+    'humidity': (0.0, 100.0),
+    'rainfall': (0.0, 30.0)
+}
+
+
+def _check_columns(names) -> None:
+    """알 수 없는 컬럼과 누락된 필수 컬럼 확인"""
+    unknown = sorted(set(names) - set(RAW_OBSERVATION_COLUMNS))
+    if unknown:
+        raise ValueError(f"알 수 없는 시나리오 컬럼: {', '.join(unknown)} (사용 가능: {RAW_OBSERVATION_COLUMNS})")
+    missing = [col for col in RAW_OBSERVATION_COLUMNS if col not in names and col not in SCENARIO_DEFAULTS]
+    if missing:
+        raise ValueError(f"필수 시나리오 컬럼이 없습니다: {', '.join(missing)}")
+
+
+def _check_size(n_rows: int) -> None:
+    """시나리오 수 제한 확인"""
+    if n_rows == 0:
+        raise ValueError("시나리오가 비어 있습니다.")
+    if n_rows > MLConfig.SCENARIO_MAX_ROWS:
+        raise ValueError(f"시나리오 수가 최대값({MLConfig.SCENARIO_MAX_ROWS})을 넘습니다: {n_rows}")
+
+
+def validate_scenarios(raw: np.ndarray) -> np.ndarray:
+    """
+    시나리오 배열 검증
+
+    Raises:
+        ValueError: 값이 유한하지 않거나 요일/계절이 범위를 벗어난 경우
+    """
+    if not np.isfinite(raw).all():
+        raise ValueError("시나리오 값에 NaN 또는 무한대가 있습니다.")
+    for col, n_values in CATEGORICAL_RANGES.items():
+        values = raw[:, RAW_OBSERVATION_COLUMNS.index(col)]
+        if ((values < 0) | (values >= n_values) | (values != np.floor(values))).any():
+            raise ValueError(f"{col} 값은 0~{n_values - 1} 사이의 정수여야 합니다.")
+    return raw
+
+
+def columns_to_array(columns: Dict[str, List[float]]) -> np.ndarray:
+    """
+    컬럼별 값 목록(모두 같은 길이)을 변환기 입력 배열로 변환
+
+    Returns:
+        np.ndarray: (n, 7) 배열, 컬럼 순서는 RAW_OBSERVATION_COLUMNS
+    """
+    _check_columns(columns)
+    lengths = {len(values) for values in columns.values()}
+    if len(lengths) != 1:
+        raise ValueError("시나리오 컬럼의 길이가 서로 다릅니다.")
+    n_rows = lengths.pop()
+    _check_size(n_rows)
+
+    raw = np.empty((n_rows, len(RAW_OBSERVATION_COLUMNS)), dtype=float)
+    for i, col in enumerate(RAW_OBSERVATION_COLUMNS):
+        raw[:, i] = columns[col] if col in columns else SCENARIO_DEFAULTS[col]
+    return validate_scenarios(raw)
+
+
+def rows_to_array(rows: List[Dict[str, float]]) -> np.ndarray:
+    """시나리오 행 목록({"pm10": ..., "weekday": ...})을 변환기 입력 배열로 변환"""
+    _check_size(len(rows))
+    names = set().union(*rows)
+    _check_columns(names)
+
+    raw = np.empty((len(rows), len(RAW_OBSERVATION_COLUMNS)), dtype=float)
+    for i, col in enumerate(RAW_OBSERVATION_COLUMNS):
+        default = SCENARIO_DEFAULTS.get(col)
+        try:
+            raw[:, i] = [row[col] if col in row else default for row in rows]
+        except TypeError:
+            raise ValueError(f"필수 시나리오 컬럼이 없는 행이 있습니다: {col}")
+    return validate_scenarios(raw)
+
+
+def grid_to_array(grid: Dict[str, List[float]]) -> np.ndarray:
+    """
+    컬럼별 후보값의 데카르트 곱으로 시나리오 배열 생성
+
+    마지막 컬럼(RAW_OBSERVATION_COLUMNS 순서)이 가장 빠르게 변합니다.
+    생략한 컬럼은 SCENARIO_DEFAULTS 값 하나로 고정됩니다.
+    """
+    _check_columns(grid)
+    axes = [
+        np.asarray(grid[col] if col in grid else [SCENARIO_DEFAULTS[col]], dtype=float).ravel()
+        for col in RAW_OBSERVATION_COLUMNS
+    ]
+    # np.prod는 int64로 곱하므로 큰 그리드에서 음수로 넘칠 수 있어 파이썬 정수로 계산
+    _check_size(math.prod(axis.size for axis in axes))
+
+    mesh = np.meshgrid(*axes, indexing="ij")
+    raw = np.stack([m.ravel() for m in mesh], axis=1)
+    return validate_scenarios(raw)
+
+
+def build_scenarios(rows: Optional[List[dict]] = None, columns: Optional[Dict[str, list]] = None,
+                    grid: Optional[Dict[str, list]] = None) -> np.ndarray:
+    """
+    rows / columns / grid 중 하나로 시나리오 배열 생성
+
+    Raises:
+        ValueError: 입력 형식이 하나가 아니거나 값이 올바르지 않은 경우
+    """
+    given = [name for name, value in (("rows", rows), ("columns", columns), ("grid", grid)) if value is not None]
+    if len(given) != 1:
+        raise ValueError("rows, columns, grid 중 하나만 지정해야 합니다.")
+    if rows is not None:
+        return rows_to_array(rows)
+    if columns is not None:
+        return columns_to_array(columns)
+    return grid_to_array(grid)
+
+
+def sample_observations(n_samples: int, ranges: Optional[Dict[str, Tuple[float, float]]] = None,
+                        seed: int = 0) -> np.ndarray:
+    """
+    연속형 컬럼은 범위 안의 균등 분포, 요일/계절은 모든 값에서 무작위로 뽑은 관측값 배열
+
+    Args:
+        n_samples: 행 수
+        ranges: 연속형 컬럼별 (최소, 최대) 범위 (None이면 OBSERVATION_RANGES, 생략한 컬럼은 0)
+        seed: 난수 시드
+
+    Returns:
+        np.ndarray: (n_samples, 7) 배열, 컬럼 순서는 RAW_OBSERVATION_COLUMNS
+    """
+    ranges = ranges or OBSERVATION_RANGES
+    rng = np.random.default_rng(seed)
+    raw = np.empty((n_samples, len(RAW_OBSERVATION_COLUMNS)), dtype=float)
+    for i, col in enumerate(RAW_OBSERVATION_COLUMNS):
+        if col in CATEGORICAL_RANGES:
+            raw[:, i] = rng.integers(0, CATEGORICAL_RANGES[col], n_samples)
+        else:
+            low, high = ranges.get(col, (0.0, 0.0))
+            raw[:, i] = rng.uniform(low, high, n_samples)
+    return raw
@@ -0,0 +1,184 @@
+"""
+워커 간 공유 상태 모듈
+여러 서버 워커 프로세스가 관측 데이터 캐시와 예측 스냅샷을 로컬 SQLite 파일로 공유하고,
+파일 잠금으로 업스트림 갱신을 담당할 워커 하나를 선출
+"""
+import os
+import pickle
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Hashable, Optional, Tuple
+
+from ml_service.config import MLConfig
+
+CACHE_FILENAME = "observation_cache.sqlite3"
+LEADER_LOCK_FILENAME = "snapshot_refresh.lock"
+
+
+class SharedObservationCache:
+    """
+    만료 시각 기반 관측 데이터 캐시 (여러 프로세스가 같은 SQLite 파일 공유)
+
+    ObservationCache와 같은 인터페이스를 제공합니다. 값은 pickle로 저장하며,
+    WAL 모드로 열어 읽기가 쓰기를 기다리지 않습니다.
+    연결은 스레드마다 따로 열고, fork 이후에는 자식 프로세스에서 새로 엽니다.
+    hits/misses는 프로세스별 통계입니다.
+
+    Args:
+        path: SQLite 파일 경로
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self.hits = 0
+        self.misses = 0
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        """현재 스레드/프로세스의 연결 (없으면 새로 염)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=MLConfig.SHARED_CACHE_TIMEOUT, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    @staticmethod
+    def _key(key: Hashable) -> str:
+        """캐시 키를 문자열로 변환 (튜플 키는 repr이 프로세스 간에 같음)"""
+        return repr(key)
+
+    def get(self, key: Hashable, now: Optional[datetime] = None) -> Optional[Any]:
+        """
+        캐시 조회
+
+        Args:
+            key: 캐시 키
+            now: 기준 시각 (None이면 현재 시각)
+
+        Returns:
+            캐시된 값 (없거나 만료된 경우 None)
+        """
+        now = now or datetime.now()
+        row = self._connect().execute(
+            "SELECT value, expires_at FROM cache WHERE key = ?", (self._key(key),)
+        ).fetchone()
+        if row is None or row[1] <= now.timestamp():
+            self.misses += 1
+            return None
+        self.hits += 1
+        return pickle.loads(row[0])
+
+    def set(self, key: Hashable, value: Any, expires_at: datetime):
+        """
+        캐시 저장 (만료된 항목도 함께 정리)
+
+        Args:
+            key: 캐시 키
+            value: 저장할 값
+            expires_at: 만료 시각
+        """
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+            (self._key(key), pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), expires_at.timestamp())
+        )
+        conn.execute("DELETE FROM cache WHERE expires_at <= ?", (datetime.now().timestamp(),))
+
+    def clear(self):
+        """캐시 전체 삭제 (모든 워커에 적용)"""
+        self._connect().execute("DELETE FROM cache")
+
+    def invalidate(self, kinds: Tuple[str, ...]):
+        """
+        키 종류(튜플 키의 첫 값)가 kinds에 속하는 항목만 삭제 (모든 워커에 적용, 공유 스냅샷 등 다른 키는 유지)
+
+        Args:
+            kinds: 삭제할 키 종류 (예: REALTIME_OBSERVATION_KINDS)
+        """
+        conn = self._connect()
+        for kind in kinds:
+            # 튜플 키의 repr은 "('air', ...)" 형태이므로 접두사로 비교
+            prefix = f"({kind!r}, "
+            conn.execute("DELETE FROM cache WHERE substr(key, 1, ?) = ?", (len(prefix), prefix))
+
+    def __len__(self) -> int:
+        row = self._connect().execute(
+            "SELECT COUNT(*) FROM cache WHERE expires_at > ?", (datetime.now().timestamp(),)
+        ).fetchone()
+        return int(row[0])
+
+
+class RefreshLeader:
+    """
+    업스트림 갱신 담당 워커 선출 (파일 잠금)
+
+    잠금 파일에 비차단 배타 잠금(flock)을 먼저 건 워커가 담당자가 되고, 프로세스가 끝날 때까지 유지합니다.
+    담당 워커가 종료되면 운영체제가 잠금을 풀어 다른 워커가 이어받습니다.
+
+    Args:
+        path: 잠금 파일 경로
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._fd: Optional[int] = None
+        self._pid: Optional[int] = None
+
+    @property
+    def is_leader(self) -> bool:
+        """현재 프로세스가 잠금을 가지고 있는지 여부 (fork로 물려받은 잠금은 제외)"""
+        return self._fd is not None and self._pid == os.getpid()
+
+    def try_acquire(self) -> bool:
+        """
+        잠금 시도 (이미 가지고 있으면 True)
+
+        Returns:
+            bool: 담당 워커 여부
+        """
+        if self.is_leader:
+            return True
+        import fcntl
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        self._fd = fd
+        self._pid = os.getpid()
+        return True
+
+    def release(self):
+        """잠금 해제"""
+        if self.is_leader:
+            import fcntl
+
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+        self._fd = None
+        self._pid = None
+
+
+def shared_state_paths(state_dir: Path) -> dict:
+    """공유 상태 디렉토리의 캐시 파일과 갱신 잠금 파일 경로"""
+    state_dir = Path(state_dir)
+    return {
+        "cache": state_dir / CACHE_FILENAME,
+        "leader_lock": state_dir / LEADER_LOCK_FILENAME
+    }
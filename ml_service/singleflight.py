@@ -0,0 +1,123 @@
+"""
+Single-flight 모듈
+같은 키에 대한 동시 호출을 하나의 실행으로 합쳐 결과를 공유
+"""
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class _Call:
+    """진행 중인 호출 상태"""
+
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    스레드용 single-flight
+
+    같은 키로 동시에 do()를 호출하면 첫 호출자만 fn을 실행하고
+    나머지 호출자는 완료를 기다렸다가 같은 결과(또는 예외)를 받습니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.executed = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        키별로 합쳐진 fn 실행
+
+        Args:
+            key: 합칠 호출을 식별하는 키
+            fn: 실행할 함수 (인자 없음)
+
+        Returns:
+            fn의 반환값 (동시 호출자 간 공유)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.shared += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.executed += 1
+                leader = True
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+    def in_flight(self) -> int:
+        """현재 진행 중인 키 수"""
+        with self._lock:
+            return len(self._calls)
+
+
+class AsyncSingleFlight:
+    """
+    asyncio용 single-flight
+
+    같은 키의 코루틴은 하나의 태스크로만 실행되며 모든 호출자가 그 결과를 기다립니다.
+    한 호출자가 취소되어도 공유 태스크는 취소되지 않습니다.
+    """
+
+    def __init__(self):
+        self._tasks: Dict[Hashable, asyncio.Task] = {}
+        self.executed = 0
+        self.shared = 0
+
+    async def do(self, key: Hashable, coro_fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        키별로 합쳐진 코루틴 실행
+
+        Args:
+            key: 합칠 호출을 식별하는 키
+            coro_fn: 코루틴을 반환하는 함수 (인자 없음)
+
+        Returns:
+            코루틴의 반환값 (동시 호출자 간 공유)
+        """
+        task = self._tasks.get(key)
+        if task is not None:
+            self.shared += 1
+        else:
+            task = asyncio.ensure_future(coro_fn())
+            self._tasks[key] = task
+            self.executed += 1
+            task.add_done_callback(lambda t: self._on_done(key, t))
+        return await asyncio.shield(task)
+
+    def _on_done(self, key: Hashable, task: asyncio.Task):
+        """완료된 태스크 정리 (모든 호출자가 취소된 경우 예외 경고 방지)"""
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        if not task.cancelled():
+            task.exception()
+
+    def in_flight(self) -> int:
+        """현재 진행 중인 키 수"""
+        return len(self._tasks)
@@ -0,0 +1,295 @@
+"""
+예측 스냅샷 모듈
+업스트림 발표 주기에 맞춰 관측 데이터를 갱신하고 전체 예측 결과를 불변 스냅샷으로 보관
+"""
+import asyncio
+import os
+import warnings
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from types import MappingProxyType
+from typing import List, Mapping, Optional, Tuple
+
+from ml_service.config import MLConfig
+from ml_service.observation_cache import REALTIME_OBSERVATION_KINDS
+
+# 워커 간 공유 캐시에 스냅샷을 저장하는 키
+SHARED_SNAPSHOT_KEY = ("prediction_snapshot",)
+
+
+@dataclass(frozen=True)
+class PredictionSnapshot:
+    """
+    한 번의 갱신으로 계산된 전체 관광지 예측 결과 (불변)
+
+    갱신에 실패한 관광지는 이전 스냅샷의 예측을 이어받으므로 관광지마다 예측 시각(site_created_at)이 다를 수 있습니다.
+    created_at은 스냅샷을 만든 갱신 시각이고, 나이/stale 여부는 관광지별 예측 시각으로 계산합니다.
+    """
+
+    predictions: Mapping[str, Mapping[str, float]]
+    codes: Mapping[str, str]
+    errors: Tuple[dict, ...]
+    created_at: datetime
+    refreshed_codes: Tuple[str, ...] = field(default_factory=tuple)
+    site_created_at: Mapping[str, datetime] = field(default_factory=dict)
+
+    def predicted_at(self, tourist_code: Optional[str] = None) -> datetime:
+        """
+        예측 시각
+
+        Args:
+            tourist_code: 관광지 코드 (None이면 가장 오래된 관광지의 예측 시각)
+        """
+        if tourist_code is not None:
+            return self.site_created_at.get(tourist_code, self.created_at)
+        return min(self.site_created_at.values(), default=self.created_at)
+
+    def age_seconds(self, now: Optional[datetime] = None, tourist_code: Optional[str] = None) -> float:
+        """예측 후 경과 시간 (초, tourist_code가 None이면 가장 오래된 관광지 기준)"""
+        now = now or datetime.now()
+        return (now - self.predicted_at(tourist_code)).total_seconds()
+
+    def is_stale(self, now: Optional[datetime] = None, tourist_code: Optional[str] = None) -> bool:
+        """최대 허용 나이(SNAPSHOT_MAX_AGE)를 넘었는지 여부 (tourist_code가 None이면 가장 오래된 관광지 기준)"""
+        return self.age_seconds(now, tourist_code) > MLConfig.SNAPSHOT_MAX_AGE
+
+    def get(self, tourist_code: str) -> Optional[dict]:
+        """관광지 코드의 예측 결과 {"관광지명": {...}} 반환 (없으면 None)"""
+        korean_name = self.codes.get(tourist_code)
+        if korean_name is None:
+            return None
+        return {korean_name: dict(self.predictions[korean_name])}
+
+    def metadata(self, now: Optional[datetime] = None) -> dict:
+        """
+        응답에 포함할 스냅샷 메타데이터
+
+        Returns:
+            dict: created_at(갱신 시각), age_seconds/stale(가장 오래된 관광지 기준),
+                  sites(관광지 코드별 created_at, age_seconds, stale, carried_over: 이전 갱신의 예측을 이어받았는지 여부)
+        """
+        now = now or datetime.now()
+        return {
+            "created_at": self.created_at.isoformat(),
+            "age_seconds": round(self.age_seconds(now), 3),
+            "stale": self.is_stale(now),
+            "sites": {
+                code: {
+                    "created_at": self.predicted_at(code).isoformat(),
+                    "age_seconds": round(self.age_seconds(now, code), 3),
+                    "stale": self.is_stale(now, code),
+                    "carried_over": code not in self.refreshed_codes
+                }
+                for code in self.codes
+            }
+        }
+
+    def to_state(self) -> dict:
+        """다른 프로세스와 공유할 수 있는 일반 dict로 변환 (MappingProxyType은 pickle 불가)"""
+        return {
+            "predictions": {name: dict(result) for name, result in self.predictions.items()},
+            "codes": dict(self.codes),
+            "errors": list(self.errors),
+            "created_at": self.created_at,
+            "refreshed_codes": list(self.refreshed_codes),
+            "site_created_at": dict(self.site_created_at)
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> "PredictionSnapshot":
+        """to_state 결과로 스냅샷 복원"""
+        return cls(
+            predictions=MappingProxyType({
+                name: MappingProxyType(dict(result)) for name, result in state["predictions"].items()
+            }),
+            codes=MappingProxyType(dict(state["codes"])),
+            errors=tuple(state["errors"]),
+            created_at=state["created_at"],
+            refreshed_codes=tuple(state["refreshed_codes"]),
+            site_created_at=MappingProxyType(dict(state.get("site_created_at", {})))
+        )
+
+
+def build_snapshot(results: dict, errors: List[dict], previous: Optional[PredictionSnapshot] = None,
+                   now: Optional[datetime] = None) -> PredictionSnapshot:
+    """
+    예측 결과로 새 스냅샷 생성
+
+    이번 갱신에서 실패한 관광지는 이전 스냅샷의 값과 예측 시각을 그대로 유지하며,
+    이어받은 예측이 SNAPSHOT_MAX_AGE보다 오래되면 버리고 오류로 표시합니다.
+    errors에는 예측을 반환하지 않는 관광지만 남깁니다 (이어받은 예측이 있는 관광지의 오류는 제외).
+    """
+    now = now or datetime.now()
+    codes_by_name = {info["korean_name"]: code for code, info in MLConfig.TOURIST_SITES.items()}
+
+    predictions = {}
+    codes = {}
+    site_created_at = {}
+    if previous is not None:
+        for code, korean_name in previous.codes.items():
+            predicted_at = previous.predicted_at(code)
+            if (now - predicted_at).total_seconds() > MLConfig.SNAPSHOT_MAX_AGE:
+                continue
+            predictions[korean_name] = previous.predictions[korean_name]
+            codes[code] = korean_name
+            site_created_at[code] = predicted_at
+
+    for korean_name, result in results.items():
+        code = codes_by_name[korean_name]
+        predictions[korean_name] = MappingProxyType(dict(result))
+        codes[code] = korean_name
+        site_created_at[code] = now
+
+    return PredictionSnapshot(
+        predictions=MappingProxyType(predictions),
+        codes=MappingProxyType(codes),
+        errors=tuple(error for error in errors if error.get("code") not in codes),
+        created_at=now,
+        refreshed_codes=tuple(codes_by_name[name] for name in results),
+        site_created_at=MappingProxyType(site_created_at)
+    )
+
+
+def next_refresh_time(now: Optional[datetime] = None) -> datetime:
+    """
+    다음 갱신 시각 계산
+
+    SNAPSHOT_REFRESH_MINUTES(매시 n분 목록) 중 현재 이후 가장 가까운 시각을 반환합니다.
+    기본값은 서울시 대기환경 발표(약 20분)와 기상청 초단기실황 제공(40분 이후) 직후입니다.
+    """
+    now = now or datetime.now()
+    hour_start = now.replace(minute=0, second=0, microsecond=0)
+    candidates = [
+        hour_start + timedelta(hours=offset, minutes=minute)
+        for offset in (0, 1)
+        for minute in MLConfig.SNAPSHOT_REFRESH_MINUTES
+    ]
+    return min(candidate for candidate in candidates if candidate > now)
+
+
+class SnapshotScheduler:
+    """
+    예측 스냅샷 백그라운드 갱신 스케줄러
+
+    시작 시 한 번, 이후 업스트림 발표 시각마다 관측 데이터를 새로 수집하고
+    전체 예측을 다시 계산하여 스냅샷을 교체합니다.
+    갱신에 실패하면 이전 스냅샷을 계속 제공하고 SNAPSHOT_RETRY_SECONDS 후 재시도합니다.
+
+    여러 워커가 관측 데이터 캐시를 공유하는 경우(leader 지정) 잠금을 얻은 워커 하나만 업스트림 데이터를 갱신하여
+    스냅샷을 공유 캐시에 저장하고, 나머지 워커는 SNAPSHOT_FOLLOW_SECONDS마다 공유 스냅샷을 읽습니다.
+    담당 워커가 종료되면 다른 워커가 잠금을 이어받아 갱신합니다.
+
+    Args:
+        service: PredictionService
+        leader: 갱신 담당 워커 선출 잠금 (RefreshLeader, None이면 단일 워커로 항상 갱신)
+    """
+
+    def __init__(self, service, leader=None):
+        self.service = service
+        self.leader = leader
+        self.snapshot: Optional[PredictionSnapshot] = None
+        self.last_refresh_at: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+        self.next_refresh_at: Optional[datetime] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def refresh(self, clear_cache: bool = True) -> PredictionSnapshot:
+        """
+        관측 데이터를 새로 수집하여 스냅샷 갱신
+
+        Args:
+            clear_cache: 캐시된 대기환경/기상 관측값을 버리고 새로 수집 (모델만 교체된 경우 False)
+
+        Raises:
+            RuntimeError: 모든 관광지 예측에 실패한 경우 (이전 스냅샷 유지)
+        """
+        # 발표 직후 갱신이므로 캐시된 실시간 관측값만 버리고 새로 수집
+        # (예보/예측 시계열 캐시와 공유 스냅샷은 유지하여 다른 워커가 스냅샷 없는 구간을 보지 않도록 함)
+        if clear_cache:
+            self.service.observation_cache.invalidate(REALTIME_OBSERVATION_KINDS)
+        results, errors = await self.service.predict_all_async()
+        self.last_refresh_at = datetime.now()
+
+        if not results:
+            messages = "; ".join(f"{e['code']}: {e['error']}" for e in errors) or "결과 없음"
+            raise RuntimeError(f"스냅샷 갱신 실패: {messages}")
+
+        self.snapshot = build_snapshot(results, errors, previous=self.snapshot)
+        self.last_error = "; ".join(f"{e['code']}: {e['error']}" for e in errors) or None
+        if self.leader is not None and self.leader.is_leader:
+            self.service.observation_cache.set(
+                SHARED_SNAPSHOT_KEY, self.snapshot.to_state(),
+                self.snapshot.created_at + timedelta(seconds=MLConfig.SNAPSHOT_MAX_AGE)
+            )
+        return self.snapshot
+
+    def follow(self) -> Optional[PredictionSnapshot]:
+        """공유 캐시의 스냅샷이 현재 스냅샷보다 새로우면 교체 (갱신 담당이 아닌 워커)"""
+        state = self.service.observation_cache.get(SHARED_SNAPSHOT_KEY)
+        if state is not None and (self.snapshot is None or state["created_at"] > self.snapshot.created_at):
+            self.snapshot = PredictionSnapshot.from_state(state)
+        return self.snapshot
+
+    @property
+    def role(self) -> Optional[str]:
+        """다중 워커에서의 역할 (leader: 갱신 담당, follower: 공유 스냅샷 사용, None: 단일 워커)"""
+        if self.leader is None:
+            return None
+        return "leader" if self.leader.is_leader else "follower"
+
+    async def run(self):
+        """갱신 루프 (start()에서 백그라운드 태스크로 실행)"""
+        while True:
+            if self.leader is not None and not self.leader.try_acquire():
+                # 다른 워커가 갱신 담당: 공유 스냅샷만 읽음
+                try:
+                    self.follow()
+                    self.next_refresh_at = datetime.now() + timedelta(seconds=MLConfig.SNAPSHOT_FOLLOW_SECONDS)
+                except Exception as e:
+                    self.last_error = str(e)
+                    warnings.warn(f"공유 예측 스냅샷 읽기 실패, 이전 스냅샷 유지: {e}")
+                await asyncio.sleep(MLConfig.SNAPSHOT_FOLLOW_SECONDS)
+                continue
+
+            try:
+                await self.refresh()
+                self.next_refresh_at = next_refresh_time()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.last_error = str(e)
+                warnings.warn(f"예측 스냅샷 갱신 실패, 이전 스냅샷 유지: {e}")
+                retry_at = datetime.now() + timedelta(seconds=MLConfig.SNAPSHOT_RETRY_SECONDS)
+                self.next_refresh_at = min(retry_at, next_refresh_time())
+
+            delay = (self.next_refresh_at - datetime.now()).total_seconds()
+            await asyncio.sleep(max(delay, 0.0))
+
+    def start(self):
+        """백그라운드 갱신 시작"""
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        """백그라운드 갱신 중지"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.leader is not None:
+            self.leader.release()
+
+    def status(self) -> dict:
+        """스케줄러 상태"""
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "role": self.role,
+            "pid": os.getpid(),
+            "snapshot": self.snapshot.metadata() if self.snapshot else None,
+            "last_refresh_at": self.last_refresh_at.isoformat() if self.last_refresh_at else None,
+            "next_refresh_at": self.next_refresh_at.isoformat() if self.next_refresh_at else None,
+            "last_error": self.last_error
+        }
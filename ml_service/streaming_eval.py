@@ -0,0 +1,211 @@
+"""
+청크 단위 스트리밍 평가 모듈
+테이블 전체를 한 번에 메모리에 올리지 않고 청크마다 예측한 뒤 지표의 충분 통계량만 누적
+
+- 학습/테스트 분할: 행 키(SQLite rowid)의 해시로 결정하므로 청크 크기나 읽는 순서와 무관하게 같은 행은 항상 같은 쪽
+  (scripts/train_models.py도 hash_train_test_split으로 같은 분할을 사용하고 피처 스키마에 SPLIT_METHOD로 기록)
+- 지표: 오차 합계, 제곱 오차 합계, 절대 백분율 오차 합계와 실제값의 평균/편차 제곱합(Welford)으로 MAE, MSE, RMSE, R², MAPE 계산
+- 산점도: 해시 우선순위가 가장 작은 테스트 행 k개를 유지하는 결정적 표본 (크기 고정)
+"""
+from typing import Tuple
+
+import numpy as np
+
+# sklearn mean_absolute_percentage_error와 같은 0 나눗셈 방지값
+_EPSILON = np.finfo(np.float64).eps
+
+# splitmix64 상수
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+_MIX1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX2 = np.uint64(0x94D049BB133111EB)
+
+# 학습/테스트 분할과 표본 우선순위에 서로 다른 해시를 쓰기 위한 시드 오프셋
+_SAMPLE_SEED_OFFSET = 0x5A17
+
+# 학습 시 분할 방식 기록값 (피처 스키마와 평가 아티팩트의 split.method)
+SPLIT_METHOD = "row_hash"
+
+
+def row_hash(keys: np.ndarray, seed: int = 0) -> np.ndarray:
+    """
+    행 키의 64비트 해시 (splitmix64, 플랫폼/프로세스와 무관하게 같은 값)
+
+    Args:
+        keys: 정수 행 키 배열
+        seed: 해시 시드
+
+    Returns:
+        np.ndarray: uint64 해시 배열
+    """
+    with np.errstate(over="ignore"):
+        z = np.asarray(keys).astype(np.uint64) + np.uint64(seed) * _GOLDEN + _GOLDEN
+        z = (z ^ (z >> np.uint64(30))) * _MIX1
+        z = (z ^ (z >> np.uint64(27))) * _MIX2
+        return z ^ (z >> np.uint64(31))
+
+
+def hash_unit(keys: np.ndarray, seed: int = 0) -> np.ndarray:
+    """행 키 해시를 [0, 1) 구간 실수로 변환 (상위 53비트 사용)"""
+    return (row_hash(keys, seed) >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+
+
+def hash_split(keys: np.ndarray, test_size: float, seed: int = 0) -> np.ndarray:
+    """
+    행 키 해시 기반 학습/테스트 분할
+
+    Returns:
+        np.ndarray: 테스트 행이면 True인 bool 마스크 (전체의 약 test_size 비율)
+    """
+    return hash_unit(keys, seed) < test_size
+
+
+def hash_train_test_split(X, y, test_size: float, seed: int = 0) -> Tuple:
+    """
+    행 키 해시 기반 학습/테스트 분할 (X, y의 인덱스를 행 키로 사용, 스트리밍 평가와 같은 분할)
+
+    Args:
+        X: Feature DataFrame (인덱스: SQLite rowid)
+        y: Label Series (X와 같은 인덱스)
+        test_size: 테스트 비율
+        seed: 해시 시드
+
+    Returns:
+        tuple: (X_train, X_test, y_train, y_test)
+    """
+    is_test = hash_split(X.index.to_numpy(), test_size, seed)
+    return X[~is_test], X[is_test], y[~is_test], y[is_test]
+
+
+class RunningMoments:
+    """
+    개수, 평균, 편차 제곱합, 최솟값, 최댓값의 누적 계산 (청크 단위 Welford/Chan 병합)
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values: np.ndarray):
+        """청크 값 누적"""
+        values = np.asarray(values, dtype=np.float64)
+        n = len(values)
+        if n == 0:
+            return
+        mean = float(values.mean())
+        m2 = float(((values - mean) ** 2).sum())
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta * delta * self.count * n / total
+        self.count = total
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+    def std(self, ddof: int = 0) -> float:
+        """표준편차 (ddof=1이면 표본 표준편차, 데이터가 부족하면 nan)"""
+        if self.count - ddof <= 0:
+            return float("nan")
+        return float(np.sqrt(self.m2 / (self.count - ddof)))
+
+
+class RunningRegressionMetrics:
+    """
+    회귀 지표의 충분 통계량 누적
+
+    metrics()는 scripts/evaluate_models.py의 전체 데이터 평가와 같은 키와 단위의 지표를 반환합니다
+    (MAPE는 백분율, 실제값이 0이면 sklearn과 같이 분모를 float64 eps로 대체).
+    """
+
+    def __init__(self):
+        self.actual = RunningMoments()
+        self.predicted = RunningMoments()
+        self.abs_error = 0.0
+        self.squared_error = 0.0
+        self.abs_percentage_error = 0.0
+
+    @property
+    def count(self) -> int:
+        """누적된 행 수"""
+        return self.actual.count
+
+    def update(self, actual: np.ndarray, predicted: np.ndarray):
+        """청크의 실제값/예측값 누적"""
+        actual = np.asarray(actual, dtype=np.float64)
+        predicted = np.asarray(predicted, dtype=np.float64)
+        error = actual - predicted
+        self.abs_error += float(np.abs(error).sum())
+        self.squared_error += float((error ** 2).sum())
+        self.abs_percentage_error += float((np.abs(error) / np.maximum(np.abs(actual), _EPSILON)).sum())
+        self.actual.update(actual)
+        self.predicted.update(predicted)
+
+    def metrics(self) -> dict:
+        """
+        누적된 데이터의 지표
+
+        Returns:
+            dict: MAE, MSE, RMSE, R², MAPE (데이터가 없으면 모두 nan)
+        """
+        n = self.count
+        if n == 0:
+            return {name: float("nan") for name in ("MAE", "MSE", "RMSE", "R²", "MAPE")}
+        mse = self.squared_error / n
+        if self.actual.m2 > 0:
+            r2 = 1.0 - self.squared_error / self.actual.m2
+        else:
+            # 실제값이 모두 같으면 sklearn r2_score와 같이 완전 예측 1.0, 그 외 0.0
+            r2 = 1.0 if self.squared_error == 0 else 0.0
+        return {
+            "MAE": self.abs_error / n,
+            "MSE": mse,
+            "RMSE": float(np.sqrt(mse)),
+            "R²": r2,
+            "MAPE": self.abs_percentage_error / n * 100
+        }
+
+
+class HashSample:
+    """
+    해시 우선순위 기반 고정 크기 표본 (bottom-k)
+
+    행 키 해시가 가장 작은 size개 행을 유지하므로 청크 크기나 순서와 무관하게 같은 표본이 되고,
+    메모리는 size개 행만 사용합니다. 반환 순서는 행 키 순입니다.
+
+    Args:
+        size: 표본 크기
+        seed: 우선순위 해시 시드
+    """
+
+    def __init__(self, size: int, seed: int = 0):
+        self.size = size
+        self.seed = seed + _SAMPLE_SEED_OFFSET
+        self._priority = np.empty(0, dtype=np.uint64)
+        self._keys = np.empty(0, dtype=np.int64)
+        self._actual = np.empty(0, dtype=np.float64)
+        self._predicted = np.empty(0, dtype=np.float64)
+
+    def update(self, keys: np.ndarray, actual: np.ndarray, predicted: np.ndarray):
+        """청크의 행을 표본 후보에 추가"""
+        if self.size <= 0 or len(keys) == 0:
+            return
+        priority = np.concatenate([self._priority, row_hash(keys, self.seed)])
+        keys = np.concatenate([self._keys, np.asarray(keys, dtype=np.int64)])
+        actual = np.concatenate([self._actual, np.asarray(actual, dtype=np.float64)])
+        predicted = np.concatenate([self._predicted, np.asarray(predicted, dtype=np.float64)])
+        if len(priority) > self.size:
+            keep = np.argpartition(priority, self.size - 1)[:self.size]
+            priority, keys, actual, predicted = priority[keep], keys[keep], actual[keep], predicted[keep]
+        self._priority, self._keys, self._actual, self._predicted = priority, keys, actual, predicted
+
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        표본 배열
+
+        Returns:
+            tuple: (실제값, 예측값) 행 키 순
+        """
+        order = np.argsort(self._keys, kind="stable")
+        return self._actual[order], self._predicted[order]
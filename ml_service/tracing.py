@@ -0,0 +1,261 @@
+"""
+요청 추적 모듈
+?trace=1 또는 X-Debug-Trace 헤더가 있는 요청만 단계별 소요 시간을 span 트리로 기록하여
+응답 본문(trace)과 Server-Timing 헤더로 반환
+
+현재 span은 contextvars로 전달되므로 asyncio 태스크와 asyncio.to_thread에는 자동으로 이어지고,
+스레드 풀에 직접 제출하는 작업은 contextvars.copy_context().run으로 감싸야 합니다.
+추적하지 않는 요청에서는 ContextVar 조회 한 번만 수행합니다.
+"""
+import re
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Sequence
+
+from ml_service.config import MLConfig
+
+# Server-Timing 메트릭 이름에 쓸 수 없는 문자 (RFC 7230 token)
+_NON_TOKEN = re.compile(r"[^A-Za-z0-9!#$%&'*+.^_`|~-]")
+
+
+class Span:
+    """
+    추적 구간 하나 (이름, 속성, 하위 구간)
+
+    Args:
+        name: 구간 이름 (단계 이름, upstream.kma 등)
+        attributes: 구간 속성 (캐시 적중 여부, 오류 유형 등)
+    """
+
+    __slots__ = ("name", "attributes", "children", "start", "end")
+
+    def __init__(self, name: str, attributes: Optional[dict] = None):
+        self.name = name
+        self.attributes = attributes or {}
+        self.children: List["Span"] = []
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+
+    def set(self, **attributes):
+        """구간 속성 추가"""
+        self.attributes.update(attributes)
+
+    def finish(self):
+        """구간 종료 시각 기록 (이미 종료된 경우 무시)"""
+        if self.end is None:
+            self.end = time.perf_counter()
+
+    @property
+    def duration_ms(self) -> float:
+        """소요 시간 (밀리초, 진행 중이면 현재까지)"""
+        end = self.end if self.end is not None else time.perf_counter()
+        return (end - self.start) * 1000
+
+    def to_dict(self, origin: Optional[float] = None) -> dict:
+        """
+        응답에 포함할 span 트리
+
+        Args:
+            origin: start_ms 기준 시각 (None이면 이 구간의 시작 시각)
+        """
+        origin = self.start if origin is None else origin
+        result = {
+            "name": self.name,
+            "start_ms": round((self.start - origin) * 1000, 3),
+            "duration_ms": round(self.duration_ms, 3)
+        }
+        if self.attributes:
+            result["attributes"] = dict(self.attributes)
+        if self.children:
+            # 스레드 풀 작업은 끝나는 순서대로 추가되므로 시작 시각 순으로 정렬
+            children = sorted(list(self.children), key=lambda child: child.start)
+            result["children"] = [child.to_dict(origin) for child in children]
+        return result
+
+    def walk(self):
+        """하위 구간 전체 (자기 자신 제외, 깊이 우선)"""
+        for child in list(self.children):
+            yield child
+            yield from child.walk()
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+_root_span: ContextVar[Optional[Span]] = ContextVar("root_span", default=None)
+
+
+class _SpanScope:
+    """현재 span 아래에 하위 span을 만들고 현재 span으로 지정하는 컨텍스트 매니저"""
+
+    __slots__ = ("parent", "name", "attributes", "span", "_token")
+
+    def __init__(self, parent: Span, name: str, attributes: dict):
+        self.parent = parent
+        self.name = name
+        self.attributes = attributes
+
+    def __enter__(self) -> Span:
+        self.span = Span(self.name, self.attributes)
+        # list.append는 원자적이므로 여러 스레드가 같은 부모에 추가해도 안전
+        self.parent.children.append(self.span)
+        self._token = _current_span.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        self.span.finish()
+        if exc_type is not None:
+            self.span.attributes["error"] = exc_type.__name__
+        _current_span.reset(self._token)
+        return False
+
+
+class _NoopSpan:
+    """추적하지 않는 요청에서 사용하는 빈 span (set 호출 무시)"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **attributes):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def span(name: str, **attributes):
+    """
+    하위 구간 기록 컨텍스트 매니저 (추적 중이 아니면 아무것도 하지 않음)
+
+    Usage:
+        with span("cache_lookup") as s:
+            value = cache.get(key)
+            s.set(hit=value is not None)
+    """
+    parent = _current_span.get()
+    if parent is None:
+        return _NOOP_SPAN
+    return _SpanScope(parent, name, attributes)
+
+
+def annotate(**attributes):
+    """현재 구간에 속성 추가 (추적 중이 아니면 무시)"""
+    current = _current_span.get()
+    if current is not None:
+        current.set(**attributes)
+
+
+def current_trace() -> Optional[Span]:
+    """현재 요청의 최상위 구간 (추적 중이 아니면 None)"""
+    return _root_span.get()
+
+
+def start_trace(name: str) -> tuple:
+    """
+    추적 시작 (현재 컨텍스트의 최상위 구간 지정)
+
+    Returns:
+        tuple: (최상위 Span, end_trace에 넘길 토큰)
+    """
+    root = Span(name)
+    return root, (_root_span.set(root), _current_span.set(root))
+
+
+def end_trace(tokens: tuple):
+    """start_trace 이전 상태로 복원"""
+    root_token, current_token = tokens
+    _current_span.reset(current_token)
+    _root_span.reset(root_token)
+
+
+def attach_trace(result):
+    """
+    추적 중이면 응답 dict에 span 트리(trace)를 추가한 복사본 반환
+
+    Args:
+        result: 응답 dict (스냅샷의 읽기 전용 매핑도 가능)
+
+    Returns:
+        추적 중이 아니면 result 그대로
+    """
+    root = current_trace()
+    if root is None:
+        return result
+    return {**result, "trace": root.to_dict()}
+
+
+def server_timing(root: Span, limit: int = 32) -> str:
+    """
+    Server-Timing 헤더 값 (구간 이름별 소요 시간 합계 + total)
+
+    같은 이름의 구간(관광지별 model_predict 등)은 합산하고 desc에 횟수를 표시합니다.
+    하위 구간의 시간은 상위 구간에도 포함되므로 합계가 total보다 클 수 있습니다.
+    """
+    totals: Dict[str, list] = {}
+    for child in root.walk():
+        name = _NON_TOKEN.sub("_", child.name)
+        entry = totals.setdefault(name, [0.0, 0])
+        entry[0] += child.duration_ms
+        entry[1] += 1
+
+    parts = [
+        f'{name};dur={duration:.3f};desc="{count}x"' if count > 1 else f"{name};dur={duration:.3f}"
+        for name, (duration, count) in list(totals.items())[:limit]
+    ]
+    parts.append(f"total;dur={root.duration_ms:.3f}")
+    return ", ".join(parts)
+
+
+def trace_requested(scope) -> bool:
+    """?trace=1(true) 쿼리 파라미터 또는 TRACE_HEADER 헤더(1/true)가 있는지 확인"""
+    for pair in scope.get("query_string", b"").decode("latin-1").split("&"):
+        key, _, value = pair.partition("=")
+        if key == "trace" and value.lower() in ("1", "true"):
+            return True
+    header = MLConfig.TRACE_HEADER.lower().encode("latin-1")
+    for key, value in scope.get("headers", []):
+        if key == header and value.decode("latin-1").lower() in ("1", "true"):
+            return True
+    return False
+
+
+class TraceMiddleware:
+    """
+    추적을 요청한 API 요청에 최상위 구간을 만들고 Server-Timing 헤더를 추가하는 ASGI 미들웨어
+
+    span 트리는 엔드포인트가 attach_trace로 응답 본문에 넣습니다.
+    Timing-Allow-Origin 헤더도 함께 보내므로 다른 출처의 프론트엔드에서도 브라우저 개발자 도구에 표시됩니다.
+
+    Args:
+        app: ASGI 애플리케이션
+        prefixes: 추적을 허용할 경로 접두사
+    """
+
+    def __init__(self, app, prefixes: Sequence[str] = ("/api/predict", "/api/evaluate")):
+        self.app = app
+        self.prefixes = tuple(prefixes)
+
+    async def __call__(self, scope, receive, send):
+        if (scope["type"] != "http" or not MLConfig.TRACE_ENABLED
+                or not scope["path"].startswith(self.prefixes) or not trace_requested(scope)):
+            await self.app(scope, receive, send)
+            return
+
+        root, tokens = start_trace(f"{scope['method']} {scope['path']}")
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                root.finish()
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", server_timing(root).encode("latin-1")))
+                headers.append((b"timing-allow-origin", b"*"))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            end_trace(tokens)
@@ -0,0 +1,371 @@
+"""
+트리 평가 엔진 모듈
+저장된 XGBoost 모델을 float32 노드 배열로 컴파일하여 NumPy만으로 예측
+"""
+import json
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+
+from ml_service.config import MLConfig
+from ml_service.preprocessing import ObservationFeatureTransformer, get_model_pipeline, has_feature_step
+
+# 컴파일된 트리 파일 형식 버전 (배열 구성이 바뀌면 증가)
+COMPILED_FORMAT_VERSION = 1
+
+# 컴파일을 지원하는 목적 함수 (예측값 = base_score + 리프 값 합계)
+SUPPORTED_OBJECTIVES = ("reg:squarederror", "reg:absoluteerror", "reg:pseudohubererror")
+
+# 완전 이진 트리 배열 크기가 2^depth이므로 깊이 제한
+MAX_COMPILED_DEPTH = 12
+
+# check_parity에서 한 행씩 따로 비교할 행 수
+PARITY_SINGLE_ROWS = 64
+
+# 한 번에 평가할 행 수 ((트리 수, 행 수) 중간 배열이 CPU 캐시에 들어가는 크기)
+CHUNK_ROWS = 512
+
+
+class CompiledForest:
+    """
+    배열 기반 트리 앙상블
+
+    모든 트리를 같은 깊이의 완전 이진 트리(힙 배열)로 펼쳐 저장합니다.
+    노드 i의 자식은 2i+1, 2i+2이므로 자식 인덱스 배열 없이 한 단계씩 이동하고,
+    최대 깊이보다 얕은 리프는 항상 왼쪽으로 가는 분기(threshold=inf)로 채워
+    아래 리프 칸에 같은 값을 복사합니다.
+
+    분기 규칙은 XGBoost와 같습니다: x < threshold이면 왼쪽, 결측값은 default_left 방향.
+    리프 값은 트리 순서대로 float32로 누적하여 XGBoost 예측값과 비트 단위로 일치합니다.
+
+    Args:
+        feature: (트리 수, 2^depth - 1) 분기 피처 인덱스
+        threshold: (트리 수, 2^depth - 1) 분기 임계값
+        default_left: (트리 수, 2^depth - 1) 결측값이 왼쪽으로 가는지 여부
+        leaf_value: (트리 수, 2^depth) 리프 값
+        base_score: 초기 예측값
+        feature_names: 모델 입력 피처 순서
+    """
+
+    def __init__(self, feature: np.ndarray, threshold: np.ndarray, default_left: np.ndarray,
+                 leaf_value: np.ndarray, base_score: float, feature_names: list):
+        self.feature = np.ascontiguousarray(feature, dtype=np.intp)
+        self.threshold = np.ascontiguousarray(threshold, dtype=np.float32)
+        self.default_left = np.ascontiguousarray(default_left, dtype=bool)
+        self.leaf_value = np.ascontiguousarray(leaf_value, dtype=np.float32)
+        self.base_score = np.float32(base_score)
+        self.feature_names = list(feature_names)
+        self.depth = int(np.log2(self.leaf_value.shape[1]))
+
+        n_trees, n_internal = self.feature.shape
+        self._internal_offsets = (np.arange(n_trees, dtype=np.intp) * n_internal)[:, None]
+        # 마지막 단계의 힙 인덱스(n_internal ~ 2*n_internal)를 리프 배열의 평탄화 인덱스로 변환
+        self._leaf_offsets = (np.arange(n_trees, dtype=np.intp) * self.leaf_value.shape[1] - n_internal)[:, None]
+
+    @property
+    def n_trees(self) -> int:
+        return self.feature.shape[0]
+
+    @classmethod
+    def from_booster(cls, booster) -> "CompiledForest":
+        """
+        XGBoost Booster를 컴파일
+
+        Raises:
+            ValueError: gbtree가 아니거나 범주형 분기, 다중 출력, 지원하지 않는 목적 함수를 사용하는 경우
+        """
+        trees, base_score, feature_names = booster_trees(booster)
+        depth = max(tree_depth(tree) for tree in trees)
+        return cls(*heap_arrays(trees, depth), base_score, feature_names)
+
+    def leaf_values(self, X: np.ndarray, tree_rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        트리별 도착 리프 값
+
+        Args:
+            X: (n, 피처 수) float32 배열
+            tree_rows: 트리별로 평가할 행 하나를 지정하는 (트리 수,) 인덱스 (None이면 모든 트리가 모든 행 평가)
+
+        Returns:
+            np.ndarray: (트리 수, n) 또는 tree_rows를 지정하면 (트리 수, 1) 리프 값
+        """
+        n_rows = X.shape[0]
+        # (피처 수, n) 평탄화 배열에서 (트리 수, 행) 위치의 값을 한 번에 조회
+        flat_x = np.ascontiguousarray(X.T).ravel()
+        if tree_rows is None:
+            row_offsets = np.arange(n_rows, dtype=np.intp)
+            width = n_rows
+        else:
+            row_offsets = np.asarray(tree_rows, dtype=np.intp)[:, None]
+            width = 1
+        has_missing = bool(np.isnan(flat_x).any())
+        feature = self.feature.ravel()
+        threshold = self.threshold.ravel()
+
+        node = np.zeros((self.n_trees, width), dtype=np.intp)
+        for _ in range(self.depth):
+            flat_node = node + self._internal_offsets
+            x = flat_x[feature[flat_node] * n_rows + row_offsets]
+            go_right = x >= threshold[flat_node]
+            if has_missing:
+                missing = np.isnan(x)
+                go_right[missing] = ~self.default_left.ravel()[flat_node[missing]]
+            node = 2 * node + 1 + go_right
+
+        return self.leaf_value.ravel()[node + self._leaf_offsets]
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        """
+        피처 배열 예측
+
+        Args:
+            features: (n, 피처 수) 배열 (feature_names 순서)
+
+        Returns:
+            np.ndarray: (n,) float32 예측값
+        """
+        X = np.asarray(features, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != len(self.feature_names):
+            raise ValueError(f"입력 형식이 올바르지 않습니다: {X.shape} (필요: (n, {len(self.feature_names)}))")
+        if len(X) <= CHUNK_ROWS:
+            return self._predict_chunk(X)
+
+        out = np.empty(len(X), dtype=np.float32)
+        for start in range(0, len(X), CHUNK_ROWS):
+            out[start:start + CHUNK_ROWS] = self._predict_chunk(X[start:start + CHUNK_ROWS])
+        return out
+
+    def _predict_chunk(self, X: np.ndarray) -> np.ndarray:
+        """행 묶음 하나를 모든 트리에 대해 동시에 평가"""
+        return accumulate_trees(self.leaf_values(X), self.base_score)
+
+    def save(self, path: Path):
+        """컴파일 결과를 .npz 파일로 저장"""
+        np.savez(
+            path,
+            format_version=np.int32(COMPILED_FORMAT_VERSION),
+            feature=self.feature.astype(np.int32),
+            threshold=self.threshold,
+            default_left=self.default_left,
+            leaf_value=self.leaf_value,
+            base_score=self.base_score,
+            feature_names=np.asarray(self.feature_names)
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "CompiledForest":
+        """
+        .npz 파일에서 컴파일 결과 로드
+
+        Raises:
+            ValueError: 파일 형식 버전이 다른 경우
+        """
+        with np.load(path) as data:
+            version = int(data["format_version"])
+            if version != COMPILED_FORMAT_VERSION:
+                raise ValueError(f"컴파일된 트리 형식 버전이 다릅니다: {version} (필요: {COMPILED_FORMAT_VERSION})")
+            return cls(
+                data["feature"], data["threshold"], data["default_left"], data["leaf_value"],
+                float(data["base_score"]), data["feature_names"].tolist()
+            )
+
+
+def accumulate_trees(leaves: np.ndarray, base_score: float) -> np.ndarray:
+    """
+    (트리 수, n) 리프 값을 base_score부터 트리 순서대로 float32로 누적
+
+    XGBoost와 같은 순서로 더해야 비트 단위로 일치합니다.
+    np.add.reduce는 행이 하나이면 쌍별(pairwise) 합으로 바뀌므로 항상 순차적인 accumulate를 사용합니다.
+    """
+    leaves = np.array(leaves, dtype=np.float32)
+    leaves[0] += np.float32(base_score)
+    return np.add.accumulate(leaves, axis=0)[-1]
+
+
+def booster_trees(booster) -> Tuple[list, float, list]:
+    """
+    Booster의 트리 목록(JSON), base_score, 피처 이름
+
+    Raises:
+        ValueError: gbtree가 아니거나 범주형 분기, 다중 출력, 지원하지 않는 목적 함수를 사용하는 경우
+    """
+    model = json.loads(booster.save_raw("json"))
+    learner = model["learner"]
+    model_param = learner["learner_model_param"]
+    objective = learner["objective"]["name"]
+    if objective not in SUPPORTED_OBJECTIVES:
+        raise ValueError(f"컴파일할 수 없는 목적 함수입니다: {objective}")
+
+    gradient_booster = learner["gradient_booster"]
+    if gradient_booster.get("name", "gbtree") != "gbtree":
+        raise ValueError(f"트리 모델(gbtree)만 컴파일할 수 있습니다: {gradient_booster.get('name')}")
+    if int(model_param.get("num_target", "1")) > 1 or int(model_param.get("num_class", "0")) > 1:
+        raise ValueError("다중 출력 모델은 컴파일할 수 없습니다.")
+
+    trees = gradient_booster["model"]["trees"]
+    # best_iteration이 있으면 XGBRegressor.predict와 같이 그 반복까지만 사용
+    best_iteration = booster.attr("best_iteration")
+    if best_iteration is not None:
+        trees = trees[:int(best_iteration) + 1]
+    for tree in trees:
+        if any(int(s) != 0 for s in tree.get("split_type", [])):
+            raise ValueError("범주형 분기가 있는 모델은 컴파일할 수 없습니다.")
+
+    base_score = float(model_param["base_score"].strip("[]"))
+    feature_names = booster.feature_names or [f"f{i}" for i in range(int(model_param["num_feature"]))]
+    return trees, base_score, list(feature_names)
+
+
+def tree_depth(tree: dict) -> int:
+    """루트에서 가장 깊은 리프까지의 분기 수"""
+    left = tree["left_children"]
+    right = tree["right_children"]
+    depth = 0
+    level = [0]
+    while True:
+        level = [child for node in level for child in (left[node], right[node]) if child != -1]
+        if not level:
+            return depth
+        depth += 1
+
+
+def heap_arrays(trees: list, depth: int, feature_map: Optional[np.ndarray] = None
+                ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    트리 목록(JSON)을 깊이 depth의 완전 이진 트리 배열로 변환
+
+    Args:
+        trees: booster_trees의 트리 목록
+        depth: 펼칠 깊이 (모든 트리의 깊이 이상)
+        feature_map: 모델 피처 인덱스 → 출력 피처 인덱스 (None이면 그대로)
+
+    Returns:
+        tuple: (feature, threshold, default_left, leaf_value)
+    """
+    if depth > MAX_COMPILED_DEPTH:
+        raise ValueError(f"트리 깊이({depth})가 컴파일 가능한 최대 깊이({MAX_COMPILED_DEPTH})를 넘습니다.")
+
+    n_internal = 2 ** depth - 1
+    feature = np.zeros((len(trees), n_internal), dtype=np.intp)
+    threshold = np.full((len(trees), n_internal), np.inf, dtype=np.float32)
+    default_left = np.ones((len(trees), n_internal), dtype=bool)
+    leaf_value = np.zeros((len(trees), n_internal + 1), dtype=np.float32)
+
+    for t, tree in enumerate(trees):
+        left = tree["left_children"]
+        right = tree["right_children"]
+        # (원래 노드, 힙 위치, 깊이)
+        stack = [(0, 0, 0)]
+        while stack:
+            node, pos, level = stack.pop()
+            if level == depth:
+                # XGBoost JSON에서 리프 노드의 split_conditions는 리프 값
+                leaf_value[t, pos - n_internal] = tree["split_conditions"][node]
+            elif left[node] == -1:
+                # 얕은 리프: 기본값(threshold=inf)으로 양쪽 모두 같은 리프로 이어짐
+                stack.extend([(node, 2 * pos + 1, level + 1), (node, 2 * pos + 2, level + 1)])
+            else:
+                split_index = tree["split_indices"][node]
+                feature[t, pos] = split_index if feature_map is None else feature_map[split_index]
+                threshold[t, pos] = tree["split_conditions"][node]
+                default_left[t, pos] = bool(tree["default_left"][node])
+                stack.extend([(left[node], 2 * pos + 1, level + 1), (right[node], 2 * pos + 2, level + 1)])
+
+    return feature, threshold, default_left, leaf_value
+
+
+class CompiledPipeline:
+    """
+    관측값 변환기 + 컴파일된 트리 (Pipeline.predict와 같은 입력/출력)
+
+    NumPy 평가는 행 수가 적을 때 XGBoost 호출 비용보다 빠르고, 많을 때는 느립니다.
+    COMPILED_MAX_BATCH_ROWS보다 큰 배치는 원래 Pipeline으로 예측합니다.
+
+    Args:
+        pipeline: 관측값 변환기 단계가 있는 원래 Pipeline
+        forest: 모델 단계를 컴파일한 CompiledForest
+    """
+
+    def __init__(self, pipeline, forest: CompiledForest):
+        transformer: ObservationFeatureTransformer = pipeline.steps[0][1]
+        if list(transformer.feature_columns_) != forest.feature_names:
+            raise ValueError("변환기 피처 순서와 컴파일된 모델의 피처 순서가 다릅니다.")
+        self.pipeline = pipeline
+        self.transformer = transformer
+        self.forest = forest
+
+    def predict(self, raw: np.ndarray) -> np.ndarray:
+        """관측값 배열 (n, 7) 예측"""
+        if len(raw) > MLConfig.COMPILED_MAX_BATCH_ROWS:
+            return self.pipeline.predict(raw)
+        return self.forest.predict(self.transformer.transform(raw))
+
+    def predict_features(self, features: np.ndarray) -> np.ndarray:
+        """변환기를 거친 피처 배열 예측"""
+        if len(features) > MLConfig.COMPILED_MAX_BATCH_ROWS:
+            return get_model_pipeline(self.pipeline).predict(features)
+        return self.forest.predict(features)
+
+
+def compile_pipeline(pipeline) -> CompiledForest:
+    """
+    관측값 변환기를 포함한 Pipeline의 모델 단계를 컴파일
+
+    Raises:
+        ValueError: 모델 단계가 XGBoost 모델 하나가 아닌 경우
+    """
+    model_pipeline = get_model_pipeline(pipeline)
+    steps = getattr(model_pipeline, "steps", [("model", model_pipeline)])
+    if len(steps) != 1 or not hasattr(steps[0][1], "get_booster"):
+        raise ValueError("변환기 뒤의 단계가 XGBoost 모델 하나인 Pipeline만 컴파일할 수 있습니다.")
+    return CompiledForest.from_booster(steps[0][1].get_booster())
+
+
+def compiled_path(model_path: Path) -> Path:
+    """모델 파일에 대응하는 컴파일된 트리 파일 경로 (model_x.pkl → model_x.trees.npz)"""
+    return model_path.with_suffix(".trees.npz")
+
+
+def load_compiled_pipeline(pipeline, model_path: Optional[Path] = None) -> CompiledPipeline:
+    """
+    Pipeline의 컴파일된 버전 반환
+
+    모델 파일보다 최신인 .trees.npz 파일이 있으면 이를 사용하고,
+    없으면 Pipeline의 Booster를 바로 컴파일합니다.
+
+    Raises:
+        ValueError: 관측값 변환기 단계가 없거나 모델을 컴파일할 수 없는 경우
+    """
+    if not has_feature_step(pipeline):
+        raise ValueError("관측값 변환기 단계가 있는 Pipeline만 컴파일할 수 있습니다.")
+
+    forest = None
+    if model_path is not None:
+        path = compiled_path(model_path)
+        if path.exists() and path.stat().st_mtime >= model_path.stat().st_mtime:
+            forest = CompiledForest.load(path)
+    if forest is None:
+        forest = compile_pipeline(pipeline)
+    return CompiledPipeline(pipeline, forest)
+
+
+def check_parity(pipeline, forest: CompiledForest, raw: np.ndarray) -> dict:
+    """
+    XGBoost Pipeline과 컴파일된 트리의 예측 차이 측정
+
+    Returns:
+        dict: {"samples", "max_abs_diff", "mismatched_visitors"} (mismatched_visitors는 정수 방문자 수가 다른 행 수)
+    """
+    expected = np.asarray(pipeline.predict(raw), dtype=np.float32)
+    features = pipeline.steps[0][1].transform(raw)
+    actual = forest.predict(features)
+    # 한 행 예측은 배치와 다른 경로(합산 순서)를 타므로 앞부분 행은 한 행씩 따로 비교
+    n_single = min(len(raw), PARITY_SINGLE_ROWS)
+    actual[:n_single] = [forest.predict(features[i:i + 1])[0] for i in range(n_single)]
+    diff = np.abs(expected.astype(float) - actual.astype(float))
+    return {
+        "samples": int(len(raw)),
+        "max_abs_diff": float(diff.max()) if diff.size else 0.0,
+        "mismatched_visitors": int((expected.astype(np.int64) != actual.astype(np.int64)).sum())
+    }
@@ -0,0 +1,471 @@
+"""
+업스트림 API 클라이언트 모듈
+서울시 대기환경 API / 기상청 초단기실황·단기예보 API 요청 생성, 응답 파싱 및 비동기 호출
+"""
+import asyncio
+import re
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import pandas as pd
+
+from ml_service.config import MLConfig
+from ml_service.fixtures import record_fixture
+from ml_service.metrics import timed_stage
+from ml_service.resilience import (
+    AIR_QUALITY_UPSTREAM,
+    KMA_UPSTREAM,
+    Deadline,
+    DeadlineExceededError,
+    UpstreamGuard,
+    build_upstream_guards,
+)
+from ml_service.tracing import span
+
+
+def build_air_quality_url(district_code: str) -> str:
+    """서울시 자치구별 실시간 대기환경 API URL 생성"""
+    return (
+        f"{MLConfig.SEOUL_AIR_QUALITY_API_BASE_URL}/{MLConfig.SEOUL_AIR_QUALITY_API_KEY}"
+        f"/{MLConfig.AIR_QUALITY_API_TYPE}/{MLConfig.AIR_QUALITY_API_SERVICE}"
+        f"/{MLConfig.AIR_QUALITY_API_START_INDEX}/{MLConfig.AIR_QUALITY_API_END_INDEX}/{district_code}"
+    )
+
+
+def build_weather_request(nx: int, ny: int, now: Optional[datetime] = None) -> Tuple[str, dict]:
+    """
+    기상청 초단기실황 API URL 및 파라미터 생성
+
+    Returns:
+        tuple: (URL, 쿼리 파라미터)
+    """
+    now = now or datetime.now()
+    current_hour = now.hour
+    base_time = f"{current_hour:02d}00"
+    base_date = now.strftime("%Y%m%d")
+
+    if current_hour == 0:
+        base_date = (now - timedelta(days=1)).strftime("%Y%m%d")
+        base_time = "2300"
+
+    url = f"{MLConfig.KMA_API_BASE_URL}/{MLConfig.KMA_API_SERVICE}"
+    params = {
+        "ServiceKey": MLConfig.KMA_API_KEY,
+        "pageNo": MLConfig.KMA_API_PAGE_NO,
+        "numOfRows": MLConfig.KMA_API_NUM_OF_ROWS,
+        "dataType": MLConfig.KMA_API_DATA_TYPE,
+        "base_date": base_date,
+        "base_time": base_time,
+        "nx": nx,
+        "ny": ny
+    }
+    return url, params
+
+
+def forecast_base_datetime(now: Optional[datetime] = None) -> datetime:
+    """
+    현재 조회할 수 있는 가장 최근 단기예보 발표 시각
+
+    발표 시각(KMA_FORECAST_BASE_HOURS) 후 KMA_FORECAST_RELEASE_DELAY_MINUTES가 지나야 제공됩니다.
+    """
+    now = now or datetime.now()
+    available = now - timedelta(minutes=MLConfig.KMA_FORECAST_RELEASE_DELAY_MINUTES)
+    hours = [hour for hour in MLConfig.KMA_FORECAST_BASE_HOURS if hour <= available.hour]
+    if hours:
+        return available.replace(hour=max(hours), minute=0, second=0, microsecond=0)
+    previous_day = available - timedelta(days=1)
+    return previous_day.replace(hour=max(MLConfig.KMA_FORECAST_BASE_HOURS), minute=0, second=0, microsecond=0)
+
+
+def next_forecast_issue_time(now: Optional[datetime] = None) -> datetime:
+    """다음 단기예보가 API로 제공되는 시각"""
+    now = now or datetime.now()
+    day_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    delay = timedelta(minutes=MLConfig.KMA_FORECAST_RELEASE_DELAY_MINUTES)
+    return min(
+        candidate
+        for offset in (0, 1)
+        for hour in MLConfig.KMA_FORECAST_BASE_HOURS
+        for candidate in [day_start + timedelta(days=offset, hours=hour) + delay]
+        if candidate > now
+    )
+
+
+def build_forecast_request(nx: int, ny: int, now: Optional[datetime] = None) -> Tuple[str, dict]:
+    """
+    기상청 단기예보 API URL 및 파라미터 생성
+
+    Returns:
+        tuple: (URL, 쿼리 파라미터)
+    """
+    base = forecast_base_datetime(now)
+    url = f"{MLConfig.KMA_API_BASE_URL}/{MLConfig.KMA_FORECAST_SERVICE}"
+    params = {
+        "ServiceKey": MLConfig.KMA_API_KEY,
+        "pageNo": MLConfig.KMA_API_PAGE_NO,
+        "numOfRows": MLConfig.KMA_FORECAST_NUM_OF_ROWS,
+        "dataType": MLConfig.KMA_API_DATA_TYPE,
+        "base_date": base.strftime("%Y%m%d"),
+        "base_time": base.strftime("%H00"),
+        "nx": nx,
+        "ny": ny
+    }
+    return url, params
+
+
+def parse_air_quality_response(contents: dict) -> dict:
+    """
+    서울시 대기환경 API 응답 파싱
+
+    Returns:
+        dict: {'pm10': float, 'datetime': pd.Timestamp}
+
+    Raises:
+        RuntimeError: API 오류 코드가 반환된 경우
+        ValueError, KeyError, TypeError: 응답 형식이 올바르지 않은 경우
+    """
+    if 'ListAirQualityByDistrictService' not in contents:
+        raise ValueError("API 응답 형식이 올바르지 않습니다.")
+
+    api_response = contents['ListAirQualityByDistrictService']
+
+    if 'RESULT' in api_response:
+        result_code = api_response['RESULT'].get('CODE', '')
+        if result_code != 'INFO-000':
+            error_msg = api_response['RESULT'].get('MESSAGE', '알 수 없는 오류')
+            raise RuntimeError(f"API 오류: {error_msg} (코드: {result_code})")
+
+    if 'row' not in api_response:
+        raise ValueError("API 응답에 데이터가 없습니다.")
+
+    if isinstance(api_response['row'], list):
+        row_data = api_response['row'][0]
+    else:
+        row_data = api_response['row']
+
+    msrmt_ymd = str(row_data.get('MSRMT_YMD', ''))
+    if len(msrmt_ymd) >= 14:
+        datetime_str = f"{msrmt_ymd[:4]}-{msrmt_ymd[4:6]}-{msrmt_ymd[6:8]} {msrmt_ymd[8:10]}:{msrmt_ymd[10:12]}"
+        datetime_obj = pd.to_datetime(datetime_str)
+    else:
+        datetime_obj = pd.Timestamp.now()
+
+    return {
+        'pm10': float(row_data.get('PM', 0)),
+        'datetime': datetime_obj
+    }
+
+
+def parse_weather_response(contents: dict) -> dict:
+    """
+    기상청 초단기실황 API 응답 파싱
+
+    Returns:
+        dict: {'temperature', 'humidity', 'windspeed', 'rainfall', 'datetime'}
+
+    Raises:
+        RuntimeError: API 오류 코드가 반환된 경우
+        ValueError, KeyError, TypeError: 응답 형식이 올바르지 않은 경우
+    """
+    if 'response' not in contents:
+        raise ValueError("API 응답 형식이 올바르지 않습니다.")
+
+    response_data = contents['response']
+
+    if 'header' in response_data:
+        result_code = response_data['header'].get('resultCode', '')
+        if result_code != '00':
+            result_msg = response_data['header'].get('resultMsg', '알 수 없는 오류')
+            raise RuntimeError(f"기상청 API 오류: {result_msg} (코드: {result_code})")
+
+    if 'body' not in response_data or 'items' not in response_data['body']:
+        raise ValueError("API 응답에 데이터가 없습니다.")
+
+    items = response_data['body']['items']['item']
+    if not items:
+        raise ValueError("API 응답에 아이템이 없습니다.")
+
+    data_dict = {}
+    for item in items:
+        category = item.get('category', '')
+        obsr_value = item.get('obsrValue', '0')
+        try:
+            data_dict[category] = float(obsr_value)
+        except (ValueError, TypeError):
+            data_dict[category] = 0.0
+
+    return {
+        'temperature': data_dict.get('T1H', 20.0),
+        'humidity': data_dict.get('REH', 60.0),
+        'windspeed': data_dict.get('WSD', 2.0),
+        'rainfall': data_dict.get('RN1', 0.0),
+        'datetime': pd.Timestamp.now()
+    }
+
+
+def parse_precipitation(value) -> float:
+    """
+    단기예보 1시간 강수량(PCP) 문자열을 mm 값으로 변환
+
+    "강수없음" → 0, "1mm 미만" → 0.5, "30.0~50.0mm" → 구간 중앙값, "50.0mm 이상" → 하한값
+    """
+    text = str(value).strip()
+    if not text or text == "강수없음":
+        return 0.0
+    numbers = [float(number) for number in re.findall(r"\d+(?:\.\d+)?", text)]
+    if not numbers:
+        return 0.0
+    if "미만" in text:
+        return numbers[0] / 2
+    if len(numbers) >= 2:
+        return (numbers[0] + numbers[1]) / 2
+    return numbers[0]
+
+
+def parse_forecast_response(contents: dict) -> List[dict]:
+    """
+    기상청 단기예보 API 응답 파싱
+
+    Returns:
+        list: 예보 시각 순으로 정렬된 {'temperature', 'humidity', 'windspeed', 'rainfall', 'datetime'} 목록
+              (기온/습도/풍속 중 하나라도 없는 시각은 제외)
+
+    Raises:
+        RuntimeError: API 오류 코드가 반환된 경우
+        ValueError, KeyError, TypeError: 응답 형식이 올바르지 않은 경우
+    """
+    if 'response' not in contents:
+        raise ValueError("API 응답 형식이 올바르지 않습니다.")
+
+    response_data = contents['response']
+
+    if 'header' in response_data:
+        result_code = response_data['header'].get('resultCode', '')
+        if result_code != '00':
+            result_msg = response_data['header'].get('resultMsg', '알 수 없는 오류')
+            raise RuntimeError(f"기상청 API 오류: {result_msg} (코드: {result_code})")
+
+    if 'body' not in response_data or 'items' not in response_data['body']:
+        raise ValueError("API 응답에 데이터가 없습니다.")
+
+    items = response_data['body']['items']['item']
+    if not items:
+        raise ValueError("API 응답에 아이템이 없습니다.")
+
+    categories = {'TMP': 'temperature', 'REH': 'humidity', 'WSD': 'windspeed', 'PCP': 'rainfall'}
+    steps: Dict[str, dict] = {}
+    for item in items:
+        field = categories.get(item.get('category', ''))
+        if field is None:
+            continue
+        value = item.get('fcstValue', '')
+        step = steps.setdefault(f"{item['fcstDate']}{item['fcstTime']}", {})
+        if field == 'rainfall':
+            step[field] = parse_precipitation(value)
+        else:
+            try:
+                step[field] = float(value)
+            except (ValueError, TypeError):
+                continue
+
+    forecast = []
+    for key in sorted(steps):
+        step = steps[key]
+        if not {'temperature', 'humidity', 'windspeed'} <= step.keys():
+            continue
+        forecast.append({
+            'temperature': step['temperature'],
+            'humidity': step['humidity'],
+            'windspeed': step['windspeed'],
+            'rainfall': step.get('rainfall', 0.0),
+            'datetime': pd.Timestamp(datetime.strptime(key, "%Y%m%d%H%M"))
+        })
+
+    if not forecast:
+        raise ValueError("API 응답에 예보 데이터가 없습니다.")
+    return forecast
+
+
+class AsyncUpstreamClient:
+    """
+    비동기 업스트림 API 클라이언트
+
+    호스트마다 연결 풀을 유지하는 httpx.AsyncClient를 하나씩 재사용하고,
+    호스트별 세마포어로 동시 요청 수를 제한합니다.
+    클라이언트는 처음 사용하는 이벤트 루프에서 생성되며 aclose()로 정리합니다.
+
+    업스트림별 UpstreamGuard로 회로 차단기와 지연 시간을 관리하며,
+    UPSTREAM_HEDGE_ENABLED이면 최근 지연 시간 백분위수를 넘긴 요청을 한 번 더 보내
+    먼저 도착한 응답을 사용합니다.
+    """
+
+    def __init__(self, max_connections_per_host: Optional[int] = None, timeout: Optional[float] = None,
+                 guards: Optional[Dict[str, UpstreamGuard]] = None):
+        self.max_connections_per_host = max_connections_per_host or MLConfig.UPSTREAM_MAX_CONNECTIONS_PER_HOST
+        self.timeout = timeout or MLConfig.UPSTREAM_TIMEOUT
+        self.guards = guards if guards is not None else build_upstream_guards()
+        self._clients: Dict[str, object] = {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def _client_for(self, url: str):
+        """URL의 호스트에 해당하는 (클라이언트, 세마포어) 반환"""
+        import httpx
+
+        parts = urlsplit(url)
+        host = f"{parts.scheme}://{parts.netloc}"
+
+        if host not in self._clients:
+            limits = httpx.Limits(
+                max_connections=self.max_connections_per_host,
+                max_keepalive_connections=self.max_connections_per_host
+            )
+            self._clients[host] = httpx.AsyncClient(limits=limits, timeout=self.timeout)
+            self._semaphores[host] = asyncio.Semaphore(self.max_connections_per_host)
+
+        return self._clients[host], self._semaphores[host]
+
+    async def _get_once(self, url: str, params: Optional[dict], guard: Optional[UpstreamGuard],
+                        timeout: float) -> dict:
+        """GET 요청 한 번 실행 후 JSON 응답 반환 (성공 시 지연 시간 기록)"""
+        client, semaphore = self._client_for(url)
+        with span(f"upstream.{guard.name}" if guard is not None else "upstream"):
+            async with semaphore:
+                start = time.monotonic()
+                response = await client.get(url, params=params, timeout=timeout)
+            response.raise_for_status()
+            contents = response.json()
+        if guard is not None:
+            guard.observe_latency(time.monotonic() - start)
+        return contents
+
+    async def _get_hedged(self, url: str, params: Optional[dict], guard: UpstreamGuard,
+                          timeout: float, hedge_delay: float) -> dict:
+        """hedge_delay 안에 응답이 없으면 같은 요청을 한 번 더 보내고 먼저 성공한 응답 반환"""
+        tasks = [asyncio.ensure_future(self._get_once(url, params, guard, timeout))]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+            if not done:
+                guard.hedges += 1
+                tasks.append(asyncio.ensure_future(self._get_once(url, params, guard, timeout)))
+
+            pending = set(tasks)
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()
+
+    async def get_json(self, url: str, params: Optional[dict] = None, upstream: Optional[str] = None,
+                       deadline: Optional[Deadline] = None) -> dict:
+        """
+        GET 요청 후 JSON 응답 반환
+
+        Args:
+            url: 요청 URL
+            params: 쿼리 파라미터
+            upstream: 업스트림 이름 (회로 차단기/지연 시간 통계 대상, None이면 미적용)
+            deadline: 요청 시간 예산 (None이면 UPSTREAM_TIMEOUT만 적용)
+
+        Raises:
+            CircuitOpenError: 회로 차단기가 열려 있는 경우
+            DeadlineExceededError: 시간 예산 안에 응답이 없는 경우
+            httpx.HTTPError: HTTP 요청 실패
+        """
+        guard = self.guards.get(upstream) if upstream else None
+        timeout = deadline.timeout(self.timeout) if deadline is not None else self.timeout
+        if guard is None:
+            return await self._get_once(url, params, None, timeout)
+
+        guard.breaker.before_call()
+        start = time.monotonic()
+        try:
+            hedge_delay = guard.hedge_delay()
+            if hedge_delay is not None and hedge_delay < timeout:
+                request = self._get_hedged(url, params, guard, timeout, hedge_delay)
+            else:
+                request = self._get_once(url, params, guard, timeout)
+            contents = await asyncio.wait_for(request, timeout)
+        except asyncio.TimeoutError:
+            error = DeadlineExceededError(f"{upstream} 업스트림 응답 시간 초과 ({timeout:.1f}초)")
+            guard.record_failure(error)
+            raise error
+        except asyncio.CancelledError:
+            guard.breaker.release()
+            raise
+        except Exception as e:
+            guard.record_failure(e)
+            raise
+
+        guard.record_success()
+        return contents
+
+    @timed_stage("air_quality_fetch")
+    async def fetch_air_quality(self, district_code: str, deadline: Optional[Deadline] = None) -> dict:
+        """서울시 자치구별 실시간 대기환경 데이터 수집"""
+        import httpx
+
+        url = build_air_quality_url(district_code)
+        try:
+            contents = await self.get_json(url, upstream=AIR_QUALITY_UPSTREAM, deadline=deadline)
+            air_data = parse_air_quality_response(contents)
+            record_fixture(url, None, contents)
+            return air_data
+        except httpx.HTTPError as e:
+            raise RuntimeError(f"API 요청 실패: {e}")
+        except (KeyError, ValueError, TypeError) as e:
+            raise RuntimeError(f"데이터 파싱 실패: {e}")
+
+    @timed_stage("weather_fetch")
+    async def fetch_weather(self, nx: int, ny: int, deadline: Optional[Deadline] = None) -> dict:
+        """기상청 API에서 초단기실황 데이터 수집"""
+        import httpx
+
+        url, params = build_weather_request(nx, ny)
+        try:
+            contents = await self.get_json(url, params=params, upstream=KMA_UPSTREAM, deadline=deadline)
+            weather_data = parse_weather_response(contents)
+            record_fixture(url, params, contents)
+            return weather_data
+        except httpx.HTTPError as e:
+            raise RuntimeError(f"기상청 API 요청 실패: {e}")
+        except (KeyError, ValueError, TypeError) as e:
+            raise RuntimeError(f"기상청 데이터 파싱 실패: {e}")
+
+    @timed_stage("forecast_fetch")
+    async def fetch_forecast(self, nx: int, ny: int, deadline: Optional[Deadline] = None) -> List[dict]:
+        """기상청 API에서 단기예보 데이터 수집"""
+        import httpx
+
+        url, params = build_forecast_request(nx, ny)
+        try:
+            contents = await self.get_json(url, params=params, upstream=KMA_UPSTREAM, deadline=deadline)
+            forecast = parse_forecast_response(contents)
+            record_fixture(url, params, contents)
+            return forecast
+        except httpx.HTTPError as e:
+            raise RuntimeError(f"기상청 단기예보 API 요청 실패: {e}")
+        except (KeyError, ValueError, TypeError) as e:
+            raise RuntimeError(f"기상청 단기예보 데이터 파싱 실패: {e}")
+
+    def stats(self) -> dict:
+        """업스트림별 회로 차단기 상태와 지연 시간 통계"""
+        return {name: guard.stats() for name, guard in self.guards.items()}
+
+    async def aclose(self):
+        """모든 연결 풀 종료"""
+        clients = list(self._clients.values())
+        self._clients.clear()
+        self._semaphores.clear()
+        for client in clients:
+            await client.aclose()
@@ -0,0 +1,157 @@
+"""
+모델 예열 모듈
+서버 시작 시 모든 관광지의 스케일러/스키마/모델을 미리 로드하고 더미 예측을 실행하여 준비 상태를 관리
+"""
+import asyncio
+import time
+import warnings
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from ml_service.config import MLConfig
+from ml_service.scenarios import sample_observations
+
+# 더미 예측 행 수 (한 행 경로와 일괄 경로를 모두 예열)
+WARMUP_ROWS = 8
+
+
+def _elapsed_ms(fn: Callable[[], object]) -> float:
+    """함수 실행 시간 (밀리초)"""
+    start = time.perf_counter()
+    fn()
+    return round((time.perf_counter() - start) * 1000, 1)
+
+
+def warm_site(models, tourist_code: str) -> Dict[str, float]:
+    """
+    모델 세트에서 관광지 하나의 스키마, Pipeline, 예측 엔진 로드 후 더미 예측
+
+    Args:
+        models: ModelSet (서비스의 현재 모델 세트 또는 교체 전 새 모델 세트)
+        tourist_code: 관광지 코드
+
+    Returns:
+        dict: 단계별 소요 시간 (밀리초)
+    """
+    raw = sample_observations(WARMUP_ROWS)
+    timings = {
+        "schema_ms": _elapsed_ms(lambda: models.load_schema(tourist_code)),
+        "pipeline_ms": _elapsed_ms(lambda: models.load_pipeline(tourist_code)),
+        "engine_ms": _elapsed_ms(lambda: models.load_engine(tourist_code))
+    }
+    engine = models.load_engine(tourist_code)
+    timings["predict_ms"] = _elapsed_ms(lambda: (engine.predict(raw[:1]), engine.predict(raw)))
+    return timings
+
+
+class ModelWarmup:
+    """
+    시작 시 모델 예열 및 준비(readiness) 상태
+
+    - pending: 예열 시작 전
+    - running: 백그라운드에서 예열 중 (요청은 받지만 준비되지 않음)
+    - ready: 모든 관광지 예열 완료
+    - failed: 하나 이상의 관광지 예열 실패 (errors 참고, 준비되지 않음)
+
+    WARMUP_ENABLED가 꺼져 있으면 모델은 첫 요청에서 로드되며 메모 사전 계산만 수행합니다.
+    """
+
+    PENDING = "pending"
+    RUNNING = "running"
+    READY = "ready"
+    FAILED = "failed"
+
+    def __init__(self, service):
+        self.service = service
+        self.state = self.PENDING
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.timings: Dict[str, object] = {}
+        self.errors: List[dict] = []
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        """준비 완료 여부"""
+        return self.state == self.READY
+
+    def run_sync(self):
+        """예열 실행 (스레드에서 실행, 실패한 관광지는 errors에 기록)"""
+        self.state = self.RUNNING
+        self.started_at = datetime.now()
+        self.timings = {}
+        self.errors = []
+        service = self.service
+
+        if MLConfig.WARMUP_ENABLED:
+            try:
+                self.timings["scalers_ms"] = _elapsed_ms(service.load_scalers)
+            except (FileNotFoundError, ValueError) as e:
+                self.errors.append({"code": "scalers", "error": str(e)})
+
+            sites = {}
+            for tourist_code in MLConfig.TOURIST_SITES:
+                try:
+                    sites[tourist_code] = warm_site(service.models, tourist_code)
+                except Exception as e:
+                    self.errors.append({"code": tourist_code, "error": str(e)})
+            self.timings["sites"] = sites
+
+            if MLConfig.MODEL_BUNDLE_ENABLED:
+                self.timings["bundle_ms"] = _elapsed_ms(service.load_bundle)
+
+        # 양자화 메모 테이블 사전 계산 (실패해도 LRU만 사용하므로 준비 상태에 영향 없음)
+        if MLConfig.MEMO_ENABLED and MLConfig.MEMO_PRECOMPUTE:
+            try:
+                self.timings["memo_ms"] = _elapsed_ms(service.precompute_memo)
+            except (ValueError, FileNotFoundError) as e:
+                warnings.warn(f"예측 메모 사전 계산 실패, LRU만 사용: {e}")
+
+        self.finished_at = datetime.now()
+        if self.errors:
+            messages = "; ".join(f"{e['code']}: {e['error']}" for e in self.errors)
+            warnings.warn(f"모델 예열 실패, 준비 상태로 전환하지 않습니다: {messages}")
+            self.state = self.FAILED
+        else:
+            self.state = self.READY
+
+    async def run(self):
+        """예열을 스레드에서 실행 (이벤트 루프는 그동안 liveness 요청을 처리)"""
+        await asyncio.to_thread(self.run_sync)
+
+    def start(self):
+        """
+        백그라운드 예열 시작
+
+        pre-fork 모드의 워커처럼 fork 전 부모 프로세스에서 run_sync()로 이미 준비를 마쳤으면 다시 실행하지 않습니다
+        (모델과 메모는 부모에서 물려받음). 부모의 예열이 실패했으면 워커에서 다시 시도합니다.
+        """
+        if self._task is None and not self.ready:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        """예열 태스크 정리 (실행 중인 스레드는 끝날 때까지 계속 실행)"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def status(self) -> dict:
+        """예열 상태와 단계별 소요 시간"""
+        elapsed_ms = None
+        if self.started_at is not None:
+            end = self.finished_at or datetime.now()
+            elapsed_ms = round((end - self.started_at).total_seconds() * 1000, 1)
+        return {
+            "state": self.state,
+            "ready": self.ready,
+            "enabled": MLConfig.WARMUP_ENABLED,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "elapsed_ms": elapsed_ms,
+            "timings": self.timings,
+            "errors": list(self.errors)
+        }
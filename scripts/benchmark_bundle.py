@@ -0,0 +1,121 @@
+"""
+모델 배치 방식별 전체 관광지 예측 벤치마크
+
+관광지별 XGBoost Pipeline, 관광지별 컴파일 엔진, 다중 관광지 번들로
+전체 관광지 예측(predict-all과 같은 경로) 소요 시간과 모델 로드 후 메모리(RSS) 증가량을 비교합니다.
+각 방식은 별도 프로세스에서 실행되며 네트워크와 실제 API 키 없이 실행됩니다.
+번들 파일이 없으면 먼저 'python scripts/train_models.py --bundle-only'를 실행하세요.
+
+Usage:
+    python scripts/benchmark_bundle.py --repeat 2000
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+os.environ.setdefault("SEOUL_AIR_QUALITY_API_KEY", "stub")
+os.environ.setdefault("KMA_API_KEY", "stub")
+
+# 방식별 환경 변수
+LAYOUTS = {
+    "pipelines": {"PREDICT_ENGINE": "xgboost", "MODEL_BUNDLE_ENABLED": "false"},
+    "compiled": {"PREDICT_ENGINE": "compiled", "MODEL_BUNDLE_ENABLED": "false"},
+    "bundle": {"PREDICT_ENGINE": "xgboost", "MODEL_BUNDLE_ENABLED": "true"},
+}
+
+
+def rss_mb() -> float:
+    """현재 프로세스의 상주 메모리 (MB)"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure_layout(repeat: int) -> dict:
+    """현재 환경 변수의 방식으로 전체 관광지 예측 측정 (하위 프로세스에서 실행)"""
+    import numpy as np
+
+    from ml_service.config import MLConfig
+    from ml_service.predictor import PredictionService
+    from ml_service.scenarios import sample_observations
+
+    service = PredictionService()
+    tourist_codes = list(MLConfig.TOURIST_SITES)
+    raw = sample_observations(len(tourist_codes), seed=1)
+    observations = {
+        code: {
+            "pm10": raw[i, 0], "windspeed": raw[i, 1], "temperature": raw[i, 2],
+            "humidity": raw[i, 3], "rainfall": raw[i, 4], "datetime": datetime(2025, 10, 11, 14)
+        }
+        for i, code in enumerate(tourist_codes)
+    }
+
+    before = rss_mb()
+    start = time.perf_counter()
+    results, errors = service.predict_observations_batch(tourist_codes, observations)
+    load_elapsed = time.perf_counter() - start
+    after = rss_mb()
+    if errors:
+        raise RuntimeError(f"예측 실패: {errors}")
+
+    elapsed = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        service.predict_observations_batch(tourist_codes, observations)
+        elapsed.append(time.perf_counter() - start)
+
+    return {
+        "load_ms": load_elapsed * 1000,
+        "rss_mb": after - before,
+        "p50_us": float(np.percentile(elapsed, 50)) * 1e6,
+        "p99_us": float(np.percentile(elapsed, 99)) * 1e6,
+        "predictions": {name: result["predicted_visitors"] for name, result in results.items()}
+    }
+
+
+def run_benchmark(repeat: int):
+    """방식별로 하위 프로세스를 실행하고 결과 비교 출력"""
+    results = {}
+    for layout, env in LAYOUTS.items():
+        output = subprocess.run(
+            [sys.executable, __file__, "--child", "--repeat", str(repeat)],
+            env={**os.environ, **env}, capture_output=True, text=True, check=True
+        ).stdout
+        results[layout] = json.loads(output.strip().splitlines()[-1])
+
+    print(f"\n[BENCHMARK] 전체 관광지 예측 {repeat:,}회")
+    print("-" * 70)
+    print(f"{'방식':<12} {'첫 호출(로드)':>14} {'RSS 증가':>10} {'p50':>10} {'p99':>10}")
+    for layout, result in results.items():
+        print(f"{layout:<12} {result['load_ms']:>12.1f}ms {result['rss_mb']:>8.1f}MB "
+              f"{result['p50_us']:>8.0f}us {result['p99_us']:>8.0f}us")
+
+    reference = results["pipelines"]["predictions"]
+    for layout, result in results.items():
+        if result["predictions"] != reference:
+            print(f"[WARNING] {layout} 예측이 pipelines와 다릅니다: {result['predictions']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="모델 배치 방식별 전체 관광지 예측 벤치마크")
+    parser.add_argument("--repeat", type=int, default=2000, help="반복 횟수")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure_layout(args.repeat)))
+    else:
+        run_benchmark(args.repeat)
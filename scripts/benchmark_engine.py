@@ -0,0 +1,73 @@
+"""
+예측 엔진 마이크로벤치마크
+
+같은 관측값 배열을 XGBoost Pipeline과 컴파일된 NumPy 트리(ml_service/tree_engine.py)로
+예측하여 배치 크기별 소요 시간과 예측 일치 여부를 출력합니다.
+compiled 열은 COMPILED_MAX_BATCH_ROWS와 관계없이 항상 NumPy 트리로 평가한 시간입니다.
+
+Usage:
+    python scripts/benchmark_engine.py
+    python scripts/benchmark_engine.py --site gyeongbok_palace --sizes 1 16 256 4096
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+os.environ.setdefault("SEOUL_AIR_QUALITY_API_KEY", "stub")
+os.environ.setdefault("KMA_API_KEY", "stub")
+
+import numpy as np
+
+from ml_service.predictor import PredictionService
+from ml_service.scenarios import sample_observations
+from ml_service.tree_engine import check_parity, compile_pipeline
+
+
+def time_call(fn, repeat: int) -> float:
+    """fn을 repeat번 실행한 평균 소요 시간 (초)"""
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def run_benchmark(tourist_code: str, sizes: list):
+    """배치 크기별 XGBoost / 컴파일 엔진 예측 시간 측정 및 출력"""
+    service = PredictionService()
+    pipeline = service.load_pipeline(tourist_code)
+    transformer = pipeline.steps[0][1]
+
+    start = time.perf_counter()
+    forest = compile_pipeline(pipeline)
+    compile_elapsed = time.perf_counter() - start
+
+    raw = sample_observations(max(sizes))
+    parity = check_parity(pipeline, forest, raw)
+
+    print(f"\n[BENCHMARK] {tourist_code} (트리 {forest.n_trees}개, 깊이 {forest.depth})")
+    print(f"컴파일 {compile_elapsed * 1000:.1f}ms, "
+          f"XGBoost와 최대 차이 {parity['max_abs_diff']:.4f} (방문자 수 불일치 {parity['mismatched_visitors']}행)")
+    print("-" * 70)
+    print(f"{'행 수':>10} {'xgboost':>14} {'compiled':>14} {'속도 비율':>10}")
+    for n_rows in sizes:
+        batch = np.ascontiguousarray(raw[:n_rows])
+        repeat = max(3, 2000 // n_rows)
+        xgb_elapsed = time_call(lambda: pipeline.predict(batch), repeat)
+        compiled_elapsed = time_call(lambda: forest.predict(transformer.transform(batch)), repeat)
+        print(f"{n_rows:>10,} {xgb_elapsed * 1e6:>12.0f}us {compiled_elapsed * 1e6:>12.0f}us "
+              f"{xgb_elapsed / compiled_elapsed:>9.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="예측 엔진 마이크로벤치마크")
+    parser.add_argument("--site", default="changdeok_palace", help="관광지 코드")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 8, 64, 256, 1024, 16384, 100000],
+                        help="배치 크기 목록")
+    args = parser.parse_args()
+
+    run_benchmark(args.site, args.sizes)
@@ -0,0 +1,91 @@
+"""
+모델 파일 형식별 콜드 로드 벤치마크
+
+관광지별 모델을 pickle(joblib Pipeline)과 네이티브 형식(XGBoost UBJSON 부스터 + 메타데이터 사이드카)으로
+새 프로세스에서 처음 로드할 때의 소요 시간, 메모리(RSS) 증가량, 로드 중 발생한 경고 수를 비교합니다.
+각 형식은 별도 프로세스에서 실행되며, 첫 파일의 로드 시간에는 로드 중 지연 import되는 xgboost 비용이 포함됩니다.
+네이티브 파일이 없으면 먼저 'python scripts/train_models.py --native-only'를 실행하세요.
+
+Usage:
+    python scripts/benchmark_model_load.py
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import warnings
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+os.environ.setdefault("SEOUL_AIR_QUALITY_API_KEY", "stub")
+os.environ.setdefault("KMA_API_KEY", "stub")
+
+from scripts.benchmark_bundle import rss_mb
+
+FORMATS = ("pickle", "native")
+
+
+def measure_format(model_format: str) -> dict:
+    """현재 프로세스에서 모든 관광지 모델을 지정한 형식으로 한 번씩 로드 (하위 프로세스에서 실행)"""
+    from ml_service.config import MLConfig
+
+    start_rss = rss_mb()
+    if model_format == "pickle":
+        import joblib
+
+        def load(tourist_code: str):
+            return joblib.load(MLConfig.MODELS_SAVED_DIR / MLConfig.MODEL_FILES[tourist_code])
+    else:
+        from ml_service.native_model import load_native_pipeline as load
+
+    sites = {}
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        for tourist_code in MLConfig.TOURIST_SITES:
+            before = rss_mb()
+            start = time.perf_counter()
+            load(tourist_code)
+            sites[tourist_code] = {
+                "load_ms": (time.perf_counter() - start) * 1000,
+                "rss_mb": rss_mb() - before
+            }
+    return {"sites": sites, "total_rss_mb": rss_mb() - start_rss, "warnings": len(caught)}
+
+
+def run_benchmark():
+    """형식별로 하위 프로세스를 실행하고 결과 비교 출력"""
+    results = {}
+    for model_format in FORMATS:
+        output = subprocess.run(
+            [sys.executable, __file__, "--child", model_format],
+            capture_output=True, text=True, check=True
+        ).stdout
+        results[model_format] = json.loads(output.strip().splitlines()[-1])
+
+    print("\n[BENCHMARK] 모델 파일 형식별 콜드 로드 (관광지별 첫 로드, 첫 행은 지연 import 포함)")
+    print("-" * 70)
+    print(f"{'관광지':<22} " + " ".join(f"{fmt + ' ms':>11} {fmt + ' MB':>10}" for fmt in FORMATS))
+    for tourist_code in results[FORMATS[0]]["sites"]:
+        cells = [results[fmt]["sites"][tourist_code] for fmt in FORMATS]
+        print(f"{tourist_code:<22} " + " ".join(f"{c['load_ms']:>11.1f} {c['rss_mb']:>10.1f}" for c in cells))
+
+    print("-" * 70)
+    for model_format, result in results.items():
+        loads = [site["load_ms"] for site in result["sites"].values()]
+        print(f"[INFO] {model_format}: 전체 로드 {sum(loads):.1f}ms "
+              f"(첫 파일 {loads[0]:.1f}ms, 이후 평균 {sum(loads[1:]) / max(len(loads) - 1, 1):.1f}ms), "
+              f"RSS 증가 {result['total_rss_mb']:.1f}MB, 경고 {result['warnings']}개")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="모델 파일 형식별 콜드 로드 벤치마크")
+    parser.add_argument("--child", choices=FORMATS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure_format(args.child)))
+    else:
+        run_benchmark()
@@ -0,0 +1,70 @@
+"""
+시나리오(what-if) 일괄 예측 벤치마크
+
+데카르트 곱 그리드로 시나리오 배열을 만들고 관광지별 예측 소요 시간을 측정합니다.
+네트워크와 실제 API 키 없이 실행됩니다.
+
+Usage:
+    python scripts/benchmark_scenarios.py --rows 100000
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+os.environ.setdefault("SEOUL_AIR_QUALITY_API_KEY", "stub")
+os.environ.setdefault("KMA_API_KEY", "stub")
+
+from ml_service.config import MLConfig
+from ml_service.predictor import PredictionService
+from ml_service.scenarios import grid_to_array
+
+
+def build_grid(n_rows: int) -> dict:
+    """약 n_rows개의 조합을 만드는 그리드 (요일 7 x 계절 4 x 습도 4 x 풍속 5 x 기온 9 x 미세먼지 k)"""
+    fixed = 7 * 4 * 4 * 5 * 9
+    n_pm10 = max(1, round(n_rows / fixed))
+    return {
+        "pm10": [float(v) for v in range(0, n_pm10 * 10, 10)],
+        "temperature": [float(v) for v in range(-10, 35, 5)],
+        "humidity": [30.0, 50.0, 70.0, 90.0],
+        "windspeed": [0.0, 2.0, 4.0, 8.0, 12.0],
+        "weekday": list(range(7)),
+        "season": list(range(4))
+    }
+
+
+def run_benchmark(n_rows: int):
+    """그리드 생성/예측 소요 시간 측정 및 출력"""
+    service = PredictionService()
+    tourist_codes = list(MLConfig.TOURIST_SITES)
+
+    start = time.perf_counter()
+    raw = grid_to_array(build_grid(n_rows))
+    build_elapsed = time.perf_counter() - start
+
+    # 모델 로드 비용이 측정에 섞이지 않도록 미리 한 번 실행
+    service.predict_scenarios(raw[:1])
+
+    print(f"\n[BENCHMARK] 시나리오 {raw.shape[0]:,}개")
+    print("-" * 50)
+    print(f"{'그리드 생성':<32} {build_elapsed * 1000:>10.1f}ms")
+    for tourist_code in tourist_codes:
+        start = time.perf_counter()
+        service.predict_scenarios(raw, [tourist_code])
+        print(f"{tourist_code:<32} {(time.perf_counter() - start) * 1000:>10.1f}ms")
+
+    start = time.perf_counter()
+    service.predict_scenarios(raw)
+    print(f"{'전체 관광지':<32} {(time.perf_counter() - start) * 1000:>10.1f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="시나리오 일괄 예측 벤치마크")
+    parser.add_argument("--rows", type=int, default=100000, help="시나리오 수 (근사값)")
+    args = parser.parse_args()
+
+    run_benchmark(args.rows)
@@ -0,0 +1,91 @@
+"""
+업스트림 호출 지연 시간 벤치마크
+
+로컬 스텁 서버(scripts/stub_upstream.py)에 인위적인 지연을 주고
+동기(requests) 경로와 비동기(httpx 연결 풀) 경로의 예측 소요 시간을 비교합니다.
+네트워크와 실제 API 키 없이 실행됩니다.
+
+Usage:
+    python scripts/benchmark_upstream.py --latency-ms 200 --concurrency 20
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+os.environ.setdefault("SEOUL_AIR_QUALITY_API_KEY", "stub")
+os.environ.setdefault("KMA_API_KEY", "stub")
+
+from ml_service.config import MLConfig
+from ml_service.predictor import PredictionService
+from scripts.stub_upstream import start_stub_server, stub_base_urls
+
+
+def run_benchmark(latency_ms: float, concurrency: int):
+    """동기/비동기 경로 소요 시간 측정 및 출력"""
+    server = start_stub_server(port=0, latency_ms=latency_ms)
+    for key, value in stub_base_urls(server).items():
+        setattr(MLConfig, key, value)
+    # 캐시를 끄고 매 요청마다 업스트림 호출 비용을 측정
+    MLConfig.OBSERVATION_CACHE_ENABLED = False
+
+    service = PredictionService()
+    tourist_code = next(iter(MLConfig.TOURIST_SITES))
+
+    # 모델 로드 비용이 측정에 섞이지 않도록 미리 한 번 실행
+    service.predict_all()
+
+    results = []
+
+    start = time.perf_counter()
+    service.predict(tourist_code)
+    results.append(("predict (sync)", time.perf_counter() - start))
+
+    start = time.perf_counter()
+    service.predict_all()
+    results.append(("predict_all (sync)", time.perf_counter() - start))
+
+    start = time.perf_counter()
+    for _ in range(concurrency):
+        service.predict(tourist_code)
+    results.append((f"{concurrency}x predict (sync, 순차)", time.perf_counter() - start))
+
+    async def run_async():
+        timings = []
+        await service.predict_async(tourist_code)
+
+        start = time.perf_counter()
+        await service.predict_async(tourist_code)
+        timings.append(("predict_async", time.perf_counter() - start))
+
+        start = time.perf_counter()
+        await service.predict_all_async()
+        timings.append(("predict_all_async", time.perf_counter() - start))
+
+        start = time.perf_counter()
+        await asyncio.gather(*[service.predict_async(tourist_code) for _ in range(concurrency)])
+        timings.append((f"{concurrency}x predict_async (동시)", time.perf_counter() - start))
+
+        await service.aclose()
+        return timings
+
+    results.extend(asyncio.run(run_async()))
+    server.shutdown()
+
+    print(f"\n[BENCHMARK] 업스트림 지연 {latency_ms}ms, 호스트당 최대 연결 {MLConfig.UPSTREAM_MAX_CONNECTIONS_PER_HOST}")
+    print("-" * 50)
+    for name, elapsed in results:
+        print(f"{name:<32} {elapsed * 1000:>10.1f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="업스트림 호출 지연 시간 벤치마크")
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="스텁 서버 응답 지연 (밀리초)")
+    parser.add_argument("--concurrency", type=int, default=20, help="동시 요청 수")
+    args = parser.parse_args()
+
+    run_benchmark(args.latency_ms, args.concurrency)
@@ -0,0 +1,183 @@
+"""
+워커 수별 서버 메모리와 처리량 벤치마크
+
+python backend/server.py --workers N으로 서버를 띄워(2 이상이면 pre-fork, 공유 캐시 사용)
+워커 수별 프로세스 트리 전체의 RSS/PSS, 시나리오 예측(POST /api/scenarios) 처리량과 지연 시간,
+시작부터 측정 종료까지 스텁 업스트림 서버가 받은 요청 수를 비교합니다.
+PSS(비례 배분 메모리)는 여러 프로세스가 공유하는 페이지를 나눠 계산하므로 copy-on-write 공유 효과가 드러납니다.
+네트워크와 실제 API 키 없이 실행되며 Linux(/proc)에서만 메모리를 측정합니다.
+
+Usage:
+    python scripts/benchmark_workers.py --workers 1 2 4 --duration 10 --concurrency 16
+"""
+import argparse
+import math
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import requests
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from scripts.stub_upstream import start_stub_server, stub_base_urls
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# 시나리오 요청 (모든 관광지 × 48행)
+SCENARIO_REQUEST = {
+    "grid": {"pm10": [20, 60, 100, 150], "temperature": [0, 15, 30], "weekday": [0, 2, 4, 6], "season": [1]},
+    "include_inputs": False
+}
+
+
+def process_tree(pid: int) -> list:
+    """pid와 모든 하위 프로세스 PID"""
+    pids = [pid]
+    for child in Path(f"/proc/{pid}/task/{pid}/children").read_text().split():
+        pids.extend(process_tree(int(child)))
+    return pids
+
+
+def memory_mb(pid: int) -> dict:
+    """프로세스의 RSS와 PSS (MB)"""
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            if key in ("Rss", "Pss"):
+                values[key.lower()] = int(rest.split()[0]) / 1024
+    return values
+
+
+def wait_ready(base_url: str, workers: int, timeout: float = 120.0):
+    """모든 워커가 준비될 때까지 대기 (연속 성공 횟수로 판단)"""
+    deadline = time.monotonic() + timeout
+    consecutive = 0
+    while time.monotonic() < deadline:
+        try:
+            ok = requests.get(f"{base_url}/api/health/ready", timeout=2).status_code == 200
+        except requests.exceptions.RequestException:
+            ok = False
+        consecutive = consecutive + 1 if ok else 0
+        if consecutive >= 4 * workers:
+            return
+        time.sleep(0.1)
+    raise RuntimeError("서버가 준비되지 않았습니다.")
+
+
+def run_load(base_url: str, duration: float, concurrency: int) -> dict:
+    """여러 스레드에서 시나리오 예측 요청을 반복하여 처리량과 지연 시간 측정"""
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def client():
+        session = requests.Session()
+        while time.monotonic() < stop_at:
+            start = time.perf_counter()
+            try:
+                ok = session.post(f"{base_url}/api/scenarios", json=SCENARIO_REQUEST, timeout=30).status_code == 200
+            except requests.exceptions.RequestException:
+                ok = False
+            elapsed = time.perf_counter() - start
+            with lock:
+                if ok:
+                    latencies.append(elapsed)
+                else:
+                    errors[0] += 1
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    latencies.sort()
+    percentile = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000 if latencies else 0.0
+    return {
+        "requests": len(latencies),
+        "errors": errors[0],
+        "rps": len(latencies) / duration,
+        "p50_ms": percentile(0.5),
+        "p99_ms": percentile(0.99)
+    }
+
+
+def measure_workers(workers: int, port: int, stub, duration: float, concurrency: int) -> dict:
+    """워커 수 하나에 대해 서버를 띄워 측정"""
+    start_count = stub.request_count
+    base_url = f"http://127.0.0.1:{port}"
+    env = {
+        **os.environ,
+        **stub_base_urls(stub),
+        "SEOUL_AIR_QUALITY_API_KEY": "stub",
+        "KMA_API_KEY": "stub",
+        "SHARED_STATE_DIR": tempfile.mkdtemp(prefix="shared-state-"),
+        "MODEL_RELOAD_POLL_SECONDS": "0"
+    }
+    proc = subprocess.Popen(
+        [sys.executable, str(PROJECT_ROOT / "backend" / "server.py"), "--host", "127.0.0.1",
+         "--port", str(port), "--workers", str(workers)],
+        env=env, cwd=PROJECT_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        wait_ready(base_url, workers)
+        load = run_load(base_url, duration, concurrency)
+        pids = process_tree(proc.pid)
+        memory = [memory_mb(pid) for pid in pids]
+        # 스냅샷 상태를 여러 번 조회하여 워커별 갱신 역할 확인
+        roles = {}
+        for _ in range(8 * workers):
+            status = requests.get(f"{base_url}/api/snapshot", timeout=5).json()
+            roles[status["pid"]] = status["role"]
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        try:
+            proc.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+    return {
+        "workers": workers,
+        "processes": len(pids),
+        "rss_mb": sum(m["rss"] for m in memory),
+        "pss_mb": sum(m["pss"] for m in memory),
+        "leaders": sum(1 for role in roles.values() if role != "follower"),
+        "upstream_calls": stub.request_count - start_count,
+        **load
+    }
+
+
+def run_benchmark(worker_counts: list, port: int, duration: float, concurrency: int, latency_ms: float):
+    """워커 수별 측정 및 출력"""
+    stub = start_stub_server(port=0, latency_ms=latency_ms)
+    print(f"[INFO] CPU {os.cpu_count()}개, 클라이언트 동시 요청 {concurrency}개, 측정 {duration:.0f}초, "
+          f"시나리오 {math.prod(len(values) for values in SCENARIO_REQUEST['grid'].values())}행 × 모든 관광지")
+    print("-" * 100)
+    print(f"{'workers':>7} {'procs':>5} {'RSS(MB)':>9} {'PSS(MB)':>9} {'req/s':>8} {'p50(ms)':>9} "
+          f"{'p99(ms)':>9} {'errors':>6} {'upstream':>8} {'leaders':>7}")
+    for workers in worker_counts:
+        result = measure_workers(workers, port, stub, duration, concurrency)
+        print(f"{result['workers']:>7} {result['processes']:>5} {result['rss_mb']:>9.1f} {result['pss_mb']:>9.1f} "
+              f"{result['rps']:>8.1f} {result['p50_ms']:>9.1f} {result['p99_ms']:>9.1f} {result['errors']:>6} "
+              f"{result['upstream_calls']:>8} {result['leaders']:>7}")
+    stub.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="워커 수별 서버 메모리와 처리량 벤치마크")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="비교할 워커 수 목록")
+    parser.add_argument("--port", type=int, default=8765, help="서버 포트")
+    parser.add_argument("--duration", type=float, default=10.0, help="워커 수별 부하 시간 (초)")
+    parser.add_argument("--concurrency", type=int, default=16, help="동시 요청 클라이언트 수")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="스텁 업스트림 응답 지연 (밀리초)")
+    args = parser.parse_args()
+
+    run_benchmark(args.workers, args.port, args.duration, args.concurrency, args.latency_ms)
@@ -0,0 +1,67 @@
+"""
+저장된 모델을 NumPy 트리 배열로 컴파일
+
+models/saved/의 관광지별 Pipeline을 ml_service/tree_engine.py 형식으로 컴파일하여
+model_<관광지>.trees.npz로 저장하고, XGBoost 예측과 일치하는지 확인합니다.
+PREDICT_ENGINE=compiled로 실행한 서버는 모델 파일보다 최신인 .trees.npz가 있으면 이를 사용합니다.
+
+Usage:
+    python scripts/compile_models.py
+    python scripts/compile_models.py --sites changdeok_palace --samples 100000
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+os.environ.setdefault("SEOUL_AIR_QUALITY_API_KEY", "stub")
+os.environ.setdefault("KMA_API_KEY", "stub")
+
+from ml_service.config import MLConfig
+from ml_service.predictor import PredictionService
+from ml_service.scenarios import sample_observations
+from ml_service.tree_engine import check_parity, compile_pipeline, compiled_path
+
+
+def compile_models(tourist_codes: list, n_samples: int) -> bool:
+    """
+    관광지별 모델 컴파일 및 XGBoost 비교
+
+    Returns:
+        bool: 모든 모델이 XGBoost와 일치하면 True
+    """
+    service = PredictionService()
+    raw = sample_observations(n_samples)
+    all_match = True
+
+    print(f"\n[INFO] 무작위 관측값 {n_samples:,}개로 XGBoost와 비교")
+    print("-" * 70)
+    for tourist_code in tourist_codes:
+        pipeline = service.load_pipeline(tourist_code)
+        forest = compile_pipeline(pipeline)
+        parity = check_parity(pipeline, forest, raw)
+
+        if parity["mismatched_visitors"]:
+            all_match = False
+            print(f"[ERROR] {tourist_code}: 방문자 수 불일치 {parity['mismatched_visitors']}행 "
+                  f"(최대 차이 {parity['max_abs_diff']:.4f}), 저장하지 않음")
+            continue
+
+        path = compiled_path(MLConfig.MODELS_SAVED_DIR / MLConfig.MODEL_FILES[tourist_code])
+        forest.save(path)
+        print(f"[INFO] {tourist_code}: 트리 {forest.n_trees}개, 깊이 {forest.depth}, "
+              f"최대 차이 {parity['max_abs_diff']:.4f} → {path.name}")
+
+    return all_match
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="저장된 모델을 NumPy 트리 배열로 컴파일")
+    parser.add_argument("--sites", nargs="+", default=list(MLConfig.TOURIST_SITES), help="관광지 코드 목록")
+    parser.add_argument("--samples", type=int, default=10000, help="XGBoost와 비교할 무작위 관측값 수")
+    args = parser.parse_args()
+
+    if not compile_models(args.sites, args.samples):
+        sys.exit(1)
@@ -5,25 +5,38 @@
 
 Usage:
     python scripts/evaluate_models.py
+    python scripts/evaluate_models.py --workers 4
+    python scripts/evaluate_models.py --streaming true --chunk-rows 100000
 """
+import argparse
+import os
 import sys
 import warnings
+from functools import partial
 from pathlib import Path
+from typing import Optional
 
 import pandas as pd
 import numpy as np
 import joblib
-from sklearn.metrics import (
-    mean_absolute_error,
-    mean_squared_error,
-    r2_score,
-    mean_absolute_percentage_error
-)
 
 sys.path.append(str(Path(__file__).parent.parent))
 
 from ml_service.config import MLConfig
-from ml_service.data_loader import load_tourist_data
+from ml_service.data_loader import count_tourist_rows, iter_tourist_data, load_tourist_data
+from ml_service.evaluation_artifact import build_evaluation_result
+from ml_service.evaluation_pool import EvaluationPool
+from ml_service.feature_schema import load_feature_schema
+from ml_service.metrics import track_stage
+from ml_service.model_set import limit_model_threads
+from ml_service.preprocessing import get_model_pipeline
+from ml_service.streaming_eval import (
+    SPLIT_METHOD,
+    HashSample,
+    RunningRegressionMetrics,
+    hash_split,
+    hash_train_test_split,
+)
 from sklearn.model_selection import train_test_split
 
 TOURIST_SITES = MLConfig.TOURIST_SITES
@@ -41,12 +54,59 @@ MODEL_CONFIG = {
 warnings.simplefilter("ignore")
 
 
-def evaluate_model(tourist_code: str) -> dict:
+def trained_with_hash_split(tourist_code: str, models_dir: Optional[Path] = None) -> bool:
+    """
+    모델이 스트리밍 평가와 같은 행 키 해시 분할로 학습되었는지 여부
+    
+    학습 시 피처 스키마에 기록한 분할 설정(split)이 이 스크립트의 test_size, random_state와 같아야 합니다.
+    기록이 없는 기존 모델은 train_test_split으로 학습된 것으로 봅니다.
+    
+    Args:
+        tourist_code: 관광지 코드
+        models_dir: 모델 파일 디렉토리 (None이면 MLConfig.MODELS_SAVED_DIR)
+    """
+    try:
+        split = load_feature_schema(tourist_code, models_dir).get("split") or {}
+    except (FileNotFoundError, ValueError):
+        return False
+    return (
+        split.get("method") == SPLIT_METHOD
+        and split.get("test_size") == MODEL_CONFIG["test_size"]
+        and split.get("random_state") == MODEL_CONFIG["random_state"]
+    )
+
+
+def use_streaming(korean_name: str, streaming: Optional[str] = None, hash_trained: bool = False) -> bool:
+    """
+    스트리밍 평가 사용 여부
+    
+    Args:
+        korean_name: 관광지 테이블 이름
+        streaming: "auto", "true", "false" (None이면 MLConfig.EVALUATE_STREAMING)
+        hash_trained: 모델이 행 키 해시 분할로 학습되었는지 여부 (trained_with_hash_split)
+    
+    Returns:
+        bool: "auto"이면 모델이 해시 분할로 학습되었고 테이블 행 수가 EVALUATE_STREAMING_MIN_ROWS 이상일 때 True
+              (train_test_split으로 학습한 모델을 해시 분할로 평가하면 테스트 데이터에 학습 데이터가 섞임)
+    """
+    streaming = (streaming or MLConfig.EVALUATE_STREAMING).lower()
+    if streaming not in ("auto", "true", "false"):
+        raise ValueError(f"EVALUATE_STREAMING은 auto, true, false 중 하나여야 합니다: {streaming}")
+    if streaming != "auto":
+        return streaming == "true"
+    return hash_trained and count_tourist_rows(korean_name) >= MLConfig.EVALUATE_STREAMING_MIN_ROWS
+
+
+def evaluate_model(tourist_code: str, model_threads: int = 0, streaming: Optional[str] = None,
+                   models_dir: Optional[Path] = None) -> dict:
     """
     관광지별 모델 성능 평가
     
     Args:
         tourist_code: 관광지 코드 (예: "changdeok_palace")
+        model_threads: 모델 내부 스레드 수 (0이면 모델 설정 그대로, 병렬 평가 시 CPU 과다 할당 방지)
+        streaming: 스트리밍 평가 여부 "auto", "true", "false" (None이면 MLConfig.EVALUATE_STREAMING)
+        models_dir: 모델 파일 디렉토리 (None이면 MLConfig.MODELS_SAVED_DIR, 서버는 현재 모델 세트의 버전 디렉토리)
     
     Returns:
         dict: 평가 결과 (지표 및 통계)
@@ -59,7 +119,7 @@ def evaluate_model(tourist_code: str) -> dict:
     
     # 모델 파일 확인
     model_filename = MODEL_FILES[tourist_code]
-    model_path = MODELS_SAVED_DIR / model_filename
+    model_path = (models_dir or MODELS_SAVED_DIR) / model_filename
     
     if not model_path.exists():
         return {
@@ -68,6 +128,10 @@ def evaluate_model(tourist_code: str) -> dict:
             "korean_name": korean_name
         }
     
+    hash_trained = trained_with_hash_split(tourist_code, models_dir)
+    if use_streaming(korean_name, streaming, hash_trained):
+        return evaluate_model_streaming(tourist_code, model_threads, models_dir=models_dir)
+    
     # 데이터 로드
     X, y = load_tourist_data(korean_name)
     
@@ -77,61 +141,134 @@ def evaluate_model(tourist_code: str) -> dict:
     X = X[mask]
     y = y[mask]
     
-    # 데이터 분할 (학습 시와 동일한 random_state 사용)
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y,
-        test_size=MODEL_CONFIG["test_size"],
-        random_state=MODEL_CONFIG["random_state"]
-    )
+    # 데이터 분할 (학습 시와 같은 방식, 분할 기록이 없는 기존 모델은 train_test_split)
+    if hash_trained:
+        X_train, X_test, y_train, y_test = hash_train_test_split(
+            X, y,
+            test_size=MODEL_CONFIG["test_size"],
+            seed=MODEL_CONFIG["random_state"]
+        )
+    else:
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, y,
+            test_size=MODEL_CONFIG["test_size"],
+            random_state=MODEL_CONFIG["random_state"]
+        )
     
-    # 모델 로드
-    pipeline = joblib.load(model_path)
+    # 모델 로드 (학습 DB 피처는 전처리 완료 상태이므로 관측값 변환기 단계 제외)
+    with track_stage("evaluate_load"):
+        pipeline = get_model_pipeline(joblib.load(model_path))
+        if model_threads > 0:
+            limit_model_threads(pipeline, model_threads)
     
     # 예측
-    y_train_pred = pipeline.predict(X_train)
-    y_test_pred = pipeline.predict(X_test)
-    
-    # 지표 계산
-    train_metrics = {
-        "MAE": mean_absolute_error(y_train, y_train_pred),
-        "MSE": mean_squared_error(y_train, y_train_pred),
-        "RMSE": np.sqrt(mean_squared_error(y_train, y_train_pred)),
-        "R²": r2_score(y_train, y_train_pred),
-        "MAPE": mean_absolute_percentage_error(y_train, y_train_pred) * 100
-    }
+    with track_stage("evaluate_predict"):
+        y_train_pred = pipeline.predict(X_train)
+        y_test_pred = pipeline.predict(X_test)
     
-    test_metrics = {
-        "MAE": mean_absolute_error(y_test, y_test_pred),
-        "MSE": mean_squared_error(y_test, y_test_pred),
-        "RMSE": np.sqrt(mean_squared_error(y_test, y_test_pred)),
-        "R²": r2_score(y_test, y_test_pred),
-        "MAPE": mean_absolute_percentage_error(y_test, y_test_pred) * 100
-    }
+    # 지표 및 통계 계산 (학습 시 평가 아티팩트와 같은 형식)
+    return build_evaluation_result(tourist_code, y_train, y_train_pred, y_test, y_test_pred, len(X.columns))
+
+
+def evaluate_model_streaming(tourist_code: str, model_threads: int = 0,
+                             chunk_rows: Optional[int] = None, sample_rows: Optional[int] = None,
+                             models_dir: Optional[Path] = None) -> dict:
+    """
+    관광지별 모델 성능 평가 (청크 단위 스트리밍)
     
-    # 통계 정보
+    테이블을 chunk_rows행씩 읽어 예측하고 지표의 충분 통계량만 누적하므로 최대 메모리 사용량은
+    테이블 크기와 무관하게 청크 하나와 산점도 표본(sample_rows행) 크기로 제한됩니다.
+    학습/테스트는 행 키(rowid) 해시로 나누며 predictions는 테스트 데이터 전체가 아닌 해시 표본입니다.
+    해시 분할로 학습한 모델은 학습 시와 같은 분할이지만, 분할 기록이 없는 기존 모델(train_test_split)은
+    테스트 데이터에 학습 데이터가 섞이므로 결과의 streaming.held_out이 False입니다.
+    
+    Args:
+        tourist_code: 관광지 코드 (예: "changdeok_palace")
+        model_threads: 모델 내부 스레드 수 (0이면 모델 설정 그대로)
+        chunk_rows: 청크 행 수 (None이면 MLConfig.EVALUATE_CHUNK_ROWS)
+        sample_rows: 산점도 표본 크기 (None이면 MLConfig.EVALUATE_STREAM_SAMPLE_ROWS)
+        models_dir: 모델 파일 디렉토리 (None이면 MLConfig.MODELS_SAVED_DIR)
+    
+    Returns:
+        dict: evaluate_model과 같은 형식의 평가 결과
+              (streaming: 청크 수, 청크 행 수, 표본 크기, 테스트 데이터가 학습에 쓰이지 않았는지 여부)
+    """
+    if tourist_code not in TOURIST_SITES:
+        raise ValueError(f"알 수 없는 관광지 코드: {tourist_code}")
+    
+    korean_name = TOURIST_SITES[tourist_code]["korean_name"]
+    model_path = (models_dir or MODELS_SAVED_DIR) / MODEL_FILES[tourist_code]
+    chunk_rows = chunk_rows or MLConfig.EVALUATE_CHUNK_ROWS
+    sample_rows = MLConfig.EVALUATE_STREAM_SAMPLE_ROWS if sample_rows is None else sample_rows
+    held_out = trained_with_hash_split(tourist_code, models_dir)
+    
+    # 모델 로드 (학습 DB 피처는 전처리 완료 상태이므로 관측값 변환기 단계 제외)
+    with track_stage("evaluate_load"):
+        pipeline = get_model_pipeline(joblib.load(model_path))
+        if model_threads > 0:
+            limit_model_threads(pipeline, model_threads)
+    
+    train = RunningRegressionMetrics()
+    test = RunningRegressionMetrics()
+    sample = HashSample(sample_rows, seed=MODEL_CONFIG["random_state"])
+    feature_count = 0
+    chunks = 0
+    
+    for keys, X, y in iter_tourist_data(korean_name, chunk_rows):
+        chunks += 1
+        feature_count = len(X.columns)
+        
+        # 결측값 처리
+        X = X.fillna(0)
+        mask = (~y.isnull()).to_numpy()
+        X, y, keys = X[mask], y[mask].to_numpy(dtype=np.float64), keys[mask]
+        if len(y) == 0:
+            continue
+        
+        # 데이터 분할 (행 키 해시, 청크 크기와 무관)
+        is_test = hash_split(keys, MODEL_CONFIG["test_size"], seed=MODEL_CONFIG["random_state"])
+        
+        # 예측 및 누적
+        with track_stage("evaluate_predict"):
+            y_pred = np.asarray(pipeline.predict(X), dtype=np.float64)
+        train.update(y[~is_test], y_pred[~is_test])
+        test.update(y[is_test], y_pred[is_test])
+        sample.update(keys[is_test], y[is_test], y_pred[is_test])
+    
+    if test.count == 0 or train.count == 0:
+        raise ValueError(f"'{korean_name}' 테이블의 학습/테스트 데이터가 부족합니다.")
+    
+    # 통계 정보 (실제값 표준편차는 pandas, 예측값 표준편차는 numpy 기본값과 같은 자유도)
     stats = {
-        "train_size": len(X_train),
-        "test_size": len(X_test),
-        "feature_count": len(X.columns),
-        "actual_mean": float(y_test.mean()),
-        "actual_std": float(y_test.std()),
-        "predicted_mean": float(y_test_pred.mean()),
-        "predicted_std": float(y_test_pred.std()),
-        "max_actual": int(y_test.max()),
-        "max_predicted": int(y_test_pred.max()),
-        "min_actual": int(y_test.min()),
-        "min_predicted": int(y_test_pred.min())
+        "train_size": train.count,
+        "test_size": test.count,
+        "feature_count": feature_count,
+        "actual_mean": test.actual.mean,
+        "actual_std": test.actual.std(ddof=1),
+        "predicted_mean": test.predicted.mean,
+        "predicted_std": test.predicted.std(ddof=0),
+        "max_actual": int(test.actual.max),
+        "max_predicted": int(test.predicted.max),
+        "min_actual": int(test.actual.min),
+        "min_predicted": int(test.predicted.min)
     }
     
+    actual_sample, predicted_sample = sample.arrays()
     return {
         "tourist_code": tourist_code,
         "korean_name": korean_name,
-        "train_metrics": train_metrics,
-        "test_metrics": test_metrics,
+        "train_metrics": train.metrics(),
+        "test_metrics": test.metrics(),
         "stats": stats,
         "predictions": {
-            "actual": y_test.values.tolist(),
-            "predicted": y_test_pred.tolist()
+            "actual": actual_sample.tolist(),
+            "predicted": predicted_sample.tolist()
+        },
+        "streaming": {
+            "chunks": chunks,
+            "chunk_rows": chunk_rows,
+            "sample_size": len(actual_sample),
+            "held_out": held_out
         }
     }
 
@@ -147,6 +284,12 @@ def print_evaluation_report(results: dict):
     print(f"[EVALUATION] {korean_name} 모델 성능 평가")
     print(f"{'='*70}")
     
+    if "streaming" in results:
+        streaming = results["streaming"]
+        print(f"\n[INFO] 스트리밍 평가 ({streaming['chunks']}개 청크 × {streaming['chunk_rows']:,}행, 행 키 해시 분할)")
+        if not streaming["held_out"]:
+            print("[WARNING] 모델이 해시 분할로 학습되지 않아 테스트 지표에 학습 데이터가 포함되어 있습니다 (재학습 필요)")
+    
     print(f"\n[TRAIN] 학습 데이터 성능 ({stats['train_size']}개 샘플):")
     print(f"   R² Score:        {train_metrics['R²']:>8.4f}")
     print(f"   MAE (평균 절대 오차): {train_metrics['MAE']:>8.2f}명")
@@ -187,25 +330,39 @@ def print_evaluation_report(results: dict):
         print("   [GOOD] 일반화 성능 양호")
 
 
-def evaluate_all_models():
-    """모든 관광지 모델 평가"""
+def evaluate_all_models(workers: Optional[int] = None, streaming: Optional[str] = None):
+    """
+    모든 관광지 모델 평가
+    
+    Args:
+        workers: 동시에 평가할 프로세스 수 (None이면 MLConfig.EVALUATE_WORKERS)
+        streaming: 스트리밍 평가 여부 "auto", "true", "false" (None이면 MLConfig.EVALUATE_STREAMING)
+    """
+    evaluate = evaluate_model if streaming is None else partial(evaluate_model, streaming=streaming)
+    pool = EvaluationPool(evaluate, workers=workers)
     print("\n" + "="*70)
-    print("[INFO] 모든 관광지 모델 성능 평가 시작")
+    print(f"[INFO] 모든 관광지 모델 성능 평가 시작 (워커 {pool.workers}개, 모델 스레드 {pool.model_threads}개)")
     print("="*70)
     
     all_results = []
     failed = []
     
+    try:
+        results, errors = pool.evaluate_many(list(TOURIST_SITES.keys()))
+    finally:
+        pool.shutdown()
+    
     for tourist_code in TOURIST_SITES.keys():
-        try:
-            result = evaluate_model(tourist_code)
+        if tourist_code in results:
+            result = results[tourist_code]
             if "error" in result:
                 failed.append(result)
                 print(f"\n[ERROR] {result['korean_name']}: {result['error']}")
             else:
                 all_results.append(result)
                 print_evaluation_report(result)
-        except Exception as e:
+        else:
+            e = errors[tourist_code]
             korean_name = TOURIST_SITES[tourist_code]["korean_name"]
             failed.append({
                 "tourist_code": tourist_code,
@@ -247,8 +404,22 @@ def evaluate_all_models():
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="모델 성능 평가 및 진단")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="동시에 평가할 프로세스 수 (기본: EVALUATE_WORKERS, 0이면 CPU 수에 맞춤)")
+    parser.add_argument("--streaming", choices=["auto", "true", "false"], default=None,
+                        help="청크 단위 스트리밍 평가 (기본: EVALUATE_STREAMING)")
+    parser.add_argument("--chunk-rows", type=int, default=None,
+                        help="스트리밍 평가 청크 행 수 (기본: EVALUATE_CHUNK_ROWS)")
+    args = parser.parse_args()
+    
+    if args.chunk_rows:
+        # spawn으로 시작하는 평가 워커도 같은 값을 읽도록 환경 변수로 전달
+        os.environ["EVALUATE_CHUNK_ROWS"] = str(args.chunk_rows)
+        MLConfig.EVALUATE_CHUNK_ROWS = args.chunk_rows
+    
     try:
-        evaluate_all_models()
+        evaluate_all_models(args.workers, args.streaming)
     except KeyboardInterrupt:
         print("\n\n[WARNING] 사용자에 의해 중단되었습니다.")
         sys.exit(1)
@@ -0,0 +1,100 @@
+"""
+학습된 모델을 모델 레지스트리에 새 버전으로 게시
+
+models/saved/의 관광지별 모델 파일(pkl, 스키마, 네이티브 모델, 컴파일된 트리, 모델 번들)을
+models/registry/<버전>/으로 복사하고 현재 버전 포인터(CURRENT)를 원자적으로 교체합니다.
+실행 중인 서버는 MODEL_RELOAD_POLL_SECONDS마다 포인터를 확인하거나
+POST /api/models/reload 요청을 받으면 새 버전을 예열한 뒤 무중단으로 교체합니다.
+
+Usage:
+    python scripts/publish_models.py                      # models/saved/를 새 버전으로 게시
+    python scripts/publish_models.py --list               # 게시된 버전 목록
+    python scripts/publish_models.py --activate VERSION   # 이전 버전으로 되돌리기
+    python scripts/publish_models.py --prune 3            # 최근 3개 버전만 남기기
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from ml_service.config import MLConfig
+from ml_service.registry import ModelRegistry
+
+
+def publish_models(source_dir: Path, keep: int) -> bool:
+    """
+    모델 디렉토리를 새 버전으로 게시하고 현재 버전으로 지정
+
+    Returns:
+        bool: 게시 성공 여부
+    """
+    registry = ModelRegistry()
+    try:
+        previous = registry.current_version()
+        version = registry.create_version(source_dir)
+        manifest = registry.verify(version)
+        registry.activate(version)
+        removed = registry.prune(keep)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"[ERROR] 모델 게시 실패: {e}")
+        return False
+
+    print(f"[INFO] {source_dir} → {registry.version_dir(version)} (파일 {len(manifest['files'])}개)")
+    print(f"[INFO] 현재 버전: {previous or '(없음)'} → {version}")
+    if removed:
+        print(f"[INFO] 오래된 버전 삭제: {', '.join(removed)}")
+    return True
+
+
+def list_versions():
+    """게시된 버전 목록 출력 (현재 버전은 * 표시)"""
+    registry = ModelRegistry()
+    current = registry.current_version()
+    versions = registry.versions()
+    if not versions:
+        print(f"[INFO] 게시된 버전이 없습니다 ({registry.root}), 서버는 {MLConfig.MODELS_SAVED_DIR}을(를) 사용합니다")
+        return
+    for version in versions:
+        manifest = registry.load_manifest(version)
+        marker = "*" if version == current else " "
+        print(f"{marker} {version}  {manifest['created_at']}  {manifest['model_type']}  파일 {len(manifest['files'])}개")
+
+
+def activate_version(version: str) -> bool:
+    """
+    게시된 버전을 현재 버전으로 지정
+
+    Returns:
+        bool: 지정 성공 여부
+    """
+    registry = ModelRegistry()
+    try:
+        previous = registry.current_version()
+        registry.activate(version)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"[ERROR] 버전 지정 실패: {e}")
+        return False
+    print(f"[INFO] 현재 버전: {previous or '(없음)'} → {version}")
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="학습된 모델을 모델 레지스트리에 새 버전으로 게시")
+    parser.add_argument("--source", type=Path, default=MLConfig.MODELS_SAVED_DIR, help="게시할 모델 디렉토리")
+    parser.add_argument("--keep", type=int, default=MLConfig.MODEL_REGISTRY_KEEP, help="게시 후 남겨 둘 최근 버전 수")
+    parser.add_argument("--list", action="store_true", help="게시된 버전 목록 출력")
+    parser.add_argument("--activate", metavar="VERSION", help="게시된 버전을 현재 버전으로 지정")
+    parser.add_argument("--prune", type=int, metavar="N", help="최근 N개 버전만 남기고 삭제 (현재 버전은 유지)")
+    args = parser.parse_args()
+
+    if args.list:
+        list_versions()
+    elif args.activate:
+        if not activate_version(args.activate):
+            sys.exit(1)
+    elif args.prune is not None:
+        removed = ModelRegistry().prune(args.prune)
+        print(f"[INFO] 삭제한 버전: {', '.join(removed) or '(없음)'}")
+    elif not publish_models(args.source, args.keep):
+        sys.exit(1)
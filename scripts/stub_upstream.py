@@ -0,0 +1,370 @@
+"""
+업스트림 API 로컬 스텁 서버
+
+서울시 대기환경 API와 기상청 초단기실황/단기예보 API를 흉내 내는 로컬 HTTP 서버입니다.
+네트워크나 API 키 없이 예측 경로와 지연 시간을 테스트할 수 있습니다.
+--replay를 지정하면 UPSTREAM_MODE=record로 녹화한 실제 응답을 현재 시각에 맞춰 다시 제공하고,
+지정하지 않으면 위치별로 결정적인 가상 응답을 만듭니다.
+
+Usage:
+    python scripts/stub_upstream.py --port 8089 --latency-ms 200
+    python scripts/stub_upstream.py --replay --latency-ms 80 --jitter-ms 40 --error-rate 0.02
+    python scripts/stub_upstream.py --replay fixtures/upstream --profile profile.json --seed 1
+
+    # 다른 터미널에서 백엔드를 스텁 서버로 연결 (API 키 불필요)
+    UPSTREAM_MODE=replay UPSTREAM_STUB_URL=http://127.0.0.1:8089 python backend/server.py
+
+    # 실제 API 응답 녹화 (API 키 필요, fixtures/upstream/에 저장)
+    UPSTREAM_MODE=record python backend/server.py
+"""
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import urlsplit, parse_qs
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from ml_service.config import MLConfig
+from ml_service.fixtures import (
+    AIR_QUALITY_FIXTURE,
+    FIXTURE_UPSTREAMS,
+    FORECAST_FIXTURE,
+    FixtureStore,
+    fixture_name,
+)
+from ml_service.resilience import AIR_QUALITY_UPSTREAM, KMA_UPSTREAM
+
+
+def _seed(*parts) -> int:
+    """위치 정보로부터 결정적인 값 생성용 시드 계산"""
+    return sum(ord(c) for c in "".join(str(p) for p in parts))
+
+
+def build_air_quality_payload(district_code: str) -> dict:
+    """대기환경 API 응답 본문 생성"""
+    now = datetime.now()
+    seed = _seed(district_code)
+    return {
+        MLConfig.AIR_QUALITY_API_SERVICE: {
+            "list_total_count": 1,
+            "RESULT": {"CODE": "INFO-000", "MESSAGE": "정상 처리되었습니다"},
+            "row": [{
+                "MSRMT_YMD": now.strftime("%Y%m%d%H00") + "00",
+                "MSRSTN_PBADMS_CD": district_code,
+                "PM": str(20 + seed % 40)
+            }]
+        }
+    }
+
+
+def build_weather_payload(nx: int, ny: int, base_date: str, base_time: str) -> dict:
+    """기상청 초단기실황 API 응답 본문 생성"""
+    seed = _seed(nx, ny)
+    values = {
+        "T1H": 10 + seed % 15,
+        "REH": 40 + seed % 40,
+        "WSD": round(1 + (seed % 30) / 10, 1),
+        "RN1": 0
+    }
+    return {
+        "response": {
+            "header": {"resultCode": "00", "resultMsg": "NORMAL_SERVICE"},
+            "body": {
+                "dataType": "JSON",
+                "items": {"item": [
+                    {"baseDate": base_date, "baseTime": base_time, "category": category,
+                     "nx": nx, "ny": ny, "obsrValue": str(value)}
+                    for category, value in values.items()
+                ]},
+                "pageNo": 1,
+                "numOfRows": len(values),
+                "totalCount": len(values)
+            }
+        }
+    }
+
+
+def build_forecast_payload(nx: int, ny: int, base_date: str, base_time: str, hours: int = 80) -> dict:
+    """기상청 단기예보 API 응답 본문 생성 (발표 시각 이후 hours 시간)"""
+    seed = _seed(nx, ny)
+    try:
+        base = datetime.strptime(base_date + base_time, "%Y%m%d%H%M")
+    except ValueError:
+        base = datetime.now().replace(minute=0, second=0, microsecond=0)
+
+    items = []
+    for step in range(1, hours + 1):
+        fcst = base + timedelta(hours=step)
+        hour = fcst.hour
+        values = {
+            "TMP": str(10 + seed % 15 + (4 if 11 <= hour <= 17 else 0)),
+            "REH": str(40 + (seed + hour) % 40),
+            "WSD": str(round(1 + ((seed + hour) % 30) / 10, 1)),
+            "PCP": ["강수없음", "강수없음", "강수없음", "1mm 미만", "2.0mm"][(seed + step) % 5],
+            "SKY": "1"
+        }
+        items.extend(
+            {"baseDate": base_date, "baseTime": base_time, "category": category,
+             "fcstDate": fcst.strftime("%Y%m%d"), "fcstTime": fcst.strftime("%H00"),
+             "fcstValue": value, "nx": nx, "ny": ny}
+            for category, value in values.items()
+        )
+
+    return {
+        "response": {
+            "header": {"resultCode": "00", "resultMsg": "NORMAL_SERVICE"},
+            "body": {
+                "dataType": "JSON",
+                "items": {"item": items},
+                "pageNo": 1,
+                "numOfRows": len(items),
+                "totalCount": len(items)
+            }
+        }
+    }
+
+
+class StubProfile:
+    """
+    업스트림 하나의 지연/오류 프로필
+
+    Args:
+        latency_ms: 모든 응답에 추가할 지연 시간 (밀리초)
+        jitter_ms: 추가 지연 시간의 최대값 (0 ~ jitter_ms 균등 분포, 밀리초)
+        slow_rate: 느린 응답 비율 (0~1)
+        slow_ms: 느린 응답에 추가할 지연 시간 (밀리초, 시간 초과/헤지 요청 테스트용)
+        error_rate: HTTP 오류 응답 비율 (0~1)
+        error_status: HTTP 오류 응답 상태 코드
+        api_error_rate: HTTP 200이지만 본문에 API 오류 코드를 담은 응답 비율 (0~1)
+    """
+
+    FIELDS = ("latency_ms", "jitter_ms", "slow_rate", "slow_ms", "error_rate", "error_status", "api_error_rate")
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, slow_rate: float = 0.0,
+                 slow_ms: float = 0.0, error_rate: float = 0.0, error_status: int = 503,
+                 api_error_rate: float = 0.0):
+        self.latency_ms = float(latency_ms)
+        self.jitter_ms = float(jitter_ms)
+        self.slow_rate = float(slow_rate)
+        self.slow_ms = float(slow_ms)
+        self.error_rate = float(error_rate)
+        self.error_status = int(error_status)
+        self.api_error_rate = float(api_error_rate)
+
+    def merged(self, overrides: dict) -> "StubProfile":
+        """일부 항목만 바꾼 새 프로필"""
+        unknown = set(overrides) - set(self.FIELDS)
+        if unknown:
+            raise ValueError(f"알 수 없는 프로필 항목: {sorted(unknown)}")
+        return StubProfile(**{**{field: getattr(self, field) for field in self.FIELDS}, **overrides})
+
+    def delay(self, rng: random.Random) -> float:
+        """이번 응답의 지연 시간 (초)"""
+        delay_ms = self.latency_ms + rng.uniform(0, self.jitter_ms)
+        if rng.random() < self.slow_rate:
+            delay_ms += self.slow_ms
+        return delay_ms / 1000.0
+
+    def describe(self) -> str:
+        return ", ".join(f"{field}={getattr(self, field):g}" for field in self.FIELDS)
+
+
+def load_profiles(default: StubProfile, profile_file: Optional[Path] = None) -> Dict[str, StubProfile]:
+    """
+    업스트림별 프로필 (프로필 파일 없으면 모든 업스트림이 default 사용)
+
+    프로필 파일 형식 (JSON, 지정한 항목만 default에서 변경):
+        {"default": {"latency_ms": 50}, "kma": {"error_rate": 0.1, "slow_rate": 0.05, "slow_ms": 3000}}
+    """
+    overrides = {}
+    if profile_file is not None:
+        with open(profile_file, encoding="utf-8") as f:
+            overrides = json.load(f)
+    default = default.merged(overrides.get("default", {}))
+    return {
+        upstream: default.merged(overrides.get(upstream, {}))
+        for upstream in (AIR_QUALITY_UPSTREAM, KMA_UPSTREAM)
+    }
+
+
+def api_error_payload(kind: str) -> dict:
+    """HTTP 200이지만 API 오류 코드를 담은 응답 본문 (데이터 없음)"""
+    if kind == AIR_QUALITY_FIXTURE:
+        return {MLConfig.AIR_QUALITY_API_SERVICE: {
+            "list_total_count": 0,
+            "RESULT": {"CODE": "INFO-200", "MESSAGE": "해당하는 데이터가 없습니다."}
+        }}
+    return {"response": {"header": {"resultCode": "03", "resultMsg": "NO_DATA"}}}
+
+
+def synthetic_payload(kind: str, query: dict, segments: list) -> dict:
+    """요청 위치로 만든 가상 응답 본문"""
+    if kind == AIR_QUALITY_FIXTURE:
+        return build_air_quality_payload(segments[-1])
+    builder = build_forecast_payload if kind == FORECAST_FIXTURE else build_weather_payload
+    return builder(
+        int(query.get("nx", "60")),
+        int(query.get("ny", "127")),
+        query.get("base_date", ""),
+        query.get("base_time", "")
+    )
+
+
+class StubUpstreamHandler(BaseHTTPRequestHandler):
+    """
+    대기환경/기상청 API 요청을 처리하는 스텁 핸들러
+
+    fixtures가 있으면 녹화된 응답(시각을 현재 기준으로 이동)을, 없으면 가상 응답을 반환합니다.
+    """
+
+    profiles: Dict[str, StubProfile] = {}
+    fixtures: Optional[FixtureStore] = None
+    rng = random.Random()
+
+    def do_GET(self):
+        self.server.count_request()
+
+        parts = urlsplit(self.path)
+        segments = [seg for seg in parts.path.split("/") if seg]
+        query = {key: values[0] for key, values in parse_qs(parts.query).items()}
+        name = fixture_name(self.path, query)
+        if name is None:
+            self.send_error(404, "Unknown endpoint")
+            return
+
+        kind = name.split("/", 1)[0]
+        profile = self.profiles.get(FIXTURE_UPSTREAMS[kind]) or StubProfile()
+        time.sleep(profile.delay(self.rng))
+
+        if self.rng.random() < profile.error_rate:
+            self.send_error(profile.error_status, "Stub upstream error")
+            return
+        if self.rng.random() < profile.api_error_rate:
+            payload = api_error_payload(kind)
+        elif self.fixtures is not None:
+            payload = self.fixtures.load(name)
+            if payload is None:
+                self.send_error(404, f"No fixture: {name}")
+                return
+        else:
+            payload = synthetic_payload(kind, query, segments)
+
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # 헤지 요청 등으로 클라이언트가 먼저 연결을 닫은 경우
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubHTTPServer(ThreadingHTTPServer):
+    """동시 연결 버스트를 받을 수 있도록 listen 백로그를 늘린 스레드 서버"""
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.request_count = 0
+        self._count_lock = threading.Lock()
+
+    def count_request(self):
+        """받은 업스트림 요청 수 증가 (벤치마크에서 워커별 중복 호출 확인용)"""
+        with self._count_lock:
+            self.request_count += 1
+
+
+def start_stub_server(host: str = "127.0.0.1", port: int = 8089, latency_ms: float = 0.0,
+                      fixtures_dir: Optional[Path] = None, profiles: Optional[Dict[str, StubProfile]] = None,
+                      seed: Optional[int] = None):
+    """
+    스텁 서버를 백그라운드 스레드에서 시작
+
+    Args:
+        host: 바인딩 호스트
+        port: 바인딩 포트 (0이면 임의 포트)
+        latency_ms: 모든 응답에 추가할 지연 시간 (밀리초, profiles를 지정하면 무시)
+        fixtures_dir: 녹화된 픽스처 디렉토리 (None이면 가상 응답)
+        profiles: 업스트림별 지연/오류 프로필 (load_profiles 반환값)
+        seed: 지연/오류 난수 시드 (같은 시드면 같은 순서로 발생)
+
+    Returns:
+        ThreadingHTTPServer: 실행 중인 서버 (server.shutdown()으로 종료)
+    """
+    if profiles is None:
+        profiles = load_profiles(StubProfile(latency_ms=latency_ms))
+    handler = type("ConfiguredStubHandler", (StubUpstreamHandler,), {
+        "profiles": profiles,
+        "fixtures": FixtureStore(fixtures_dir) if fixtures_dir is not None else None,
+        "rng": random.Random(seed)
+    })
+    server = StubHTTPServer((host, port), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def stub_base_urls(server) -> dict:
+    """스텁 서버를 가리키는 MLConfig Base URL 값 반환"""
+    host, port = server.server_address[:2]
+    return {
+        "SEOUL_AIR_QUALITY_API_BASE_URL": f"http://{host}:{port}",
+        "KMA_API_BASE_URL": f"http://{host}:{port}{MLConfig.KMA_API_PATH}"
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="업스트림 API 로컬 스텁 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--replay", type=Path, nargs="?", const=MLConfig.UPSTREAM_FIXTURES_DIR, metavar="DIR",
+                        help="녹화된 픽스처로 응답 (기본 디렉토리: UPSTREAM_FIXTURES_DIR)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="응답 지연 시간 (밀리초)")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="추가 지연 시간 최대값 (밀리초)")
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="느린 응답 비율 (0~1)")
+    parser.add_argument("--slow-ms", type=float, default=0.0, help="느린 응답에 추가할 지연 시간 (밀리초)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="HTTP 오류 응답 비율 (0~1)")
+    parser.add_argument("--error-status", type=int, default=503, help="HTTP 오류 응답 상태 코드")
+    parser.add_argument("--api-error-rate", type=float, default=0.0, help="API 오류 코드 응답 비율 (0~1)")
+    parser.add_argument("--profile", type=Path, help="업스트림별 프로필 JSON 파일 (air_quality, kma, default)")
+    parser.add_argument("--seed", type=int, help="지연/오류 난수 시드")
+    args = parser.parse_args()
+
+    default_profile = StubProfile(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, slow_rate=args.slow_rate, slow_ms=args.slow_ms,
+        error_rate=args.error_rate, error_status=args.error_status, api_error_rate=args.api_error_rate
+    )
+    profiles = load_profiles(default_profile, args.profile)
+    if args.replay is not None:
+        fixtures = FixtureStore(args.replay)
+        if not fixtures.names():
+            print(f"[ERROR] 픽스처가 없습니다: {args.replay} (UPSTREAM_MODE=record로 먼저 녹화하세요)")
+            sys.exit(1)
+        print(f"[INFO] 픽스처 재생: {args.replay} {fixtures.summary()}")
+
+    server = start_stub_server(args.host, args.port, fixtures_dir=args.replay, profiles=profiles, seed=args.seed)
+    print(f"[INFO] 스텁 서버 실행 중: http://{args.host}:{args.port}")
+    for upstream, profile in profiles.items():
+        print(f"[INFO] {upstream}: {profile.describe()}")
+    print(f"[INFO] 백엔드 연결: UPSTREAM_MODE=replay UPSTREAM_STUB_URL=http://{args.host}:{args.port} python backend/server.py")
+
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+        print("\n[INFO] 스텁 서버 종료")
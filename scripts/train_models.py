@@ -5,6 +5,10 @@
 
 Usage:
     python scripts/train_models.py
+    python scripts/train_models.py --bundle       # 학습 후 다중 관광지 번들 생성
+    python scripts/train_models.py --bundle-only  # 저장된 모델로 번들만 다시 생성
+    python scripts/train_models.py --native-only  # 저장된 pkl 모델을 네이티브 형식(.ubj + .native.json)으로만 변환
+    python scripts/train_models.py --publish      # 학습 후 모델 레지스트리에 새 버전으로 게시 (scripts/publish_models.py)
     
 환경변수로 모델 타입 변경 가능:
     MODEL_TYPE=xgboost python scripts/train_models.py
@@ -12,20 +16,39 @@ Usage:
     MODEL_TYPE=lightgbm python scripts/train_models.py
     MODEL_TYPE=catboost python scripts/train_models.py
 """
+import argparse
 import sys
+import time
 import warnings
 from pathlib import Path
 
 import pandas as pd
 import joblib
-from sklearn.model_selection import train_test_split
 from sklearn.pipeline import Pipeline
 
 sys.path.append(str(Path(__file__).parent.parent))
 
+from ml_service.bundle import SiteBundle, check_bundle_parity, model_sources
 from ml_service.config import MLConfig
 from ml_service.data_loader import load_tourist_data
+from ml_service.evaluation_artifact import build_evaluation_result, save_evaluation_artifact
+from ml_service.feature_schema import (
+    build_feature_schema,
+    build_feature_schema_from_pipeline,
+    load_feature_schema,
+    save_feature_schema,
+)
 from ml_service.model_factory import ModelFactory
+from ml_service.native_model import save_native_model
+from ml_service.preprocessing import (
+    FEATURE_STEP_NAME,
+    ObservationFeatureTransformer,
+    has_feature_step,
+    load_scalers,
+    with_feature_step,
+)
+from ml_service.scenarios import sample_observations
+from ml_service.streaming_eval import SPLIT_METHOD, hash_train_test_split
 
 TOURIST_SITES = MLConfig.TOURIST_SITES
 MODELS_SAVED_DIR = MLConfig.MODELS_SAVED_DIR
@@ -60,7 +83,9 @@ def train_and_save_model(tourist_code: str) -> bool:
     try:
         # 데이터 로드
         print("[INFO] 데이터 로드 중...")
+        started = time.perf_counter()
         X, y = load_tourist_data(korean_name)
+        load_seconds = time.perf_counter() - started
         print(f"[INFO] 데이터 로드 완료: {len(X)}행, {len(X.columns)}개 피처")
         
         # 결측값 처리
@@ -71,12 +96,17 @@ def train_and_save_model(tourist_code: str) -> bool:
         y = y[mask]
         print(f"[INFO] 결측값 처리 완료: {len(X)}행")
         
-        # 데이터 분할
+        # 데이터 분할 (행 키 해시, 스트리밍 평가와 같은 분할이므로 어느 평가 방식이든 테스트 데이터가 학습에 쓰이지 않음)
         print("[INFO] 데이터 분할 중...")
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y, 
-            test_size=MODEL_CONFIG["test_size"], 
-            random_state=MODEL_CONFIG["random_state"]
+        split = {
+            "method": SPLIT_METHOD,
+            "test_size": MODEL_CONFIG["test_size"],
+            "random_state": MODEL_CONFIG["random_state"]
+        }
+        X_train, X_test, y_train, y_test = hash_train_test_split(
+            X, y,
+            test_size=split["test_size"],
+            seed=split["random_state"]
         )
         print(f"[INFO] 학습 데이터: {len(X_train)}행, 테스트 데이터: {len(X_test)}행")
         
@@ -98,19 +128,32 @@ def train_and_save_model(tourist_code: str) -> bool:
         
         model = ModelFactory.create_model(MODEL_TYPE, model_config)
         
-        # Pipeline 생성 (향후 전처리 단계 추가 가능)
+        # 학습 DB의 피처는 이미 전처리된 값이므로 모델만 학습
+        started = time.perf_counter()
+        model.fit(X_train, y_train)
+        fit_seconds = time.perf_counter() - started
+        
+        # Pipeline 생성: 관측값 변환기(스케일링, 불쾌지수, 원-핫) + 모델
+        # 서빙 시에는 관측값을 그대로 넣어 한 번의 predict 호출로 예측
+        transformer = ObservationFeatureTransformer.from_scalers(
+            load_scalers(), feature_columns=list(X.columns)
+        )
         pipeline = Pipeline([
+            (FEATURE_STEP_NAME, transformer),
             ('model', model)
         ])
         
-        pipeline.fit(X_train, y_train)
-        
-        # 테스트 데이터로 평가
-        train_score = pipeline.score(X_train, y_train)
-        test_score = pipeline.score(X_test, y_test)
+        # 테스트 데이터로 평가 (결과는 평가 아티팩트로 저장하여 평가 API가 다시 예측하지 않도록 함)
+        started = time.perf_counter()
+        y_train_pred = model.predict(X_train)
+        y_test_pred = model.predict(X_test)
+        predict_seconds = time.perf_counter() - started
+        evaluation = build_evaluation_result(
+            tourist_code, y_train, y_train_pred, y_test, y_test_pred, len(X.columns)
+        )
         print(f"[INFO] 학습 완료")
-        print(f"[INFO] 학습 데이터 R²: {train_score:.4f}")
-        print(f"[INFO] 테스트 데이터 R²: {test_score:.4f}")
+        print(f"[INFO] 학습 데이터 R²: {evaluation['train_metrics']['R²']:.4f}")
+        print(f"[INFO] 테스트 데이터 R²: {evaluation['test_metrics']['R²']:.4f}")
         
         # 모델 저장 디렉토리 생성
         MODELS_SAVED_DIR.mkdir(parents=True, exist_ok=True)
@@ -122,6 +165,25 @@ def train_and_save_model(tourist_code: str) -> bool:
         joblib.dump(pipeline, model_path)
         print(f"[INFO] 모델 저장 완료: {model_path}")
         
+        # 네이티브 모델 파일 저장 (서빙 시 pickle 없이 빠르게 로드, pkl보다 나중에 저장해야 사용됨)
+        if MODEL_TYPE == "xgboost":
+            meta_path = save_native_model(tourist_code, pipeline)
+            print(f"[INFO] 네이티브 모델 저장 완료: {meta_path}")
+        
+        # 피처 스키마 매니페스트 저장 (서빙 시 DB 조회 없이 컬럼 순서 확인용, 평가 시 분할 방식 확인용)
+        schema_path = save_feature_schema(tourist_code, build_feature_schema(tourist_code, X, split))
+        print(f"[INFO] 피처 스키마 저장 완료: {schema_path}")
+        
+        # 평가 아티팩트 저장 (pkl 저장 후 모델 파일 지문을 기록해야 하므로 마지막에 저장)
+        artifact_path = save_evaluation_artifact(
+            tourist_code, evaluation,
+            train_index=X_train.index.to_numpy(),
+            test_index=X_test.index.to_numpy(),
+            timing={"load_seconds": load_seconds, "fit_seconds": fit_seconds, "predict_seconds": predict_seconds},
+            split=split
+        )
+        print(f"[INFO] 평가 아티팩트 저장 완료: {artifact_path}")
+        
         return True
         
     except Exception as e:
@@ -173,6 +235,121 @@ def train_all_models():
     return results
 
 
+def load_saved_pipeline(tourist_code: str, scalers: dict):
+    """
+    저장된 Pipeline 로드
+    
+    변환기 없이 저장된 기존 모델은 피처 스키마 순서로 pkl/ 스케일러 변환기를 앞에 붙입니다.
+    """
+    model_path = MODELS_SAVED_DIR / MODEL_FILES[tourist_code]
+    pipeline = joblib.load(model_path)
+    if has_feature_step(pipeline):
+        return pipeline
+    
+    try:
+        feature_columns = load_feature_schema(tourist_code)["feature_columns"]
+    except FileNotFoundError:
+        feature_columns = build_feature_schema_from_pipeline(tourist_code, pipeline)["feature_columns"]
+    return with_feature_step(pipeline, ObservationFeatureTransformer.from_scalers(scalers, feature_columns))
+
+
+def save_native_models() -> bool:
+    """
+    저장된 관광지별 pkl 모델을 네이티브 형식(XGBoost UBJSON 부스터 + 메타데이터 사이드카)으로 변환
+    
+    Returns:
+        bool: 모든 관광지 변환 성공 여부
+    """
+    print("\n" + "="*60)
+    print("[INFO] 네이티브 모델 파일 생성")
+    print("="*60)
+    
+    scalers = load_scalers()
+    success = True
+    for tourist_code in TOURIST_SITES.keys():
+        model_path = MODELS_SAVED_DIR / MODEL_FILES[tourist_code]
+        if not model_path.exists():
+            print(f"[ERROR] 모델 파일을 찾을 수 없습니다: {model_path}")
+            success = False
+            continue
+        try:
+            meta_path = save_native_model(tourist_code, load_saved_pipeline(tourist_code, scalers))
+            print(f"[INFO] {TOURIST_SITES[tourist_code]['korean_name']}: {meta_path}")
+        except ValueError as e:
+            print(f"[ERROR] {tourist_code}: {e}")
+            success = False
+    return success
+
+
+def save_model_bundle(n_samples: int = 10000) -> bool:
+    """
+    저장된 관광지별 Pipeline을 하나의 다중 관광지 번들로 합쳐 저장
+    
+    번들은 관광지별 XGBoost 예측과 일치하는지 무작위 관측값으로 확인한 뒤 저장합니다.
+    
+    Returns:
+        bool: 성공 여부
+    """
+    print("\n" + "="*60)
+    print("[INFO] 다중 관광지 모델 번들 생성")
+    print("="*60)
+    
+    try:
+        tourist_codes = list(TOURIST_SITES.keys())
+        scalers = load_scalers()
+        pipelines = {}
+        for tourist_code in tourist_codes:
+            model_path = MODELS_SAVED_DIR / MODEL_FILES[tourist_code]
+            if not model_path.exists():
+                print(f"[ERROR] 모델 파일을 찾을 수 없습니다: {model_path}")
+                return False
+            pipelines[tourist_code] = load_saved_pipeline(tourist_code, scalers)
+        
+        bundle = SiteBundle.from_pipelines(pipelines, model_sources(tourist_codes, MODELS_SAVED_DIR))
+        print(f"[INFO] 관광지 {len(tourist_codes)}개, 트리 {bundle.forest.n_trees}개, 깊이 {bundle.forest.depth}")
+        
+        parity = check_bundle_parity(bundle, pipelines, sample_observations(n_samples))
+        mismatched = {code: p for code, p in parity.items() if p["mismatched_visitors"]}
+        if mismatched:
+            for tourist_code, p in mismatched.items():
+                print(f"[ERROR] {tourist_code}: 방문자 수 불일치 {p['mismatched_visitors']}행")
+            return False
+        print(f"[INFO] 관광지별 모델과 예측 일치 확인 (무작위 관측값 {n_samples:,}개)")
+        
+        bundle_path = MODELS_SAVED_DIR / MLConfig.MODEL_BUNDLE_FILE
+        bundle.save(bundle_path)
+        print(f"[INFO] 번들 저장 완료: {bundle_path}")
+        return True
+        
+    except Exception as e:
+        print(f"[ERROR] 오류 발생: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
 if __name__ == "__main__":
-    train_all_models()
+    parser = argparse.ArgumentParser(description="관광지별 모델 학습 및 Pipeline 저장")
+    parser.add_argument("--bundle", action="store_true", help="학습 후 다중 관광지 모델 번들 생성")
+    parser.add_argument("--bundle-only", action="store_true", help="학습 없이 저장된 모델로 번들만 생성")
+    parser.add_argument("--native-only", action="store_true", help="학습 없이 저장된 pkl 모델을 네이티브 형식으로만 변환")
+    parser.add_argument("--publish", action="store_true", help="학습 후 모델 레지스트리에 새 버전으로 게시")
+    args = parser.parse_args()
+    
+    if args.native_only:
+        if not save_native_models():
+            sys.exit(1)
+    elif not args.bundle_only:
+        results = train_all_models()
+        if (args.bundle or args.publish) and not all(results.values()):
+            print("[WARNING] 학습에 실패한 모델이 있어 번들을 생성하거나 게시하지 않습니다")
+            sys.exit(1)
+    if args.bundle or args.bundle_only:
+        if not save_model_bundle():
+            sys.exit(1)
+    if args.publish:
+        from scripts.publish_models import publish_models
+        
+        if not publish_models(MLConfig.MODELS_SAVED_DIR, MLConfig.MODEL_REGISTRY_KEEP):
+            sys.exit(1)
 
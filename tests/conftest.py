@@ -0,0 +1,8 @@
+"""
+pytest 공통 설정
+scripts/와 같이 프로젝트 루트를 import 경로에 추가하여 ml_service 패키지를 불러옴
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
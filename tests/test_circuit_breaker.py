@@ -0,0 +1,110 @@
+"""
+업스트림 회로 차단기 상태 전이 테스트 (ml_service/resilience.py)
+"""
+import types
+
+import pytest
+
+from ml_service import resilience
+from ml_service.resilience import CircuitBreaker, CircuitOpenError
+
+THRESHOLD = 3
+RESET_SECONDS = 30.0
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """resilience 모듈이 보는 monotonic 시계를 직접 조작"""
+    now = types.SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(resilience, "time", types.SimpleNamespace(monotonic=lambda: now.value))
+    return now
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker("test", failure_threshold=THRESHOLD, reset_seconds=RESET_SECONDS)
+
+
+def trip(breaker: CircuitBreaker):
+    """연속 실패로 회로 열기"""
+    for _ in range(THRESHOLD):
+        breaker.before_call()
+        breaker.record_failure(RuntimeError("timeout"))
+
+
+def test_opens_after_consecutive_failures(breaker):
+    for _ in range(THRESHOLD - 1):
+        breaker.before_call()
+        breaker.record_failure(RuntimeError("timeout"))
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    breaker.before_call()
+    breaker.record_failure(RuntimeError("timeout"))
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.trips == 1
+
+
+def test_success_resets_failure_count(breaker):
+    for _ in range(THRESHOLD - 1):
+        breaker.record_failure(RuntimeError("timeout"))
+    breaker.record_success()
+    for _ in range(THRESHOLD - 1):
+        breaker.record_failure(RuntimeError("timeout"))
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_open_rejects_calls_until_reset(breaker, clock):
+    trip(breaker)
+    clock.value += RESET_SECONDS - 1
+    with pytest.raises(CircuitOpenError, match="timeout"):
+        breaker.before_call()
+    assert breaker.rejected == 1
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_half_open_allows_single_trial(breaker, clock):
+    trip(breaker)
+    clock.value += RESET_SECONDS
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    assert breaker.rejected == 1
+
+
+def test_trial_success_closes(breaker, clock):
+    trip(breaker)
+    clock.value += RESET_SECONDS
+    breaker.before_call()
+    breaker.record_success()
+
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.before_call()
+    assert breaker.stats()["consecutive_failures"] == 0
+
+
+def test_trial_failure_reopens(breaker, clock):
+    trip(breaker)
+    clock.value += RESET_SECONDS
+    breaker.before_call()
+    breaker.record_failure(RuntimeError("still down"))
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.trips == 2
+    with pytest.raises(CircuitOpenError, match="still down"):
+        breaker.before_call()
+
+    # 대기 시간은 다시 열린 시각부터 계산
+    clock.value += RESET_SECONDS
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+
+def test_released_trial_allows_next_trial(breaker, clock):
+    trip(breaker)
+    clock.value += RESET_SECONDS
+    breaker.before_call()
+    breaker.release()
+
+    breaker.before_call()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
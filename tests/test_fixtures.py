@@ -0,0 +1,49 @@
+"""
+업스트림 응답 픽스처 녹화 테스트 (ml_service/fixtures.py, ml_service/upstream.py)
+"""
+import asyncio
+
+import pytest
+
+from ml_service import fixtures
+from ml_service.config import MLConfig
+from ml_service.fixtures import FixtureStore
+from ml_service.upstream import AsyncUpstreamClient
+
+DISTRICT_CODE = "111123"
+GOOD = {MLConfig.AIR_QUALITY_API_SERVICE: {
+    "RESULT": {"CODE": "INFO-000"},
+    "row": [{"MSRMT_YMD": "20250101120000", "PM": "30"}]
+}}
+ERROR = {MLConfig.AIR_QUALITY_API_SERVICE: {"RESULT": {"CODE": "ERROR-500", "MESSAGE": "서버 오류"}}}
+
+
+@pytest.fixture
+def record_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(MLConfig, "UPSTREAM_MODE", "record")
+    monkeypatch.setattr(MLConfig, "UPSTREAM_FIXTURES_DIR", tmp_path)
+    monkeypatch.setattr(fixtures, "_recorder", None)
+    return tmp_path
+
+
+def fetch(payload: dict) -> dict:
+    """get_json이 payload를 반환하도록 바꾼 클라이언트로 대기환경 조회"""
+    client = AsyncUpstreamClient()
+
+    async def get_json(url, params=None, upstream=None, deadline=None):
+        return payload
+
+    client.get_json = get_json
+    return asyncio.run(client.fetch_air_quality(DISTRICT_CODE))
+
+
+def test_records_parsed_response(record_dir):
+    assert fetch(GOOD)["pm10"] == 30.0
+    assert FixtureStore(record_dir).load(f"air_quality/{DISTRICT_CODE}", rebase=False) == GOOD
+
+
+def test_error_payload_does_not_overwrite_fixture(record_dir):
+    fetch(GOOD)
+    with pytest.raises(RuntimeError, match="ERROR-500"):
+        fetch(ERROR)
+    assert FixtureStore(record_dir).load(f"air_quality/{DISTRICT_CODE}", rebase=False) == GOOD
@@ -0,0 +1,46 @@
+"""
+양자화 예측 메모 테스트 (ml_service/memo.py)
+"""
+import numpy as np
+import pytest
+
+from ml_service.config import MLConfig
+from ml_service.memo import PredictionMemo
+
+
+def _predict(raw):
+    return raw[:, 0] * 10.0 + raw[:, 2]
+
+
+def test_default_bins_do_not_depend_on_precompute():
+    assert MLConfig.MEMO_BINS == {
+        "pm10": 1.0, "windspeed": 0.1, "temperature": 0.1, "humidity": 1.0, "rainfall": 0.1
+    }
+
+
+def test_precompute_over_cap_falls_back_to_lru(monkeypatch):
+    monkeypatch.setattr(MLConfig, "MEMO_PRECOMPUTE_MAX_CELLS", 1000)
+    memo = PredictionMemo(max_entries=100)
+
+    with pytest.warns(UserWarning, match="LRU만 사용"):
+        cells = memo.precompute("gyeongbok_palace", _predict)
+
+    assert cells == 0
+    stats = memo.stats()
+    assert stats["precomputed"] == {}
+    assert "gyeongbok_palace" in stats["precompute_skipped"]
+    # 구간 폭은 그대로이며 LRU로 예측
+    raw = np.array([[35.0, 1.2, 21.4, 60.0, 0.0, 2, 1]])
+    assert memo.predict("gyeongbok_palace", raw, _predict).tolist() == _predict(raw).tolist()
+
+
+def test_precompute_within_cap_builds_table():
+    memo = PredictionMemo(max_entries=100)
+    ranges = {"pm10": (30, 40), "windspeed": (1, 1.5), "temperature": (20, 22), "humidity": (60, 60), "rainfall": (0, 0)}
+    cells = memo.precompute("gyeongbok_palace", _predict, ranges=ranges)
+
+    assert cells == 11 * 6 * 21 * 1 * 1 * 7 * 4
+    assert memo.stats()["precompute_skipped"] == {}
+    raw = np.array([[35.0, 1.2, 21.4, 60.0, 0.0, 2, 1]])
+    np.testing.assert_allclose(memo.predict("gyeongbok_palace", raw, _predict), _predict(raw), rtol=1e-6)
+    assert memo.stats()["table_hits"] == 1
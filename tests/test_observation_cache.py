@@ -0,0 +1,68 @@
+"""
+관측 데이터 캐시 만료 테스트 (ml_service/observation_cache.py)
+"""
+from datetime import datetime, timedelta
+
+from ml_service.config import MLConfig
+from ml_service.observation_cache import (
+    ObservationCache,
+    air_quality_cache_key,
+    air_quality_expires_at,
+    forecast_cache_key,
+    weather_cache_key,
+    weather_expires_at,
+    REALTIME_OBSERVATION_KINDS
+)
+
+NOW = datetime(2025, 1, 1, 12, 20, 0)
+
+
+def test_get_returns_value_until_expiry():
+    cache = ObservationCache()
+    key = air_quality_cache_key("111123")
+    cache.set(key, {"PM10": 30}, NOW + timedelta(minutes=40))
+
+    assert cache.get(key, now=NOW) == {"PM10": 30}
+    assert cache.get(key, now=NOW + timedelta(minutes=39, seconds=59)) == {"PM10": 30}
+    # 만료 시각과 같으면 만료로 처리하고 항목을 삭제
+    assert cache.get(key, now=NOW + timedelta(minutes=40)) is None
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_missing_key_counts_as_miss():
+    cache = ObservationCache()
+    assert cache.get(weather_cache_key(60, 127), now=NOW) is None
+    assert cache.misses == 1
+
+
+def test_air_quality_expires_at_next_measurement():
+    measured_at = datetime(2025, 1, 1, 12, 0, 0)
+    assert air_quality_expires_at(measured_at, now=NOW) == datetime(2025, 1, 1, 13, 0, 0)
+
+
+def test_air_quality_expires_at_min_ttl_when_publication_is_late():
+    # 12시 측정값이 13시 10분에도 최신이면 다음 측정 시각이 이미 지났으므로 최소 TTL 후 다시 조회
+    measured_at = datetime(2025, 1, 1, 12, 0, 0)
+    now = datetime(2025, 1, 1, 13, 10, 0)
+    expected = now + timedelta(seconds=MLConfig.OBSERVATION_CACHE_MIN_TTL)
+    assert air_quality_expires_at(measured_at, now=now) == expected
+
+
+def test_weather_expires_at_next_hour():
+    assert weather_expires_at(NOW) == datetime(2025, 1, 1, 13, 0, 0)
+    assert weather_expires_at(datetime(2025, 1, 1, 23, 59, 59)) == datetime(2025, 1, 2, 0, 0, 0)
+
+
+def test_invalidate_keeps_other_kinds():
+    cache = ObservationCache()
+    expires_at = NOW + timedelta(hours=1)
+    cache.set(air_quality_cache_key("111123"), "air", expires_at)
+    cache.set(weather_cache_key(60, 127), "weather", expires_at)
+    cache.set(forecast_cache_key(60, 127), "forecast", expires_at)
+
+    cache.invalidate(REALTIME_OBSERVATION_KINDS)
+
+    assert cache.get(air_quality_cache_key("111123"), now=NOW) is None
+    assert cache.get(weather_cache_key(60, 127), now=NOW) is None
+    assert cache.get(forecast_cache_key(60, 127), now=NOW) == "forecast"
@@ -0,0 +1,129 @@
+"""
+모델 레지스트리 게시/활성화/검증 테스트 (ml_service/registry.py)
+"""
+import json
+from pathlib import Path
+
+import pytest
+
+from ml_service.config import MLConfig
+from ml_service.registry import ModelRegistry, STAGING_PREFIX
+
+
+@pytest.fixture
+def source_dir(tmp_path) -> Path:
+    """관광지별 pkl과 스키마 파일이 있는 모델 디렉토리 (레지스트리는 내용을 해석하지 않음)"""
+    models_dir = tmp_path / "saved"
+    models_dir.mkdir()
+    for tourist_code, filename in MLConfig.MODEL_FILES.items():
+        model_path = models_dir / filename
+        model_path.write_bytes(f"model:{tourist_code}".encode())
+        model_path.with_suffix(MLConfig.FEATURE_SCHEMA_SUFFIX).write_text("{}", encoding="utf-8")
+    return models_dir
+
+
+@pytest.fixture
+def registry(tmp_path) -> ModelRegistry:
+    return ModelRegistry(tmp_path / "registry")
+
+
+def first_model_file() -> str:
+    return next(iter(MLConfig.MODEL_FILES.values()))
+
+
+def test_create_version_copies_files_without_activating(registry, source_dir):
+    version = registry.create_version(source_dir, "v1")
+
+    assert version == "v1"
+    assert registry.versions() == ["v1"]
+    assert registry.current_version() is None
+    manifest = registry.verify("v1")
+    assert set(manifest["files"]) == {
+        name for filename in MLConfig.MODEL_FILES.values()
+        for name in (filename, Path(filename).stem + MLConfig.FEATURE_SCHEMA_SUFFIX)
+    }
+    assert (registry.version_dir("v1") / first_model_file()).read_bytes() == (source_dir / first_model_file()).read_bytes()
+
+
+def test_create_version_rejects_existing_version(registry, source_dir):
+    registry.create_version(source_dir, "v1")
+    with pytest.raises(ValueError):
+        registry.create_version(source_dir, "v1")
+
+
+def test_create_version_requires_every_model(registry, source_dir):
+    (source_dir / first_model_file()).unlink()
+    with pytest.raises(FileNotFoundError):
+        registry.create_version(source_dir, "v1")
+    assert registry.versions() == []
+    assert list(registry.root.glob(STAGING_PREFIX + "*")) == []
+
+
+@pytest.mark.parametrize("version", ["", ".hidden", "../escape", "a/b"])
+def test_rejects_invalid_version_names(registry, version):
+    with pytest.raises(ValueError):
+        registry.version_dir(version)
+
+
+def test_activate_switches_pointer(registry, source_dir):
+    registry.create_version(source_dir, "v1")
+    registry.create_version(source_dir, "v2")
+
+    registry.activate("v1")
+    assert registry.resolve() == ("v1", registry.version_dir("v1"))
+    registry.activate("v2")
+    assert registry.current_version() == "v2"
+    assert registry.pointer_path.read_text(encoding="utf-8") == "v2\n"
+
+
+def test_resolve_without_pointer_uses_saved_dir(registry):
+    assert registry.resolve() == (None, MLConfig.MODELS_SAVED_DIR)
+
+
+def test_verify_detects_modified_file(registry, source_dir):
+    registry.create_version(source_dir, "v1")
+    (registry.version_dir("v1") / first_model_file()).write_bytes(b"tampered")
+    with pytest.raises(ValueError, match=first_model_file()):
+        registry.verify("v1")
+
+
+def test_verify_detects_same_size_modification(registry, source_dir):
+    registry.create_version(source_dir, "v1")
+    path = registry.version_dir("v1") / first_model_file()
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 1
+    path.write_bytes(bytes(data))
+    with pytest.raises(ValueError):
+        registry.verify("v1")
+
+
+def test_verify_detects_missing_file(registry, source_dir):
+    registry.create_version(source_dir, "v1")
+    (registry.version_dir("v1") / first_model_file()).unlink()
+    with pytest.raises(FileNotFoundError):
+        registry.verify("v1")
+
+
+def test_activate_keeps_pointer_when_verify_fails(registry, source_dir):
+    registry.create_version(source_dir, "v1")
+    registry.create_version(source_dir, "v2")
+    registry.activate("v1")
+    manifest_path = registry.version_dir("v2") / MLConfig.MODEL_REGISTRY_MANIFEST
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    manifest["files"][first_model_file()]["sha256"] = "0" * 64
+    manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        registry.activate("v2")
+    with pytest.raises(FileNotFoundError):
+        registry.activate("missing")
+    assert registry.current_version() == "v1"
+
+
+def test_prune_keeps_current_version(registry, source_dir):
+    for version in ("v1", "v2", "v3"):
+        registry.create_version(source_dir, version)
+    registry.activate("v1")
+
+    assert registry.prune(keep=1) == ["v2"]
+    assert registry.versions() == ["v1", "v3"]
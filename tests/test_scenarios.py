@@ -0,0 +1,32 @@
+"""
+시나리오 배열 생성 테스트 (ml_service/scenarios.py)
+"""
+import numpy as np
+import pytest
+
+from ml_service.config import MLConfig
+from ml_service.preprocessing import RAW_OBSERVATION_COLUMNS
+from ml_service.scenarios import grid_to_array
+
+
+def test_grid_is_cartesian_product_with_defaults():
+    raw = grid_to_array({"pm10": [10, 80], "temperature": [0, 15, 30], "weekday": [5], "season": [1]})
+    assert raw.shape == (6, len(RAW_OBSERVATION_COLUMNS))
+    # 마지막 컬럼이 가장 빠르게 변함
+    assert raw[:3, RAW_OBSERVATION_COLUMNS.index("temperature")].tolist() == [0, 15, 30]
+    assert raw[:, RAW_OBSERVATION_COLUMNS.index("pm10")].tolist() == [10] * 3 + [80] * 3
+
+
+def test_grid_over_limit_is_rejected():
+    values = list(range(MLConfig.SCENARIO_MAX_ROWS + 1))
+    with pytest.raises(ValueError, match="최대값"):
+        grid_to_array({"pm10": values, "weekday": [0], "season": [0]})
+
+
+def test_grid_size_does_not_overflow():
+    # 축 크기의 곱(10,000^5 × 7 × 4)은 int64를 넘어 np.prod로는 음수가 됨
+    axis = np.arange(10_000, dtype=float).tolist()
+    grid = {col: axis for col in ("pm10", "temperature", "humidity", "windspeed", "rainfall")}
+    grid.update(weekday=list(range(7)), season=list(range(4)))
+    with pytest.raises(ValueError, match="최대값"):
+        grid_to_array(grid)
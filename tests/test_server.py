@@ -0,0 +1,19 @@
+"""
+서버 실행 모듈 테스트 (backend/server.py)
+"""
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+def test_spawn_reimport_does_not_build_app():
+    # spawn 평가 워커는 실행한 스크립트를 __mp_main__으로 다시 불러오므로 서버 객체를 만들면 안 됨
+    code = (
+        "import runpy, sys\n"
+        f"runpy.run_path({str(PROJECT_ROOT / 'backend' / 'server.py')!r}, run_name='__mp_main__')\n"
+        "print('backend.main' in sys.modules)\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
@@ -0,0 +1,134 @@
+"""
+Single-flight 호출 합치기 테스트 (ml_service/singleflight.py)
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from ml_service.singleflight import AsyncSingleFlight, SingleFlight
+
+CALLERS = 5
+
+
+def wait_until(condition, timeout: float = 5.0):
+    """조건이 참이 될 때까지 대기 (동시 호출자가 모두 합류했는지 확인)"""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise TimeoutError("조건을 만족하지 않았습니다")
+        time.sleep(0.001)
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def fn():
+        calls.append(1)
+        release.wait(5)
+        return {"value": 42}
+
+    with ThreadPoolExecutor(CALLERS) as pool:
+        futures = [pool.submit(flight.do, "key", fn) for _ in range(CALLERS)]
+        wait_until(lambda: flight.shared == CALLERS - 1)
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert (flight.executed, flight.shared, flight.in_flight()) == (1, CALLERS - 1, 0)
+
+
+def test_error_is_raised_to_every_caller():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def fn():
+        release.wait(5)
+        raise RuntimeError("upstream down")
+
+    with ThreadPoolExecutor(CALLERS) as pool:
+        futures = [pool.submit(flight.do, "key", fn) for _ in range(CALLERS)]
+        wait_until(lambda: flight.shared == CALLERS - 1)
+        release.set()
+        for future in futures:
+            with pytest.raises(RuntimeError, match="upstream down"):
+                future.result()
+
+    assert flight.in_flight() == 0
+
+
+def test_sequential_calls_and_different_keys_run_separately():
+    flight = SingleFlight()
+    assert flight.do("a", lambda: 1) == 1
+    assert flight.do("a", lambda: 2) == 2
+    assert flight.do("b", lambda: 3) == 3
+    assert (flight.executed, flight.shared) == (3, 0)
+
+
+def test_async_concurrent_calls_share_one_task():
+    async def main():
+        flight = AsyncSingleFlight()
+        release = asyncio.Event()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await release.wait()
+            return "payload"
+
+        tasks = [asyncio.ensure_future(flight.do("key", fetch)) for _ in range(CALLERS)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*tasks)
+        return flight, calls, results
+
+    flight, calls, results = asyncio.run(main())
+    assert len(calls) == 1
+    assert results == ["payload"] * CALLERS
+    assert (flight.executed, flight.shared, flight.in_flight()) == (1, CALLERS - 1, 0)
+
+
+def test_async_error_is_raised_to_every_caller():
+    async def main():
+        flight = AsyncSingleFlight()
+        release = asyncio.Event()
+
+        async def fetch():
+            await release.wait()
+            raise ValueError("bad response")
+
+        tasks = [asyncio.ensure_future(flight.do("key", fetch)) for _ in range(CALLERS)]
+        await asyncio.sleep(0)
+        release.set()
+        return flight, await asyncio.gather(*tasks, return_exceptions=True)
+
+    flight, outcomes = asyncio.run(main())
+    assert all(isinstance(outcome, ValueError) for outcome in outcomes)
+    assert flight.in_flight() == 0
+
+
+def test_async_cancelled_caller_does_not_cancel_shared_task():
+    async def main():
+        flight = AsyncSingleFlight()
+        release = asyncio.Event()
+
+        async def fetch():
+            await release.wait()
+            return "payload"
+
+        first = asyncio.ensure_future(flight.do("key", fetch))
+        second = asyncio.ensure_future(flight.do("key", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        return first, await second
+
+    first, result = asyncio.run(main())
+    assert first.cancelled()
+    assert result == "payload"
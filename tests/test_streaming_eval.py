@@ -0,0 +1,164 @@
+"""
+스트리밍 평가 누적 지표와 해시 분할 테스트 (ml_service/streaming_eval.py)
+"""
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.metrics import mean_absolute_error, mean_absolute_percentage_error, mean_squared_error, r2_score
+
+from ml_service.feature_schema import get_schema_path
+from ml_service.streaming_eval import (
+    SPLIT_METHOD,
+    HashSample,
+    RunningMoments,
+    RunningRegressionMetrics,
+    hash_split,
+    hash_train_test_split,
+    row_hash,
+)
+from scripts import evaluate_models
+
+
+def sklearn_metrics(actual, predicted) -> dict:
+    """scripts/evaluate_models.py의 전체 데이터 평가와 같은 지표"""
+    mse = mean_squared_error(actual, predicted)
+    return {
+        "MAE": mean_absolute_error(actual, predicted),
+        "MSE": mse,
+        "RMSE": np.sqrt(mse),
+        "R²": r2_score(actual, predicted),
+        "MAPE": mean_absolute_percentage_error(actual, predicted) * 100
+    }
+
+
+def accumulate(actual, predicted, chunk_sizes) -> RunningRegressionMetrics:
+    """크기가 제각각인 청크로 나눠 누적"""
+    metrics = RunningRegressionMetrics()
+    bounds = np.cumsum(chunk_sizes)[:-1]
+    for a, p in zip(np.split(actual, bounds), np.split(predicted, bounds)):
+        metrics.update(a, p)
+    return metrics
+
+
+@pytest.fixture
+def visitors():
+    rng = np.random.default_rng(7)
+    actual = rng.poisson(800, size=5000).astype(np.float64)
+    # MAPE의 0 나눗셈 처리(sklearn과 같이 eps로 대체) 확인용
+    actual[:5] = 0
+    predicted = actual + rng.normal(scale=60, size=len(actual))
+    return actual, predicted
+
+
+@pytest.mark.parametrize("chunk_sizes", [[5000], [1000] * 5, [1, 17, 999, 3000, 983]])
+def test_running_metrics_match_sklearn(visitors, chunk_sizes):
+    actual, predicted = visitors
+    running = accumulate(actual, predicted, chunk_sizes).metrics()
+    expected = sklearn_metrics(actual, predicted)
+
+    assert running.keys() == expected.keys()
+    for name, value in expected.items():
+        assert running[name] == pytest.approx(value, rel=1e-9), name
+
+
+def test_running_metrics_constant_actual_matches_sklearn():
+    actual = np.full(100, 500.0)
+    for predicted in (actual.copy(), actual + 1):
+        running = accumulate(actual, predicted, [30, 70]).metrics()
+        assert running["R²"] == r2_score(actual, predicted)
+
+
+def test_running_metrics_empty_is_nan():
+    assert all(np.isnan(value) for value in RunningRegressionMetrics().metrics().values())
+
+
+def test_running_moments_match_numpy(visitors):
+    actual, _ = visitors
+    moments = RunningMoments()
+    for chunk in np.array_split(actual, 7):
+        moments.update(chunk)
+
+    assert moments.count == len(actual)
+    assert moments.mean == pytest.approx(actual.mean(), rel=1e-12)
+    assert moments.std() == pytest.approx(actual.std(), rel=1e-9)
+    assert moments.std(ddof=1) == pytest.approx(actual.std(ddof=1), rel=1e-9)
+    assert (moments.min, moments.max) == (actual.min(), actual.max())
+
+
+def test_hash_split_is_stable():
+    keys = np.arange(1, 100_001, dtype=np.int64)
+    mask = hash_split(keys, 0.2, seed=42)
+
+    # 청크로 나누거나 순서를 바꿔도 같은 행은 같은 쪽
+    chunked = np.concatenate([hash_split(chunk, 0.2, seed=42) for chunk in np.array_split(keys, 13)])
+    np.testing.assert_array_equal(chunked, mask)
+    order = np.random.default_rng(0).permutation(len(keys))
+    np.testing.assert_array_equal(hash_split(keys[order], 0.2, seed=42), mask[order])
+
+    assert mask.mean() == pytest.approx(0.2, abs=0.01)
+    assert not np.array_equal(hash_split(keys, 0.2, seed=43), mask)
+
+
+def test_row_hash_known_values():
+    # 플랫폼/프로세스와 무관한 splitmix64 값 (바뀌면 기존 스트리밍 평가 결과의 분할이 달라짐)
+    np.testing.assert_array_equal(
+        row_hash(np.array([0, 1, 2]), seed=0),
+        np.array([0xE220A8397B1DCDAF, 0x910A2DEC89025CC1, 0x975835DE1C9756CE], dtype=np.uint64)
+    )
+
+
+def test_hash_sample_is_order_independent(visitors):
+    actual, predicted = visitors
+    keys = np.arange(len(actual))
+    expected = HashSample(100, seed=42)
+    expected.update(keys, actual, predicted)
+
+    order = np.random.default_rng(1).permutation(len(keys))
+    sample = HashSample(100, seed=42)
+    for chunk in np.array_split(order, 9):
+        sample.update(keys[chunk], actual[chunk], predicted[chunk])
+
+    for got, want in zip(sample.arrays(), expected.arrays()):
+        np.testing.assert_array_equal(got, want)
+    assert len(sample.arrays()[0]) == 100
+
+
+def test_hash_train_test_split_matches_streaming_split():
+    # rowid는 삭제 등으로 연속되지 않을 수 있으므로 인덱스 값으로 분할
+    keys = np.arange(1, 20_001, dtype=np.int64) * 3
+    X = pd.DataFrame({"pm10": np.arange(len(keys), dtype=float)}, index=keys)
+    y = pd.Series(np.arange(len(keys), dtype=float), index=keys)
+
+    X_train, X_test, y_train, y_test = hash_train_test_split(X, y, 0.2, seed=42)
+
+    is_test = hash_split(keys, 0.2, seed=42)
+    np.testing.assert_array_equal(X_test.index.to_numpy(), keys[is_test])
+    np.testing.assert_array_equal(y_train.index.to_numpy(), keys[~is_test])
+    assert len(X_train) + len(X_test) == len(keys)
+
+
+def _write_schema(models_dir, tourist_code, split=None):
+    schema = {"schema_version": 1, "tourist_code": tourist_code, "feature_columns": []}
+    if split is not None:
+        schema["split"] = split
+    get_schema_path(tourist_code, models_dir).write_text(json.dumps(schema), encoding="utf-8")
+
+
+def test_streaming_auto_requires_hash_trained_model(tmp_path, monkeypatch):
+    monkeypatch.setattr(evaluate_models, "count_tourist_rows", lambda name: 10_000_000)
+    split = {"method": SPLIT_METHOD, "test_size": 0.2, "random_state": 42}
+    _write_schema(tmp_path, "gyeongbok_palace", split)
+    _write_schema(tmp_path, "changdeok_palace")
+    _write_schema(tmp_path, "jongmyo_shrine", {**split, "random_state": 7})
+
+    assert evaluate_models.trained_with_hash_split("gyeongbok_palace", tmp_path)
+    # 분할 기록이 없거나 설정이 다른 모델은 train_test_split으로 학습된 것으로 보고 자동 전환하지 않음
+    assert not evaluate_models.trained_with_hash_split("changdeok_palace", tmp_path)
+    assert not evaluate_models.trained_with_hash_split("jongmyo_shrine", tmp_path)
+    assert not evaluate_models.trained_with_hash_split("seoul_grand_park", tmp_path)
+
+    assert evaluate_models.use_streaming("경복궁", "auto", hash_trained=True)
+    assert not evaluate_models.use_streaming("창덕궁", "auto", hash_trained=False)
+    assert evaluate_models.use_streaming("창덕궁", "true", hash_trained=False)
@@ -0,0 +1,80 @@
+"""
+컴파일된 트리 엔진과 XGBoost 예측 일치 테스트 (ml_service/tree_engine.py)
+"""
+import numpy as np
+import pytest
+
+xgb = pytest.importorskip("xgboost")
+
+from ml_service.tree_engine import CompiledForest, PARITY_SINGLE_ROWS, CHUNK_ROWS
+
+N_FEATURES = 6
+
+
+@pytest.fixture(scope="module")
+def data():
+    rng = np.random.default_rng(42)
+    X = rng.normal(size=(2000, N_FEATURES)).astype(np.float32)
+    y = 100 * X[:, 0] + 50 * np.sin(X[:, 1]) + 10 * X[:, 2] * X[:, 3] + rng.normal(scale=5, size=len(X))
+    # 결측값 분기(default_left) 확인용
+    X[rng.random(X.shape) < 0.05] = np.nan
+    return X, y
+
+
+def fit(X, y, **params):
+    model = xgb.XGBRegressor(n_estimators=40, max_depth=5, learning_rate=0.3, n_jobs=1, random_state=0, **params)
+    return model.fit(X, y)
+
+
+@pytest.mark.parametrize("objective", ["reg:squarederror", "reg:absoluteerror", "reg:pseudohubererror"])
+def test_batch_predictions_match_xgboost(data, objective):
+    X, y = data
+    model = fit(X, y, objective=objective)
+    forest = CompiledForest.from_booster(model.get_booster())
+
+    # 청크 경계를 넘는 배치도 XGBoost와 비트 단위로 일치
+    rows = X[:CHUNK_ROWS * 2 + 7]
+    np.testing.assert_array_equal(forest.predict(rows), model.predict(rows))
+
+
+def test_single_row_predictions_match_xgboost(data):
+    X, y = data
+    model = fit(X, y)
+    forest = CompiledForest.from_booster(model.get_booster())
+
+    for row in X[:PARITY_SINGLE_ROWS]:
+        assert forest.predict(row[None, :])[0] == model.predict(row[None, :])[0]
+
+
+def test_shallow_trees_are_padded(data):
+    X, y = data
+    # 행이 적으면 트리마다 깊이가 달라 얕은 리프를 아래 칸으로 복사해야 함
+    model = fit(X[:40], y[:40], min_child_weight=5)
+    forest = CompiledForest.from_booster(model.get_booster())
+    np.testing.assert_array_equal(forest.predict(X[:300]), model.predict(X[:300]))
+
+
+def test_save_and_load_roundtrip(data, tmp_path):
+    X, y = data
+    model = fit(X, y)
+    forest = CompiledForest.from_booster(model.get_booster())
+    path = tmp_path / "model.trees.npz"
+    forest.save(path)
+
+    loaded = CompiledForest.load(path)
+    assert loaded.feature_names == forest.feature_names
+    np.testing.assert_array_equal(loaded.predict(X[:200]), model.predict(X[:200]))
+
+
+def test_rejects_wrong_feature_count(data):
+    X, y = data
+    forest = CompiledForest.from_booster(fit(X, y).get_booster())
+    with pytest.raises(ValueError):
+        forest.predict(X[:, :N_FEATURES - 1])
+
+
+def test_rejects_unsupported_objective(data):
+    X, y = data
+    model = fit(X, np.abs(y), objective="count:poisson")
+    with pytest.raises(ValueError, match="count:poisson"):
+        CompiledForest.from_booster(model.get_booster())